@@ -0,0 +1,39 @@
+"""
+Сравнение пропускной способности декодеров входящих сообщений (сообщений в секунду).
+
+StrictDecoder повторяет декодирование прежнего AeronCommunicator._handler (ujson.loads + Message(**dict)),
+FastDecoder - быстрый путь с парсерами по action, в том числе с разбором ордербуков в CompactOrderbook.
+Запуск: python -m benchmarks.bench_decoder
+"""
+from benchmarks.common import measure_rate, print_table
+from benchmarks.messages import orderbook_message, balances_message, orders_update_message
+from testing_core.communicator.decoder import StrictDecoder, FastDecoder
+
+MESSAGES_COUNT = 2000
+
+
+def main():
+    streams = {
+        'order_book_update (depth 3)': [orderbook_message(depth=3) for _ in range(MESSAGES_COUNT)],
+        'order_book_update (depth 20)': [orderbook_message(depth=20) for _ in range(MESSAGES_COUNT)],
+        'balance_update (3 assets)': [balances_message() for _ in range(MESSAGES_COUNT)],
+        'orders_update (1 order)': [orders_update_message() for _ in range(MESSAGES_COUNT)],
+        'orders_update (10 orders)': [orders_update_message(orders_count=10) for _ in range(MESSAGES_COUNT)],
+    }
+    strict_decoder = StrictDecoder()
+    fast_decoder = FastDecoder()
+
+    compact_decoder = FastDecoder(compact_orderbooks=True)
+
+    rows = [('stream', 'strict, msg/s', 'fast, msg/s', 'speedup', 'fast compact, msg/s')]
+    for name, messages in streams.items():
+        strict_rate = measure_rate(strict_decoder.decode, messages)
+        fast_rate = measure_rate(fast_decoder.decode, messages)
+        compact_rate = measure_rate(compact_decoder.decode, messages) if name.startswith('order_book') else None
+        rows.append((name, f'{strict_rate:,.0f}', f'{fast_rate:,.0f}', f'x{fast_rate / strict_rate:.1f}',
+                     f'{compact_rate:,.0f}' if compact_rate is not None else '-'))
+    print_table('Decoding of incoming messages', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Сравнение скорости формирования команд гейту (команд в секунду, включая сериализацию в json).
+
+Message - прежний путь: модели pydantic для ордеров и сообщения, затем Message.json().
+PreparedCommand - шаблон с заранее отрендеренной постоянной частью сообщения.
+Запуск: python -m benchmarks.bench_formatter
+"""
+from benchmarks.common import measure_rate, print_table
+from testing_core import enums
+from testing_core.formatter.formatter import Formatter
+from testing_core.order.order import OrderData
+from testing_core.utils import get_uuid
+
+COMMANDS_COUNT = 2000
+
+
+def create_orders(count: int) -> tuple[OrderData]:
+    return tuple(OrderData(core_order_id=get_uuid(), symbol='BTC/USDT', type=enums.OrderType.LIMIT,
+                           side=enums.OrderSide.BUY, price=20000.5 + i, amount=0.001) for i in range(count))
+
+
+def main():
+    message_formatter = Formatter(exchange='binance', instance='test', algo='test', prepared_commands=False)
+    prepared_formatter = Formatter(exchange='binance', instance='test', algo='test')
+    streams = {
+        'create_orders (1 order)': ('format_create_orders', [create_orders(1) for _ in range(COMMANDS_COUNT)]),
+        'create_orders (10 orders)': ('format_create_orders', [create_orders(10) for _ in range(COMMANDS_COUNT)]),
+        'cancel_orders (1 order)': ('format_cancel_orders', [create_orders(1) for _ in range(COMMANDS_COUNT)]),
+        'get_balance (3 assets)': ('format_get_balance', [['BTC', 'ETH', 'USDT'] for _ in range(COMMANDS_COUNT)]),
+    }
+
+    rows = [('command', 'Message, cmd/s', 'PreparedCommand, cmd/s', 'speedup')]
+    for name, (method, arguments) in streams.items():
+        message_format = getattr(message_formatter, method)
+        prepared_format = getattr(prepared_formatter, method)
+        message_rate = measure_rate(lambda argument: message_format(argument).json(), arguments)
+        prepared_rate = measure_rate(lambda argument: prepared_format(argument).json(), arguments)
+        rows.append((name, f'{message_rate:,.0f}', f'{prepared_rate:,.0f}', f'x{prepared_rate / message_rate:.1f}'))
+    print_table('Formatting of commands', rows)
+
+
+if __name__ == '__main__':
+    main()
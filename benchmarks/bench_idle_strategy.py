@@ -0,0 +1,83 @@
+"""
+Сравнение idle strategies цикла обработки подписок: загрузка процессора и задержка обработки сообщений.
+
+Источник сообщений имитирует подписку Aeron: сообщения появляются с заданной частотой, цикл опрашивает
+источник и вызывает idle strategy. Прежний цикл (asyncio.sleep(0.000001) после каждого опроса) приведен для
+сравнения. Загрузка процессора - отношение процессорного времени к реальному времени прогона.
+Запуск: python -m benchmarks.bench_idle_strategy
+"""
+import asyncio
+import statistics
+import time
+
+from benchmarks.common import print_table
+from testing_core.trader.idle_strategy import IdleStrategy, BusySpinIdleStrategy, YieldingIdleStrategy, \
+    BackoffIdleStrategy
+
+DURATION = 2
+MESSAGE_RATES = (0, 100, 1000, 10000)
+
+
+class LegacyIdleStrategy(IdleStrategy):
+    """Прежнее поведение Trader.handle_subscriptions_loop"""
+
+    async def idle(self, work_count: int) -> None:
+        await asyncio.sleep(0.000001)
+
+
+class SyntheticSubscription(object):
+    """Подписка, в которой сообщения появляются равномерно с заданной частотой"""
+
+    def __init__(self, rate: int, fragment_limit: int = 10):
+        self._interval = 1 / rate if rate else None
+        self._fragment_limit = fragment_limit
+        self._next_time = time.perf_counter()
+        self.latencies: list[float] = []
+
+    def poll(self) -> int:
+        if self._interval is None:
+            return 0
+        now = time.perf_counter()
+        count = 0
+        while self._next_time <= now and count < self._fragment_limit:
+            self.latencies.append(now - self._next_time)
+            self._next_time += self._interval
+            count += 1
+        return count
+
+
+async def run_loop(idle_strategy: IdleStrategy, rate: int) -> tuple[float, list[float]]:
+    """
+    Прогнать цикл обработки подписки.
+    :return: загрузка процессора (доля) и задержки сообщений в секундах
+    """
+    subscription = SyntheticSubscription(rate)
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    while time.perf_counter() - start_wall < DURATION:
+        await idle_strategy.idle(subscription.poll())
+    cpu_load = (time.process_time() - start_cpu) / (time.perf_counter() - start_wall)
+    return cpu_load, subscription.latencies
+
+
+def main():
+    strategies = {
+        'legacy sleep(1e-6)': LegacyIdleStrategy,
+        'busy spin': BusySpinIdleStrategy,
+        'yield': YieldingIdleStrategy,
+        'backoff': BackoffIdleStrategy,
+    }
+    rows = [('strategy', 'msg/s', 'cpu', 'latency p50, us', 'latency p99, us')]
+    for name, strategy_class in strategies.items():
+        for rate in MESSAGE_RATES:
+            cpu_load, latencies = asyncio.run(run_loop(strategy_class(), rate))
+            if latencies:
+                p50 = statistics.median(latencies) * 1e6
+                p99 = statistics.quantiles(latencies, n=100)[98] * 1e6 if len(latencies) > 1 else p50
+                rows.append((name, rate, f'{cpu_load:.0%}', f'{p50:,.1f}', f'{p99:,.1f}'))
+            else:
+                rows.append((name, rate, f'{cpu_load:.0%}', '-', '-'))
+    print_table('Idle strategies of subscriptions loop', rows)
+
+
+if __name__ == '__main__':
+    main()
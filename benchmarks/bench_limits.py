@@ -0,0 +1,103 @@
+"""
+Скорость проверки ордеров на лимиты торговой пары на потоке с долей ордеров, нарушающих лимиты
+(слишком маленький объем, слишком большая цена, слишком маленькая стоимость).
+
+nested Market.Limits - прежняя проверка: обход вложенных моделей лимитов и проверки `is not None` для каждого ордера.
+LimitValidator.validate - проверка, собранная при создании Market (только заданные границы, причина нарушения).
+TickLimits.violation - та же проверка по ценам и объемам в тиках (integer_ticks).
+LimitValidator.violations / TickLimits.violations - массивами numpy, как в пакетном создании ордеров.
+
+Запуск: python -m benchmarks.bench_limits [--orders 100000 --invalid-share 0.3]
+"""
+import argparse
+import random
+
+import numpy as np
+
+from benchmarks.common import measure_rate, print_table
+from testing_core.config import Market
+
+MARKET = Market(
+    exchange_symbol='BTCUSDT', common_symbol='BTC/USDT', price_increment=0.01, amount_increment=1e-05,
+    base_asset='BTC', quote_asset='USDT',
+    limits=Market.Limits(amount=Market.Limits.MinMax(min=1e-05, max=9000),
+                         price=Market.Limits.MinMax(min=0.01, max=1_000_000),
+                         cost=Market.Limits.MinMax(min=5, max=None),
+                         leverage=Market.Limits.MinMax(min=None, max=None)))
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Limit validation benchmark')
+    parser.add_argument('--orders', type=int, default=100_000, help='количество ордеров в потоке')
+    parser.add_argument('--invalid-share', type=float, default=0.3, help='доля ордеров, нарушающих лимиты')
+    return parser.parse_args()
+
+
+def create_stream(count: int, invalid_share: float) -> list[tuple[float, float]]:
+    """Поток (цена, объем) с заданной долей ордеров, нарушающих разные лимиты"""
+    random.seed(0)
+    stream = []
+    for _ in range(count):
+        price, amount = round(random.uniform(19000, 21000), 2), round(random.uniform(0.001, 0.1), 5)
+        if random.random() < invalid_share:
+            match random.randrange(3):
+                case 0:
+                    amount = 1e-06
+                case 1:
+                    price = 2_000_000.0
+                case 2:
+                    price, amount = 100.0, 0.001
+        stream.append((price, amount))
+    return stream
+
+
+def check_nested_limits(limits: Market.Limits, price: float, amount: float) -> bool:
+    """Прежняя проверка OrderFabric.check_order_to_limits (для сравнения)"""
+    is_valid = True
+    if limits.amount.min is not None and not limits.amount.min < amount or \
+            limits.amount.max is not None and not amount < limits.amount.max:
+        is_valid = False
+    elif limits.price.min is not None and not limits.price.min < price or \
+            limits.price.max is not None and not price < limits.price.max:
+        is_valid = False
+    if limits.cost.min is not None and not limits.cost.min < price * amount or \
+            limits.cost.max is not None and not price * amount < limits.cost.max:
+        is_valid = False
+    return is_valid
+
+
+def main():
+    args = parse_arguments()
+    stream = create_stream(args.orders, args.invalid_share)
+    ticks_stream = [(MARKET.price_scale.to_ticks(price), MARKET.amount_scale.to_ticks(amount))
+                    for price, amount in stream]
+    validator, tick_limits, limits = MARKET.validator, MARKET.tick_limits, MARKET.limits
+
+    # результаты всех проверок совпадают
+    nested = [check_nested_limits(limits, price, amount) for price, amount in stream]
+    assert nested == [validator.validate(price, amount) is None for price, amount in stream]
+    assert nested == [tick_limits.violation(*ticks) is None for ticks in ticks_stream]
+
+    rates = {
+        'nested Market.Limits': measure_rate(lambda order: check_nested_limits(limits, *order), stream),
+        'LimitValidator.validate': measure_rate(lambda order: validator.validate(*order), stream),
+        'TickLimits.violation': measure_rate(lambda order: tick_limits.violation(*order), ticks_stream),
+    }
+    prices, amounts = np.array([order[0] for order in stream]), np.array([order[1] for order in stream])
+    price_ticks, amount_ticks = np.array([order[0] for order in ticks_stream]), np.array(
+        [order[1] for order in ticks_stream])
+    rates['LimitValidator.violations'] = measure_rate(lambda _: validator.violations(prices, amounts), [None]) * \
+        len(stream)
+    rates['TickLimits.violations'] = measure_rate(lambda _: tick_limits.violations(price_ticks, amount_ticks),
+                                                  [None]) * len(stream)
+
+    baseline = rates['nested Market.Limits']
+    rows = [('check', 'orders/s', 'vs nested')]
+    for name, rate in rates.items():
+        rows.append((name, f'{rate:,.0f}', f'x{rate / baseline:.1f}'))
+    print_table(f'Limit validation (orders={args.orders}, invalid share={args.invalid_share}, '
+                f'invalid={nested.count(False)})', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Сравнение валидации Message с выбором типа data по action и прежней валидации с перебором вариантов Union,
+по каждому типу сообщений. Запуск: python -m benchmarks.bench_message
+"""
+import ujson
+from pydantic import BaseModel
+
+from benchmarks.common import measure_rate, print_table
+from benchmarks.messages import orderbook_message, balances_message, orders_update_message
+from testing_core import enums
+from testing_core.models.message import Message, MessageData
+
+MESSAGES_COUNT = 2000
+
+
+class UnionMessage(BaseModel):
+    """Message с полем data без выбора типа по action (как до выбора типа по action)"""
+
+    class Config:
+        extra = 'forbid'
+
+    event_id: str
+    exchange: str
+    instance: str
+    event: enums.Event
+    node: enums.Node
+    action: enums.Action | None
+    message: str | None
+    algo: str
+    timestamp: int
+    data: MessageData
+
+
+def main():
+    streams = {
+        'order_book_update': [orderbook_message(depth=3) for _ in range(MESSAGES_COUNT)],
+        'balance_update': [balances_message() for _ in range(MESSAGES_COUNT)],
+        'orders_update': [orders_update_message() for _ in range(MESSAGES_COUNT)],
+    }
+    rows = [('action', 'union, msg/s', 'by action, msg/s', 'speedup')]
+    for action, messages in streams.items():
+        messages = [ujson.loads(message) for message in messages]
+        union_rate = measure_rate(lambda message: UnionMessage(**message), messages)
+        action_rate = measure_rate(lambda message: Message(**message), messages)
+        rows.append((action, f'{union_rate:,.0f}', f'{action_rate:,.0f}', f'x{action_rate / union_rate:.2f}'))
+    print_table('Validation of Message.data', rows)
+
+
+if __name__ == '__main__':
+    main()
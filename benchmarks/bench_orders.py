@@ -0,0 +1,116 @@
+"""
+Память и скорость работы с большим количеством живых ордеров: создание ордеров фабрикой (по одному и пакетом
+OrderFabric.create_orders), память на один ордер, применение обновлений OrdersState.update и выборка ордеров по символу и состоянию (OrdersState.select).
+
+Результаты добавляются в файл (JSON lines) вместе с коммитом, чтобы их можно было сравнивать между коммитами.
+
+Запуск: python -m benchmarks.bench_orders [--orders 200000 --updates 100000]
+"""
+import argparse
+import gc
+import logging
+import os
+import random
+import tracemalloc
+
+from benchmarks.common import measure_run, measure_throughput, print_table, save_result
+from testing_core import enums
+from testing_core.config import Market
+from testing_core.order.order import OrderData
+from testing_core.order.order_fabric import OrderFabric
+from testing_core.store.state_orders import OrdersState
+from testing_core.utils import get_uuid
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.dirname(__file__), 'results', 'orders.jsonl')
+
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'ETH/BTC', 'XRP/USDT', 'SOL/USDT']
+STATES = [enums.OrderState.OPEN, enums.OrderState.FILLED, enums.OrderState.CLOSED, enums.OrderState.CANCELED]
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Live orders memory and update benchmark')
+    parser.add_argument('--orders', type=int, default=200_000, help='количество живых ордеров')
+    parser.add_argument('--updates', type=int, default=100_000, help='количество обновлений ордеров')
+    parser.add_argument('--repeat', type=int, default=3, help='количество прогонов')
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH, help='файл результатов (JSON lines)')
+    parser.add_argument('--no-save', action='store_true', help='не сохранять результаты')
+    return parser.parse_args()
+
+
+def create_fabric() -> OrderFabric:
+    no_limits = Market.Limits.MinMax(min=None, max=None)
+    markets = {
+        symbol: Market(exchange_symbol=symbol.replace('/', ''), common_symbol=symbol, price_increment=0.01,
+                       amount_increment=0.0001, base_asset=symbol.split('/')[0], quote_asset=symbol.split('/')[1],
+                       limits=Market.Limits(amount=no_limits, price=no_limits, cost=no_limits, leverage=no_limits))
+        for symbol in SYMBOLS
+    }
+    return OrderFabric(markets=markets, place_function=lambda *orders: None,
+                       request_update_function=lambda *orders: None, cancel_function=lambda *orders: None)
+
+
+def create_orders(fabric: OrderFabric, order_ids: list[str]) -> list:
+    return [fabric.create_order(core_order_id=order_id, symbol=SYMBOLS[i % len(SYMBOLS)],
+                                order_type=enums.OrderType.LIMIT, side=enums.OrderSide.BUY, price=20000.5,
+                                amount=0.1, enable_validating=False)
+            for i, order_id in enumerate(order_ids)]
+
+
+def measure_order_size(fabric: OrderFabric, order_ids: list[str]) -> float:
+    """Память на один живой ордер в байтах (без id, которые созданы заранее)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        orders = create_orders(fabric, order_ids)
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del orders
+    return round(size / len(order_ids), 1)
+
+
+def main():
+    args = parse_arguments()
+    # предупреждения не должны влиять на измерения
+    logging.disable(logging.WARNING)
+    fabric = create_fabric()
+    order_ids = [get_uuid() for _ in range(args.orders)]
+    results = {}
+
+    results['OrderFabric.create_order'] = measure_run(lambda: len(create_orders(fabric, order_ids)), args.repeat)
+    results['OrderFabric.create_order']['bytes_per_order'] = measure_order_size(fabric, order_ids)
+    # те же ордера пакетом (округление и проверка лимитов массивами)
+    symbols = [SYMBOLS[i % len(SYMBOLS)] for i in range(args.orders)]
+    prices, amounts = [20000.5] * args.orders, [0.1] * args.orders
+    results['OrderFabric.create_orders'] = measure_run(
+        lambda: len(fabric.create_orders(core_order_ids=order_ids, symbols=symbols, order_type=enums.OrderType.LIMIT,
+                                         sides=enums.OrderSide.BUY, prices=prices, amounts=amounts)),
+        args.repeat)
+
+    orders_state = OrdersState()
+    orders_state.add_order(*create_orders(fabric, order_ids))
+    updates = [[OrderData(core_order_id=order_id, symbol=SYMBOLS[0], type=enums.OrderType.LIMIT,
+                          side=enums.OrderSide.BUY, price=20000.5, amount=0.1, state=random.choice(STATES),
+                          filled=0.05)]
+               for order_id in random.choices(order_ids, k=args.updates)]
+    results['OrdersState.update'] = measure_throughput(orders_state.update, updates, args.repeat)
+    # выборка открытых ордеров по символу (по индексам, без просмотра всех ордеров)
+    results['OrdersState.select'] = measure_throughput(
+        lambda symbol: orders_state.select(symbol=symbol, state=enums.OrderState.OPEN), SYMBOLS * 20, args.repeat)
+
+    params = {key: value for key, value in vars(args).items() if key not in ('output', 'no_save', 'repeat')}
+    previous = None if args.no_save else save_result(args.output, params, results)
+
+    rows = [('stage', 'orders', 'orders/s', 'cpu us/order', 'bytes/order', 'vs previous')]
+    for stage, result in results.items():
+        change = '-'
+        if previous is not None and stage in previous['results'] and previous['results'][stage]['rate']:
+            change = f'{result["rate"] / previous["results"][stage]["rate"] - 1:+.1%} ({previous["revision"]})'
+        rows.append((stage, result['messages'], f'{result["rate"]:,.0f}', result['cpu_us'],
+                     result.get('bytes_per_order', '-'), change))
+    print_table(f'Live orders ({", ".join(f"{key}={value}" for key, value in params.items())})', rows)
+
+
+if __name__ == '__main__':
+    main()
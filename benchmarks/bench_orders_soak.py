@@ -0,0 +1,92 @@
+"""
+Длительный прогон OrdersState: ордера непрерывно создаются, обновляются и завершаются. Завершенные ордера
+переносятся в ограниченный архив (retention_delay=0), поэтому объем памяти (tracemalloc) должен оставаться
+постоянным при любом количестве ордеров. С --no-retention ордера не переносятся в архив (для сравнения).
+
+Результаты добавляются в файл (JSON lines) вместе с коммитом, чтобы их можно было сравнивать между коммитами.
+
+Запуск: python -m benchmarks.bench_orders_soak [--orders 1000000 --live 1000 --archive-size 10000]
+"""
+import argparse
+import gc
+import logging
+import os
+import time
+import tracemalloc
+
+from benchmarks.bench_orders import SYMBOLS, create_fabric
+from benchmarks.common import print_table, save_result
+from testing_core import enums
+from testing_core.order.order import OrderData
+from testing_core.store.state_orders import OrdersState
+from testing_core.utils import get_uuid
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.dirname(__file__), 'results', 'orders_soak.jsonl')
+
+CHECKPOINTS = 10
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Orders retention soak benchmark')
+    parser.add_argument('--orders', type=int, default=1_000_000, help='общее количество ордеров')
+    parser.add_argument('--live', type=int, default=1000, help='количество одновременно открытых ордеров')
+    parser.add_argument('--archive-size', type=int, default=10_000, help='максимальное количество ордеров в архиве')
+    parser.add_argument('--no-retention', action='store_true', help='не переносить завершенные ордера в архив')
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH, help='файл результатов (JSON lines)')
+    parser.add_argument('--no-save', action='store_true', help='не сохранять результаты')
+    return parser.parse_args()
+
+
+def order_update(order, state: enums.OrderState) -> list[OrderData]:
+    return [OrderData(core_order_id=order.core_order_id, symbol=order.symbol, type=order.type, side=order.side,
+                      price=order.price, amount=order.amount, state=state, filled=order.amount)]
+
+
+def main():
+    args = parse_arguments()
+    logging.disable(logging.WARNING)
+    fabric = create_fabric()
+    orders_state = OrdersState(retention_delay=None if args.no_retention else 0, archive_size=args.archive_size)
+    live = []
+    checkpoint_every = max(args.orders // CHECKPOINTS, 1)
+    checkpoints = []
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        for i in range(args.orders):
+            order = fabric.create_order(core_order_id=get_uuid(), symbol=SYMBOLS[i % len(SYMBOLS)],
+                                        order_type=enums.OrderType.LIMIT, side=enums.OrderSide.BUY, price=20000.5,
+                                        amount=0.1, enable_validating=False)
+            orders_state.add_order(order)
+            orders_state.update(orders=order_update(order, enums.OrderState.OPEN))
+            live.append(order)
+            if len(live) > args.live:
+                orders_state.update(orders=order_update(live.pop(0), enums.OrderState.CLOSED))
+            if (i + 1) % checkpoint_every == 0:
+                checkpoints.append((i + 1, len(orders_state), len(orders_state.archive),
+                                    round((tracemalloc.get_traced_memory()[0] - base) / 1024 / 1024, 2)))
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    elapsed = time.perf_counter() - start
+
+    results = {'OrdersState soak': {
+        'messages': args.orders,
+        'rate': round(args.orders / elapsed, 1),
+        'memory_mb': [checkpoint[3] for checkpoint in checkpoints],
+        'peak_memory_kb': round(peak / 1024, 1),
+    }}
+    params = {key: value for key, value in vars(args).items() if key not in ('output', 'no_save')}
+    if not args.no_save:
+        save_result(args.output, params, results)
+
+    rows = [('orders', 'stored', 'archived', 'memory MB')] + checkpoints
+    print_table(f'Orders soak ({", ".join(f"{key}={value}" for key, value in params.items())}, '
+                f'{results["OrdersState soak"]["rate"]:,.0f} orders/s under tracemalloc)', rows)
+
+
+if __name__ == '__main__':
+    main()
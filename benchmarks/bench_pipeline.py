@@ -0,0 +1,206 @@
+"""
+Пропускная способность основных этапов обработки сообщений ядром: разбор входящих сообщений (_handler),
+OrderbookState.update, OrdersState.update, формирование команд Formatter и полный путь через Trader.
+
+Синтетический трафик (ордербуки, балансы, обновления ордеров с заданной частотой) записывается в файл записи
+трафика и воспроизводится ReplayCommunicator, поэтому Aeron (media driver и гейт) не нужен.
+Для каждого этапа выводятся сообщений в секунду, процессорное время на сообщение и пиковая память.
+Результаты добавляются в файл (JSON lines) вместе с коммитом, чтобы их можно было сравнивать между коммитами.
+
+Запуск: python -m benchmarks.bench_pipeline [--depth 20 --orderbook-rate 5000 ...]
+"""
+import argparse
+import logging
+import os
+import random
+import tempfile
+
+import ujson
+
+from benchmarks.common import measure_run, measure_throughput, print_table, save_result
+from benchmarks.messages import envelope, orderbook_data, balances_data, order_info_data
+from testing_core import enums
+from testing_core.communicator.capture import CaptureWriter
+from testing_core.communicator.decoder import FastDecoder
+from testing_core.communicator.replay_communicator import ReplayCommunicator
+from testing_core.config import Configuration, CoreAeronChannels, AeronChannel, Market
+from testing_core.formatter.formatter import Formatter
+from testing_core.order.order import OrderData, OrderUpdatable
+from testing_core.store.state_orderbook import OrderbookState
+from testing_core.store.state_orders import OrdersState
+from testing_core.trader.trader import Trader
+from testing_core.utils import get_uuid
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.dirname(__file__), 'results', 'pipeline.jsonl')
+
+ASSETS = ['BTC', 'ETH', 'USDT']
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Throughput benchmark of the core message pipeline')
+    parser.add_argument('--duration', type=float, default=1, help='длительность синтетического трафика, с')
+    parser.add_argument('--orderbook-rate', type=int, default=5000, help='ордербуков в секунду')
+    parser.add_argument('--balance-rate', type=int, default=10, help='обновлений балансов в секунду')
+    parser.add_argument('--orders-rate', type=int, default=500, help='обновлений ордеров в секунду')
+    parser.add_argument('--depth', type=int, default=20, help='уровней ордербука на каждой стороне')
+    parser.add_argument('--symbols', type=int, default=5, help='количество торговых пар')
+    parser.add_argument('--orders-per-update', type=int, default=1, help='ордеров в одном обновлении и команде')
+    parser.add_argument('--replay-speed', type=float, default=0,
+                        help='скорость воспроизведения для полного пути (0 - максимально быстро)')
+    parser.add_argument('--repeat', type=int, default=3, help='количество прогонов')
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH, help='файл результатов (JSON lines)')
+    parser.add_argument('--no-save', action='store_true', help='не сохранять результаты')
+    return parser.parse_args()
+
+
+def market(symbol: str) -> Market:
+    no_limits = Market.Limits.MinMax(min=None, max=None)
+    base, quote = symbol.split('/')
+    return Market(exchange_symbol=symbol.replace('/', ''), common_symbol=symbol, price_increment=0.01,
+                  amount_increment=0.000001, base_asset=base, quote_asset=quote,
+                  limits=Market.Limits(amount=no_limits, price=no_limits, cost=no_limits, leverage=no_limits))
+
+
+def configuration(symbols: list[str], replay_path: str, replay_speed: float) -> Configuration:
+    channel = AeronChannel(channel='aeron:ipc', stream_id=0)
+    return Configuration(
+        exchange_id='binance',
+        instance='benchmark',
+        algo='benchmark',
+        assets=ASSETS,
+        markets={symbol: market(symbol) for symbol in symbols},
+        aeron_channels=CoreAeronChannels(gate_input=channel, core_input=channel, orderbooks=channel,
+                                         balances=channel, logs=channel),
+        no_subscriber_log_delay=10,
+        replay_path=replay_path,
+        replay_speed=replay_speed,
+        latency_tracking=False,
+    )
+
+
+class SyntheticTraffic(object):
+    """
+    Синтетический трафик от гейта: сообщения разных каналов, упорядоченные по времени.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.symbols = [f'COIN{i}/USDT' for i in range(args.symbols)]
+        # ордера ядра, на которые ссылаются обновления ордеров
+        self.orders = [(get_uuid(), random.choice(self.symbols)) for _ in range(max(1, args.orders_per_update * 100))]
+        # (время в наносекундах, канал, сообщение)
+        self.records: list[tuple[int, enums.CaptureChannel, str]] = []
+        self._add_stream(args, args.orderbook_rate, enums.CaptureChannel.ORDERBOOKS, lambda: self._orderbook(args))
+        self._add_stream(args, args.balance_rate, enums.CaptureChannel.BALANCES, self._balances)
+        self._add_stream(args, args.orders_rate, enums.CaptureChannel.CORE_INPUT, lambda: self._orders_update(args))
+        self.records.sort(key=lambda record: record[0])
+
+    def _add_stream(self, args: argparse.Namespace, rate: int, channel: enums.CaptureChannel, create) -> None:
+        for i in range(int(rate * args.duration)):
+            self.records.append((int(i * 1_000_000_000 / rate), channel, create()))
+
+    def _orderbook(self, args: argparse.Namespace) -> str:
+        data = orderbook_data(symbol=random.choice(self.symbols), depth=args.depth)
+        return ujson.dumps(envelope(enums.Action.ORDERBOOK_UPDATE, data))
+
+    def _balances(self) -> str:
+        return ujson.dumps(envelope(enums.Action.BALANCE_UPDATE, balances_data(ASSETS)))
+
+    def _orders_update(self, args: argparse.Namespace) -> str:
+        data = [order_info_data(client_order_id=order_id, symbol=symbol)
+                for order_id, symbol in random.sample(self.orders, args.orders_per_update)]
+        return ujson.dumps(envelope(enums.Action.ORDERS_UPDATE, data))
+
+    def messages(self, channel: enums.CaptureChannel = None) -> list[str]:
+        return [message for _, record_channel, message in self.records
+                if channel is None or record_channel == channel]
+
+    def write_capture(self, path: str) -> None:
+        writer = CaptureWriter(path)
+        for timestamp, channel, message in self.records:
+            writer.write(channel, message, timestamp=timestamp)
+        writer.close()
+
+
+def create_trader(traffic: SyntheticTraffic, config: Configuration) -> Trader:
+    trader = Trader(config=config)
+    for order_id, symbol in traffic.orders:
+        trader.add_orders(trader._order_fabric.create_order(core_order_id=order_id, symbol=symbol,
+                                                            order_type=enums.OrderType.LIMIT,
+                                                            side=enums.OrderSide.BUY, price=20000, amount=0.1,
+                                                            enable_validating=False))
+    return trader
+
+
+def main():
+    args = parse_arguments()
+    # обновления неизвестных ордеров и прочие предупреждения не должны влиять на измерения
+    logging.disable(logging.WARNING)
+    traffic = SyntheticTraffic(args)
+    decoder = FastDecoder()
+    formatter = Formatter(exchange='binance', instance='benchmark', algo='benchmark')
+
+    with tempfile.TemporaryDirectory() as directory:
+        capture_path = os.path.join(directory, 'traffic.capture')
+        traffic.write_capture(capture_path)
+        config = configuration(traffic.symbols, capture_path, args.replay_speed)
+        results = {}
+
+        # разбор входящих сообщений и выбор обработчика (AeronCommunicator._handler)
+        communicator = ReplayCommunicator(config=config, orderbook_handler=lambda message: None,
+                                          balance_handler=lambda message: None,
+                                          core_input_handler=lambda message: None)
+        results['_handler decode'] = measure_throughput(communicator._handler, traffic.messages(), args.repeat)
+
+        # применение ордербуков
+        orderbook_state = OrderbookState()
+        orderbooks = [decoder.decode(message).data for message in traffic.messages(enums.CaptureChannel.ORDERBOOKS)]
+        results['OrderbookState.update'] = measure_throughput(lambda orderbook: orderbook_state.update(orderbook),
+                                                              orderbooks, args.repeat)
+
+        # применение обновлений ордеров
+        orders_state = OrdersState()
+        for order_id, symbol in traffic.orders:
+            orders_state.add_order(OrderUpdatable(place_function=None, request_update_function=None,
+                                                  cancel_function=None, core_order_id=order_id, symbol=symbol,
+                                                  type=enums.OrderType.LIMIT, side=enums.OrderSide.BUY,
+                                                  price=20000, amount=0.1))
+        updates = [formatter.format_order_data(orders=decoder.decode(message).data)
+                   for message in traffic.messages(enums.CaptureChannel.CORE_INPUT)]
+        results['OrdersState.update'] = measure_throughput(lambda orders: orders_state.update(orders), updates,
+                                                           args.repeat)
+
+        # формирование команд
+        commands = [tuple(OrderData(core_order_id=order_id, symbol=symbol, type=enums.OrderType.LIMIT,
+                                    side=enums.OrderSide.BUY, price=20000.5, amount=0.001)
+                          for order_id, symbol in random.sample(traffic.orders, args.orders_per_update))
+                    for _ in range(len(updates) or 1000)]
+        results['Formatter create_orders'] = measure_throughput(
+            lambda orders: formatter.format_create_orders(orders).json(), commands, args.repeat)
+        results['Formatter cancel_orders'] = measure_throughput(
+            lambda orders: formatter.format_cancel_orders(orders).json(), commands, args.repeat)
+
+        # полный путь: воспроизведение записи через Trader
+        def replay() -> int:
+            trader = create_trader(traffic, config)
+            communicator = trader._communicator
+            while not communicator.is_finished:
+                communicator.handle_new_messages()
+            return communicator.replayed_count
+
+        results['Trader replay'] = measure_run(replay, args.repeat)
+
+    params = {key: value for key, value in vars(args).items() if key not in ('output', 'no_save', 'repeat')}
+    previous = None if args.no_save else save_result(args.output, params, results)
+
+    rows = [('stage', 'messages', 'msg/s', 'cpu us/msg', 'peak memory, KB', 'vs previous')]
+    for stage, result in results.items():
+        change = '-'
+        if previous is not None and stage in previous['results'] and previous['results'][stage]['rate']:
+            change = f'{result["rate"] / previous["results"][stage]["rate"] - 1:+.1%} ({previous["revision"]})'
+        rows.append((stage, result['messages'], f'{result["rate"]:,.0f}', result['cpu_us'],
+                     f'{result["peak_memory_kb"]:,.1f}', change))
+    print_table(f'Core message pipeline ({", ".join(f"{key}={value}" for key, value in params.items())})', rows)
+
+
+if __name__ == '__main__':
+    main()
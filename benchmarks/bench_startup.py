@@ -0,0 +1,69 @@
+"""
+Время запуска: вывод справки CLI (start.py --help), импорт ядра и проверка media driver.
+Каждая команда запускается в новом интерпретаторе несколько раз, из времени вычитается запуск пустого
+интерпретатора. Результаты добавляются в файл (JSON lines) вместе с коммитом, чтобы отслеживать время запуска.
+
+Запуск: python -m benchmarks.bench_startup [--repeat 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table, save_result
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.dirname(__file__), 'results', 'startup.jsonl')
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    'interpreter': [sys.executable, '-c', 'pass'],
+    'start.py --help': [sys.executable, 'start.py', '--help'],
+    'import testing_core.core': [sys.executable, '-c', 'import testing_core.core'],
+    'media driver check': [sys.executable, '-c', 'from testing_core.communicator.media_driver import '
+                                                 'is_media_driver_running; is_media_driver_running()'],
+}
+
+
+def measure_command(command: list[str], repeat: int) -> list[float]:
+    """
+    Время выполнения команды в миллисекундах для каждого запуска.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT_PATH, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup time benchmark')
+    parser.add_argument('--repeat', type=int, default=10, help='количество запусков каждой команды')
+    parser.add_argument('--output', default=DEFAULT_RESULTS_PATH, help='файл результатов (JSON lines)')
+    parser.add_argument('--no-save', action='store_true', help='не сохранять результаты')
+    args = parser.parse_args()
+
+    measurements = {name: measure_command(command, args.repeat) for name, command in COMMANDS.items()}
+    interpreter = min(measurements.pop('interpreter'))
+    results = {
+        name: {
+            'min_ms': round(min(times) - interpreter, 1),
+            'median_ms': round(statistics.median(times) - interpreter, 1),
+        }
+        for name, times in measurements.items()
+    }
+    previous = None if args.no_save else save_result(args.output, {'repeat': args.repeat}, results)
+
+    rows = [('command', 'min, ms', 'median, ms', 'vs previous')]
+    for name, result in results.items():
+        change = '-'
+        if previous is not None and name in previous['results']:
+            change = f'{result["min_ms"] - previous["results"][name]["min_ms"]:+.1f} ms ({previous["revision"]})'
+        rows.append((name, result['min_ms'], result['median_ms'], change))
+    print_table(f'Startup time without interpreter startup ({interpreter:.1f} ms)', rows)
+
+
+if __name__ == '__main__':
+    main()
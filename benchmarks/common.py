@@ -0,0 +1,130 @@
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from typing import Callable, Iterable
+
+
+def measure_rate(function: Callable, arguments: Iterable, repeat: int = 5) -> float:
+    """
+    Измерить пропускную способность функции (вызовов в секунду). Берется лучший результат из нескольких прогонов.
+    :param function: функция одного аргумента;
+    :param arguments: аргументы, с которыми функция вызывается по очереди в каждом прогоне;
+    :param repeat: количество прогонов;
+    :return: float - вызовов в секунду
+    """
+    arguments = list(arguments)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for argument in arguments:
+            function(argument)
+        best = min(best, time.perf_counter() - start)
+    return len(arguments) / best
+
+
+def print_table(title: str, rows: list[tuple]) -> None:
+    """
+    Вывести результаты бенчмарка таблицей.
+    :param title: заголовок таблицы;
+    :param rows: строки таблицы, первая строка - названия колонок;
+    """
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    print(f'\n{title}')
+    for row in rows:
+        print('  '.join(str(cell).ljust(width) for cell, width in zip(row, widths)))
+
+
+def measure_run(run: Callable[[], int], repeat: int = 5) -> dict:
+    """
+    Измерить пропускную способность, процессорное время и пиковую память прогона.
+    Пропускная способность и процессорное время - по лучшему прогону, пиковая память (tracemalloc) -
+    в отдельном прогоне, так как tracemalloc замедляет выполнение.
+    :param run: функция прогона, возвращает количество обработанных сообщений;
+    :param repeat: количество прогонов;
+    :return: dict - messages, rate (сообщений в секунду), cpu_us (процессорное время на сообщение в микросекундах),
+     peak_memory_kb (пиковый объем выделенной памяти в килобайтах)
+    """
+    best_time = best_cpu_time = float('inf')
+    messages = 0
+    for _ in range(repeat):
+        start, cpu_start = time.perf_counter(), time.process_time()
+        messages = run()
+        elapsed, cpu_elapsed = time.perf_counter() - start, time.process_time() - cpu_start
+        if elapsed < best_time:
+            best_time, best_cpu_time = elapsed, cpu_elapsed
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'messages': messages,
+        'rate': round(messages / best_time, 1) if best_time else None,
+        'cpu_us': round(best_cpu_time / messages * 1_000_000, 3) if messages else None,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def measure_throughput(function: Callable, arguments: Iterable, repeat: int = 5) -> dict:
+    """
+    Измерить пропускную способность, процессорное время и пиковую память функции (см. measure_run).
+    :param function: функция одного аргумента;
+    :param arguments: аргументы, с которыми функция вызывается по очереди в каждом прогоне;
+    :param repeat: количество прогонов;
+    :return: dict - результаты measure_run
+    """
+    arguments = list(arguments)
+
+    def run() -> int:
+        for argument in arguments:
+            function(argument)
+        return len(arguments)
+
+    return measure_run(run, repeat)
+
+
+def git_revision() -> str | None:
+    """Текущий коммит репозитория (с отметкой о незакоммиченных изменениях) или None"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f'{revision}-dirty' if dirty else revision
+
+
+def save_result(path: str, params: dict, results: dict) -> dict | None:
+    """
+    Добавить результаты бенчмарка в файл (JSON lines) и вернуть предыдущий результат с теми же параметрами.
+    :param path: путь к файлу результатов;
+    :param params: параметры бенчмарка;
+    :param results: результаты по этапам;
+    :return: предыдущая запись с теми же параметрами или None
+    """
+    previous = None
+    if os.path.isfile(path):
+        with open(path) as file:
+            for line in file:
+                record = json.loads(line)
+                if record.get('params') == params:
+                    previous = record
+    record = {
+        'revision': git_revision(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'params': params,
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a') as file:
+        file.write(json.dumps(record) + '\n')
+    return previous
@@ -0,0 +1,97 @@
+import random
+
+import ujson
+
+from testing_core import enums
+from testing_core.utils import get_uuid, get_micro_timestamp
+
+
+def envelope(action: enums.Action, data, event: enums.Event = enums.Event.DATA) -> dict:
+    """
+    Сформировать сообщение от гейта в виде словаря.
+    :param action: action сообщения;
+    :param data: поле data;
+    :param event: событие сообщения (по умолчанию data);
+    :return: dict - сообщение
+    """
+    return {
+        'event_id': get_uuid(),
+        'event': event.value,
+        'exchange': 'binance',
+        'node': enums.Node.GATE.value,
+        'instance': 'benchmark',
+        'algo': 'benchmark',
+        'action': action.value,
+        'message': None,
+        'timestamp': get_micro_timestamp(),
+        'data': data
+    }
+
+
+def orderbook_data(symbol: str = 'BTC/USDT', depth: int = 3, mid_price: float = 20000.0,
+                   timestamp: int = None) -> dict:
+    """
+    Сгенерировать ордербук случайной формы.
+    :param symbol: символ торговой пары;
+    :param depth: количество уровней на каждой стороне;
+    :param mid_price: середина спреда;
+    :param timestamp: timestamp ордербука (по умолчанию текущее время);
+    :return: dict - поле data сообщения order_book_update
+    """
+    step = mid_price * 0.0001
+    return {
+        'symbol': symbol,
+        'timestamp': timestamp if timestamp is not None else get_micro_timestamp(),
+        'bids': [[round(mid_price - step * (i + 1), 2), round(random.uniform(0.001, 5), 6)] for i in range(depth)],
+        'asks': [[round(mid_price + step * (i + 1), 2), round(random.uniform(0.001, 5), 6)] for i in range(depth)],
+    }
+
+
+def balances_data(assets: list[str] = ('BTC', 'ETH', 'USDT')) -> dict:
+    """
+    Сгенерировать балансы по ассетам.
+    :param assets: список ассетов;
+    :return: dict - поле data сообщения balance_update
+    """
+    result = {}
+    for asset in assets:
+        free = round(random.uniform(0, 1000), 6)
+        used = round(random.uniform(0, 1000), 6)
+        result[asset] = {'free': free, 'used': used, 'total': free + used}
+    return {'timestamp': get_micro_timestamp(), 'assets': result}
+
+
+def order_info_data(client_order_id: str = None, symbol: str = 'BTC/USDT',
+                    status: enums.GateOrderStatus = enums.GateOrderStatus.OPEN) -> dict:
+    """
+    Сгенерировать информацию об ордере от гейта.
+    :param client_order_id: id ордера ядра (по умолчанию случайный uuid);
+    :param symbol: символ торговой пары;
+    :param status: статус ордера;
+    :return: dict - элемент списка data сообщения orders_update
+    """
+    return {
+        'id': get_uuid(),
+        'client_order_id': client_order_id if client_order_id is not None else get_uuid(),
+        'timestamp': get_micro_timestamp(),
+        'status': status.value,
+        'symbol': symbol,
+        'type': enums.OrderType.LIMIT.value,
+        'side': random.choice(list(enums.OrderSide)).value,
+        'price': round(random.uniform(19000, 21000), 2),
+        'amount': round(random.uniform(0.001, 1), 6),
+        'filled': 0.0,
+        'info': None
+    }
+
+
+def orderbook_message(**kwargs) -> str:
+    return ujson.dumps(envelope(enums.Action.ORDERBOOK_UPDATE, orderbook_data(**kwargs)))
+
+
+def balances_message(**kwargs) -> str:
+    return ujson.dumps(envelope(enums.Action.BALANCE_UPDATE, balances_data(**kwargs)))
+
+
+def orders_update_message(orders_count: int = 1) -> str:
+    return ujson.dumps(envelope(enums.Action.ORDERS_UPDATE, [order_info_data() for _ in range(orders_count)]))
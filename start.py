@@ -1,16 +1,39 @@
 #!./venv/bin/python
 # -*- coding: UTF-8 -*-
 
-import asyncio
+import importlib
 
 import click
 
-from strategies.strategies_for_testing.breaking import BreakingTesting
-from strategies.strategies_for_testing.fast_test import FastTesting
-from strategies.strategies_for_testing.order_creating import OrderCreatingTesting
-from strategies.strategies_for_testing.orderbooks import OrderbookTesting
-from strategies.strategies_for_testing.orders_cancelling import CancellingTesting
-from testing_core.core import run_core
+# стратегии загружаются только для выбранной команды (импорт ядра и стратегий долгий, для --help не нужен)
+FAST_TESTING = 'strategies.strategies_for_testing.fast_test:FastTesting'
+ORDERBOOK_TESTING = 'strategies.strategies_for_testing.orderbooks:OrderbookTesting'
+ORDER_CREATING_TESTING = 'strategies.strategies_for_testing.order_creating:OrderCreatingTesting'
+CANCELLING_TESTING = 'strategies.strategies_for_testing.orders_cancelling:CancellingTesting'
+BREAKING_TESTING = 'strategies.strategies_for_testing.breaking:BreakingTesting'
+
+
+def load_strategy(strategy_path: str):
+    """
+    Импортировать класс стратегии.
+    :param strategy_path: путь к классу в виде "module:Class";
+    :return: класс стратегии
+    """
+    module_name, class_name = strategy_path.split(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def run_strategies(*strategy_paths: str, parallel: bool = False):
+    """
+    Запустить стратегии по очереди в одной сессии (общий Trader без переподключения к гейту).
+    :param strategy_paths: пути к классам стратегий в виде "module:Class";
+    :param parallel: запускать независимые по ресурсам стратегии одновременно;
+    """
+    import asyncio
+
+    from testing_core.core import run_session
+
+    asyncio.run(run_session(*(load_strategy(strategy_path) for strategy_path in strategy_paths), parallel=parallel))
 
 
 class CustomMultiCommand(click.Group):
@@ -22,14 +45,19 @@ class CustomMultiCommand(click.Group):
         """
 
         def decorator(f):
+            # параметры команды (click.option) click забирает из функции при создании команды,
+            # поэтому для каждого псевдонима они восстанавливаются
+            params = list(getattr(f, '__click_params__', []))
             if isinstance(args[0], list):
                 _args = [args[0][0]] + list(args[1:])
                 for alias in args[0][1:]:
+                    f.__click_params__ = list(params)
                     cmd = super(CustomMultiCommand, self).command(
                         alias, *args[1:], **kwargs)(f)
                     cmd.short_help = "Alias for '{}'".format(_args[0])
             else:
                 _args = args
+            f.__click_params__ = list(params)
             cmd = super(CustomMultiCommand, self).command(
                 *_args, **kwargs)(f)
             return cmd
@@ -59,7 +87,7 @@ def fast_testing():
 
     6. Выставление рыночного ордера;
     """
-    asyncio.run(run_core(strategy_type=FastTesting))
+    run_strategies(FAST_TESTING)
 
 
 @cli.command(['cancelling-testing'])
@@ -86,7 +114,7 @@ def cancelling_testing():
     7. Выбираем случайным образом от 3 до 5 рынков из настроек и выполняем с п.3 - 7. Только ордера создаем одной
     командой, и отменяем командой `cancel_all_orders`;
     """
-    asyncio.run(run_core(strategy_type=CancellingTesting))
+    run_strategies(CANCELLING_TESTING)
 
 
 @cli.command(['order-creating-testing'])
@@ -111,7 +139,7 @@ def order_creating_testing():
     8. Отправляю команду гейту, в которой есть лимитные и рыночные ордера одновременно;
 
     """
-    asyncio.run(run_core(strategy_type=OrderCreatingTesting))
+    run_strategies(ORDER_CREATING_TESTING)
 
 
 @cli.command(['orderbook-testing'])
@@ -127,7 +155,7 @@ def orderbook_testing():
     3. в структуре стакана есть timestamp, это время события на бирже, и гейт должен присывать последовательные
     ордербуки, т.е. если пришел ордербук с запоздавшими данными это критическа ошибка. Время должно рости;
     """
-    asyncio.run(run_core(strategy_type=OrderbookTesting))
+    run_strategies(ORDERBOOK_TESTING)
 
 
 @cli.command(['breaking-testing'])
@@ -149,32 +177,27 @@ def breaking_testing():
 
     6. Создаем команду с 10 ордерами, 1 из них кривой, должно прийти 9 статусов open и одна ошибка;
     """
-    asyncio.run(run_core(strategy_type=BreakingTesting))
-
-
-async def run_all():
-    """
-    Асинхронная функция для запуска стратегий.
-    """
-    await run_core(strategy_type=FastTesting)
-    await run_core(strategy_type=OrderbookTesting)
-    await run_core(strategy_type=OrderCreatingTesting)
-    await run_core(strategy_type=CancellingTesting)
-    await run_core(strategy_type=BreakingTesting)
+    run_strategies(BREAKING_TESTING)
 
 
 @cli.command(['full-testing', 'all'])
-def full_testing():
+@click.option('--parallel', is_flag=True, help='Запускать одновременно стратегии, которые не конфликтуют по ресурсам.')
+def full_testing(parallel: bool):
     """
-    По очереди запустить все тестирующие стратегии. Порядок следующий:
+    По очереди запустить все тестирующие стратегии в одной сессии (подключение к гейту, ордербуки и балансы
+    сохраняются между стратегиями). Порядок следующий:
 
     fast-testing
     orderbook-testing
     order-creating-testing
     cancelling-testing
     breaking-testing
+
+    С --parallel стратегии, которые не конфликтуют по ресурсам (например, orderbook-testing не выставляет ордера),
+    запускаются одновременно, ордера каждой стратегии создаются в ее пространстве имен id.
     """
-    asyncio.run(run_all())
+    run_strategies(FAST_TESTING, ORDERBOOK_TESTING, ORDER_CREATING_TESTING, CANCELLING_TESTING, BREAKING_TESTING,
+                   parallel=parallel)
 
 
 if __name__ == '__main__':
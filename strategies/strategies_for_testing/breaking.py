@@ -45,10 +45,9 @@ class BreakingTesting(Strategy):
         trader.request_update_balances(assets=self.assets)
 
         self.logger.info('Жду баланс и ордербуки...')
-        # проверяю наличие балансов, а также проверяю с помощью множеств, что для каждого маркета пришел ордербук
-        while balances or \
-                set(orderbooks.orderbooks.keys()).intersection(self.markets.keys()) != set(self.markets.keys()):
-            await asyncio.sleep(0.1)
+        # жду балансы и ордербуки для каждого маркета
+        await balances.wait_ready()
+        await orderbooks.wait_for_symbols(self.markets.keys())
 
         self.logger.info('1. Создаю лимитный ордер с нулевой ценой и жду ошибку в течение 5 секунд.')
         zero_price_order = self.get_order(
@@ -126,7 +125,7 @@ class BreakingTesting(Strategy):
                     return
                 order.cancel()
                 # жду, пока ордер закроется
-                await asyncio.sleep(0.3)
+                await order.wait_for_state(enums.OrderState.CANCELED, timeout=5)
 
         self.logger.info('6. Создаю команду с 10 ордерами, один из них кривой, должно прийти 9 статусов open '
                          'и 1 ошибка в течение 5 секунд.')
@@ -134,7 +133,8 @@ class BreakingTesting(Strategy):
         # создаю ордер с очень большим amount
         partially_invalid_orders.append(self.get_order('limit', amount=10**7))
         trader.place_orders(*partially_invalid_orders)
-        await asyncio.sleep(5)
+        await asyncio.gather(*(order.wait_while_state(enums.OrderState.PLACING, timeout=5)
+                               for order in partially_invalid_orders))
 
         # проверка, что не был выставлен только неправильный ордер
         for order in partially_invalid_orders[:9]:
@@ -209,10 +209,4 @@ class BreakingTesting(Strategy):
         """
         Дождаться пока ордер примет правильное состояние. Есть ограничение максимального времени ожидания
         """
-        sleeping_time = 0
-        while order.state != state:
-            await asyncio.sleep(0.1)
-            sleeping_time += 0.1
-            if sleeping_time >= max_waiting_time:
-                return False
-        return True
+        return await order.wait_for_state(state, timeout=max_waiting_time)
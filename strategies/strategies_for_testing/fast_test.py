@@ -38,10 +38,9 @@ class FastTesting(Strategy):
         trader.request_update_balances(assets=self.assets)
 
         self.logger.info('2. Ожидание, пока придут балансы и ордербуки')
-        # проверяю наличие балансов, а также проверяю с помощью множеств, что для каждого маркета пришел ордербук
-        while balances or \
-                set(orderbooks.orderbooks.keys()).intersection(self.markets.keys()) != set(self.markets.keys()):
-            await asyncio.sleep(0.1)
+        # жду балансы и ордербуки для каждого маркета
+        await balances.wait_ready()
+        await orderbooks.wait_for_symbols(self.markets.keys())
 
         self.logger.info(f'Балансы: {balances.balances}')
         self.logger.info(f'Ордербуки: {orderbooks.orderbooks}')
@@ -51,8 +50,9 @@ class FastTesting(Strategy):
         limit_order.place()
 
         self.logger.info('Ожидание информации по ордеру...')
-        while limit_order.state == enums.OrderState.PLACING:
-            await asyncio.sleep(0.1)
+        if not await limit_order.wait_while_state(enums.OrderState.PLACING, timeout=5):
+            self.logger.critical(f'TEST FAILED. Не пришла информация по ордеру {limit_order} в течение 5 секунд')
+            return
 
         self.logger.info(f'Лимитные ордер: {limit_order}')
 
@@ -64,8 +64,9 @@ class FastTesting(Strategy):
         limit_order.cancel()
 
         self.logger.info('Ожидание информации по ордеру...')
-        while limit_order.state != enums.OrderState.CANCELED:
-            await asyncio.sleep(0.1)
+        if not await limit_order.wait_for_state(enums.OrderState.CANCELED, timeout=5):
+            self.logger.critical(f'TEST FAILED. Ордер {limit_order} не был отменен в течение 5 секунд')
+            return
 
         self.logger.info(f'Отмененный лимитный ордер: {limit_order}')
 
@@ -73,8 +74,9 @@ class FastTesting(Strategy):
         market_order = self.get_order(order_type='market', orderbooks=orderbooks, balances=balances)
 
         self.logger.info('Ожидание информации по ордеру...')
-        while market_order.state == enums.OrderState.PLACING:
-            await asyncio.sleep(0.1)
+        if not await market_order.wait_while_state(enums.OrderState.PLACING, timeout=5):
+            self.logger.critical(f'TEST FAILED. Не пришла информация по ордеру {market_order} в течение 5 секунд')
+            return
 
         self.logger.info(f'Рыночный ордер: {market_order}')
 
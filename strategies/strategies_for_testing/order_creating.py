@@ -47,10 +47,9 @@ class OrderCreatingTesting(Strategy):
         await asyncio.sleep(0.5)
 
         self.logger.info('Жду баланс и ордербуки...')
-        # проверяю наличие балансов, а также проверяю с помощью множеств, что для каждого маркета пришел ордербук
-        while balances or \
-                set(orderbooks.orderbooks.keys()).intersection(self.markets.keys()) != set(self.markets.keys()):
-            await asyncio.sleep(0.1)
+        # жду балансы и ордербуки для каждого маркета
+        await balances.wait_ready()
+        await orderbooks.wait_for_symbols(self.markets.keys())
 
         self.logger.info('2. Создаем лимитный ордер на случайном маркете. '
                          'Цена подбирается таким образом, чтобы ордер быстро исполнился. ')
@@ -72,14 +71,12 @@ class OrderCreatingTesting(Strategy):
         orders = [self.get_order('limit', orderbooks, balances), self.get_order('market', orderbooks, balances)]
         for order in orders:
             order.place()
-        executing_sleeping_time = 0
-        while orders[0].state != enums.OrderState.CLOSED and orders[1].state != enums.OrderState.CLOSED:
-            await asyncio.sleep(0.1)
-            executing_sleeping_time += 0.1
-            if executing_sleeping_time >= 5:
-                self.logger.critical(
-                    f'TEST FAILED. Не удалось исполнить ордера {orders} за 5 секунд')
-                return
+        is_closed = await asyncio.gather(*(order.wait_for_state(enums.OrderState.CLOSED, timeout=5)
+                                           for order in orders))
+        if not all(is_closed):
+            self.logger.critical(
+                f'TEST FAILED. Не удалось исполнить ордера {orders} за 5 секунд')
+            return
 
         self.logger.info('SUCCESS. Тест успешно пройден.')
         return
@@ -89,24 +86,16 @@ class OrderCreatingTesting(Strategy):
         for i, order in enumerate(orders):
             self.logger.info(f'Выставление ордера {i}')
             order.place()
-            # после выстваления ордера жду 5 секунд, периодически проверяю ордер
-            placing_sleeping_time = 0
-            while order.state == enums.OrderState.PLACING:
-                await asyncio.sleep(0.1)
-                placing_sleeping_time += 0.1
-                if placing_sleeping_time >= 5:
-                    self.logger.critical(
-                        f'TEST FAILED. Не удалось создать ордер {order} в течение 5 секунд.')
-                    return False
-            executing_sleeping_time = 0
-            while order.state == enums.OrderState.OPEN:
-                await asyncio.sleep(0.1)
-                executing_sleeping_time += 0.1
-                if executing_sleeping_time >= 30:
-                    self.logger.critical(
-                        f'TEST FAILED. Не удалось исполнить ордер {order} в течение 30 секунд. Возможно, маркет'
-                        f' {order.symbol} слишком волатильный или низколиквидный')
-                    return False
+            # после выстваления ордера жду 5 секунд, пока гейт пришлет статус ордера
+            if not await order.wait_while_state(enums.OrderState.PLACING, timeout=5):
+                self.logger.critical(
+                    f'TEST FAILED. Не удалось создать ордер {order} в течение 5 секунд.')
+                return False
+            if not await order.wait_while_state(enums.OrderState.OPEN, timeout=30):
+                self.logger.critical(
+                    f'TEST FAILED. Не удалось исполнить ордер {order} в течение 30 секунд. Возможно, маркет'
+                    f' {order.symbol} слишком волатильный или низколиквидный')
+                return False
             self.logger.info(f'Исполнен ордер {i}')
         return True
 
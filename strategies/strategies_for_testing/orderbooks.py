@@ -1,11 +1,11 @@
-import asyncio
 import copy
+import time
 
 from testing_core.store.state_balances import BalancesState
 from testing_core.store.state_orderbook import OrderbookState
 from testing_core.strategy.base_strategy import Strategy
+from testing_core.strategy.resources import READ_ONLY
 from testing_core.trader.trader import Trader
-from testing_core.utils import get_micro_timestamp
 
 
 class OrderbookTesting(Strategy):
@@ -17,6 +17,8 @@ class OrderbookTesting(Strategy):
     2. Проверяю на задержки в передаче данных. Должно прийти не менее 5 ордербуков за 2.5 секунды
     3. Проверяю, что гейт присылает ордербуки с последовательным timestamp.
     Если биржа не присылает timestamp, этот шаг будет пропущен.
+    Если включена трассировка ордербуков (orderbook_latency_tracing), в конце выводятся задержки по этапам:
+    биржа -> гейт -> ядро.
 
     Причины, по которым тестирование может быть провалено:
     - некорректная работа гейта;
@@ -25,6 +27,8 @@ class OrderbookTesting(Strategy):
     - неправильно настроенная конфигурация (каналы aeron, ассеты и т.п.);
     """
     name = 'Orderbook Testing'
+    # ордера не выставляются, поэтому стратегия может работать одновременно с другими
+    resources = READ_ONLY
 
     async def execute(self, trader: Trader, orderbooks: OrderbookState, balances: BalancesState):
         """
@@ -40,19 +44,16 @@ class OrderbookTesting(Strategy):
         trader.request_update_balances(assets=self.assets)
 
         self.logger.info('Жду баланс и ордербуки...')
-        # проверяю наличие балансов, а также проверяю с помощью множеств, что для каждого маркета пришел ордербук
-        while balances or \
-                set(orderbooks.orderbooks.keys()).intersection(self.markets.keys()) != set(self.markets.keys()):
-            await asyncio.sleep(0.1)
+        # жду балансы и ордербуки для каждого маркета
+        await balances.wait_ready()
+        await orderbooks.wait_for_symbols(self.markets.keys())
         self.logger.info(f'Текущий ордербук: {orderbooks}')
 
         self.logger.info('1. Проверяю, что ордербуки приходят и меняются')
         current_orderbook = copy.deepcopy(orderbooks.orderbooks)
-        sleeping_time = 0
+        deadline = time.monotonic() + 5
         while current_orderbook == orderbooks.orderbooks:
-            await asyncio.sleep(0.1)
-            sleeping_time += 0.1
-            if sleeping_time >= 5:
+            if not await orderbooks.wait_for_update(timeout=deadline - time.monotonic()):
                 self.logger.critical(
                     f'TEST FAILED. Ордербуки не обновились в течение 5 секунд.')
                 return
@@ -60,16 +61,7 @@ class OrderbookTesting(Strategy):
         self.logger.info('2. Проверяю на задержки в передаче данных. Должно прийти не менее 5 ордербуков'
                          ' за 2.5 секунды')
         symbol = list(orderbooks.orderbooks.keys())[0]
-        last_update_timestamp = copy.deepcopy(orderbooks.last_update_timestamp) \
-            if orderbooks.last_update_timestamp is not None else get_micro_timestamp()
-        updates_count = 0
-        for _ in range(250):
-            if last_update_timestamp != orderbooks[symbol].timestamp:
-                updates_count += 1
-                last_update_timestamp = copy.deepcopy(orderbooks.last_update_timestamp) \
-                    if orderbooks.last_update_timestamp is not None else get_micro_timestamp()
-            await asyncio.sleep(0.001)
-        if updates_count < 5:
+        if not await orderbooks.wait_for_update(symbol=symbol, count=5, timeout=2.5):
             self.logger.critical(
                 f'TEST FAILED. Обнаружены задержки в получении ордербуков. Причиной может быть '
                 f'низковолатильный актив (использовался {symbol}, медленное интернет-соединение гейта '
@@ -78,16 +70,21 @@ class OrderbookTesting(Strategy):
 
         self.logger.info('3. Проверяю, что гейт присылает ордербуки с последовательным timestamp')
         if orderbooks[symbol].timestamp is not None:
+            last_update_timestamp = orderbooks[symbol].timestamp
             # проверяю 100 ордербуков
             for _ in range(100):
-                if last_update_timestamp != orderbooks[symbol].timestamp:
-                    if not last_update_timestamp > orderbooks[symbol].timestamp:
-                        self.logger.critical(
-                            f'TEST FAILED. Ордербуки пришли не в правильно порядке по timestamp (у ордербука, '
-                            f'который пришел в ядро позже, ордербук меньше, чем у предыдущего).')
-                        return
-                    last_update_timestamp = copy.deepcopy(orderbooks[symbol].timestamp)
+                if not await orderbooks.wait_for_update(symbol=symbol, timeout=5):
+                    self.logger.critical(f'TEST FAILED. Ордербук {symbol} не обновился в течение 5 секунд.')
+                    return
+                if orderbooks[symbol].timestamp < last_update_timestamp:
+                    self.logger.critical(
+                        f'TEST FAILED. Ордербуки пришли не в правильно порядке по timestamp (у ордербука, '
+                        f'который пришел в ядро позже, ордербук меньше, чем у предыдущего).')
+                    return
+                last_update_timestamp = orderbooks[symbol].timestamp
         else:
             self.logger.warning('Шаг пропущен, ордербуки не имеют символов. '
                                 'Это может быть особенностью биржи, либо ошибкой гейта')
+        if trader.orderbook_latency is not None:
+            self.logger.info(trader.orderbook_latency.report())
         self.logger.info('SUCCESS. Тест успешно пройден.')
@@ -44,17 +44,15 @@ class CancellingTesting(Strategy):
         await asyncio.sleep(0.5)
 
         self.logger.info('Жду баланс и ордербуки...')
-        # проверяю наличие балансов, а также проверяю с помощью множеств, что для каждого маркета пришел ордербук
-        while balances or \
-                set(orderbooks.orderbooks.keys()).intersection(self.markets.keys()) != set(self.markets.keys()):
-            await asyncio.sleep(0.1)
+        # жду балансы и ордербуки для каждого маркета
+        await balances.wait_ready()
+        await orderbooks.wait_for_symbols(self.markets.keys())
 
         self.logger.info(' 2. Проверяем баланс, поле `used` у всех ассетов должно быть нулевым, '
                          'если где-то не нулевое, ждем 1 секунду, повторяем пункт 1.')
         if not self.check_balances_to_free(balances):
             trader.cancel_all_orders()
-            await asyncio.sleep(2)
-            if not self.check_balances_to_free(balances):
+            if not await balances.wait_for(lambda: self.check_balances_to_free(balances), timeout=2):
                 self.logger.info('2.1. Если поле `used` у какого-то ассета не нулевое - тест провален')
                 self.logger.critical('TEST FAILED. Не удалось отменить все ордера, есть используемый баланс.')
                 return
@@ -64,8 +62,9 @@ class CancellingTesting(Strategy):
         trader.place_orders(order)
 
         self.logger.info('Жду информации об ордере...')
-        while order.state == enums.OrderState.PLACING:
-            await asyncio.sleep(0.1)
+        if not await order.wait_while_state(enums.OrderState.PLACING, timeout=5):
+            self.logger.critical(f'TEST FAILED. Не пришла информация об ордере {order} в течение 5 секунд')
+            return
 
         self.logger.info('4. Баланс после установки должен измениться, а именно, поле `used`')
         if self.check_balances_to_free(balances=balances):
@@ -78,8 +77,7 @@ class CancellingTesting(Strategy):
 
         self.logger.info('6. Проверяем баланс, поле `used` у ассетов должно быть нулевым, если не нулевое -'
                          ' тест провален')
-        await asyncio.sleep(2)
-        if not self.check_balances_to_free(balances):
+        if not await balances.wait_for(lambda: self.check_balances_to_free(balances), timeout=2):
             self.logger.critical(f'TEST FAILED. Не удалось отменить ордер, есть используемый баланс: {balances}')
             return
 
@@ -93,12 +91,11 @@ class CancellingTesting(Strategy):
         trader.place_orders(*orders)
 
         self.logger.info('Жду информации об ордерах...')
-        while True:
-            await asyncio.sleep(0.5)
-            for order in orders:
-                if order.state == enums.OrderState.PLACING:
-                    continue
-            break
+        is_received = await asyncio.gather(*(order.wait_while_state(enums.OrderState.PLACING, timeout=5)
+                                             for order in orders))
+        if not all(is_received):
+            self.logger.critical(f'TEST FAILED. Не пришла информация об ордерах {orders} в течение 5 секунд')
+            return
 
         self.logger.info('7.2. Баланс после установки должен измениться, а именно, поле `used`')
         if self.check_balances_to_free(balances=balances):
@@ -112,8 +109,7 @@ class CancellingTesting(Strategy):
         self.logger.info('7.4. Проверяем баланс, поле `used` у ассетов должно быть нулевым, если не нулевое -'
                          ' тест провален')
         trader.request_update_balances(self.assets)
-        await asyncio.sleep(5)
-        if not self.check_balances_to_free(balances):
+        if not await balances.wait_for(lambda: self.check_balances_to_free(balances), timeout=5):
             self.logger.critical(f'TEST FAILED. Не удалось отменить ордера, есть используемый баланс: {balances}')
             return
 
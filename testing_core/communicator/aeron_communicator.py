@@ -3,35 +3,57 @@ import time
 from abc import ABC, abstractmethod
 from typing import Callable
 
-import ujson
 from aeron import Publisher, Subscriber, AeronPublicationNotConnectedError, AeronPublicationError, \
     AeronPublicationAdminActionError
 from pydantic import ValidationError
 from ujson import JSONDecodeError
 
 from testing_core import enums
+from testing_core.communicator.capture import CaptureWriter
+from testing_core.communicator.conflation import OrderbookConflator
+from testing_core.communicator.decoder import MessageDecoder, StrictDecoder, FastDecoder
+from testing_core.communicator.send_pipeline import SendPipeline, PublishMetrics, offer_result_status
 from testing_core.config import CoreAeronChannels, Configuration
-from testing_core.enums import Action
+from testing_core.enums import Action, PublishStatus, CaptureChannel
 from testing_core.exceptions import UnexpectedAction
 from testing_core.formatter.formatter import Formatter
+from testing_core.formatter.prepared_command import PreparedCommand
+from testing_core.metrics.orderbook_latency import OrderbookLatencyTracer
 from testing_core.models.balance import Balance
 from testing_core.models.message import Message
 from testing_core.models.orderbook import Orderbook
 from testing_core.order.order import OrderData
+from testing_core.utils import get_micro_timestamp
 
 logger = logging.getLogger(__name__)
 
+# максимальное количество poll канала ордербуков за один вызов handle_new_messages при конфлюэнции
+CONFLATION_MAX_POLLS = 100
+
 
 class Communicator(ABC):
     @abstractmethod
-    def handle_new_messages(self):
+    def handle_new_messages(self) -> int:
         """
         Проверка на наличие новых сообщений
+        :return: количество обработанных сообщений (фрагментов)
+        """
+        pass
+
+    def start(self) -> None:
+        """
+        Запустить прием сообщений. Вызывается из цикла обработки подписок перед первым handle_new_messages
+        """
+        pass
+
+    def stop(self) -> None:
+        """
+        Остановить прием сообщений
         """
         pass
 
     @abstractmethod
-    def publish(self, message: Message):
+    def publish(self, message: Message | PreparedCommand):
         """
         Отправка сообщения ядру и/или лог-серверу. Ошибки при передаче будут логгированы. Если передача не удалась,
         будут совершены повторные попытки (кроме ордер-бука, он не имеет повторных попыток).
@@ -60,12 +82,17 @@ class AeronCommunicator(Communicator):
     _events_without_subscriber: list[Action] = []
 
     _formatter: Formatter
+    _decoder: MessageDecoder
+    _conflator: OrderbookConflator | None
 
     def __init__(self,
                  config: Configuration,
                  orderbook_handler: Callable[[Message], None],
                  balance_handler: Callable[[Message], None],
-                 core_input_handler: Callable[[Message], None]
+                 core_input_handler: Callable[[Message], None],
+                 decoder: MessageDecoder = None,
+                 publish_failed_handler: Callable[[Message | PreparedCommand, str], None] = None,
+                 orderbook_tracer: OrderbookLatencyTracer = None
                  ):
         """Класс для отправки и получения сообщений по Aeron;
 
@@ -73,19 +100,43 @@ class AeronCommunicator(Communicator):
         :param orderbook_handler: callback-функция, которая вызывается с сообщением из канала orderbooks;
         :param balance_handler: callback-функция, которая вызывается с сообщением из канала balances;
         :param core_input_handler: callback-функция, которая вызывается с сообщением из канала core_input;
+        :param decoder: декодер входящих сообщений. По умолчанию выбирается по config.strict_decoding;
+        :param publish_failed_handler: callback-функция, которая вызывается с сообщением и причиной, если сообщение
+         не удалось отправить (переполнен буфер отправки, истек deadline или ошибка Aeron);
+        :param orderbook_tracer: трассировка задержек доставки ордербуков. Опционально;
         """
         self._node = config.node
         self._channels = config.aeron_channels
         self._no_subscriber_log_frequency = config.no_subscriber_log_delay
+        self._fragment_limit = config.fragment_limit
+        # конфлюэнция ордербуков (хранится только последний ордербук по символу до обработки)
+        self._conflator = OrderbookConflator() if config.conflate_orderbooks else None
+        self._orderbook_tracer = orderbook_tracer
+        # запись входящих и отправленных сообщений в файл (если включена в конфигурации)
+        self._capture = CaptureWriter(config.capture_path) if config.capture_path else None
 
         # создаю aeron publishers, aeron subscribers
         self._init_channels()
 
+        # отправка сообщений с буфером и повторными попытками
+        self._send_pipeline = SendPipeline(
+            offer_function=self._try_to_publish,
+            capacity=config.publish_buffer_size,
+            failed_handler=publish_failed_handler,
+            not_connected_handler=self._handle_no_subscriber
+        )
+
         # обработчики сообщений для подписок
         self._orderbook_handler: Callable[[Message], None] = orderbook_handler
         self._balance_handler: Callable[[Message], None] = balance_handler
         self._core_input_handler: Callable[[Message], None] = core_input_handler
 
+        # декодер входящих сообщений (строка json -> Message)
+        if decoder is None:
+            decoder = StrictDecoder() if config.strict_decoding else \
+                FastDecoder(compact_orderbooks=config.compact_orderbooks)
+        self._decoder = decoder
+
         # объект для форматирования сообщений
         self._formatter = Formatter(
             exchange=config.exchange_id,
@@ -102,59 +153,124 @@ class AeronCommunicator(Communicator):
         self._logs = Publisher(self._channels.logs.channel, self._channels.logs.stream_id)
         self._gate_input = Publisher(self._channels.gate_input.channel, self._channels.gate_input.stream_id)
         # subscribers - каналы для чтения сообщений (подписки)
-        self._orderbooks = Subscriber(self._handler, self._channels.orderbooks.channel,
-                                      self._channels.orderbooks.stream_id)
-        self._balances = Subscriber(self._handler, self._channels.balances.channel, self._channels.balances.stream_id)
-        self._core_input = Subscriber(self._handler, self._channels.core_input.channel,
-                                      self._channels.core_input.stream_id)
+        orderbooks_handler = self._orderbooks_channel_handler
+        balances_handler = core_input_handler = self._handler
+        if self._capture is not None:
+            orderbooks_handler = self._capturing_handler(CaptureChannel.ORDERBOOKS, orderbooks_handler)
+            balances_handler = self._capturing_handler(CaptureChannel.BALANCES, balances_handler)
+            core_input_handler = self._capturing_handler(CaptureChannel.CORE_INPUT, core_input_handler)
+        self._orderbooks = Subscriber(orderbooks_handler, self._channels.orderbooks.channel,
+                                      self._channels.orderbooks.stream_id, self._fragment_limit)
+        self._balances = Subscriber(balances_handler, self._channels.balances.channel,
+                                    self._channels.balances.stream_id, self._fragment_limit)
+        self._core_input = Subscriber(core_input_handler, self._channels.core_input.channel,
+                                      self._channels.core_input.stream_id, self._fragment_limit)
+
+    def _capturing_handler(self, channel: CaptureChannel, handler: Callable[[str], None]) -> Callable[[str], None]:
+        """
+        Обработчик фрагментов подписки, который сначала записывает сообщение в файл записи трафика.
+        :param channel: канал подписки;
+        :param handler: обработчик фрагментов;
+        :return: обработчик с записью
+        """
+        capture = self._capture
+
+        def handle_and_capture(message_as_str: str):
+            capture.write(channel, message_as_str)
+            handler(message_as_str)
 
-    def handle_new_messages(self) -> None:
+        return handle_and_capture
+
+    def handle_new_messages(self) -> int:
         """
         Проверка на наличие новых сообщений
+        :return: количество обработанных сообщений (фрагментов)
         """
-        self._orderbooks.poll()
-        self._balances.poll()
-        self._core_input.poll()
+        # повторная отправка сообщений, которые не были приняты из-за back pressure
+        work_count = self._send_pipeline.drain()
+        if self._conflator is None:
+            return work_count + self._orderbooks.poll() + self._balances.poll() + self._core_input.poll()
+
+        # канал ордербуков вычитывается полностью, разбираются только последние ордербуки по символам
+        for _ in range(CONFLATION_MAX_POLLS):
+            fragments = self._orderbooks.poll()
+            work_count += fragments
+            if fragments < self._fragment_limit:
+                break
+        self._handle_conflated_orderbooks()
+        return work_count + self._balances.poll() + self._core_input.poll()
 
-    def publish(self, message: Message) -> None:
+    def stop(self) -> None:
         """
-        Отправка сообщения ядру и/или лог-серверу. Ошибки при передаче будут логгированы. Если передача не удалась,
-        будут совершены повторные попытки.
+        Остановить прием сообщений: записать на диск буфер записи трафика
+        """
+        if self._capture is not None:
+            self._capture.flush()
+
+    @property
+    def conflated_orderbooks(self) -> dict[str, int]:
+        """Количество ордербуков, замененных более новыми до обработки, по символам"""
+        return self._conflator.conflated if self._conflator is not None else {}
+
+    def publish(self, message: Message | PreparedCommand) -> None:
+        """
+        Отправка сообщения ядру и/или лог-серверу. Ошибки при передаче будут логгированы. Если гейт не успевает
+        принимать сообщения (back pressure), сообщение остается в буфере отправки и будет отправлено повторно
+        в handle_new_messages (см. SendPipeline).
         :param message: сообщение, которое нужно отправить
         """
-        # отправлять сообщение, пока не будет успешно
-        is_successful = False
-        num_of_retries = 0
-        while not is_successful and num_of_retries < 5:
+        self._send_pipeline.publish(message)
 
-            try:
-                is_successful = self._try_to_publish(message)
+    @property
+    def publish_metrics(self) -> PublishMetrics:
+        """Метрики отправки сообщений"""
+        return self._send_pipeline.metrics
 
-            # обработка случая, когда нет подписчика
-            except AeronPublicationNotConnectedError:
-                self._handle_no_subscriber(message)
-                break
-            # обработка случая admin actin (сообщение будет отправлено снова)
-            except AeronPublicationAdminActionError:
-                continue
-            # обработка прочих ошибок aeron
-            except AeronPublicationError as e:
-                logger.warning(f'Error on aeron publishing: {e}')
-                break
-            # обработка неожиданного action
-            except UnexpectedAction:
-                logger.error(f'Unexpected action in message: {message}')
+    def _orderbooks_channel_handler(self, message_as_str: str):
+        """
+        Сообщение из канала ордербуков: передается в конфлюэнцию, если она включена. Время получения фрагмента
+        для трассировки фиксируется здесь, до ожидания в конфлюэнции.
+        """
+        received = get_micro_timestamp() if self._orderbook_tracer is not None else None
+        if self._conflator is None or not self._conflator.offer(message_as_str, received):
+            self._handle_message(message_as_str, self._dispatch, received)
+
+    def _handle_conflated_orderbooks(self) -> int:
+        """
+        Разобрать и обработать ордербуки, оставшиеся после конфлюэнции.
+        :return: количество обработанных сообщений
+        """
+        messages = self._conflator.drain()
+        for message_as_str, received in messages:
+            self._handle_message(message_as_str, self._call_handler, received)
+        return len(messages)
 
     def _handler(self, message_as_str: str):
         """Форматирование сообщения, отправка на лог-сервер, передача callback-функции"""
+        self._handle_message(message_as_str, self._dispatch)
+
+    def _handle_message(self, message_as_str: str, dispatch: Callable[[Callable[[Message], None], Message], None],
+                        received: int = None):
+        """
+        Разобрать сообщение и передать его обработчику. Ошибки разбора и обработки логгируются и отправляются
+        на лог-сервер.
+        :param message_as_str: сообщение в формате json;
+        :param dispatch: функция, которая передает сообщение выбранному обработчику;
+        :param received: timestamp получения фрагмента для трассировки ордербуков (по умолчанию - время разбора);
+        """
         logger.debug(f'Received message on aeron: {message_as_str}')
         try:
             # парсинг сообщения
-            message_as_dict = ujson.loads(message_as_str)
-            message = Message(**message_as_dict)
+            if self._orderbook_tracer is not None:
+                if received is None:
+                    received = get_micro_timestamp()
+                message = self._decoder.decode(message_as_str)
+                self._orderbook_tracer.on_decoded(message, received)
+            else:
+                message = self._decoder.decode(message_as_str)
 
             handler = self._match_action_to_handler(message=message)
-            handler(message)
+            dispatch(handler, message)
 
             # НЕ РЕАЛИЗОВАНО
             # Отправка команды на log server
@@ -190,18 +306,51 @@ class AeronCommunicator(Communicator):
             )
             self.publish(message_error)
 
-    def _try_to_publish(self, message: Message) -> bool:
+    def _dispatch(self, handler: Callable[[Message], None], message: Message) -> None:
+        """
+        Передать разобранное сообщение обработчику.
+        :param handler: обработчик, выбранный по action;
+        :param message: сообщение;
+        """
+        self._call_handler(handler, message)
+
+    @staticmethod
+    def _call_handler(handler: Callable[[Message], None], message: Message) -> None:
+        """Вызвать обработчик с сообщением"""
+        handler(message)
+
+    def _try_to_publish(self, message: Message | PreparedCommand) -> PublishStatus:
         """
-        Попытка найти нужного publisher и отправить сообщение.
+        Попытка найти нужного publisher и отправить сообщение (одна попытка).
         :param message: сообщение, которое нужно отправить;
-        :return: True, если успешно
+        :return: PublishStatus - результат попытки
         """
-        message_json = message.json()
         if message.event == enums.Event.COMMAND:
-            self._gate_input.offer(message_json)
+            publisher = self._gate_input
+            channel = CaptureChannel.GATE_INPUT
         elif message.event == enums.Event.ERROR:
-            self._logs.offer(message_json)
-        return True
+            publisher = self._logs
+            channel = CaptureChannel.LOGS
+        else:
+            logger.error(f'Unexpected event in message to publish: {message}')
+            return PublishStatus.ERROR
+
+        try:
+            message_as_str = message.json()
+            status = offer_result_status(publisher.offer(message_as_str))
+            if self._capture is not None and status == PublishStatus.SENT:
+                self._capture.write(channel, message_as_str)
+            return status
+        # обработка случая, когда нет подписчика
+        except AeronPublicationNotConnectedError:
+            return PublishStatus.NOT_CONNECTED
+        # обработка случая admin action (сообщение будет отправлено снова)
+        except AeronPublicationAdminActionError:
+            return PublishStatus.BACK_PRESSURED
+        # обработка прочих ошибок aeron
+        except AeronPublicationError as e:
+            logger.warning(f'Error on aeron publishing: {e}')
+            return PublishStatus.ERROR
 
     def _handle_no_subscriber(self, message):
         """
@@ -222,7 +371,7 @@ class AeronCommunicator(Communicator):
         :return: функция для обработки сообщения
         """
         match message.action:
-            case Action.ORDERBOOK_UPDATE:
+            case Action.ORDERBOOK_UPDATE | Action.ORDERBOOK_DELTA | Action.GET_ORDERBOOK:
                 handler = self._orderbook_handler
             case Action.CREATE_ORDERS | Action.CANCEL_ORDERS | \
                  Action.CANCEL_ALL_ORDERS | Action.GET_ORDERS | Action.ORDERS_UPDATE:
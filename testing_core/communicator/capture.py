@@ -0,0 +1,105 @@
+import struct
+import threading
+import time
+from typing import Iterator, BinaryIO
+
+from testing_core.enums import CaptureChannel
+from testing_core.exceptions import CaptureFormatError
+
+# сигнатура и версия формата файла записи
+CAPTURE_MAGIC = b'TCCAP\x01'
+# заголовок записи: timestamp в наносекундах, код канала, длина сообщения в байтах
+_RECORD_HEADER = struct.Struct('<qBI')
+
+# код канала в файле - номер в CaptureChannel, поэтому новые каналы добавляются только в конец CaptureChannel
+_CHANNEL_CODES: dict[CaptureChannel, int] = {channel: code for code, channel in enumerate(CaptureChannel)}
+_CODE_CHANNELS: dict[int, CaptureChannel] = {code: channel for channel, code in _CHANNEL_CODES.items()}
+
+# каналы, в которые ядро отправляет сообщения (остальные - входящие)
+OUTGOING_CHANNELS = (CaptureChannel.GATE_INPUT, CaptureChannel.LOGS)
+
+
+class CaptureRecord(object):
+    """Запись трафика: время (наносекунды, time.time_ns), канал и сообщение в формате json"""
+    __slots__ = ('timestamp', 'channel', 'message')
+
+    def __init__(self, timestamp: int, channel: CaptureChannel, message: str):
+        self.timestamp = timestamp
+        self.channel = channel
+        self.message = message
+
+    def __eq__(self, other):
+        if not isinstance(other, CaptureRecord):
+            return NotImplemented
+        return (self.timestamp, self.channel, self.message) == (other.timestamp, other.channel, other.message)
+
+    def __repr__(self):
+        return f'CaptureRecord(timestamp={self.timestamp}, channel={self.channel!r}, message={self.message!r})'
+
+
+class CaptureWriter(object):
+    """
+    Запись трафика Aeron в файл (только добавление). Формат: сигнатура CAPTURE_MAGIC, затем записи -
+    заголовок (timestamp в наносекундах int64, код канала uint8, длина uint32, little-endian) и сообщение в utf-8.
+
+    write можно вызывать из разных потоков (поток опроса подписок и event loop).
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        """
+        :param path: путь к файлу. Если файл существует, записи добавляются в конец;
+        :param buffer_size: размер буфера записи в байтах;
+        """
+        self._file: BinaryIO = open(path, 'ab', buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(CAPTURE_MAGIC)
+        self._lock = threading.Lock()
+        # количество записанных сообщений
+        self.records_count: int = 0
+
+    def write(self, channel: CaptureChannel, message: str, timestamp: int = None) -> None:
+        """
+        Записать сообщение.
+        :param channel: канал;
+        :param message: сообщение в формате json;
+        :param timestamp: время получения или отправки в наносекундах (по умолчанию - текущее время);
+        """
+        if timestamp is None:
+            timestamp = time.time_ns()
+        payload = message.encode()
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(_RECORD_HEADER.pack(timestamp, _CHANNEL_CODES[channel], len(payload)))
+            self._file.write(payload)
+            self.records_count += 1
+
+    def flush(self) -> None:
+        """Записать буфер на диск"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        """Закрыть файл"""
+        with self._lock:
+            self._file.close()
+
+
+def read_capture(path: str) -> Iterator[CaptureRecord]:
+    """
+    Прочитать записи трафика из файла (по одной, без загрузки файла в память).
+    :param path: путь к файлу записи;
+    :return: итератор CaptureRecord
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise CaptureFormatError(f'{path} is not a capture file')
+        while header := file.read(_RECORD_HEADER.size):
+            if len(header) < _RECORD_HEADER.size:
+                raise CaptureFormatError(f'Truncated record header in {path}')
+            timestamp, code, length = _RECORD_HEADER.unpack(header)
+            payload = file.read(length)
+            if len(payload) < length or code not in _CODE_CHANNELS:
+                raise CaptureFormatError(f'Truncated or corrupted record in {path}')
+            yield CaptureRecord(timestamp, _CODE_CHANNELS[code], payload.decode())
@@ -0,0 +1,85 @@
+import re
+import threading
+
+from testing_core.enums import Action, Event
+
+_EVENT_PATTERN = re.compile(r'"event"\s*:\s*"([^"]*)"')
+_ACTION_PATTERN = re.compile(r'"action"\s*:\s*"([^"]*)"')
+_SYMBOL_PATTERN = re.compile(r'"symbol"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+class OrderbookConflator(object):
+    """
+    Конфлюэнция ордербуков: сообщения из канала orderbooks хранятся в виде строк json по символам,
+    новый снапшот ордербука (order_book_update) заменяет все ожидающие сообщения по своему символу.
+    Сообщения разбираются только при выдаче (drain), поэтому устаревшие ордербуки не декодируются.
+    Вместе с сообщением хранится время получения фрагмента, чтобы ожидание в конфлюэнции учитывалось в задержке
+    доставки (трассировка ордербуков), а не считалось задержкой до получения.
+
+    Инкрементальные обновления (order_book_delta) не заменяют друг друга и выдаются по порядку после снапшота.
+    Сообщения, для которых не удалось определить символ, и сообщения остальных событий не принимаются
+    (offer возвращает False) и обрабатываются как обычно. Ордера и балансы через конфлюэнцию не проходят.
+
+    offer и drain можно вызывать из разных потоков.
+    """
+
+    def __init__(self):
+        # ожидающие сообщения и время их получения по символам (в порядке первого появления символа)
+        self._pending: dict[str, list[tuple[str, int | None]]] = {}
+        self._lock = threading.Lock()
+        # количество замененных (не разобранных) сообщений по символам
+        self.conflated: dict[str, int] = {}
+
+    def offer(self, message_as_str: str, received: int = None) -> bool:
+        """
+        Добавить сообщение из канала ордербуков.
+        :param message_as_str: сообщение в формате json;
+        :param received: timestamp получения фрагмента в микросекундах. Опционально;
+        :return: True, если сообщение принято. False, если сообщение нужно обработать без конфлюэнции
+        """
+        event = _EVENT_PATTERN.search(message_as_str)
+        if event is None or event.group(1) != Event.DATA.value:
+            return False
+        action = _ACTION_PATTERN.search(message_as_str)
+        if action is None or action.group(1) not in (Action.ORDERBOOK_UPDATE.value, Action.ORDERBOOK_DELTA.value):
+            return False
+        symbol = _SYMBOL_PATTERN.search(message_as_str)
+        if symbol is None:
+            return False
+        symbol = symbol.group(1)
+
+        item = (message_as_str, received)
+        with self._lock:
+            pending = self._pending.get(symbol)
+            if pending is None:
+                self._pending[symbol] = [item]
+            elif action.group(1) == Action.ORDERBOOK_UPDATE.value:
+                # снапшот заменяет предыдущий снапшот и все обновления после него
+                self.conflated[symbol] = self.conflated.get(symbol, 0) + len(pending)
+                pending.clear()
+                pending.append(item)
+            else:
+                pending.append(item)
+        return True
+
+    def drain(self) -> list[tuple[str, int | None]]:
+        """
+        Забрать все ожидающие сообщения.
+        :return: сообщения в формате json и время их получения, по символам в порядке поступления
+        """
+        with self._lock:
+            if not self._pending:
+                return []
+            pending = self._pending
+            self._pending = {}
+        return [item for messages in pending.values() for item in messages]
+
+    @property
+    def has_pending(self) -> bool:
+        """Есть ли ожидающие сообщения"""
+        return bool(self._pending)
+
+    @property
+    def pending_count(self) -> int:
+        """Количество ожидающих сообщений"""
+        return sum(len(messages) for messages in list(self._pending.values()))
@@ -0,0 +1,239 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+import ujson
+
+from testing_core import enums
+from testing_core.models.balance import Balance
+from testing_core.models.compact_orderbook import CompactOrderbook
+from testing_core.models.message import Message, Balances, GateOrderInfo
+from testing_core.models.orderbook import Orderbook, OrderbookDelta
+
+# поля сообщения (Message запрещает лишние поля)
+_MESSAGE_FIELDS = frozenset(Message.__fields__)
+# поля баланса одного ассета (Balance запрещает лишние поля, все поля обязательны)
+_BALANCE_FIELDS = frozenset(Balance.__fields__)
+# поля ордера от гейта (GateOrderInfo запрещает лишние поля)
+_GATE_ORDER_INFO_FIELDS = frozenset(GateOrderInfo.__fields__)
+
+
+class MessageDecoder(ABC):
+    """
+    Декодер сообщений, полученных по Aeron. Преобразует строку json в объект Message.
+    """
+
+    def decode(self, message_as_str: str) -> Message:
+        """
+        Декодировать сообщение.
+        :param message_as_str: сообщение в виде строки json;
+        :return: Message - провалидированное сообщение
+        """
+        return self.decode_dict(ujson.loads(message_as_str))
+
+    @abstractmethod
+    def decode_dict(self, message_as_dict: dict) -> Message:
+        """
+        Преобразовать распарсенный json в объект Message.
+        :param message_as_dict: сообщение в виде словаря;
+        :return: Message - провалидированное сообщение
+        """
+        ...
+
+
+class StrictDecoder(MessageDecoder):
+    """
+    Строгий декодер: полная валидация сообщения моделью Message средствами pydantic.
+    """
+
+    def decode_dict(self, message_as_dict: dict) -> Message:
+        return Message(**message_as_dict)
+
+
+class FastDecoder(MessageDecoder):
+    """
+    Быстрый декодер. Сначала читает поля event и action, затем передает data заранее подготовленному парсеру,
+    который соответствует action. Сообщения, для которых нет парсера (ошибки, команды, неизвестные action), а также
+    сообщения, которые не удалось разобрать быстрым путем, передаются строгому декодеру. Поэтому результат (в том
+    числе ValidationError для невалидных сообщений) совпадает с результатом строгого декодера.
+    """
+
+    def __init__(self, fallback: MessageDecoder = None, compact_orderbooks: bool = False):
+        """
+        :param fallback: декодер, который используется, если сообщение нельзя разобрать быстрым путем
+         (по умолчанию StrictDecoder);
+        :param compact_orderbooks: если True, ордербуки разбираются в CompactOrderbook (массивы numpy);
+        """
+        self._fallback = fallback if fallback is not None else StrictDecoder()
+        # парсеры поля data, ключ - значение action (строка, как она приходит в json)
+        self._parsers: dict[str, Callable[[Any], Any]] = {}
+
+        self.register_parser(enums.Action.ORDERBOOK_UPDATE,
+                             CompactOrderbook.from_dict if compact_orderbooks else parse_orderbook)
+        self.register_parser(enums.Action.ORDERBOOK_DELTA, parse_orderbook_delta)
+        self.register_parser(enums.Action.BALANCE_UPDATE, parse_balances)
+        self.register_parser(enums.Action.GET_BALANCE, parse_balances)
+        self.register_parser(enums.Action.ORDERS_UPDATE, parse_order_list)
+        self.register_parser(enums.Action.CREATE_ORDERS, parse_order_list)
+        self.register_parser(enums.Action.CANCEL_ORDERS, parse_order_list)
+        self.register_parser(enums.Action.GET_ORDERS, parse_order_list)
+
+    def register_parser(self, action: enums.Action, parser: Callable[[Any], Any]) -> None:
+        """
+        Зарегистрировать парсер поля data для сообщений с событием data и указанным action.
+        Парсер должен выбрасывать KeyError, TypeError, ValueError или AttributeError, если данные не подходят,
+        в этом случае сообщение будет передано строгому декодеру.
+        :param action: action сообщения;
+        :param parser: функция, которая преобразует data из json в объект модели;
+        """
+        self._parsers[action.value] = parser
+
+    def decode_dict(self, message_as_dict: dict) -> Message:
+        try:
+            message = self._decode_fast(message_as_dict)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            message = None
+        if message is None:
+            return self._fallback.decode_dict(message_as_dict)
+        return message
+
+    def _decode_fast(self, message_as_dict: dict) -> Message | None:
+        """
+        Разобрать сообщение без pydantic-валидации Union.
+        :return: Message или None, если для сообщения нет быстрого пути
+        """
+        if message_as_dict.get('event') != enums.Event.DATA.value:
+            return None
+        parser = self._parsers.get(message_as_dict.get('action'))
+        if parser is None or not _MESSAGE_FIELDS.issuperset(message_as_dict):
+            return None
+
+        text = message_as_dict.get('message')
+        if text is not None:
+            _check_str(text)
+
+        return Message.construct(
+            event_id=_check_str(message_as_dict['event_id']),
+            exchange=_check_str(message_as_dict['exchange']),
+            instance=_check_str(message_as_dict['instance']),
+            event=enums.Event.DATA,
+            node=enums.Node(message_as_dict['node']),
+            action=enums.Action(message_as_dict['action']),
+            message=text,
+            algo=_check_str(message_as_dict['algo']),
+            timestamp=_check_int(message_as_dict['timestamp']),
+            data=parser(message_as_dict['data'])
+        )
+
+
+def _check_str(value: Any) -> str:
+    if type(value) is not str:
+        raise TypeError
+    return value
+
+
+def _check_int(value: Any) -> int:
+    if type(value) is not int:
+        raise TypeError
+    return value
+
+
+def _check_non_negative(value: Any) -> float:
+    value = float(value)
+    if not value >= 0:
+        raise ValueError
+    return value
+
+
+def _parse_levels(levels: list) -> list[list[float]]:
+    if type(levels) is not list:
+        raise TypeError
+    return [[float(price), float(amount)] for price, amount in levels]
+
+
+def _parse_orderbook_fields(data: dict) -> dict:
+    timestamp = data.get('timestamp')
+    if timestamp is not None:
+        _check_int(timestamp)
+    sequence = data.get('sequence')
+    if sequence is not None:
+        _check_int(sequence)
+    return dict(
+        symbol=_check_str(data['symbol']),
+        timestamp=timestamp,
+        sequence=sequence,
+        bids=_parse_levels(data['bids']),
+        asks=_parse_levels(data['asks'])
+    )
+
+
+def parse_orderbook(data: dict) -> Orderbook:
+    """
+    Разобрать ордербук из json без поуровневой pydantic-валидации.
+    :param data: поле data сообщения order_book_update;
+    :return: Orderbook
+    """
+    return Orderbook.construct(**_parse_orderbook_fields(data))
+
+
+def parse_orderbook_delta(data: dict) -> OrderbookDelta:
+    """
+    Разобрать инкрементальное обновление ордербука из json без поуровневой pydantic-валидации.
+    :param data: поле data сообщения order_book_delta;
+    :return: OrderbookDelta
+    """
+    return OrderbookDelta.construct(**_parse_orderbook_fields(data))
+
+
+def parse_balances(data: dict) -> Balances:
+    """
+    Разобрать балансы из json без pydantic-валидации.
+    :param data: поле data сообщения balance_update или get_balance;
+    :return: Balances
+    """
+    assets = {}
+    for asset, balance in data['assets'].items():
+        if balance.keys() != _BALANCE_FIELDS:
+            raise KeyError(asset)
+        assets[asset] = Balance.construct(
+            free=_check_non_negative(balance['free']),
+            used=_check_non_negative(balance['used']),
+            total=_check_non_negative(balance['total'])
+        )
+    timestamp = data.get('timestamp')
+    if timestamp is not None:
+        _check_int(timestamp)
+    return Balances.construct(timestamp=timestamp, assets=assets)
+
+
+def parse_order_list(data: list) -> list[GateOrderInfo]:
+    """
+    Разобрать список ордеров от гейта из json без pydantic-валидации.
+    :param data: поле data сообщения orders_update, create_orders, cancel_orders или get_orders;
+    :return: list[GateOrderInfo]
+    """
+    if type(data) is not list:
+        raise TypeError
+    orders = []
+    for order in data:
+        if not _GATE_ORDER_INFO_FIELDS.issuperset(order):
+            raise KeyError
+        price = order.get('price')
+        status = order.get('status')
+        filled = order.get('filled')
+        info = order.get('info')
+        if info is not None and type(info) is not dict:
+            raise TypeError
+        orders.append(GateOrderInfo.construct(
+            id=_check_str(order['id']),
+            client_order_id=_check_str(order['client_order_id']),
+            symbol=_check_str(order['symbol']),
+            type=enums.OrderType(order['type']),
+            side=enums.OrderSide(order['side']),
+            amount=_check_non_negative(order['amount']),
+            price=_check_non_negative(price) if price is not None else None,
+            timestamp=_check_int(order['timestamp']),
+            status=enums.GateOrderStatus(status) if status is not None else None,
+            filled=_check_non_negative(filled) if filled is not None else None,
+            info=info
+        ))
+    return orders
@@ -0,0 +1,94 @@
+import functools
+import getpass
+import logging
+import os
+import struct
+import sys
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# файл Command and Control (CnC), который создает запущенный media driver в своей директории
+CNC_FILE_NAME = 'cnc.dat'
+# смещение PID процесса media driver в заголовке CnC (int64, little-endian)
+CNC_PID_OFFSET = 40
+_PID_FIELD = struct.Struct('<q')
+
+
+def get_aeron_dir() -> str:
+    """
+    Директория media driver: AERON_DIR или директория по умолчанию Aeron (/dev/shm/aeron-<user> в Linux,
+    <tmp>/aeron-<user> в остальных системах).
+    """
+    if aeron_dir := os.environ.get('AERON_DIR'):
+        return aeron_dir
+    base_dir = '/dev/shm' if sys.platform.startswith('linux') and os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base_dir, f'aeron-{getpass.getuser()}')
+
+
+def _is_process_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # процесс существует, но принадлежит другому пользователю
+        return True
+    except (OSError, OverflowError):
+        return False
+    return True
+
+
+def _driver_pid_from_cnc(aeron_dir: str) -> int | None:
+    """PID media driver из файла CnC или None, если файла нет или он не прочитан"""
+    try:
+        with open(os.path.join(aeron_dir, CNC_FILE_NAME), 'rb') as file:
+            file.seek(CNC_PID_OFFSET)
+            data = file.read(_PID_FIELD.size)
+    except OSError:
+        return None
+    if len(data) < _PID_FIELD.size:
+        return None
+    return _PID_FIELD.unpack(data)[0]
+
+
+def _find_aeron_process() -> bool | None:
+    """
+    Найти процесс, в имени или командной строке которого есть "aeron" (по /proc).
+    :return: None, если /proc недоступен
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    own_pid = str(os.getpid())
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit() or pid == own_pid:
+            continue
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as file:
+                cmdline = file.read()
+        except OSError:
+            continue
+        if b'aeron' in cmdline.lower():
+            return True
+    return False
+
+
+@functools.cache
+def is_media_driver_running() -> bool:
+    """
+    Проверить, запущен ли Aeron media driver. Проверка выполняется в процессе (без запуска shell) один раз:
+    сначала по PID из файла CnC в директории Aeron, затем поиском процесса aeron в /proc.
+    Если проверить нельзя (нет CnC и /proc), считается, что media driver запущен.
+    :return: bool
+    """
+    aeron_dir = get_aeron_dir()
+    pid = _driver_pid_from_cnc(aeron_dir)
+    if pid is not None and _is_process_alive(pid):
+        return True
+    found = _find_aeron_process()
+    if found is None:
+        logger.warning(f'Could not check if Aeron media driver is running (no {CNC_FILE_NAME} in {aeron_dir}).')
+        return True
+    return found
@@ -0,0 +1,146 @@
+import logging
+import time
+from typing import Callable, Iterator
+
+from testing_core.communicator.aeron_communicator import AeronCommunicator
+from testing_core.communicator.capture import CaptureRecord, read_capture, OUTGOING_CHANNELS
+from testing_core.communicator.decoder import MessageDecoder
+from testing_core.config import Configuration
+from testing_core.enums import CaptureChannel, PublishStatus
+from testing_core.formatter.prepared_command import PreparedCommand
+from testing_core.metrics.orderbook_latency import OrderbookLatencyTracer
+from testing_core.models.message import Message
+from testing_core.store.notifier import StateNotifier
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayCommunicator(AeronCommunicator):
+    """
+    Коммуникатор, который вместо подписок Aeron воспроизводит файл записи трафика (CaptureWriter).
+    Входящие сообщения проходят тот же путь, что и сообщения из Aeron (декодер, конфлюэнция, трассировка),
+    поэтому на записанном трафике можно измерять производительность разбора и стратегии без media driver и гейта.
+
+    Скорость воспроизведения: 1 - с записанными интервалами между сообщениями, 2 - в два раза быстрее,
+    0 - максимально быстро (за один вызов handle_new_messages обрабатывается до batch_size сообщений).
+    Отправленные сообщения не передаются в Aeron, а считаются и передаются в publish_handler.
+    Записанные в файле отправленные ядром сообщения при воспроизведении пропускаются.
+    """
+
+    def __init__(self,
+                 config: Configuration,
+                 orderbook_handler: Callable[[Message], None],
+                 balance_handler: Callable[[Message], None],
+                 core_input_handler: Callable[[Message], None],
+                 decoder: MessageDecoder = None,
+                 publish_failed_handler: Callable[[Message | PreparedCommand, str], None] = None,
+                 orderbook_tracer: OrderbookLatencyTracer = None,
+                 path: str = None,
+                 speed: float = None,
+                 batch_size: int = None,
+                 publish_handler: Callable[[Message | PreparedCommand], None] = None
+                 ):
+        """
+        Коммуникатор, который воспроизводит файл записи трафика.
+
+        :param config: конфигурация гейта;
+        :param orderbook_handler: callback-функция, которая вызывается с сообщением из канала orderbooks;
+        :param balance_handler: callback-функция, которая вызывается с сообщением из канала balances;
+        :param core_input_handler: callback-функция, которая вызывается с сообщением из канала core_input;
+        :param decoder: декодер входящих сообщений. По умолчанию выбирается по config.strict_decoding;
+        :param publish_failed_handler: callback-функция для неотправленных сообщений;
+        :param orderbook_tracer: трассировка задержек доставки ордербуков. Опционально;
+        :param path: файл записи. По умолчанию config.replay_path;
+        :param speed: скорость воспроизведения. По умолчанию config.replay_speed;
+        :param batch_size: максимальное количество сообщений за один вызов handle_new_messages.
+         По умолчанию - как три подписки за один poll (3 * config.fragment_limit);
+        :param publish_handler: callback-функция, которая вызывается с каждым отправленным сообщением. Опционально;
+        """
+        self._path = path if path is not None else config.replay_path
+        self._speed = speed if speed is not None else config.replay_speed
+        self._batch_size = batch_size if batch_size is not None else 3 * config.fragment_limit
+        self._publish_handler = publish_handler
+        super().__init__(config=config,
+                         orderbook_handler=orderbook_handler,
+                         balance_handler=balance_handler,
+                         core_input_handler=core_input_handler,
+                         decoder=decoder,
+                         publish_failed_handler=publish_failed_handler,
+                         orderbook_tracer=orderbook_tracer)
+        # время начала воспроизведения и время первой записи (в наносекундах)
+        self._start_time: int | None = None
+        self._first_timestamp: int | None = None
+        self._next_record: CaptureRecord | None = None
+        self._finished_notifier = StateNotifier()
+        self.is_finished: bool = False
+        # количество воспроизведенных входящих сообщений
+        self.replayed_count: int = 0
+        # количество отправленных сообщений
+        self.published_count: int = 0
+
+    def _init_channels(self):
+        """
+        Вместо каналов Aeron открыть файл записи.
+        """
+        self._records: Iterator[CaptureRecord] = read_capture(self._path)
+
+    def handle_new_messages(self) -> int:
+        """
+        Обработать сообщения из записи, время которых наступило (с учетом скорости воспроизведения).
+        :return: количество обработанных сообщений
+        """
+        work_count = self._send_pipeline.drain()
+        if self.is_finished:
+            return work_count
+        now = time.perf_counter_ns()
+        if self._start_time is None:
+            self._start_time = now
+        elapsed = (now - self._start_time) * self._speed
+
+        for _ in range(self._batch_size):
+            record = self._next_record
+            if record is None:
+                record = next(self._records, None)
+                if record is None:
+                    self._finish()
+                    break
+                if self._first_timestamp is None:
+                    self._first_timestamp = record.timestamp
+            if self._speed and record.timestamp - self._first_timestamp > elapsed:
+                self._next_record = record
+                break
+            self._next_record = None
+            if record.channel in OUTGOING_CHANNELS:
+                continue
+            if record.channel == CaptureChannel.ORDERBOOKS:
+                self._orderbooks_channel_handler(record.message)
+            else:
+                self._handler(record.message)
+            self.replayed_count += 1
+            work_count += 1
+
+        if self._conflator is not None:
+            self._handle_conflated_orderbooks()
+        return work_count
+
+    async def wait_finished(self, timeout: float = None) -> bool:
+        """
+        Дождаться окончания воспроизведения.
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если запись воспроизведена полностью. False, если истекло время ожидания
+        """
+        return await self._finished_notifier.wait_for(lambda: self.is_finished, timeout=timeout)
+
+    def _finish(self) -> None:
+        self.is_finished = True
+        logger.info(f'Replay of {self._path} finished: {self.replayed_count} messages.')
+        self._finished_notifier.notify()
+
+    def _try_to_publish(self, message: Message | PreparedCommand) -> PublishStatus:
+        """
+        Сообщение не отправляется в Aeron, а передается в publish_handler.
+        """
+        self.published_count += 1
+        if self._publish_handler is not None:
+            self._publish_handler(message)
+        return PublishStatus.SENT
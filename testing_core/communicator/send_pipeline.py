@@ -0,0 +1,247 @@
+import logging
+import time
+from collections import deque
+from typing import Callable, Any
+
+from testing_core.enums import Action, Event, MessageClass, PublishStatus
+
+logger = logging.getLogger(__name__)
+
+# коды возврата offer в Aeron
+AERON_NOT_CONNECTED = -1
+AERON_BACK_PRESSURED = -2
+AERON_ADMIN_ACTION = -3
+
+
+def offer_result_status(result: Any) -> PublishStatus:
+    """
+    Статус отправки по результату Publisher.offer: отрицательный код Aeron или позиция в логе.
+    :param result: результат offer;
+    :return: PublishStatus
+    """
+    if not isinstance(result, int) or result >= 0:
+        return PublishStatus.SENT
+    if result == AERON_NOT_CONNECTED:
+        return PublishStatus.NOT_CONNECTED
+    if result in (AERON_BACK_PRESSURED, AERON_ADMIN_ACTION):
+        return PublishStatus.BACK_PRESSURED
+    return PublishStatus.ERROR
+
+
+def get_message_class(message) -> MessageClass:
+    """
+    Класс сообщения для выбора политики повторных попыток.
+    :param message: Message или PreparedCommand;
+    :return: MessageClass
+    """
+    if message.event == Event.COMMAND:
+        if message.action in (Action.CREATE_ORDERS, Action.CANCEL_ORDERS, Action.CANCEL_ALL_ORDERS):
+            return MessageClass.ORDERS
+        if message.action is not None:
+            return MessageClass.REQUESTS
+    return MessageClass.LOGS
+
+
+class RetryPolicy(object):
+    """
+    Политика повторных попыток отправки: ожидание между попытками удваивается от min_backoff до max_backoff,
+    после deadline секунд с первой попытки сообщение считается неотправленным.
+    """
+
+    def __init__(self, deadline: float, min_backoff: float = 0.00005, max_backoff: float = 0.01):
+        """
+        :param deadline: время в секундах с первой попытки, после которого сообщение не отправляется;
+        :param min_backoff: ожидание перед первой повторной попыткой в секундах;
+        :param max_backoff: максимальное ожидание между попытками в секундах;
+        """
+        self.deadline = deadline
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Ожидание перед следующей попыткой.
+        :param attempt: номер неудачной попытки (с 1);
+        :return: время ожидания в секундах
+        """
+        return min(self.max_backoff, self.min_backoff * 2 ** min(attempt - 1, 30))
+
+
+DEFAULT_RETRY_POLICIES: dict[MessageClass, RetryPolicy] = {
+    # команды по ордерам: повторять дольше всего
+    MessageClass.ORDERS: RetryPolicy(deadline=5),
+    # запросы данных (балансы, ордера, ордербуки) будут запрошены повторно, поэтому ждать меньше
+    MessageClass.REQUESTS: RetryPolicy(deadline=1),
+    # сообщения на лог-сервер
+    MessageClass.LOGS: RetryPolicy(deadline=0.1, max_backoff=0.05),
+}
+
+
+class PublishMetrics(object):
+    """
+    Метрики отправки сообщений.
+    """
+
+    def __init__(self):
+        # отправлено сообщений
+        self.sent: int = 0
+        # количество повторных попыток
+        self.retries: int = 0
+        # количество отказов offer из-за back pressure (и admin action)
+        self.back_pressured: int = 0
+        # отброшено сообщений из-за переполнения буфера
+        self.dropped: int = 0
+        # не отправлено сообщений до истечения deadline
+        self.expired: int = 0
+        # не отправлено сообщений из-за отсутствия подписчика
+        self.not_connected: int = 0
+        # не отправлено сообщений из-за ошибок Aeron
+        self.errors: int = 0
+        # суммарное время в секундах, которое сообщения ждали из-за back pressure
+        self.back_pressured_time: float = 0
+        # максимальное количество сообщений в буфере
+        self.max_buffer_depth: int = 0
+
+    def dict(self) -> dict:
+        return dict(self.__dict__)
+
+    def __repr__(self):
+        return f'PublishMetrics({", ".join(f"{key}={value}" for key, value in self.__dict__.items())})'
+
+
+class _PendingMessage(object):
+    """Сообщение в буфере отправки"""
+    __slots__ = ('message', 'policy', 'first_attempt_time', 'next_attempt_time', 'attempts')
+
+    def __init__(self, message, policy: RetryPolicy, first_attempt_time: float):
+        self.message = message
+        self.policy = policy
+        self.first_attempt_time = first_attempt_time
+        self.next_attempt_time = first_attempt_time
+        self.attempts = 0
+
+
+class SendPipeline(object):
+    """
+    Отправка сообщений с буфером и повторными попытками.
+
+    Если буфер пуст, сообщение отправляется сразу. Если offer вернул back pressure, сообщение остается в буфере
+    (ограниченный кольцевой буфер) и отправляется повторно в drain, который вызывается из цикла обработки
+    подписок, с ожиданием между попытками по политике для класса сообщения. Пока в буфере есть сообщения,
+    новые сообщения встают в очередь за ними, поэтому порядок отправки сохраняется.
+
+    Сообщение не отправляется и передается в failed_handler, если буфер переполнен, истек deadline политики
+    или offer завершился ошибкой. Если нет подписчика, команда ордеров передается в failed_handler,
+    остальные сообщения - в not_connected_handler.
+    """
+
+    def __init__(self,
+                 offer_function: Callable[[Any], PublishStatus],
+                 capacity: int = 1024,
+                 policies: dict[MessageClass, RetryPolicy] = None,
+                 failed_handler: Callable[[Any, str], None] = None,
+                 not_connected_handler: Callable[[Any], None] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param offer_function: функция однократной попытки отправки сообщения;
+        :param capacity: максимальное количество сообщений в буфере;
+        :param policies: политики повторных попыток по классам сообщений (по умолчанию DEFAULT_RETRY_POLICIES);
+        :param failed_handler: вызывается с сообщением и причиной, если сообщение не удалось отправить;
+        :param not_connected_handler: вызывается с сообщением (кроме команд ордеров), если у канала нет подписчика;
+        :param clock: источник времени в секундах;
+        """
+        self._offer_function = offer_function
+        self._capacity = capacity
+        self._policies = DEFAULT_RETRY_POLICIES.copy() if policies is None else policies
+        self._failed_handler = failed_handler
+        self._not_connected_handler = not_connected_handler
+        self._clock = clock
+        self._buffer: deque[_PendingMessage] = deque()
+        self.metrics = PublishMetrics()
+
+    def publish(self, message) -> None:
+        """
+        Отправить сообщение или поставить его в буфер.
+        :param message: Message или PreparedCommand;
+        """
+        now = self._clock()
+        pending = _PendingMessage(message, self._policies[get_message_class(message)], now)
+        if self._buffer:
+            self._enqueue(pending)
+            self.drain()
+            return
+        if not self._try_to_send(pending, now):
+            self._enqueue(pending)
+
+    def drain(self) -> int:
+        """
+        Повторить отправку сообщений из буфера (по порядку, пока offer не вернет back pressure).
+        :return: количество отправленных сообщений
+        """
+        if not self._buffer:
+            return 0
+        sent = 0
+        now = self._clock()
+        while self._buffer:
+            pending = self._buffer[0]
+            if now - pending.first_attempt_time > pending.policy.deadline:
+                self._buffer.popleft()
+                self.metrics.expired += 1
+                self.metrics.back_pressured_time += now - pending.first_attempt_time
+                self._fail(pending.message, 'deadline exceeded')
+                continue
+            if pending.next_attempt_time > now:
+                break
+            if pending.attempts:
+                self.metrics.retries += 1
+            if not self._try_to_send(pending, now):
+                break
+            self._buffer.popleft()
+            self.metrics.back_pressured_time += now - pending.first_attempt_time
+            sent += 1
+        return sent
+
+    @property
+    def buffer_depth(self) -> int:
+        """Количество сообщений в буфере"""
+        return len(self._buffer)
+
+    def _try_to_send(self, pending: _PendingMessage, now: float) -> bool:
+        """
+        Попытка отправки.
+        :return: False, если сообщение нужно отправить повторно (back pressure)
+        """
+        pending.attempts += 1
+        status = self._offer_function(pending.message)
+        match status:
+            case PublishStatus.SENT:
+                self.metrics.sent += 1
+            case PublishStatus.BACK_PRESSURED:
+                self.metrics.back_pressured += 1
+                pending.next_attempt_time = now + pending.policy.backoff(pending.attempts)
+                return False
+            case PublishStatus.NOT_CONNECTED:
+                self.metrics.not_connected += 1
+                # команды ордеров без подписчика не будут исполнены, поэтому ордера должны перейти в error
+                if get_message_class(pending.message) is MessageClass.ORDERS:
+                    self._fail(pending.message, 'not connected')
+                elif self._not_connected_handler is not None:
+                    self._not_connected_handler(pending.message)
+            case _:
+                self.metrics.errors += 1
+                self._fail(pending.message, 'publication error')
+        return True
+
+    def _enqueue(self, pending: _PendingMessage) -> None:
+        if len(self._buffer) >= self._capacity:
+            self.metrics.dropped += 1
+            self._fail(pending.message, 'send buffer is full')
+            return
+        self._buffer.append(pending)
+        if len(self._buffer) > self.metrics.max_buffer_depth:
+            self.metrics.max_buffer_depth = len(self._buffer)
+
+    def _fail(self, message, reason: str) -> None:
+        logger.error(f'Failed to publish message ({reason}): {message.json()}')
+        if self._failed_handler is not None:
+            self._failed_handler(message, reason)
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from testing_core.communicator.aeron_communicator import AeronCommunicator
+from testing_core.communicator.decoder import MessageDecoder
+from testing_core.config import Configuration
+from testing_core.enums import Action
+from testing_core.formatter.prepared_command import PreparedCommand
+from testing_core.metrics.orderbook_latency import OrderbookLatencyTracer
+from testing_core.models.message import Message
+from testing_core.utils import get_micro_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class BackpressureMetrics(object):
+    """
+    Метрики очереди между потоком опроса подписок и event loop.
+    """
+
+    def __init__(self):
+        # количество сообщений, добавленных в очередь
+        self.enqueued: int = 0
+        # количество сообщений, переданных обработчикам в event loop
+        self.handled: int = 0
+        # количество ордербуков, отброшенных из-за переполнения очереди
+        self.dropped: int = 0
+        # сколько раз поток опроса ждал освобождения места в очереди (для сообщений, которые нельзя отбросить)
+        self.blocked: int = 0
+        # количество пробуждений event loop из потока опроса
+        self.wakeups: int = 0
+        # максимальная длина очереди
+        self.max_queue_depth: int = 0
+
+    def dict(self) -> dict:
+        return dict(self.__dict__)
+
+    def __repr__(self):
+        return f'BackpressureMetrics({", ".join(f"{key}={value}" for key, value in self.__dict__.items())})'
+
+
+class ThreadedAeronCommunicator(AeronCommunicator):
+    """
+    Коммуникатор, в котором подписки Aeron опрашивает и декодирует отдельный поток. Готовые сообщения передаются
+    в event loop через ограниченную очередь (collections.deque, добавление и извлечение атомарны), event loop
+    пробуждается через call_soon_threadsafe. Обработчики сообщений вызываются в event loop в handle_new_messages,
+    поэтому долгие корутины стратегий не мешают вычитывать сообщения из буферов Aeron.
+
+    При переполнении очереди новые ордербуки отбрасываются (состояние будет обновлено следующим ордербуком),
+    а поток опроса ждет освобождения места для остальных сообщений. При конфлюэнции ордербуков (conflate_orderbooks)
+    ордербуки минуют очередь: поток опроса передает строки в OrderbookConflator, а разбираются они в event loop.
+    """
+
+    def __init__(self,
+                 config: Configuration,
+                 orderbook_handler: Callable[[Message], None],
+                 balance_handler: Callable[[Message], None],
+                 core_input_handler: Callable[[Message], None],
+                 decoder: MessageDecoder = None,
+                 publish_failed_handler: Callable[[Message | PreparedCommand, str], None] = None,
+                 orderbook_tracer: OrderbookLatencyTracer = None
+                 ):
+        """
+        Коммуникатор с отдельным потоком опроса подписок.
+
+        :param config: конфигурация гейта;
+        :param orderbook_handler: callback-функция, которая вызывается с сообщением из канала orderbooks;
+        :param balance_handler: callback-функция, которая вызывается с сообщением из канала balances;
+        :param core_input_handler: callback-функция, которая вызывается с сообщением из канала core_input;
+        :param decoder: декодер входящих сообщений. По умолчанию выбирается по config.strict_decoding;
+        :param publish_failed_handler: callback-функция, которая вызывается с сообщением и причиной, если сообщение
+         не удалось отправить;
+        :param orderbook_tracer: трассировка задержек доставки ордербуков. Опционально;
+        """
+        super().__init__(config=config,
+                         orderbook_handler=orderbook_handler,
+                         balance_handler=balance_handler,
+                         core_input_handler=core_input_handler,
+                         decoder=decoder,
+                         publish_failed_handler=publish_failed_handler,
+                         orderbook_tracer=orderbook_tracer)
+        self._queue_size = config.polling_queue_size
+        self._max_spins = config.idle_max_spins
+        self._max_park_period = config.idle_max_park_period
+
+        self._messages: deque[tuple[Callable[[Message], None], Message]] = deque()
+        self.metrics = BackpressureMetrics()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._messages_ready: asyncio.Event | None = None
+        self._wakeup_pending = False
+
+    def start(self) -> None:
+        """
+        Запустить поток опроса подписок. Должен вызываться из работающего event loop
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._messages_ready = asyncio.Event()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name='aeron-polling', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Остановить поток опроса подписок и записать на диск буфер записи трафика
+        """
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        super().stop()
+
+    def publish(self, message: Message | PreparedCommand) -> None:
+        """
+        Отправка сообщения. Буфер отправки используется только из event loop, поэтому сообщения из потока опроса
+        (ошибки разбора входящих сообщений) передаются в event loop.
+        :param message: сообщение, которое нужно отправить
+        """
+        if self._thread is not None and threading.current_thread() is self._thread:
+            self._loop.call_soon_threadsafe(self._send_pipeline.publish, message)
+        else:
+            self._send_pipeline.publish(message)
+
+    @property
+    def queue_depth(self) -> int:
+        """Текущая длина очереди сообщений"""
+        return len(self._messages)
+
+    def handle_new_messages(self) -> int:
+        """
+        Передать обработчикам сообщения, которые поток опроса положил в очередь, и повторить отправку сообщений
+        из буфера отправки.
+        :return: количество обработанных и отправленных из буфера сообщений
+        """
+        work_count = self._send_pipeline.drain()
+        # обрабатываются только сообщения, которые были в очереди на момент вызова
+        count = len(self._messages)
+        for _ in range(count):
+            handler, message = self._messages.popleft()
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f'Failed to handle message. Exception: {e}.\n Faulty message: {message}', exc_info=True)
+                self.publish(self._formatter.format_error(
+                    action=None,
+                    message='Failed to handle command',
+                    event_id=None,
+                    data=message.json()
+                ))
+        self.metrics.handled += count
+        if self._conflator is not None:
+            count += self._handle_conflated_orderbooks()
+        return work_count + count
+
+    async def wait_new_messages(self) -> None:
+        """
+        Дождаться, пока в очереди появятся сообщения. Если в буфере отправки есть сообщения (back pressure),
+        ожидание ограничено max_park_period: поток опроса пробуждает event loop только при входящих сообщениях,
+        а повторная отправка выполняется в handle_new_messages.
+        """
+        self._messages_ready.clear()
+        if self._messages or self._conflator is not None and self._conflator.has_pending:
+            return
+        if not self._send_pipeline.buffer_depth:
+            await self._messages_ready.wait()
+            return
+        try:
+            await asyncio.wait_for(self._messages_ready.wait(), timeout=self._max_park_period)
+        except asyncio.TimeoutError:
+            pass
+
+    def _poll_loop(self) -> None:
+        """Цикл потока опроса: опрос подписок, при отсутствии сообщений - ожидание с нарастанием до max_park_period"""
+        idle_count = 0
+        while not self._stopped.is_set():
+            try:
+                work_count = self._orderbooks.poll() + self._balances.poll() + self._core_input.poll()
+            except Exception as e:
+                logger.error(f'Failed to poll subscriptions. Exception: {e}', exc_info=True)
+                work_count = 0
+            if work_count:
+                idle_count = 0
+                continue
+            idle_count += 1
+            if idle_count <= self._max_spins:
+                time.sleep(0)
+            else:
+                time.sleep(min(self._max_park_period, 0.00001 * 2 ** min(idle_count - self._max_spins, 10)))
+
+    def _orderbooks_channel_handler(self, message_as_str: str):
+        """Сообщение из канала ордербуков (вызывается в потоке опроса, время получения фиксируется здесь)"""
+        received = get_micro_timestamp() if self._orderbook_tracer is not None else None
+        if self._conflator is not None and self._conflator.offer(message_as_str, received):
+            self._wakeup_loop()
+        else:
+            self._handle_message(message_as_str, self._dispatch, received)
+
+    def _dispatch(self, handler: Callable[[Message], None], message: Message) -> None:
+        """
+        Положить разобранное сообщение в очередь для event loop (вызывается в потоке опроса).
+        :param handler: обработчик, выбранный по action;
+        :param message: сообщение;
+        """
+        if len(self._messages) >= self._queue_size:
+            if message.action in (Action.ORDERBOOK_UPDATE, Action.ORDERBOOK_DELTA):
+                self.metrics.dropped += 1
+                return
+            self.metrics.blocked += 1
+            while len(self._messages) >= self._queue_size and not self._stopped.is_set():
+                self._wakeup_loop()
+                time.sleep(self._max_park_period)
+
+        self._messages.append((handler, message))
+        self.metrics.enqueued += 1
+        depth = len(self._messages)
+        if depth > self.metrics.max_queue_depth:
+            self.metrics.max_queue_depth = depth
+        self._wakeup_loop()
+
+    def _wakeup_loop(self) -> None:
+        """Пробудить event loop, если пробуждение еще не запланировано"""
+        if self._wakeup_pending or self._loop is None:
+            return
+        self._wakeup_pending = True
+        self.metrics.wakeups += 1
+        try:
+            self._loop.call_soon_threadsafe(self._on_wakeup)
+        except RuntimeError:
+            # event loop уже закрыт
+            self._wakeup_pending = False
+
+    def _on_wakeup(self) -> None:
+        """Вызывается в event loop после пробуждения из потока опроса"""
+        self._wakeup_pending = False
+        self._messages_ready.set()
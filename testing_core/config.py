@@ -4,11 +4,13 @@ import asyncio
 from pprint import pprint
 from typing import Optional
 
-import requests
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from testing_core import enums
+from testing_core.config_cache import ConfigurationCache, get_cache
 from testing_core.exceptions import InvalidConfigurationSource
+from testing_core.order.limit_validator import LimitValidator
+from testing_core.order.ticks import TickScale, TickLimits
 from testing_core.utils import follow_path
 
 PING_DELAY = 1
@@ -38,6 +40,9 @@ class Market(BaseModel):
     max_amount: float - максимальный объем ордера
     base_asset: str - базовый актив
     quote_asset: str - котируемый актив
+
+    Шкалы тиков цены и объема (price_scale, amount_scale), лимиты в тиках (tick_limits) и проверка ордеров
+    на лимиты (validator) рассчитываются один раз при создании.
     """
     class Limits(BaseModel):
         class MinMax(BaseModel):
@@ -56,6 +61,42 @@ class Market(BaseModel):
     base_asset: str
     quote_asset: str
 
+    _price_scale: TickScale | None = PrivateAttr(None)
+    _amount_scale: TickScale | None = PrivateAttr(None)
+    _tick_limits: TickLimits | None = PrivateAttr(None)
+    _validator: LimitValidator = PrivateAttr()
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        if self.price_increment:
+            self._price_scale = TickScale(self.price_increment)
+        if self.amount_increment:
+            self._amount_scale = TickScale(self.amount_increment)
+        if self._price_scale is not None and self._amount_scale is not None:
+            self._tick_limits = TickLimits(self.limits, price_scale=self._price_scale,
+                                           amount_scale=self._amount_scale)
+        self._validator = LimitValidator(self.limits, tick_limits=self._tick_limits)
+
+    @property
+    def price_scale(self) -> TickScale | None:
+        """Шкала тиков цены (None, если шаг цены не задан)"""
+        return self._price_scale
+
+    @property
+    def amount_scale(self) -> TickScale | None:
+        """Шкала тиков объема (None, если шаг объема не задан)"""
+        return self._amount_scale
+
+    @property
+    def tick_limits(self) -> TickLimits | None:
+        """Лимиты в тиках (None, если не задан шаг цены или объема)"""
+        return self._tick_limits
+
+    @property
+    def validator(self) -> LimitValidator:
+        """Проверка ордеров на лимиты торговой пары"""
+        return self._validator
+
 class Configuration(BaseModel):
 
     # General settings
@@ -70,6 +111,64 @@ class Configuration(BaseModel):
     # Aeron communicator settings
     aeron_channels: CoreAeronChannels
     no_subscriber_log_delay: int
+    # если True, все входящие сообщения валидируются только строгим декодером (полная валидация pydantic)
+    strict_decoding: bool = False
+    # если True, ордербуки хранятся в CompactOrderbook (массивы numpy). Работает только без strict_decoding
+    compact_orderbooks: bool = False
+    # максимальное количество фрагментов, которое читается из одной подписки за один poll
+    fragment_limit: int = 10
+    # если True, подписки опрашиваются и декодируются в отдельном потоке (ThreadedAeronCommunicator)
+    polling_thread: bool = False
+    # максимальная длина очереди сообщений между потоком опроса и event loop
+    polling_queue_size: int = 10000
+    # если True, из ожидающих обработки ордербуков разбирается только последний по каждому символу
+    conflate_orderbooks: bool = False
+    # максимальное количество сообщений в буфере отправки (ожидающих повторной отправки из-за back pressure)
+    publish_buffer_size: int = 1024
+    # файл, в который записываются все полученные и отправленные сообщения (CaptureWriter). Опционально
+    capture_path: str | None = None
+    # файл записи трафика, который воспроизводится вместо подписок Aeron (ReplayCommunicator). Опционально
+    replay_path: str | None = None
+    # скорость воспроизведения относительно записанной (2 - в два раза быстрее). 0 - максимально быстро
+    replay_speed: float = 1.0
+    # если True, команды по ордерам, вызванные за один проход event loop, отправляются пакетом (CommandBatcher)
+    batch_publishing: bool = False
+    # окно накопления команд в микросекундах (0 - до конца текущего прохода event loop)
+    batch_window_us: int = 0
+    # если True, измеряются задержки полного цикла ордеров (Trader.latency, отчет в конце работы стратегии).
+    # По умолчанию выключено, чтобы не замедлять обработку ордеров
+    latency_tracking: bool = False
+    # если True, измеряются задержки доставки ордербуков по этапам (Trader.orderbook_latency)
+    orderbook_latency_tracing: bool = False
+    # файл, в который в конце работы стратегии выгружаются задержки доставки ордербуков (JSON lines). Опционально
+    orderbook_latency_export_path: str | None = None
+    # количество последних трассировок ордербуков, которые выгружаются в файл вместе со статистиками
+    orderbook_latency_traces: int = 0
+    # через сколько секунд завершенные ордера (CLOSED, CANCELED, ERROR) переносятся в архив (перенос выполняется
+    # при обновлении ордеров). None - не переносить (по умолчанию, ордера остаются в Trader.orders)
+    orders_retention_delay: float | None = None
+    # максимальное количество ордеров в архиве завершенных ордеров
+    orders_archive_size: int = 10000
+    # файл, в который дописываются вытесненные из архива ордера (JSON lines). Опционально
+    orders_archive_path: str | None = None
+    # если True, ордера хранят цену и объем также в тиках (price_ticks, amount_ticks): лимиты проверяются
+    # целочисленно, в командах цена и объем сериализуются десятичными строками из тиков
+    integer_ticks: bool = False
+    # если True, Trader.place_orders проверяет ордера на лимиты перед отправкой: ордера, которые не соответствуют
+    # лимитам, не отправляются и переводятся в состояние ERROR
+    pre_publish_validation: bool = False
+
+    # Idle strategy цикла обработки подписок (см. testing_core/trader/idle_strategy.py)
+    idle_strategy: enums.IdleStrategyType = enums.IdleStrategyType.BACKOFF
+    # количество пустых проходов подряд без передачи управления event loop
+    idle_max_spins: int = 10
+    # количество пустых проходов подряд с передачей управления event loop без ожидания
+    idle_max_yields: int = 5
+    # минимальное и максимальное время ожидания (в секундах) при отсутствии сообщений
+    idle_min_park_period: float = 0.0001
+    idle_max_park_period: float = 0.001
+    # количество проходов подряд с сообщениями, после которого управление передается event loop
+    idle_max_busy_polls: int = 10
 
 
 def parse_configuration(configuration: dict) -> Configuration:
@@ -99,7 +198,11 @@ def parse_configuration(configuration: dict) -> Configuration:
 
 def get_configuration_from_api(api_url: str, params: dict = None) -> Configuration:
     """Receive json from api and parse it to Configuration object"""
+    # requests импортируется только при загрузке конфигурации по api (долгий импорт)
+    import requests
+
     response = requests.request(url=api_url, method='GET')
+    response.raise_for_status()
     json_data = response.json()
     configuration = parse_configuration(json_data)
     return configuration
@@ -113,13 +216,44 @@ def get_configuration_from_file(file_path: str) -> Configuration:
     return configuration
 
 
+# конфигурации, полученные от конфигуратора в этом процессе (по url): повторные запуски стратегий не запрашивают
+# и не разбирают конфигурацию заново
+_configurations_memo: dict[str, Configuration] = {}
+
+
+async def get_configuration_from_api_cached(api_url: str, cache: ConfigurationCache = None,
+                                            stale_while_revalidate: bool = False) -> Configuration:
+    """
+    Receive configuration from api without blocking event loop. Configuration is memoized in process and cached
+    on disk (see ConfigurationCache), cache is used if configurator is not available.
+    :param api_url: адрес конфигуратора;
+    :param cache: дисковый кеш. Если None, конфигурация запрашивается без кеширования на диске;
+    :param stale_while_revalidate: вернуть конфигурацию из кеша сразу и проверить ее у конфигуратора в фоне;
+    """
+    if (configuration := _configurations_memo.get(api_url)) is None:
+        if cache is not None:
+            json_data = await cache.fetch(api_url, stale_while_revalidate=stale_while_revalidate)
+            configuration = parse_configuration(json_data)
+        else:
+            configuration = await asyncio.to_thread(get_configuration_from_api, api_url)
+        _configurations_memo[api_url] = configuration
+    # глубокая копия, чтобы изменения полей конфигурации (в том числе markets и лимитов) одним запуском
+    # не влияли на следующие
+    return configuration.copy(deep=True)
+
+
 async def receive_configuration(basic_settings: dict) -> Configuration:
     """Receive full gate configuration from basic settings"""
     match basic_settings.get('type'):
         case 'api':
             if basic_settings.get('path') is None:
                 raise InvalidConfigurationSource
-            config = get_configuration_from_api(api_url=basic_settings['path'])
+            cache = None
+            if basic_settings.get('cache', True):
+                cache = get_cache(cache_dir=basic_settings.get('cache_dir'))
+            config = await get_configuration_from_api_cached(
+                api_url=basic_settings['path'], cache=cache,
+                stale_while_revalidate=basic_settings.get('stale_while_revalidate', False))
         case 'file':
             if basic_settings.get('path') is None:
                 raise InvalidConfigurationSource
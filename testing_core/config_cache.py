@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# максимальное время ожидания ответа конфигуратора в секундах
+REQUEST_TIMEOUT = 10
+
+
+def default_cache_dir() -> str:
+    """Директория кеша конфигураций по умолчанию: $XDG_CACHE_HOME/testing_core/configuration"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'testing_core', 'configuration')
+
+
+class ConfigurationCache(object):
+    """
+    Кеш ответов конфигуратора на диске (файл на каждый url).
+
+    При запросе кешированная конфигурация проверяется у конфигуратора условным запросом (ETag в If-None-Match,
+    Last-Modified в If-Modified-Since): если конфигурация не изменилась, конфигуратор отвечает 304 и используется
+    кеш. Если конфигуратор недоступен, используется кеш (работа без сети).
+    В режиме stale_while_revalidate кеш возвращается сразу, а проверка выполняется в фоне и обновляет кеш
+    для следующего запуска.
+
+    HTTP-запросы выполняются в отдельном потоке и не блокируют event loop.
+    """
+
+    def __init__(self, cache_dir: str = None, timeout: float = REQUEST_TIMEOUT):
+        """
+        :param cache_dir: директория кеша (по умолчанию default_cache_dir());
+        :param timeout: максимальное время ожидания ответа конфигуратора в секундах;
+        """
+        self._cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+        self._timeout = timeout
+        # фоновые проверки кеша (ссылки хранятся, чтобы задачи не были удалены сборщиком мусора)
+        self._revalidations: set[asyncio.Task] = set()
+
+    async def fetch(self, url: str, stale_while_revalidate: bool = False) -> dict:
+        """
+        Получить конфигурацию (json конфигуратора).
+        :param url: адрес конфигуратора;
+        :param stale_while_revalidate: если True и конфигурация есть в кеше, вернуть ее сразу и проверить в фоне;
+        :return: dict - ответ конфигуратора
+        """
+        entry = self._read_entry(url)
+        if entry is not None and stale_while_revalidate:
+            task = asyncio.create_task(self._revalidate(url, entry))
+            self._revalidations.add(task)
+            task.add_done_callback(self._revalidations.discard)
+            return entry['body']
+        try:
+            return await self._revalidate(url, entry, raise_errors=True)
+        except Exception as exception:
+            if entry is None:
+                raise
+            logger.warning(f'Configurator {url} is not available, using cached configuration '
+                           f'from {time.ctime(entry["fetched_at"])}. Exception: {exception}')
+            return entry['body']
+
+    async def wait_revalidation(self) -> None:
+        """Дождаться завершения фоновых проверок кеша"""
+        if self._revalidations:
+            await asyncio.gather(*self._revalidations, return_exceptions=True)
+
+    async def _revalidate(self, url: str, entry: dict | None, raise_errors: bool = False) -> dict | None:
+        """
+        Запросить конфигурацию (условным запросом, если она есть в кеше) и обновить кеш.
+        :return: dict - актуальная конфигурация
+        """
+        try:
+            status, body, headers = await asyncio.to_thread(self._request, url, entry)
+        except Exception as exception:
+            if raise_errors:
+                raise
+            logger.warning(f'Failed to revalidate cached configuration {url}. Exception: {exception}')
+            return None
+        if status == 304 and entry is not None:
+            entry['fetched_at'] = time.time()
+        else:
+            entry = {
+                'url': url,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'fetched_at': time.time(),
+                'body': body,
+            }
+        self._write_entry(url, entry)
+        return entry['body']
+
+    def _request(self, url: str, entry: dict | None) -> tuple[int, dict | None, dict]:
+        """
+        HTTP-запрос к конфигуратору (выполняется в отдельном потоке).
+        :return: статус, json ответа (None для 304) и заголовки
+        """
+        # requests импортируется только при загрузке конфигурации по api (долгий импорт)
+        import requests
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        response = requests.request(url=url, method='GET', headers=headers, timeout=self._timeout)
+        if response.status_code == 304:
+            return 304, None, dict(response.headers)
+        response.raise_for_status()
+        return response.status_code, response.json(), dict(response.headers)
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self._cache_dir, f'{hashlib.sha256(url.encode()).hexdigest()}.json')
+
+    def _read_entry(self, url: str) -> dict | None:
+        """Запись кеша для url или None, если ее нет или она повреждена"""
+        try:
+            with open(self._entry_path(url)) as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exception:
+            logger.warning(f'Failed to read cached configuration {url}. Exception: {exception}')
+            return None
+        if entry.get('url') != url or 'body' not in entry:
+            return None
+        return entry
+
+    def _write_entry(self, url: str, entry: dict) -> None:
+        """Атомарно записать запись кеша (через временный файл)"""
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as file:
+                json.dump(entry, file)
+            os.replace(temp_path, self._entry_path(url))
+        except OSError as exception:
+            logger.warning(f'Failed to cache configuration {url}. Exception: {exception}')
+
+
+# кеши конфигураций процесса по директориям: фоновые проверки кеша (stale_while_revalidate) ожидаются
+# в конце сессии (wait_revalidations), а не теряются вместе с временным объектом кеша
+_caches: dict[str | None, ConfigurationCache] = {}
+
+
+def get_cache(cache_dir: str = None) -> ConfigurationCache:
+    """
+    Кеш конфигураций процесса для директории (один объект на директорию).
+    :param cache_dir: директория кеша (по умолчанию default_cache_dir());
+    :return: ConfigurationCache
+    """
+    if (cache := _caches.get(cache_dir)) is None:
+        cache = _caches[cache_dir] = ConfigurationCache(cache_dir=cache_dir)
+    return cache
+
+
+async def wait_revalidations() -> None:
+    """Дождаться завершения фоновых проверок всех кешей конфигураций процесса"""
+    for cache in list(_caches.values()):
+        await cache.wait_revalidation()
@@ -1,31 +1,27 @@
 import asyncio
+import contextlib
 import logging
 import os
-import subprocess
 from typing import Type
 
 import pydantic
 import tomli as tomli
 
-from testing_core.config import receive_configuration
+from testing_core.communicator.media_driver import is_media_driver_running
+from testing_core.config import Configuration, receive_configuration
+from testing_core.config_cache import wait_revalidations
 from testing_core.strategy.base_strategy import Strategy
+from testing_core.strategy.scheduler import StrategyScheduler
 from testing_core.trader.trader import Trader
 
-# проверяю запущен ли aeron media driver
-if subprocess.run('ps -A | grep aeron', shell=True, stdout=None).returncode != 0 and \
-        subprocess.run('systemctl is-active --quiet aeron', shell=True, stdout=None).returncode != 0:
-    print('Critical: Aeron service is not launched. Please launch Aeron before launching application.')
-    exit(1)
-
 # путь до начальной конфигурации (в ней указан способ получения полной конфигурации)
 BASIC_SETTINGS_PATH = 'settings.toml'
 
 logger = logging.getLogger(__name__)
 
 
-async def run_core(strategy_type: Type[Strategy]):
-    """Запуск гейта. Функция загружает конфигурацию и запускает гейт"""
-    # Загрузка начальной конфигурации (в ней указан способ получения полной конфигурации)
+def load_basic_settings() -> dict:
+    """Загрузка начальной конфигурации (в ней указан способ получения полной конфигурации)"""
     if not os.path.isfile(BASIC_SETTINGS_PATH):
         logger.critical(f'Could not find file with basic settings.'
                         f' Specified file path: "{BASIC_SETTINGS_PATH}".'
@@ -34,27 +30,81 @@ async def run_core(strategy_type: Type[Strategy]):
     with open(BASIC_SETTINGS_PATH, "rb") as f:
         basic_settings = tomli.load(f)
     logger.info('Loaded basic settings for gate.')
+    return basic_settings
 
-    # получение полной конфигурации и создание объекта гейта
-    try:
-        config = await receive_configuration(basic_settings=basic_settings['configuration'])
-        trader = Trader(config=config)
-        strategy = strategy_type(trader=trader, markets=config.markets, assets=config.assets)
-        loop = asyncio.get_event_loop()
-
-        logger.info(f'Start strategy "{strategy.name}": {strategy.__doc__}')
 
-        trader_executing = loop.create_task(trader.get_loop())
-        strategy_executing = loop.create_task(strategy.execute(
+async def run_strategy(trader: Trader, config: Configuration, strategy_type: Type[Strategy]) -> None:
+    """
+    Запустить стратегию на работающем Trader и дождаться ее завершения. После завершения состояние Trader
+    сбрасывается для следующей стратегии сессии (ордербуки и балансы сохраняются).
+    """
+    strategy = strategy_type(trader=trader, markets=config.markets, assets=config.assets)
+    logger.info(f'Start strategy "{strategy.name}": {strategy.__doc__}')
+    try:
+        await strategy.execute(
             trader=trader,
             orderbooks=trader.orderbooks,
             balances=trader.balances
-        ))
+        )
+    finally:
+        _finish_strategies(trader)
+
+
+def _finish_strategies(trader: Trader) -> None:
+    """
+    Вывести отчет о задержках (если их измерение включено) и сбросить состояние Trader после завершения стратегий.
+    :param trader: Trader;
+    """
+    if trader.latency is not None or trader.orderbook_latency is not None:
+        logger.info(trader.latency_report())
+    trader.reset_session()
 
-        await strategy_executing
 
+async def run_session(*strategy_types: Type[Strategy], parallel: bool = False):
+    """
+    Запуск гейта и стратегий по очереди в одной сессии. Конфигурация загружается, а Trader (подключение к гейту,
+    ордербуки и балансы) создается один раз, поэтому следующие стратегии запускаются без переподключения
+    и ожидания ордербуков и балансов.
+    Если parallel=True, независимые по ресурсам стратегии запускаются одновременно (StrategyScheduler).
+    """
+    basic_settings = load_basic_settings()
+
+    # получение полной конфигурации и создание объекта гейта
+    try:
+        config = await receive_configuration(basic_settings=basic_settings['configuration'])
+        # media driver нужен только для работы с Aeron (при воспроизведении записи трафика не нужен)
+        if not config.replay_path and not is_media_driver_running():
+            logger.critical('Aeron service is not launched. Please launch Aeron before launching application.')
+            exit(1)
+        trader = Trader(config=config)
     except pydantic.error_wrappers.ValidationError as exception:
         logger.critical(f'Invalid of missed field in configuration: {exception}. '
                         f'Please, make sure that specified fields are in configuration '
                         f'and they are correct.')
         exit(1)
+
+    trader_executing = asyncio.create_task(trader.get_loop())
+    try:
+        if parallel:
+            try:
+                await StrategyScheduler(trader=trader, config=config).run(*strategy_types)
+            finally:
+                _finish_strategies(trader)
+        else:
+            for strategy_type in strategy_types:
+                await run_strategy(trader=trader, config=config, strategy_type=strategy_type)
+    finally:
+        # остановка цикла обработки подписок (коммуникатор останавливается в нем)
+        trader_executing.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await trader_executing
+        # фоновая проверка конфигурации у конфигуратора (stale_while_revalidate) обновляет кеш для следующего
+        # запуска, поэтому она должна завершиться до закрытия event loop
+        await wait_revalidations()
+        if trader.orderbook_latency is not None and config.orderbook_latency_export_path:
+            trader.orderbook_latency.export_jsonl(config.orderbook_latency_export_path)
+
+
+async def run_core(strategy_type: Type[Strategy]):
+    """Запуск гейта. Функция загружает конфигурацию и запускает гейт"""
+    await run_session(strategy_type)
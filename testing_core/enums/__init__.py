@@ -50,6 +50,8 @@ class Node(Enum):
 
 class Action(Enum):
     ORDERBOOK_UPDATE = 'order_book_update'
+    ORDERBOOK_DELTA = 'order_book_delta'
+    GET_ORDERBOOK = 'get_orderbook'
     CREATE_ORDERS = 'create_orders'
     CANCEL_ORDERS = 'cancel_orders'
     CANCEL_ALL_ORDERS = 'cancel_all_orders'
@@ -63,6 +65,45 @@ class Action(Enum):
         return self.value
 
 
+class IdleStrategyType(Enum):
+    BUSY_SPIN = 'busy_spin'
+    YIELD = 'yield'
+    BACKOFF = 'backoff'
+
+    def __repr__(self):
+        return self.value
+
+
+class PublishStatus(Enum):
+    SENT = 'sent'
+    BACK_PRESSURED = 'back_pressured'
+    NOT_CONNECTED = 'not_connected'
+    ERROR = 'error'
+
+    def __repr__(self):
+        return self.value
+
+
+class MessageClass(Enum):
+    ORDERS = 'orders'
+    REQUESTS = 'requests'
+    LOGS = 'logs'
+
+    def __repr__(self):
+        return self.value
+
+
+class CaptureChannel(Enum):
+    ORDERBOOKS = 'orderbooks'
+    BALANCES = 'balances'
+    CORE_INPUT = 'core_input'
+    GATE_INPUT = 'gate_input'
+    LOGS = 'logs'
+
+    def __repr__(self):
+        return self.value
+
+
 class OrderState(Enum):
     UNPLACED = 'unplaced'
     PLACING = 'placing'
@@ -74,3 +115,25 @@ class OrderState(Enum):
 
     def __repr__(self):
         return self.value
+
+
+class LimitViolationReason(Enum):
+    INVALID_VALUE = 'invalid_value'
+    UNKNOWN_SYMBOL = 'unknown_symbol'
+    AMOUNT_TOO_LOW = 'amount_too_low'
+    AMOUNT_TOO_HIGH = 'amount_too_high'
+    PRICE_TOO_LOW = 'price_too_low'
+    PRICE_TOO_HIGH = 'price_too_high'
+    COST_TOO_LOW = 'cost_too_low'
+    COST_TOO_HIGH = 'cost_too_high'
+
+    def __repr__(self):
+        return self.value
+
+
+class ViolationPolicy(Enum):
+    REJECT = 'reject'
+    CLIP = 'clip'
+
+    def __repr__(self):
+        return self.value
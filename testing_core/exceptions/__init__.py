@@ -11,4 +11,11 @@ class InsufficientBalance(Exception):
 
 
 class LimitViolation(Exception):
-    ...
\ No newline at end of file
+    """Ордер не соответствует лимитам торговой пары (reason - причина, LimitViolationReason)"""
+    def __init__(self, reason=None):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CaptureFormatError(Exception):
+    ...
@@ -1,6 +1,8 @@
 from typing import Any
 
 from testing_core import enums
+from testing_core.config import Market
+from testing_core.formatter.prepared_command import CommandTemplate, PreparedCommand, encode_str, encode_float
 from testing_core.models.message import Message, GateOrderToCreate, GateOrderId, GateOrderInfo
 from testing_core.order.order import OrderData
 from testing_core.utils import get_uuid, get_micro_timestamp
@@ -19,7 +21,9 @@ class Formatter(object):
                  exchange: str,
                  instance: str,
                  algo: str,
-                 node: str = 'core'
+                 node: str = 'core',
+                 prepared_commands: bool = True,
+                 markets: dict[str, Market] = None
                  ):
         """
         Создать форматтер, инициализация основных полей;
@@ -27,11 +31,21 @@ class Formatter(object):
         :param instance: название инстанса торгового сервера;
         :param algo: название алгоритма торгового сервера;
         :param node: название узла торговой системы (по умолчанию 'core')
+        :param prepared_commands: если True, команды по ордерам, балансам и ордербукам сериализуются по шаблону
+         (PreparedCommand), без создания Message;
+        :param markets: торговые пары. Если переданы, цена и объем ордеров с тиками (price_ticks, amount_ticks)
+         сериализуются десятичными строками из тиков (только для prepared_commands);
         """
         self._exchange = exchange
         self._instance = instance
         self._algo = algo
         self._node = node
+        self._markets = markets
+        # шаблон с заранее отрендеренной постоянной частью команд
+        self._template: CommandTemplate | None = None
+        if prepared_commands:
+            self._template = CommandTemplate(exchange=exchange, instance=instance, algo=algo,
+                                             node=enums.Node(node).value)
 
     def format_command(self, action: enums.Action, data: Any, message: str = None) -> Message:
         """
@@ -73,12 +87,62 @@ class Formatter(object):
         )
         return message
 
-    def format_create_orders(self, orders: tuple[OrderData]) -> Message:
+    def _prepare_command(self, action: enums.Action, data_json: str) -> PreparedCommand:
+        """
+        Форматировать команду по шаблону, data уже сериализована в json
+        """
+        return self._template.render(
+            event_id=get_uuid(),
+            action=action,
+            timestamp=get_micro_timestamp(),
+            data_json=data_json
+        )
+
+    @staticmethod
+    def _order_ids_json(orders: tuple[OrderData]) -> str:
+        """
+        Сериализовать идентификаторы ордеров в json (так же, как list[GateOrderId])
+        """
+        return '[' + ', '.join(
+            f'{{"client_order_id": {encode_str(order.core_order_id)}, "symbol": {encode_str(order.symbol)}}}'
+            for order in orders
+        ) + ']'
+
+    @staticmethod
+    def _strings_json(values: list[str]) -> str:
+        """
+        Сериализовать список строк в json
+        """
+        return '[' + ', '.join(encode_str(value) for value in values) + ']'
+
+    def _encode_amount_price(self, order: OrderData) -> tuple[str, str]:
+        """
+        Сериализовать объем и цену ордера в json: из тиков, если они есть и известна торговая пара, иначе из float
+        """
+        amount = price = None
+        if self._markets is not None and (market := self._markets.get(order.symbol)) is not None:
+            if order.amount_ticks is not None and market.amount_scale is not None:
+                amount = market.amount_scale.format(order.amount_ticks)
+            if order.price_ticks is not None and market.price_scale is not None:
+                price = market.price_scale.format(order.price_ticks)
+        return amount or encode_float(order.amount), price or encode_float(order.price)
+
+    def _order_to_create_json(self, order: OrderData) -> str:
+        amount, price = self._encode_amount_price(order)
+        return (f'{{"client_order_id": {encode_str(order.core_order_id)}, "symbol": {encode_str(order.symbol)}, '
+                f'"type": "{enums.OrderType(order.type).value}", "side": "{enums.OrderSide(order.side).value}", '
+                f'"amount": {amount}, "price": {price}}}')
+
+    def format_create_orders(self, orders: tuple[OrderData]) -> Message | PreparedCommand:
         """
         Форматировать команду для создания ордеров;
         :param orders: список ордеров;
         :return: Message готовое сообщение, которое можно отправить гейту;
         """
+        if self._template is not None:
+            return self._prepare_command(enums.Action.CREATE_ORDERS, '[' + ', '.join(
+                self._order_to_create_json(order) for order in orders
+            ) + ']')
         formatted_orders: list[GateOrderToCreate] = []
         for order in orders:
             formatted_orders.append(GateOrderToCreate(
@@ -113,6 +177,8 @@ class Formatter(object):
         :param orders: список ордеров;
         :return: Message готовое сообщение, которое можно отправить гейту;
         """
+        if self._template is not None:
+            return self._prepare_command(enums.Action.CANCEL_ORDERS, self._order_ids_json(orders))
         order_ids = self.format_order_ids(orders=orders)
         command = self.format_command(action=enums.Action.CANCEL_ORDERS, data=order_ids)
         return command
@@ -122,6 +188,8 @@ class Formatter(object):
         Форматировать команду для отмены всех открытых ордеров;
         :return: Message готовое сообщение, которое можно отправить гейту;
         """
+        if self._template is not None:
+            return self._prepare_command(enums.Action.CANCEL_ALL_ORDERS, 'null')
         command = self.format_command(
             action=enums.Action.CANCEL_ALL_ORDERS,
             data=None
@@ -134,6 +202,8 @@ class Formatter(object):
         :param orders: список ордеров;
         :return: Message готовое сообщение, которое можно отправить гейту;
         """
+        if self._template is not None:
+            return self._prepare_command(enums.Action.GET_ORDERS, self._order_ids_json(orders))
         order_ids = self.format_order_ids(orders=orders)
         command = self.format_command(action=enums.Action.GET_ORDERS, data=order_ids)
         return command
@@ -144,9 +214,22 @@ class Formatter(object):
         :param assets: список ассетов;
         :return: Message готовое сообщение, которое можно отправить гейту;
         """
+        if self._template is not None:
+            return self._prepare_command(enums.Action.GET_BALANCE, self._strings_json(assets))
         command = self.format_command(action=enums.Action.GET_BALANCE, data=assets)
         return command
 
+    def format_get_orderbook(self, symbols: list[str]):
+        """
+        Форматировать команду для запроса снапшота ордербуков;
+        :param symbols: список символов торговых пар;
+        :return: Message готовое сообщение, которое можно отправить гейту;
+        """
+        if self._template is not None:
+            return self._prepare_command(enums.Action.GET_ORDERBOOK, self._strings_json(symbols))
+        command = self.format_command(action=enums.Action.GET_ORDERBOOK, data=symbols)
+        return command
+
     @staticmethod
     def format_order_state(gate_order: GateOrderInfo) -> enums.OrderState:
         """
@@ -183,7 +266,8 @@ class Formatter(object):
                 amount=order.amount,
                 price=order.price,
                 filled=order.filled if not is_error else 0.0,
-                state=self.format_order_state(order) if not is_error else enums.OrderState.ERROR
+                state=self.format_order_state(order) if not is_error else enums.OrderState.ERROR,
+                exchange_order_id=order.id or None
             ))
         return formatted_orders
 
@@ -0,0 +1,102 @@
+import math
+from json import dumps
+from json.encoder import encode_basestring_ascii
+
+from testing_core import enums
+from testing_core.models.message import Message
+
+
+def encode_str(value: str) -> str:
+    """Строка в json (так же, как ее кодирует Message.json())"""
+    return encode_basestring_ascii(value)
+
+
+def encode_float(value: float) -> str:
+    """Число с плавающей точкой в json (так же, как его кодирует Message.json())"""
+    value = float(value)
+    if math.isfinite(value):
+        return float.__repr__(value)
+    return dumps(value)
+
+
+class PreparedCommand(object):
+    """
+    Команда, которая уже сериализована в json. Создается Formatter без создания модели pydantic:
+    постоянная часть сообщения (exchange, instance, event, node, algo) заранее отрендерена в шаблон,
+    при создании команды в него подставляются только event_id, action, timestamp и data.
+
+    Для отправки используется так же, как Message: event, action и json(). Поля data и message доступны
+    через модель Message, которая создается из json при первом обращении (для логов и тестов).
+    """
+    __slots__ = ('event_id', 'action', 'timestamp', '_json', '_message')
+
+    event = enums.Event.COMMAND
+
+    def __init__(self, event_id: str, action: enums.Action, timestamp: int, message_json: str):
+        self.event_id = event_id
+        self.action = action
+        self.timestamp = timestamp
+        self._json = message_json
+        self._message: Message | None = None
+
+    def json(self) -> str:
+        """Команда в формате json (совпадает с Message.json() для тех же полей)"""
+        return self._json
+
+    def to_message(self) -> Message:
+        """Команда в виде Message"""
+        if self._message is None:
+            self._message = Message.parse_raw(self._json)
+        return self._message
+
+    @property
+    def data(self):
+        return self.to_message().data
+
+    def __eq__(self, other):
+        if isinstance(other, PreparedCommand):
+            return self._json == other._json
+        if isinstance(other, Message):
+            return self.to_message() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f'PreparedCommand({self._json})'
+
+
+class CommandTemplate(object):
+    """
+    Шаблон команды с заранее отрендеренной постоянной частью сообщения.
+    Порядок полей совпадает с порядком полей Message.
+    """
+
+    def __init__(self, exchange: str, instance: str, algo: str, node: str):
+        """
+        :param exchange: название биржи;
+        :param instance: название инстанса торгового сервера;
+        :param algo: название алгоритма торгового сервера;
+        :param node: название узла торговой системы;
+        """
+        envelope = f'", "exchange": {encode_str(exchange)}, "instance": {encode_str(instance)}, ' \
+                   f'"event": "{enums.Event.COMMAND.value}", "node": {encode_str(node)}, "action": '
+        # часть сообщения от event_id до timestamp для каждого action (поле message - null)
+        self._heads: dict[enums.Action, str] = {
+            action: f'{envelope}{encode_str(action.value)}, "message": null, "algo": {encode_str(algo)}, "timestamp": '
+            for action in enums.Action
+        }
+
+    def render(self, event_id: str, action: enums.Action, timestamp: int, data_json: str) -> PreparedCommand:
+        """
+        Создать команду.
+        :param event_id: идентификатор сообщения (uuid);
+        :param action: action команды;
+        :param timestamp: timestamp в микросекундах;
+        :param data_json: поле data, уже сериализованное в json;
+        :return: PreparedCommand
+        """
+        return PreparedCommand(
+            event_id=event_id,
+            action=action,
+            timestamp=timestamp,
+            message_json=f'{{"event_id": "{event_id}{self._heads[action]}{timestamp}, "data": {data_json}}}'
+        )
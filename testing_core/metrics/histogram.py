@@ -0,0 +1,196 @@
+from typing import Iterable
+
+# количество бит под дробную часть значения: в каждом интервале [2^n, 2^(n+1)) 64 корзины,
+# относительная погрешность значения не больше 1/64
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+
+def _bucket_index(value: int) -> int:
+    """Номер корзины для значения"""
+    if value < 1 << SUB_BUCKET_BITS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+
+def _bucket_highest_value(index: int) -> int:
+    """Наибольшее значение, которое попадает в корзину"""
+    if index < 1 << SUB_BUCKET_BITS:
+        return index
+    shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+    mantissa = index - (shift << (SUB_BUCKET_BITS - 1))
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram(object):
+    """
+    Гистограмма задержек в стиле HdrHistogram: логарифмические интервалы, каждый разбит на 64 линейные корзины.
+    Память ограничена (количество корзин зависит только от max_value), запись значения - O(1) без выделения памяти.
+    Значения - целые микросекунды. Значения больше max_value записываются в последнюю корзину.
+    """
+
+    def __init__(self, max_value: int = 3_600_000_000):
+        """
+        :param max_value: максимальное различимое значение (по умолчанию 1 час в микросекундах);
+        """
+        self._max_value = max_value
+        self._counts: list[int] = [0] * (_bucket_index(max_value) + 1)
+        self.count: int = 0
+        self.total: int = 0
+        self.min: int | None = None
+        self.max: int | None = None
+
+    def record(self, value: int) -> None:
+        """
+        Записать значение.
+        :param value: задержка в микросекундах;
+        """
+        if value < 0:
+            value = 0
+        self._counts[_bucket_index(min(value, self._max_value))] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """
+        Добавить значения другой гистограммы (с тем же max_value).
+        :param other: гистограмма;
+        """
+        for index, count in enumerate(other._counts):
+            if count:
+                self._counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, percentile: float) -> int | None:
+        """
+        Значение перцентиля (с точностью до корзины, как в HdrHistogram - наибольшее значение корзины).
+        :param percentile: перцентиль от 0 до 100;
+        :return: значение в микросекундах. None, если значений нет
+        """
+        if not self.count:
+            return None
+        threshold = max(1, round(self.count * percentile / 100))
+        accumulated = 0
+        for index, count in enumerate(self._counts):
+            accumulated += count
+            if accumulated >= threshold:
+                return min(_bucket_highest_value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float | None:
+        """Среднее значение"""
+        return self.total / self.count if self.count else None
+
+    def summary(self) -> dict:
+        """Основные статистики: количество, min, перцентили, max, среднее"""
+        return {
+            'count': self.count,
+            'min': self.min,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p99.9': self.percentile(99.9),
+            'max': self.max,
+            'mean': round(self.mean) if self.count else None,
+        }
+
+    def reset(self) -> None:
+        """Удалить все значения"""
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+
+class LatencyHistograms(object):
+    """
+    Набор гистограмм задержек по интервалам (stage) и символам.
+    """
+
+    def __init__(self, max_value: int = 3_600_000_000):
+        """
+        :param max_value: максимальное различимое значение гистограмм в микросекундах;
+        """
+        self._max_value = max_value
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, name: str, symbol: str, value: int) -> None:
+        """
+        Записать задержку.
+        :param name: название интервала;
+        :param symbol: символ;
+        :param value: задержка в микросекундах;
+        """
+        histogram = self._histograms.get((name, symbol))
+        if histogram is None:
+            histogram = self._histograms[(name, symbol)] = LatencyHistogram(self._max_value)
+        histogram.record(value)
+
+    def histogram(self, name: str, symbol: str = None) -> LatencyHistogram:
+        """
+        Гистограмма задержек интервала.
+        :param name: название интервала;
+        :param symbol: символ. По умолчанию - по всем символам;
+        :return: LatencyHistogram
+        """
+        if symbol is not None:
+            return self._histograms.get((name, symbol)) or LatencyHistogram(self._max_value)
+        merged = LatencyHistogram(self._max_value)
+        for (histogram_name, _), histogram in list(self._histograms.items()):
+            if histogram_name == name:
+                merged.merge(histogram)
+        return merged
+
+    def summary(self, names: Iterable[str]) -> dict[str, dict[str, dict]]:
+        """
+        Статистики задержек (в микросекундах) по интервалам: по всем символам ('all') и по каждому символу.
+        :param names: названия интервалов в порядке вывода;
+        :return: dict[interval, dict[symbol, summary]]
+        """
+        keys = list(self._histograms)
+        result = {}
+        for name in names:
+            symbols = sorted(symbol for histogram_name, symbol in keys if histogram_name == name)
+            if not symbols:
+                continue
+            result[name] = {'all': self.histogram(name).summary()}
+            for symbol in symbols:
+                result[name][symbol] = self._histograms[(name, symbol)].summary()
+        return result
+
+    def report(self, title: str, names: Iterable[str]) -> str:
+        """
+        Отчет о задержках в виде таблицы (значения в микросекундах).
+        :param title: заголовок отчета;
+        :param names: названия интервалов в порядке вывода;
+        :return: str
+        """
+        columns = ('count', 'min', 'p50', 'p90', 'p99', 'p99.9', 'max', 'mean')
+        rows = [('interval', 'symbol') + columns]
+        for name, symbols in self.summary(names).items():
+            for symbol, summary in symbols.items():
+                rows.append((name, symbol) + tuple('-' if summary[column] is None else str(summary[column])
+                                                   for column in columns))
+        if len(rows) == 1:
+            return f'{title}: no data'
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [f'{title}:']
+        for row in rows:
+            lines.append('  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+        return '\n'.join(lines)
+
+    def reset(self) -> None:
+        """Удалить все гистограммы"""
+        self._histograms.clear()
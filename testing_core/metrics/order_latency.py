@@ -0,0 +1,135 @@
+import time
+
+from testing_core import enums
+from testing_core.enums import OrderState
+from testing_core.metrics.histogram import LatencyHistogram, LatencyHistograms
+from testing_core.order.order import OrderData
+
+# названия измеряемых интервалов
+PLACE_TO_PUBLISH = 'place->publish'
+PLACE_TO_OPEN = 'place->open'
+PLACE_TO_CLOSED = 'place->closed'
+PLACE_TO_ERROR = 'place->error'
+CANCEL_TO_CANCELED = 'cancel->canceled'
+
+LATENCY_NAMES = (PLACE_TO_PUBLISH, PLACE_TO_OPEN, PLACE_TO_CLOSED, PLACE_TO_ERROR, CANCEL_TO_CANCELED)
+
+# состояния, после которых ордер больше не отслеживается
+_TERMINAL_STATES = (OrderState.CLOSED, OrderState.CANCELED, OrderState.ERROR)
+
+
+def _now() -> int:
+    """Монотонное время в микросекундах"""
+    return time.monotonic_ns() // 1000
+
+
+class _OrderTimestamps(object):
+    """Время событий одного ордера (монотонное время в микросекундах)"""
+    __slots__ = ('symbol', 'place', 'publish', 'cancel', 'is_opened')
+
+    def __init__(self, symbol: str, place: int):
+        self.symbol = symbol
+        self.place = place
+        self.publish: int | None = None
+        self.cancel: int | None = None
+        self.is_opened = False
+
+
+class OrderLatencyTracker(object):
+    """
+    Задержки полного цикла ордера: от размещения (place) до отправки команды, до открытия ордера, до закрытия,
+    и от отмены (cancel) до подтверждения отмены. Задержки записываются в гистограммы по интервалам и символам.
+
+    Память ограничена: хранится не больше max_tracked_orders незавершенных ордеров (самые старые вытесняются),
+    гистограммы имеют фиксированный размер.
+    """
+
+    def __init__(self, max_tracked_orders: int = 100_000):
+        """
+        :param max_tracked_orders: максимальное количество отслеживаемых незавершенных ордеров;
+        """
+        self._max_tracked_orders = max_tracked_orders
+        self._orders: dict[str, _OrderTimestamps] = {}
+        self._histograms = LatencyHistograms()
+
+    def on_place(self, *orders: OrderData) -> None:
+        """
+        Ордера размещаются (Trader.place_orders).
+        :param orders: ордера;
+        """
+        now = _now()
+        for order in orders:
+            if len(self._orders) >= self._max_tracked_orders:
+                del self._orders[next(iter(self._orders))]
+            self._orders[order.core_order_id] = _OrderTimestamps(order.symbol, now)
+
+    def on_publish(self, action: enums.Action, orders: tuple[OrderData]) -> None:
+        """
+        Команда по ордерам передана коммуникатору.
+        :param action: action команды;
+        :param orders: ордера команды;
+        """
+        now = _now()
+        for order in orders:
+            if (timestamps := self._orders.get(order.core_order_id)) is None:
+                continue
+            if action == enums.Action.CREATE_ORDERS and timestamps.publish is None:
+                timestamps.publish = now
+                self._record(PLACE_TO_PUBLISH, timestamps.symbol, now - timestamps.place)
+            elif action == enums.Action.CANCEL_ORDERS:
+                timestamps.cancel = now
+
+    def on_state_changed(self, order: OrderData, previous_state: OrderState) -> None:
+        """
+        Состояние ордера изменилось (OrdersState).
+        :param order: ордер с новым состоянием;
+        :param previous_state: предыдущее состояние;
+        """
+        state = order.state
+        if state == previous_state or (timestamps := self._orders.get(order.core_order_id)) is None:
+            return
+        now = _now()
+        match state:
+            case OrderState.OPEN | OrderState.FILLED:
+                if not timestamps.is_opened:
+                    timestamps.is_opened = True
+                    self._record(PLACE_TO_OPEN, timestamps.symbol, now - timestamps.place)
+            case OrderState.CLOSED:
+                self._record(PLACE_TO_CLOSED, timestamps.symbol, now - timestamps.place)
+            case OrderState.CANCELED:
+                if timestamps.cancel is not None:
+                    self._record(CANCEL_TO_CANCELED, timestamps.symbol, now - timestamps.cancel)
+            case OrderState.ERROR:
+                self._record(PLACE_TO_ERROR, timestamps.symbol, now - timestamps.place)
+        if state in _TERMINAL_STATES:
+            del self._orders[order.core_order_id]
+
+    def _record(self, name: str, symbol: str, value: int) -> None:
+        self._histograms.record(name, symbol, value)
+
+    def histogram(self, name: str, symbol: str = None) -> LatencyHistogram:
+        """
+        Гистограмма задержек интервала.
+        :param name: название интервала (например, PLACE_TO_OPEN);
+        :param symbol: символ. По умолчанию - по всем символам;
+        :return: LatencyHistogram
+        """
+        return self._histograms.histogram(name, symbol)
+
+    def summary(self) -> dict[str, dict[str, dict]]:
+        """
+        Статистики задержек (в микросекундах) по интервалам: по всем символам ('all') и по каждому символу.
+        :return: dict[interval, dict[symbol, summary]]
+        """
+        return self._histograms.summary(LATENCY_NAMES)
+
+    def report(self) -> str:
+        """
+        Отчет о задержках в виде таблицы (значения в микросекундах).
+        """
+        return self._histograms.report('Order latency (us)', LATENCY_NAMES)
+
+    def reset(self) -> None:
+        """Удалить все записанные задержки и отслеживаемые ордера"""
+        self._orders.clear()
+        self._histograms.reset()
@@ -0,0 +1,165 @@
+import json
+import threading
+from collections import deque
+from typing import Iterator
+
+from testing_core.metrics.histogram import LatencyHistogram, LatencyHistograms
+from testing_core.models.compact_orderbook import CompactOrderbook
+from testing_core.models.message import Message
+from testing_core.models.orderbook import Orderbook, OrderbookDelta
+from testing_core.utils import get_micro_timestamp
+
+# названия этапов доставки ордербука
+EXCHANGE_TO_GATE = 'exchange->gate'
+GATE_TO_FRAGMENT = 'gate->fragment'
+FRAGMENT_TO_DECODED = 'fragment->decoded'
+DECODED_TO_VISIBLE = 'decoded->visible'
+FRAGMENT_TO_VISIBLE = 'fragment->visible'
+EXCHANGE_TO_VISIBLE = 'exchange->visible'
+
+STAGE_NAMES = (EXCHANGE_TO_GATE, GATE_TO_FRAGMENT, FRAGMENT_TO_DECODED, DECODED_TO_VISIBLE, FRAGMENT_TO_VISIBLE,
+               EXCHANGE_TO_VISIBLE)
+
+
+class OrderbookTrace(object):
+    """
+    Время этапов доставки одного ордербука (timestamp в микросекундах):
+    exchange - время события на бирже (Orderbook.timestamp), gate - время отправки гейтом (Message.timestamp),
+    received - получение фрагмента Aeron, decoded - сообщение разобрано, visible - ордербук в OrderbookState.
+    """
+    __slots__ = ('orderbook', 'symbol', 'exchange', 'gate', 'received', 'decoded', 'visible')
+
+    def __init__(self, orderbook, exchange: int | None, gate: int, received: int, decoded: int):
+        self.orderbook = orderbook
+        self.symbol: str = orderbook.symbol
+        self.exchange = exchange
+        self.gate = gate
+        self.received = received
+        self.decoded = decoded
+        self.visible: int | None = None
+
+    def dict(self) -> dict:
+        return {
+            'symbol': self.symbol,
+            'exchange': self.exchange,
+            'gate': self.gate,
+            'received': self.received,
+            'decoded': self.decoded,
+            'visible': self.visible,
+        }
+
+
+class OrderbookLatencyTracer(object):
+    """
+    Задержки доставки ордербуков по этапам: от биржи до гейта, от гейта до получения фрагмента Aeron,
+    разбор сообщения и от разбора до появления ордербука в OrderbookState. Позволяет отделить задержку гейта
+    от задержки ядра.
+
+    Этапы exchange->gate и gate->fragment сравнивают время разных машин и зависят от синхронизации часов
+    (отрицательные значения записываются как 0). Этапы ядра измеряются по одним часам.
+
+    on_decoded вызывается коммуникатором (в том числе из потока опроса), on_visible - OrderbookState.
+    Ордербуки, которые не дошли до OrderbookState (конфлюэнция, переполнение очереди), вытесняются,
+    когда ожидающих трассировок больше max_pending.
+    """
+
+    def __init__(self, max_pending: int = 10_000, max_traces: int = 0):
+        """
+        :param max_pending: максимальное количество ордербуков, которые разобраны, но еще не в OrderbookState;
+        :param max_traces: количество последних трассировок, которые хранятся для выгрузки (0 - не хранить);
+        """
+        self._max_pending = max_pending
+        self._pending: dict[int, OrderbookTrace] = {}
+        self._lock = threading.Lock()
+        self._histograms = LatencyHistograms()
+        self.traces: deque[OrderbookTrace] = deque(maxlen=max_traces)
+
+    def on_decoded(self, message: Message, received: int) -> None:
+        """
+        Сообщение из канала ордербуков разобрано.
+        :param message: разобранное сообщение;
+        :param received: timestamp получения фрагмента в микросекундах;
+        """
+        orderbook = message.data
+        if not isinstance(orderbook, (Orderbook, CompactOrderbook, OrderbookDelta)):
+            return
+        trace = OrderbookTrace(orderbook, exchange=orderbook.timestamp, gate=message.timestamp, received=received,
+                               decoded=get_micro_timestamp())
+        with self._lock:
+            if len(self._pending) >= self._max_pending:
+                del self._pending[next(iter(self._pending))]
+            self._pending[id(orderbook)] = trace
+
+    def on_visible(self, orderbook: Orderbook | CompactOrderbook | OrderbookDelta) -> None:
+        """
+        Ордербук (или инкрементальное обновление) применен в OrderbookState.
+        :param orderbook: ордербук;
+        """
+        with self._lock:
+            # трассировка хранит ссылку на ордербук, поэтому id не может быть переиспользован, пока она ожидает
+            trace = self._pending.pop(id(orderbook), None)
+        if trace is None:
+            return
+        trace.visible = get_micro_timestamp()
+        trace.orderbook = None
+        symbol = trace.symbol
+        if trace.exchange is not None:
+            self._histograms.record(EXCHANGE_TO_GATE, symbol, trace.gate - trace.exchange)
+            self._histograms.record(EXCHANGE_TO_VISIBLE, symbol, trace.visible - trace.exchange)
+        self._histograms.record(GATE_TO_FRAGMENT, symbol, trace.received - trace.gate)
+        self._histograms.record(FRAGMENT_TO_DECODED, symbol, trace.decoded - trace.received)
+        self._histograms.record(DECODED_TO_VISIBLE, symbol, trace.visible - trace.decoded)
+        self._histograms.record(FRAGMENT_TO_VISIBLE, symbol, trace.visible - trace.received)
+        if self.traces.maxlen:
+            self.traces.append(trace)
+
+    def histogram(self, stage: str, symbol: str = None) -> LatencyHistogram:
+        """
+        Гистограмма задержек этапа.
+        :param stage: название этапа (например, FRAGMENT_TO_VISIBLE);
+        :param symbol: символ. По умолчанию - по всем символам;
+        :return: LatencyHistogram
+        """
+        return self._histograms.histogram(stage, symbol)
+
+    def summary(self) -> dict[str, dict[str, dict]]:
+        """
+        Статистики задержек (в микросекундах) по этапам: по всем символам ('all') и по каждому символу.
+        :return: dict[stage, dict[symbol, summary]]
+        """
+        return self._histograms.summary(STAGE_NAMES)
+
+    def report(self) -> str:
+        """
+        Отчет о задержках в виде таблицы (значения в микросекундах).
+        """
+        return self._histograms.report('Orderbook latency (us)', STAGE_NAMES)
+
+    def jsonl(self) -> Iterator[str]:
+        """
+        Статистики и сохраненные трассировки в формате JSON lines: сначала строки со статистиками
+        ({"type": "summary", "stage": ..., "symbol": ..., "count": ..., "p50": ...}), затем трассировки
+        ({"type": "trace", "symbol": ..., "exchange": ..., ...}).
+        """
+        for stage, symbols in self.summary().items():
+            for symbol, summary in symbols.items():
+                yield json.dumps({'type': 'summary', 'stage': stage, 'symbol': symbol, **summary})
+        for trace in list(self.traces):
+            yield json.dumps({'type': 'trace', **trace.dict()})
+
+    def export_jsonl(self, path: str) -> None:
+        """
+        Записать статистики и сохраненные трассировки в файл в формате JSON lines.
+        :param path: путь к файлу;
+        """
+        with open(path, 'w') as file:
+            for line in self.jsonl():
+                file.write(line)
+                file.write('\n')
+
+    def reset(self) -> None:
+        """Удалить все записанные задержки и трассировки"""
+        with self._lock:
+            self._pending.clear()
+        self._histograms.reset()
+        self.traces.clear()
@@ -0,0 +1,153 @@
+import numpy as np
+
+from testing_core import enums
+from testing_core.models.orderbook import Orderbook
+
+
+def _levels_to_array(levels: list) -> np.ndarray:
+    """
+    Преобразовать уровни ордербука из json в массив формы (n, 2): цена, объем.
+    :param levels: список уровней [[price, amount], ...];
+    :return: np.ndarray с dtype float64
+    """
+    if type(levels) is not list:
+        raise TypeError
+    if not levels:
+        return np.empty((0, 2), dtype=np.float64)
+    array = np.array(levels, dtype=np.float64)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError('Orderbook level must contain price and amount')
+    return array
+
+
+class CompactOrderbook(object):
+    """
+    Ордербук, в котором каждая сторона хранится непрерывным массивом float64 формы (n, 2): цена, объем.
+    Индексация совпадает с Orderbook: bids[0][0] - лучшая цена на покупку, asks[0][1] - объем лучшей цены на продажу.
+    bids отсортированы по убыванию цены, asks - по возрастанию (так их присылает гейт).
+    """
+    __slots__ = ('symbol', 'timestamp', 'sequence', 'bids', 'asks')
+
+    symbol: str
+    timestamp: int | None
+    sequence: int | None
+    bids: np.ndarray
+    asks: np.ndarray
+
+    def __init__(self, symbol: str, timestamp: int | None, bids: np.ndarray, asks: np.ndarray,
+                 sequence: int | None = None):
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.sequence = sequence
+        self.bids = bids
+        self.asks = asks
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CompactOrderbook':
+        """
+        Создать ордербук из json без поуровневой валидации.
+        :param data: поле data сообщения order_book_update;
+        :return: CompactOrderbook
+        """
+        symbol = data['symbol']
+        timestamp = data.get('timestamp')
+        sequence = data.get('sequence')
+        if type(symbol) is not str or timestamp is not None and type(timestamp) is not int or \
+                sequence is not None and type(sequence) is not int:
+            raise TypeError
+        return cls(
+            symbol=symbol,
+            timestamp=timestamp,
+            sequence=sequence,
+            bids=_levels_to_array(data['bids']),
+            asks=_levels_to_array(data['asks'])
+        )
+
+    @classmethod
+    def from_orderbook(cls, orderbook: Orderbook) -> 'CompactOrderbook':
+        """
+        Создать ордербук из Orderbook.
+        :param orderbook: Orderbook;
+        :return: CompactOrderbook
+        """
+        return cls.from_dict(orderbook.dict())
+
+    @property
+    def best_bid(self) -> float | None:
+        """Лучшая цена на покупку (None, если сторона пуста)"""
+        return float(self.bids[0, 0]) if len(self.bids) else None
+
+    @property
+    def best_ask(self) -> float | None:
+        """Лучшая цена на продажу (None, если сторона пуста)"""
+        return float(self.asks[0, 0]) if len(self.asks) else None
+
+    @property
+    def mid(self) -> float | None:
+        """Середина спреда (None, если одна из сторон пуста)"""
+        if not len(self.bids) or not len(self.asks):
+            return None
+        return float(self.bids[0, 0] + self.asks[0, 0]) / 2
+
+    @property
+    def spread(self) -> float | None:
+        """Спред между лучшими ценами (None, если одна из сторон пуста)"""
+        if not len(self.bids) or not len(self.asks):
+            return None
+        return float(self.asks[0, 0] - self.bids[0, 0])
+
+    def _side_levels(self, side: enums.OrderSide) -> np.ndarray:
+        """Уровни, с которыми исполнится ордер с указанной стороной: buy - asks, sell - bids"""
+        return self.asks if side == enums.OrderSide.BUY else self.bids
+
+    def cumulative_depth(self, side: enums.OrderSide) -> np.ndarray:
+        """
+        Накопленный объем по уровням, с которыми исполнится ордер указанной стороны.
+        :param side: сторона ордера (buy - считается по asks, sell - по bids);
+        :return: np.ndarray формы (n, 2): цена, накопленный до этой цены включительно объем
+        """
+        levels = self._side_levels(side)
+        return np.column_stack((levels[:, 0], np.cumsum(levels[:, 1])))
+
+    def vwap(self, side: enums.OrderSide, amount: float) -> float | None:
+        """
+        Средневзвешенная по объему цена исполнения рыночного ордера заданного объема.
+        :param side: сторона ордера (buy - исполняется по asks, sell - по bids);
+        :param amount: объем ордера;
+        :return: float - средняя цена исполнения. None, если глубины ордербука не хватает для объема
+        """
+        levels = self._side_levels(side)
+        if amount <= 0 or not len(levels):
+            return None
+        cumulative = np.cumsum(levels[:, 1])
+        if cumulative[-1] < amount:
+            return None
+        # объем, который будет взят с каждого уровня
+        taken = np.clip(amount - (cumulative - levels[:, 1]), 0, levels[:, 1])
+        return float(np.dot(levels[:, 0], taken) / amount)
+
+    def dict(self) -> dict:
+        """Ордербук в виде словаря (в том же формате, что и Orderbook.dict())"""
+        return {
+            'symbol': self.symbol,
+            'timestamp': self.timestamp,
+            'sequence': self.sequence,
+            'bids': self.bids.tolist(),
+            'asks': self.asks.tolist()
+        }
+
+    def __eq__(self, other):
+        if isinstance(other, CompactOrderbook):
+            return self.symbol == other.symbol and self.timestamp == other.timestamp and \
+                self.sequence == other.sequence and \
+                np.array_equal(self.bids, other.bids) and np.array_equal(self.asks, other.asks)
+        if isinstance(other, Orderbook):
+            return self.dict() == other.dict()
+        if isinstance(other, dict):
+            return self.dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f'CompactOrderbook(symbol={self.symbol!r}, timestamp={self.timestamp!r}, ' \
+               f'sequence={self.sequence!r}, ' \
+               f'bids={self.bids.tolist()!r}, asks={self.asks.tolist()!r})'
@@ -1,10 +1,12 @@
-from typing import Union
+from typing import Union, Any, Optional
 
-from pydantic import BaseModel, PositiveFloat, NonNegativeFloat
+from pydantic import BaseModel, PositiveFloat, NonNegativeFloat, BaseConfig, ValidationError, validator
+from pydantic.fields import ModelField
 
 from testing_core import enums
 from testing_core.models.balance import Balance
-from testing_core.models.orderbook import Orderbook
+from testing_core.models.compact_orderbook import CompactOrderbook
+from testing_core.models.orderbook import Orderbook, OrderbookDelta
 
 
 class GateOrderId(BaseModel):
@@ -56,11 +58,52 @@ class Balances(BaseModel):
     assets: dict[str, Balance]
 
 
+# все возможные типы поля data. Используется, если тип нельзя определить по event и action
+MessageData = Union[
+    list[GateOrderToCreate], list[GateOrderInfo], list[GateOrderId], Orderbook, OrderbookDelta,
+    GateOrderToCreate, Balances, list[str], int, str, None
+]
+
+# ожидаемый тип поля data в зависимости от event и action сообщения
+DATA_TYPES: dict[tuple[enums.Event, enums.Action], Any] = {
+    # данные от гейта
+    (enums.Event.DATA, enums.Action.ORDERBOOK_UPDATE): Orderbook,
+    (enums.Event.DATA, enums.Action.ORDERBOOK_DELTA): OrderbookDelta,
+    (enums.Event.DATA, enums.Action.BALANCE_UPDATE): Balances,
+    (enums.Event.DATA, enums.Action.GET_BALANCE): Balances,
+    (enums.Event.DATA, enums.Action.ORDERS_UPDATE): list[GateOrderInfo],
+    (enums.Event.DATA, enums.Action.CREATE_ORDERS): list[GateOrderInfo],
+    (enums.Event.DATA, enums.Action.CANCEL_ORDERS): list[GateOrderInfo],
+    (enums.Event.DATA, enums.Action.GET_ORDERS): list[GateOrderInfo],
+    # команды ядра
+    (enums.Event.COMMAND, enums.Action.CREATE_ORDERS): list[GateOrderToCreate],
+    (enums.Event.COMMAND, enums.Action.CANCEL_ORDERS): list[GateOrderId],
+    (enums.Event.COMMAND, enums.Action.GET_ORDERS): list[GateOrderId],
+    (enums.Event.COMMAND, enums.Action.GET_BALANCE): list[str],
+    (enums.Event.COMMAND, enums.Action.GET_ORDERBOOK): list[str],
+    (enums.Event.COMMAND, enums.Action.CANCEL_ALL_ORDERS): None,
+}
+
+
+def _data_field(data_type: Any) -> ModelField:
+    """Создать поле pydantic для валидации data заданного типа (data может отсутствовать, т.е. быть None)"""
+    return ModelField.infer(name='data', value=None, annotation=Optional[data_type], class_validators=None,
+                            config=BaseConfig)
+
+
+# поля для валидации data, создаются один раз при импорте модуля
+_DATA_FIELDS: dict[tuple[enums.Event, enums.Action], ModelField] = {
+    key: _data_field(data_type) for key, data_type in DATA_TYPES.items()
+}
+_DEFAULT_DATA_FIELD = _data_field(MessageData)
+
+
 class Message(BaseModel):
     """Главная структура сообщения, которая используется для обмена информацией между частями торговой системы"""
 
     class Config:
         extra = 'forbid'
+        json_encoders = {CompactOrderbook: CompactOrderbook.dict}
 
     event_id: str
     exchange: str
@@ -71,7 +114,17 @@ class Message(BaseModel):
     message: str | None
     algo: str
     timestamp: int
-    data: Union[
-        list[GateOrderToCreate], list[GateOrderInfo], list[GateOrderId], Orderbook,
-        GateOrderToCreate, Balances, list[str], int, str, None
-    ]
+    # тип data выбирается по event и action (см. DATA_TYPES), иначе - один из типов MessageData
+    data: Any
+
+    @validator('data')
+    def validate_data(cls, data: Any, values: dict) -> Any:
+        """
+        Провалидировать data по типу, соответствующему event и action. Так data валидируется один раз,
+        без перебора всех вариантов MessageData.
+        """
+        field = _DATA_FIELDS.get((values.get('event'), values.get('action')), _DEFAULT_DATA_FIELD)
+        data, errors = field.validate(data, values, loc=(), cls=cls)
+        if errors:
+            raise ValidationError([errors], cls)
+        return data
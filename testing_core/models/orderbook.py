@@ -9,5 +9,20 @@ class Orderbook(BaseModel):
     """
     symbol: str
     timestamp: int = None
+    # номер обновления ордербука (опционально). Нужен для применения инкрементальных обновлений OrderbookDelta
+    sequence: int | None = None
+    bids: list[list[float]]
+    asks: list[list[float]]
+
+
+class OrderbookDelta(BaseModel):
+    """
+    Инкрементальное обновление ордербука. Уровни передаются в виде [price, amount]:
+    amount - новый объем на уровне цены, нулевой amount означает удаление уровня.
+    """
+    symbol: str
+    timestamp: int = None
+    # номер обновления. Должен быть на единицу больше номера предыдущего обновления (или снапшота)
+    sequence: int | None = None
     bids: list[list[float]]
     asks: list[list[float]]
@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+
+from testing_core import enums
+from testing_core.order.order import OrderData
+from testing_core.order.ticks import TickLimits, VIOLATION_REASONS
+
+
+class LimitValidator(object):
+    """
+    Проверка ордеров на лимиты торговой пары (Market.Limits), собранная один раз при создании Market.
+    Границы хранятся плоскими полями, незаданная граница заменяется бесконечностью, поэтому для каждого ордера
+    не нужно обходить вложенные модели лимитов и проверять, задана ли граница (nan не проходит ни одну проверку).
+    Сравнения строгие, проверки выполняются в порядке: объем, цена, стоимость. Вместо bool возвращается
+    причина нарушения (LimitViolationReason) или None.
+    """
+    __slots__ = ('amount_min', 'amount_max', 'price_min', 'price_max', 'cost_min', 'cost_max', 'tick_limits')
+
+    def __init__(self, limits, tick_limits: TickLimits = None):
+        """
+        :param limits: лимиты торговой пары (Market.Limits);
+        :param tick_limits: лимиты в тиках (для ордеров с price_ticks и amount_ticks). Опционально;
+        """
+        self.amount_min, self.amount_max = _bounds(limits.amount)
+        self.price_min, self.price_max = _bounds(limits.price)
+        self.cost_min, self.cost_max = _bounds(limits.cost)
+        self.tick_limits = tick_limits
+
+    def validate(self, price: float, amount: float) -> enums.LimitViolationReason | None:
+        """
+        Проверить цену и объем на лимиты.
+        :return: причина нарушения первой нарушенной проверки или None, если лимиты не нарушены
+        """
+        if not self.amount_min < amount:
+            return enums.LimitViolationReason.AMOUNT_TOO_LOW
+        if not amount < self.amount_max:
+            return enums.LimitViolationReason.AMOUNT_TOO_HIGH
+        if not self.price_min < price:
+            return enums.LimitViolationReason.PRICE_TOO_LOW
+        if not price < self.price_max:
+            return enums.LimitViolationReason.PRICE_TOO_HIGH
+        cost = price * amount
+        if not self.cost_min < cost:
+            return enums.LimitViolationReason.COST_TOO_LOW
+        if not cost < self.cost_max:
+            return enums.LimitViolationReason.COST_TOO_HIGH
+        return None
+
+    def validate_order(self, order: OrderData) -> enums.LimitViolationReason | None:
+        """
+        Проверить ордер на лимиты: по тикам, если они есть у ордера, иначе по цене и объему.
+        :return: причина нарушения или None, если лимиты не нарушены
+        """
+        if order.price_ticks is not None and order.amount_ticks is not None and self.tick_limits is not None:
+            return self.tick_limits.violation(order.price_ticks, order.amount_ticks)
+        return self.validate(order.price, order.amount)
+
+    def violations(self, prices: np.ndarray, amounts: np.ndarray) -> list[enums.LimitViolationReason | None]:
+        """
+        Проверить массивы цен и объемов на лимиты (векторизованный validate).
+        :return: причины нарушения по строкам (None - лимиты не нарушены)
+        """
+        prices, amounts = np.asarray(prices, dtype=np.float64), np.asarray(amounts, dtype=np.float64)
+        costs = prices * amounts
+        conditions = [
+            ~(self.amount_min < amounts), ~(amounts < self.amount_max),
+            ~(self.price_min < prices), ~(prices < self.price_max),
+            ~(self.cost_min < costs), ~(costs < self.cost_max),
+        ]
+        codes = np.select(conditions, np.arange(1, len(VIOLATION_REASONS)), 0)
+        return [VIOLATION_REASONS[code] for code in codes.tolist()]
+
+
+def _bounds(min_max) -> tuple[float, float]:
+    """Границы Market.Limits.MinMax, незаданные границы - бесконечность"""
+    return (-math.inf if min_max.min is None else min_max.min,
+            math.inf if min_max.max is None else min_max.max)
@@ -5,10 +5,11 @@ from pydantic import BaseModel
 
 from testing_core import enums
 from testing_core.enums import OrderType, OrderSide, OrderState
+from testing_core.store.notifier import StateNotifier
 from testing_core.utils import get_micro_timestamp
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class OrderData(object):
     core_order_id: str
     symbol: str
@@ -18,6 +19,27 @@ class OrderData(object):
     amount: float
     state: OrderState = OrderState.UNPLACED
     filled: float = 0
+    # id ордера на бирже (GateOrderInfo.id), известен после первого обновления от гейта
+    exchange_order_id: str | None = None
+    # цена и объем в тиках шага торговой пары (Market.price_scale, Market.amount_scale), если включены integer_ticks
+    price_ticks: int | None = None
+    amount_ticks: int | None = None
+
+
+class OrderCallbacks(object):
+    """
+    Функции для размещения, отмены и запроса обновления ордеров. Один экземпляр хранится в фабрике ордеров
+    и используется всеми созданными ею ордерами.
+    """
+    __slots__ = ('place', 'request_update', 'cancel')
+
+    def __init__(self,
+                 place_function: Callable[[OrderData], None],
+                 request_update_function: Callable[[OrderData], None],
+                 cancel_function: Callable[[OrderData], None]):
+        self.place = place_function
+        self.request_update = request_update_function
+        self.cancel = cancel_function
 
 
 class Order(OrderData):
@@ -25,18 +47,22 @@ class Order(OrderData):
     Класс ордера. Содержит всю необходимую информацию об ордере. С помощью методов можно отправить ордер на биржу,
     отменить ордер, запросить обновление статуса ордера (синхронизация с биржей).
     """
-    is_placed: bool = False
-    is_open: bool = False
-    place_timestamp: int = None
-    last_update_timestamp: int = None
-    _place_function: Callable[[OrderData], None] = None
-    _request_update_function: Callable[[OrderData], None] = None
-    _cancel_function: Callable[[OrderData], None] = None
+    __slots__ = ('is_placed', 'is_open', 'place_timestamp', 'last_update_timestamp', '_callbacks',
+                 '_state_notifier')
+
+    is_placed: bool
+    is_open: bool
+    place_timestamp: int | None
+    last_update_timestamp: int | None
+    _callbacks: OrderCallbacks
+    # создается при первом ожидании состояния ордера
+    _state_notifier: StateNotifier | None
 
     def __init__(self,
-                 place_function: Callable[[OrderData], None],
-                 request_update_function: Callable[[OrderData], None],
-                 cancel_function: Callable[[OrderData], None],
+                 place_function: Callable[[OrderData], None] = None,
+                 request_update_function: Callable[[OrderData], None] = None,
+                 cancel_function: Callable[[OrderData], None] = None,
+                 callbacks: OrderCallbacks = None,
                  **order_data: Any):
         """
         Класс ордера. Содержит всю необходимую информацию об ордере. С помощью методов можно отправить ордер на биржу,
@@ -45,12 +71,21 @@ class Order(OrderData):
         :param place_function: функция для размещения ордера на бирже;
         :param request_update_function: функция для синхронизации данных с ордером на бирже;
         :param cancel_function: функция для отмены ордера на бирже;
+        :param callbacks: общие для ордеров функции (вместо place_function, request_update_function
+        и cancel_function, см. OrderFabric);
         :param order_data: Данные, относящиеся к классу OrderData.
         """
         super().__init__(**order_data)
-        self._place_function = place_function
-        self._request_update_function = request_update_function
-        self._cancel_function = cancel_function
+        if callbacks is None:
+            callbacks = OrderCallbacks(place_function=place_function,
+                                       request_update_function=request_update_function,
+                                       cancel_function=cancel_function)
+        self._callbacks = callbacks
+        self.is_placed = False
+        self.is_open = False
+        self.place_timestamp = None
+        self.last_update_timestamp = None
+        self._state_notifier = None
 
     def place(self) -> bool:
         """
@@ -59,16 +94,34 @@ class Order(OrderData):
         то он перейдет в состояние open.
         Функцию можно выполнить, если ордер находится в состояниях unplaced, error. Ордер перейдет в состояние posting,
         откуда может перейти в состояния open, closed, error.
+        :return: True, если команда на размещение отправлена. False, если ордер нельзя разместить из текущего
+        состояния или он был отклонен при отправке (не прошел проверку лимитов, команда не была опубликована)
         """
         # Проверка, находится ли ордер в состоянии, из которого может быть создан на бирже
         if self.state not in [enums.OrderState.UNPLACED, enums.OrderState.ERROR]:
             return False
 
-        # Отправка ордера гейту
-        self._place_function(self)
+        # Время размещения (для измерения задержек)
+        self.place_timestamp = get_micro_timestamp()
+        previous_state = self.state
+
+        # Отправка ордера гейту. Функция размещения Trader сама переводит ордер в placing (через OrdersState)
+        # или в error, если ордер отклонен при отправке (не прошел проверку лимитов, команда не была опубликована)
+        try:
+            self._callbacks.place(self)
+        except Exception:
+            if self.state is not previous_state:
+                self.state = previous_state
+                self.notify_state_changed()
+            raise
+
+        if self.state is enums.OrderState.ERROR:
+            return False
 
-        # Изменение состояния ордера на placing
-        self.state = enums.OrderState.PLACING
+        # Изменение состояния ордера на placing, если функция размещения не изменила его
+        if self.state is previous_state:
+            self.state = enums.OrderState.PLACING
+            self.notify_state_changed()
 
         return True
 
@@ -84,7 +137,7 @@ class Order(OrderData):
             return False
 
         # Отправка команды гейту
-        self._cancel_function(self)
+        self._callbacks.cancel(self)
 
         return True
 
@@ -97,10 +150,42 @@ class Order(OrderData):
             return False
 
         # отправка команды гейту
-        self._request_update_function(self)
+        self._callbacks.request_update(self)
+
+    async def wait_for_state(self, *states: OrderState, timeout: float = None) -> bool:
+        """
+        Дождаться, пока ордер перейдет в одно из состояний. Ожидание завершается сразу после обработки сообщения
+        от гейта, которое изменило состояние.
+        :param states: ожидаемые состояния;
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если ордер в одном из состояний. False, если истекло время ожидания
+        """
+        if self._state_notifier is None:
+            self._state_notifier = StateNotifier()
+        return await self._state_notifier.wait_for(lambda: self.state in states, timeout=timeout)
+
+    async def wait_while_state(self, *states: OrderState, timeout: float = None) -> bool:
+        """
+        Дождаться, пока ордер выйдет из состояний (например, из placing).
+        :param states: состояния, из которых ордер должен выйти;
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если ордер не в одном из состояний. False, если истекло время ожидания
+        """
+        if self._state_notifier is None:
+            self._state_notifier = StateNotifier()
+        return await self._state_notifier.wait_for(lambda: self.state not in states, timeout=timeout)
+
+    def notify_state_changed(self) -> None:
+        """
+        Сообщить ожидающим, что состояние ордера изменилось.
+        """
+        if self._state_notifier is not None:
+            self._state_notifier.notify()
 
 
 class OrderUpdatable(Order):
+    __slots__ = ()
+
     def update(self, order_data: OrderData):
         """
         Обновить ордер новыми данными
@@ -109,7 +194,15 @@ class OrderUpdatable(Order):
         """
         self.state = order_data.state
         self.filled = order_data.filled
-        self.amount = order_data.amount
-        self.price = order_data.price
+        # тики остаются актуальными, только если гейт вернул те же цену и объем
+        if order_data.amount != self.amount:
+            self.amount = order_data.amount
+            self.amount_ticks = order_data.amount_ticks
+        if order_data.price != self.price:
+            self.price = order_data.price
+            self.price_ticks = order_data.price_ticks
+        if order_data.exchange_order_id is not None:
+            self.exchange_order_id = order_data.exchange_order_id
 
         self.last_update_timestamp = get_micro_timestamp()
+        self.notify_state_changed()
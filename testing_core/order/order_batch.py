@@ -0,0 +1,29 @@
+import dataclasses
+
+from testing_core import enums
+from testing_core.order.order import OrderUpdatable
+
+
+@dataclasses.dataclass(slots=True)
+class RowViolation(object):
+    # номер строки во входных массивах
+    row: int
+    reason: enums.LimitViolationReason
+
+
+@dataclasses.dataclass(slots=True)
+class OrderBatch(object):
+    """
+    Результат пакетного создания ордеров (OrderFabric.create_orders, Trader.create_orders)
+    """
+    # созданные ордера в порядке строк входных массивов
+    orders: list[OrderUpdatable] = dataclasses.field(default_factory=list)
+    # номер строки входных массивов для каждого созданного ордера
+    rows: list[int] = dataclasses.field(default_factory=list)
+    # строки, по которым ордера не созданы, с причинами
+    rejected: list[RowViolation] = dataclasses.field(default_factory=list)
+    # строки, цена или объем которых ограничены лимитами (ViolationPolicy.CLIP), с исходными причинами
+    clipped: list[RowViolation] = dataclasses.field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.orders)
@@ -1,11 +1,15 @@
 import logging
-from typing import Callable
+from typing import Callable, Sequence
 
+import numpy as np
+
+from testing_core import enums
 from testing_core.config import Market
 from testing_core.enums import OrderType, OrderSide
 from testing_core.exceptions import LimitViolation
-from testing_core.order.order import OrderData, OrderUpdatable, Order
-from testing_core.utils import truncate_to_increment
+from testing_core.order.order import OrderData, OrderUpdatable, Order, OrderCallbacks
+from testing_core.order.order_batch import OrderBatch, RowViolation
+from testing_core.order.ticks import VIOLATION_REASONS
 
 logger = logging.getLogger(__name__)
 
@@ -13,17 +17,16 @@ class OrderFabric(object):
     """
     Отвечает за создание объектов ордеров. Не размещает ордера на бирже.
     Содержит функции для создания, отмены, запроса обновления ордеров, которые передает
-     создаваемым ордерам.
+     создаваемым ордерам (один экземпляр OrderCallbacks на все ордера).
     """
-    _place_function: Callable[[OrderData], None]
-    _request_update_function: Callable[[OrderData], None]
-    _cancel_function: Callable[[OrderData], None]
+    _callbacks: OrderCallbacks
 
     def __init__(self,
                  markets: dict[str, Market],
                  place_function: Callable[[OrderData], None],
                  request_update_function: Callable[[OrderData], None],
-                 cancel_function: Callable[[OrderData], None]
+                 cancel_function: Callable[[OrderData], None],
+                 integer_ticks: bool = False
                  ):
         """
         Создать фабрику ордеров.
@@ -31,11 +34,13 @@ class OrderFabric(object):
         :param place_function: функция для размещения ордера на бирже (передается создаваемым ордерам)
         :param request_update_function: функция для запроса обновления ордера (передается создаваемым ордерам)
         :param cancel_function: функция для отмены ордера на бирже (передается создаваемым ордерам)
+        :param integer_ticks: если True, ордера хранят цену и объем также в тиках (price_ticks, amount_ticks)
         """
         self._markets = markets
-        self._place_function = place_function
-        self._request_update_function = request_update_function
-        self._cancel_function = cancel_function
+        self._integer_ticks = integer_ticks
+        self._callbacks = OrderCallbacks(place_function=place_function,
+                                         request_update_function=request_update_function,
+                                         cancel_function=cancel_function)
 
     def create_order(self,
                      core_order_id: str,
@@ -65,27 +70,201 @@ class OrderFabric(object):
             side=side,
             price=price,
             amount=amount,
-            place_function=self._place_function,
-            request_update_function=self._request_update_function,
-            cancel_function=self._cancel_function
+            callbacks=self._callbacks
         )
         order = self.truncate_values_to_increment(order)
-        if enable_validating and not self.check_order_to_limits(order):
-            logger.error(f'Limit violation on order: {order}')
-            raise LimitViolation
+        if enable_validating and (reason := self.validate_order(order)) is not None:
+            logger.error(f'Limit violation ({reason.value}) on order: {order}')
+            raise LimitViolation(reason)
         return order
 
+    def create_order_from_ticks(self,
+                                core_order_id: str,
+                                symbol: str,
+                                order_type: OrderType,
+                                side: OrderSide,
+                                price_ticks: int,
+                                amount_ticks: int,
+                                enable_validating: bool = True
+                                ) -> OrderUpdatable:
+        """
+        Создать ордер с ценой и объемом в тиках шага торговой пары (без округления).
+
+        :param price_ticks: цена ордера в тиках (Market.price_scale);
+        :param amount_ticks: объем ордера в тиках (Market.amount_scale);
+        Остальные параметры как в create_order.
+        :return: созданный ордер с price_ticks и amount_ticks
+        """
+        market = self._markets.get(symbol)
+        if market is None or market.tick_limits is None:
+            raise KeyError('Unknown symbol or market without increments. Check configuration.')
+        order = OrderUpdatable(
+            core_order_id=core_order_id,
+            symbol=symbol,
+            type=order_type,
+            side=side,
+            price=market.price_scale.from_ticks(price_ticks),
+            amount=market.amount_scale.from_ticks(amount_ticks),
+            price_ticks=price_ticks,
+            amount_ticks=amount_ticks,
+            callbacks=self._callbacks
+        )
+        if enable_validating and (reason := market.tick_limits.violation(price_ticks, amount_ticks)) is not None:
+            logger.error(f'Limit violation ({reason.value}) on order: {order}')
+            raise LimitViolation(reason)
+        return order
+
+    def create_orders(self,
+                      core_order_ids: Sequence[str],
+                      symbols: str | Sequence[str],
+                      order_type: OrderType,
+                      sides: OrderSide | Sequence[OrderSide],
+                      prices: Sequence[float] | np.ndarray,
+                      amounts: Sequence[float] | np.ndarray,
+                      enable_validating: bool = True,
+                      violation_policy: enums.ViolationPolicy = enums.ViolationPolicy.REJECT
+                      ) -> OrderBatch:
+        """
+        Создать пакет ордеров. Цены и объемы округляются и проверяются на лимиты векторизованно (массивами numpy)
+        по каждой торговой паре, результат округления совпадает с create_order. Строки, которые не соответствуют
+        лимитам, отклоняются или ограничиваются лимитами (violation_policy), исключение не выбрасывается.
+
+        :param core_order_ids: id ордеров, по одному на строку;
+        :param symbols: символ валютной пары (один для всех строк или по одному на строку);
+        :param order_type: тип ордеров;
+        :param sides: сторона ордеров (одна для всех строк или по одной на строку);
+        :param prices: цены ордеров;
+        :param amounts: объемы ордеров;
+        :param enable_validating: bool - по умолчанию True. Если True, проверять ордера на лимиты;
+        :param violation_policy: REJECT - отклонять строки, которые не соответствуют лимитам, CLIP - ограничивать
+        цену и объем лимитами (и отклонять строки, которые ограничить не удалось);
+        :return: OrderBatch - созданные ордера, отклоненные и ограниченные строки с причинами
+        """
+        # копии, так как в них записываются округленные значения
+        prices = np.array(prices, dtype=np.float64)
+        amounts = np.array(amounts, dtype=np.float64)
+        rows_count = len(core_order_ids)
+        if prices.shape != (rows_count,) or amounts.shape != (rows_count,):
+            raise ValueError('Prices and amounts must be one-dimensional and have one value per order id')
+        if isinstance(symbols, str):
+            symbol_rows = {symbols: np.arange(rows_count)}
+        else:
+            unique_symbols, inverse = np.unique(np.asarray(symbols, dtype=object).astype(str), return_inverse=True)
+            symbol_rows = {str(symbol): np.flatnonzero(inverse == index)
+                           for index, symbol in enumerate(unique_symbols)}
+        if isinstance(sides, OrderSide):
+            sides = [sides] * rows_count
+
+        # цены и объемы в тиках и причины отклонения по строкам
+        price_ticks = np.zeros(rows_count, dtype=np.int64)
+        amount_ticks = np.zeros(rows_count, dtype=np.int64)
+        has_price_ticks = np.zeros(rows_count, dtype=bool)
+        has_amount_ticks = np.zeros(rows_count, dtype=bool)
+        reasons: list[enums.LimitViolationReason | None] = [None] * rows_count
+        clipped: list[RowViolation] = []
+        rejected = np.zeros(rows_count, dtype=bool)
+        for symbol, rows in symbol_rows.items():
+            market = self._markets.get(symbol)
+            if market is None:
+                rejected[rows] = True
+                for row in rows.tolist():
+                    reasons[row] = enums.LimitViolationReason.UNKNOWN_SYMBOL
+                continue
+            if market.tick_limits is None:
+                # шаг цены или объема не задан: значения округляются по заданной шкале (как в create_order)
+                # и проверяются по float (без ограничения лимитами)
+                invalid = np.zeros(len(rows), dtype=bool)
+                if (price_scale := market.price_scale) is not None:
+                    group_prices, invalid = price_scale.to_ticks_array(prices[rows])
+                    price_ticks[rows], has_price_ticks[rows] = group_prices, True
+                    prices[rows] = price_scale.from_ticks_array(group_prices)
+                if (amount_scale := market.amount_scale) is not None:
+                    group_amounts, amount_invalid = amount_scale.to_ticks_array(amounts[rows])
+                    invalid = invalid | amount_invalid
+                    amount_ticks[rows], has_amount_ticks[rows] = group_amounts, True
+                    amounts[rows] = amount_scale.from_ticks_array(group_amounts)
+                violations = market.validator.violations(prices[rows], amounts[rows]) if enable_validating \
+                    else [None] * len(rows)
+                for row, reason, is_invalid in zip(rows.tolist(), violations, invalid.tolist()):
+                    reasons[row] = enums.LimitViolationReason.INVALID_VALUE if is_invalid else reason
+                    rejected[row] = reasons[row] is not None
+                continue
+            has_price_ticks[rows] = has_amount_ticks[rows] = True
+            group_prices, price_invalid = market.price_scale.to_ticks_array(prices[rows])
+            group_amounts, amount_invalid = market.amount_scale.to_ticks_array(amounts[rows])
+            invalid = price_invalid | amount_invalid
+            codes = np.zeros(len(rows), dtype=np.int8)
+            if enable_validating:
+                codes = market.tick_limits.violations(group_prices, group_amounts)
+                codes[invalid] = 0
+                if violation_policy is enums.ViolationPolicy.CLIP and codes.any():
+                    violated = codes != 0
+                    clipped_prices, clipped_amounts = market.tick_limits.clip(group_prices[violated],
+                                                                              group_amounts[violated])
+                    group_prices[violated], group_amounts[violated] = clipped_prices, clipped_amounts
+                    clipped_codes = market.tick_limits.violations(clipped_prices, clipped_amounts)
+                    for row, code in zip(rows[violated].tolist(), codes[violated].tolist()):
+                        clipped.append(RowViolation(row=row, reason=VIOLATION_REASONS[code]))
+                    codes[violated] = clipped_codes
+            price_ticks[rows], amount_ticks[rows] = group_prices, group_amounts
+            prices[rows] = market.price_scale.from_ticks_array(group_prices)
+            amounts[rows] = market.amount_scale.from_ticks_array(group_amounts)
+            rejected[rows] = invalid | (codes != 0)
+            for row, code, is_invalid in zip(rows.tolist(), codes.tolist(), invalid.tolist()):
+                if is_invalid:
+                    reasons[row] = enums.LimitViolationReason.INVALID_VALUE
+                elif code:
+                    reasons[row] = VIOLATION_REASONS[code]
+
+        batch = OrderBatch()
+        batch.clipped = [violation for violation in clipped if reasons[violation.row] is None]
+        for row, reason in enumerate(reasons):
+            if reason is not None:
+                batch.rejected.append(RowViolation(row=row, reason=reason))
+        accepted = np.flatnonzero(~rejected).tolist()
+        prices_list, amounts_list = prices.tolist(), amounts.tolist()
+        price_ticks_list, amount_ticks_list = price_ticks.tolist(), amount_ticks.tolist()
+        has_price_ticks_list, has_amount_ticks_list = has_price_ticks.tolist(), has_amount_ticks.tolist()
+        symbol_of_row = symbols if not isinstance(symbols, str) else None
+        callbacks, integer_ticks = self._callbacks, self._integer_ticks
+        for row in accepted:
+            batch.orders.append(OrderUpdatable(
+                core_order_id=core_order_ids[row],
+                symbol=symbols if symbol_of_row is None else str(symbol_of_row[row]),
+                type=order_type,
+                side=sides[row],
+                price=prices_list[row],
+                amount=amounts_list[row],
+                price_ticks=price_ticks_list[row] if integer_ticks and has_price_ticks_list[row] else None,
+                amount_ticks=amount_ticks_list[row] if integer_ticks and has_amount_ticks_list[row] else None,
+                callbacks=callbacks
+            ))
+        batch.rows = accepted
+        if batch.rejected:
+            logger.warning(f'{len(batch.rejected)} of {rows_count} orders rejected: '
+                           f'{[(violation.row, violation.reason.value) for violation in batch.rejected[:10]]}')
+        return batch
+
     def truncate_values_to_increment(self, order: OrderUpdatable) -> OrderUpdatable:
         """
         Округляет значения price и amount до значений, подходящих под инкремент маркета (минимальный шаг).
+        Округление целочисленное, по шкалам тиков маркета. Если шаг не задан, значение не изменяется.
         :param order: Order
-        :return: Order с округленными значениями price и amount
+        :return: Order с округленными значениями price и amount (и тиками, если включены integer_ticks)
         """
         market = self._markets.get(order.symbol)
         if market is None:
             raise KeyError('Unknown symbol. Check configuration.')
-        order.amount = truncate_to_increment(order.amount, market.amount_increment)
-        order.price = truncate_to_increment(order.price, market.price_increment)
+        if (amount_scale := market.amount_scale) is not None:
+            amount_ticks = amount_scale.to_ticks(order.amount)
+            order.amount = amount_scale.from_ticks(amount_ticks)
+            if self._integer_ticks:
+                order.amount_ticks = amount_ticks
+        if (price_scale := market.price_scale) is not None:
+            price_ticks = price_scale.to_ticks(order.price)
+            order.price = price_scale.from_ticks(price_ticks)
+            if self._integer_ticks:
+                order.price_ticks = price_ticks
         return order
 
     def check_order_to_limits(self, order: Order) -> bool:
@@ -94,23 +273,15 @@ class OrderFabric(object):
         :param order: Order который нужно проверить;
         :return: True если валидный, т.е. соответствует лимитам. False, если невалидный
         """
+        return self.validate_order(order) is None
+
+    def validate_order(self, order: OrderData) -> enums.LimitViolationReason | None:
+        """
+        Проверяет ордер на соответствие лимитам маркета (Market.validator);
+        :param order: ордер, который нужно проверить;
+        :return: причина нарушения лимитов или None, если ордер соответствует лимитам
+        """
         market = self._markets.get(order.symbol)
         if market is None:
             raise KeyError('Unknown symbol. Check configuration.')
-        limits = market.limits
-
-        is_valid = True
-        # amount
-        if limits.amount.min is not None and not limits.amount.min < order.amount or \
-                limits.amount.max is not None and not order.amount < limits.amount.max:
-            is_valid = False
-        # price
-        elif limits.price.min is not None and not limits.price.min < order.price or \
-                limits.price.max is not None and not order.price < limits.price.max:
-            is_valid = False
-        # cost
-        if limits.cost.min is not None and not limits.cost.min < order.price * order.amount or \
-                limits.cost.max is not None and not order.price * order.amount < limits.cost.max:
-            is_valid = False
-
-        return is_valid
+        return market.validator.validate_order(order)
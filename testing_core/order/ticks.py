@@ -0,0 +1,295 @@
+import decimal
+import math
+
+import numpy as np
+
+from testing_core import enums
+
+# погрешность в ulp, в пределах которой произведение value * 10 ** decimals считается целым числом
+# (ошибка представления value в float и ошибка умножения)
+_INTEGER_TOLERANCE_ULP = 2
+# максимальное значение в единицах 10 ** -decimals, которое точно представляется в float64
+_MAX_EXACT_UNITS = 2 ** 53
+# максимальная стоимость в единицах цены и объема, которая сравнивается в int64 без переполнения
+_MAX_INT64_COST = 2 ** 62
+
+# причины нарушения лимитов по кодам, которые возвращает TickLimits.violations (0 - лимиты не нарушены)
+VIOLATION_REASONS = (
+    None,
+    enums.LimitViolationReason.AMOUNT_TOO_LOW,
+    enums.LimitViolationReason.AMOUNT_TOO_HIGH,
+    enums.LimitViolationReason.PRICE_TOO_LOW,
+    enums.LimitViolationReason.PRICE_TOO_HIGH,
+    enums.LimitViolationReason.COST_TOO_LOW,
+    enums.LimitViolationReason.COST_TOO_HIGH,
+)
+
+
+class TickScale(object):
+    """
+    Шкала целочисленных шагов (тиков) для цены или объема торговой пары. Значение в тиках - целое число шагов
+    increment. Шаг представлен точно: increment = step / 10 ** decimals, поэтому округление и сравнения
+    выполняются целочисленной арифметикой, без decimal.Decimal. В строку значение переводится только
+    при сериализации (format).
+
+    Например, для increment = 0.025: decimals = 3, step = 25, 123.1234 -> 4924 тика -> '123.1'.
+    """
+    __slots__ = ('increment', 'decimals', 'step', '_power')
+
+    def __init__(self, increment: float):
+        """
+        :param increment: шаг цены или объема торговой пары;
+        """
+        exponent = decimal.Decimal(str(increment)).normalize().as_tuple().exponent
+        self.increment = increment
+        self.decimals = max(-exponent, 0)
+        self._power = 10 ** self.decimals
+        self.step = int(decimal.Decimal(str(increment)) * self._power)
+        if self.step <= 0:
+            raise ValueError(f'Increment must be positive: {increment}')
+
+    def _to_units(self, value: float) -> int:
+        """
+        Перевести число в целое количество единиц 10 ** -decimals с отбрасыванием дробной части
+        (как decimal.Decimal(str(value)), но без создания Decimal)
+        """
+        scaled = value * self._power
+        nearest = round(scaled)
+        if abs(scaled - nearest) > math.ulp(scaled) * _INTEGER_TOLERANCE_ULP:
+            return math.trunc(scaled)
+        # value - ближайшее float к nearest * 10 ** -decimals, значит, value лежит на сетке 10 ** -decimals
+        if nearest / self._power == value:
+            return nearest
+        # значение с 16-17 значащими цифрами рядом с сеткой: точный расчет (редко)
+        return int(decimal.Decimal(str(value)) * self._power)
+
+    def to_ticks(self, value: float) -> int:
+        """
+        Перевести число в тики с округлением к нулю (как truncate_to_increment).
+        :param value: цена или объем;
+        :return: int - количество шагов increment
+        """
+        units = self._to_units(value)
+        if units < 0:
+            return -(-units // self.step)
+        return units // self.step
+
+    def to_ticks_array(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Перевести массив чисел в тики с округлением к нулю (векторизованный to_ticks с тем же результатом).
+        :param values: массив float64;
+        :return: (тики int64, маска строк, которые нельзя перевести в тики: nan, inf или слишком большие значения)
+        """
+        with np.errstate(invalid='ignore', over='ignore'):
+            scaled = values * self._power
+            nearest = np.rint(scaled)
+            invalid = ~(np.abs(nearest) < _MAX_EXACT_UNITS)
+            on_grid = np.abs(scaled - nearest) <= np.abs(np.spacing(scaled)) * _INTEGER_TOLERANCE_ULP
+            units = np.where(invalid, 0, np.where(on_grid, nearest, np.trunc(scaled))).astype(np.int64)
+            # значения рядом с сеткой, которые не являются ближайшими float к ней, считаются точно (редко)
+            inexact = np.flatnonzero(on_grid & ~invalid & (nearest / self._power != values))
+        ticks = np.where(units < 0, -(-units // self.step), units // self.step)
+        for row in inexact:
+            ticks[row] = self.to_ticks(float(values[row]))
+        return ticks, invalid
+
+    def from_ticks_array(self, ticks: np.ndarray) -> np.ndarray:
+        """
+        Перевести массив тиков в числа (векторизованный from_ticks, значения должны быть меньше 2 ** 53 единиц).
+        """
+        return ticks * self.step / self._power
+
+    def from_ticks(self, ticks: int) -> float:
+        """
+        Перевести тики в число. Деление целых чисел округляется корректно, поэтому результат совпадает с
+        float(decimal.Decimal) от точного значения.
+        """
+        return ticks * self.step / self._power
+
+    def truncate(self, value: float) -> float:
+        """
+        Округлить число к нулю до шага (целочисленная замена truncate_to_increment).
+        """
+        return self.from_ticks(self.to_ticks(value))
+
+    def floor_ticks(self, value: float) -> int:
+        """
+        Наибольшее количество тиков, не превышающее value (точно, для границ лимитов при загрузке конфигурации).
+        """
+        return math.floor(decimal.Decimal(str(value)) * self._power / self.step)
+
+    def ceil_ticks(self, value: float) -> int:
+        """
+        Наименьшее количество тиков, не меньшее value (точно, для границ лимитов при загрузке конфигурации).
+        """
+        return math.ceil(decimal.Decimal(str(value)) * self._power / self.step)
+
+    def format(self, ticks: int) -> str:
+        """
+        Сериализовать тики в десятичную строку без экспоненты и лишних нулей (например, '123.1', '12340.0').
+        """
+        return format_units(ticks * self.step, self.decimals)
+
+    def __repr__(self) -> str:
+        return f'TickScale(increment={self.increment})'
+
+
+def format_units(units: int, decimals: int) -> str:
+    """
+    Сериализовать целое количество единиц 10 ** -decimals в десятичную строку.
+    :param units: значение в единицах 10 ** -decimals;
+    :param decimals: количество знаков после запятой;
+    :return: str - например, format_units(-12345, 3) -> '-12.345', format_units(1230, 2) -> '12.3'
+    """
+    sign = '-' if units < 0 else ''
+    integer, fraction = divmod(abs(units), 10 ** decimals)
+    fraction = f'{fraction:0{decimals}d}'.rstrip('0') if decimals else ''
+    return f'{sign}{integer}.{fraction or "0"}'
+
+
+class TickLimits(object):
+    """
+    Лимиты торговой пары (Market.Limits) в тиках. Границы рассчитываются точно один раз, после этого проверка
+    ордера - только сравнения целых чисел. Стоимость считается в единицах 10 ** -(decimals цены + decimals объема).
+    Сравнения строгие, как в OrderFabric.check_order_to_limits. None - граница не задана.
+    """
+    __slots__ = ('amount_min', 'amount_max', 'price_min', 'price_max', 'cost_min', 'cost_max', 'cost_step')
+
+    def __init__(self, limits, price_scale: TickScale, amount_scale: TickScale):
+        """
+        :param limits: лимиты торговой пары (Market.Limits);
+        :param price_scale: шкала тиков цены;
+        :param amount_scale: шкала тиков объема;
+        """
+        self.amount_min = _bound(limits.amount.min, amount_scale.floor_ticks)
+        self.amount_max = _bound(limits.amount.max, amount_scale.ceil_ticks)
+        self.price_min = _bound(limits.price.min, price_scale.floor_ticks)
+        self.price_max = _bound(limits.price.max, price_scale.ceil_ticks)
+        # стоимость одного тика цены на один тик объема в единицах 10 ** -cost_decimals
+        self.cost_step = price_scale.step * amount_scale.step
+        cost_power = 10 ** (price_scale.decimals + amount_scale.decimals)
+        self.cost_min = _bound(limits.cost.min, lambda value: math.floor(decimal.Decimal(str(value)) * cost_power))
+        self.cost_max = _bound(limits.cost.max, lambda value: math.ceil(decimal.Decimal(str(value)) * cost_power))
+
+    def check(self, price_ticks: int, amount_ticks: int) -> bool:
+        """
+        Проверить цену и объем в тиках на соответствие лимитам.
+        :return: True если соответствует лимитам
+        """
+        return self.violation(price_ticks, amount_ticks) is None
+
+    def violation(self, price_ticks: int, amount_ticks: int) -> enums.LimitViolationReason | None:
+        """
+        Проверить цену и объем в тиках на соответствие лимитам.
+        :return: причина нарушения первой нарушенной проверки или None, если лимиты не нарушены
+        """
+        if self.amount_min is not None and not self.amount_min < amount_ticks:
+            return enums.LimitViolationReason.AMOUNT_TOO_LOW
+        if self.amount_max is not None and not amount_ticks < self.amount_max:
+            return enums.LimitViolationReason.AMOUNT_TOO_HIGH
+        if self.price_min is not None and not self.price_min < price_ticks:
+            return enums.LimitViolationReason.PRICE_TOO_LOW
+        if self.price_max is not None and not price_ticks < self.price_max:
+            return enums.LimitViolationReason.PRICE_TOO_HIGH
+        cost = price_ticks * amount_ticks * self.cost_step
+        if self.cost_min is not None and not self.cost_min < cost:
+            return enums.LimitViolationReason.COST_TOO_LOW
+        if self.cost_max is not None and not cost < self.cost_max:
+            return enums.LimitViolationReason.COST_TOO_HIGH
+        return None
+
+    def violations(self, price_ticks: np.ndarray, amount_ticks: np.ndarray) -> np.ndarray:
+        """
+        Проверить массивы цен и объемов в тиках на соответствие лимитам (векторизованный check).
+        :return: массив кодов причин нарушения (индексы VIOLATION_REASONS, 0 - лимиты не нарушены).
+        Проверки выполняются в том же порядке, что и в check: объем, цена, стоимость
+        """
+        codes = np.zeros(len(price_ticks), dtype=np.int8)
+        cost_codes = self._cost_violations(price_ticks, amount_ticks)
+        conditions = (
+            (_int64(self.amount_min), amount_ticks, np.less_equal, 1),
+            (_int64(self.amount_max), amount_ticks, np.greater_equal, 2),
+            (_int64(self.price_min), price_ticks, np.less_equal, 3),
+            (_int64(self.price_max), price_ticks, np.greater_equal, 4),
+        )
+        # условия применяются в обратном порядке, чтобы в результате осталась первая нарушенная проверка
+        codes = np.where(cost_codes != 0, cost_codes, codes)
+        for bound, values, violated, code in reversed(conditions):
+            if bound is not None:
+                codes = np.where(violated(values, bound), np.int8(code), codes)
+        return codes
+
+    def _cost_violations(self, price_ticks: np.ndarray, amount_ticks: np.ndarray) -> np.ndarray:
+        codes = np.zeros(len(price_ticks), dtype=np.int8)
+        if self.cost_min is None and self.cost_max is None:
+            return codes
+        # стоимость в int64, если она не может переполниться, иначе в целых числах Python
+        approximate = price_ticks.astype(np.float64) * amount_ticks * self.cost_step
+        small = np.abs(approximate) < _MAX_INT64_COST
+        cost = np.where(small, price_ticks * amount_ticks * self.cost_step, 0)
+        if self.cost_min is not None:
+            codes[small & (cost <= _int64(self.cost_min))] = 5
+        if self.cost_max is not None:
+            codes[small & (cost >= _int64(self.cost_max))] = 6
+        for row in np.flatnonzero(~small):
+            exact_cost = int(price_ticks[row]) * int(amount_ticks[row]) * self.cost_step
+            if self.cost_min is not None and not self.cost_min < exact_cost:
+                codes[row] = 5
+            elif self.cost_max is not None and not exact_cost < self.cost_max:
+                codes[row] = 6
+        return codes
+
+    def clip(self, price_ticks: np.ndarray, amount_ticks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Ограничить цены и объемы в тиках лимитами: цена и объем ограничиваются своими границами, затем объем
+        изменяется так, чтобы стоимость попала в лимиты. Результат нужно проверить еще раз (violations):
+        например, стоимость может не попасть в лимиты без нарушения лимитов объема.
+        :return: (цены в тиках, объемы в тиках)
+        """
+        price_ticks = _clip(price_ticks, _int64(self.price_min), _int64(self.price_max))
+        amount_ticks = _clip(amount_ticks, _int64(self.amount_min), _int64(self.amount_max))
+        tick_cost = price_ticks * self.cost_step
+        positive = tick_cost > 0
+        divisor = np.where(positive, tick_cost, 1)
+        if self.cost_min is not None:
+            minimum = _int64(self.cost_min) // divisor + 1
+            amount_ticks = np.where(positive, np.maximum(amount_ticks, minimum), amount_ticks)
+        if self.cost_max is not None:
+            maximum = (_int64(self.cost_max) - 1) // divisor
+            amount_ticks = np.where(positive, np.minimum(amount_ticks, maximum), amount_ticks)
+        return price_ticks, amount_ticks
+
+
+def _bound(value: float | None, to_ticks) -> int | None:
+    return None if value is None else to_ticks(value)
+
+
+def _int64(bound: int | None) -> int | None:
+    """
+    Граница для сравнения с массивами int64. Значения в массивах меньше 2 ** 62 по модулю, поэтому ограничение
+    границы этим значением не меняет результат сравнения
+    """
+    if bound is None:
+        return None
+    return max(min(bound, _MAX_INT64_COST), -_MAX_INT64_COST)
+
+
+def _clip(ticks: np.ndarray, lower: int | None, upper: int | None) -> np.ndarray:
+    """Ограничить тики строгими границами (lower, upper)"""
+    if lower is not None:
+        ticks = np.maximum(ticks, lower + 1)
+    if upper is not None:
+        ticks = np.minimum(ticks, upper - 1)
+    return ticks
+
+
+def levels_to_ticks(levels, price_scale: TickScale, amount_scale: TickScale) -> list[tuple[int, int]]:
+    """
+    Перевести уровни ордербука [price, amount] в тики.
+    :param levels: уровни ордербука (Orderbook.bids, Orderbook.asks или массив CompactOrderbook);
+    :param price_scale: шкала тиков цены торговой пары;
+    :param amount_scale: шкала тиков объема торговой пары;
+    :return: список (price_ticks, amount_ticks)
+    """
+    price_to_ticks, amount_to_ticks = price_scale.to_ticks, amount_scale.to_ticks
+    return [(price_to_ticks(float(price)), amount_to_ticks(float(amount))) for price, amount in levels]
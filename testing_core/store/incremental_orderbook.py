@@ -0,0 +1,166 @@
+from bisect import bisect_left, insort
+
+from testing_core.models.compact_orderbook import CompactOrderbook
+from testing_core.models.orderbook import Orderbook, OrderbookDelta
+
+
+class OrderbookSide(object):
+    """
+    Одна сторона ордербука: объемы по ценам и отсортированный список цен.
+    Для bids цены хранятся с обратным знаком, чтобы список всегда был отсортирован по возрастанию.
+    """
+
+    def __init__(self, descending: bool, levels=()):
+        """
+        :param descending: True для bids (лучшая цена - наибольшая), False для asks;
+        :param levels: начальные уровни [[price, amount], ...];
+        """
+        self._sign = -1 if descending else 1
+        self._amounts: dict[float, float] = {}
+        self._keys: list[float] = []
+        for price, amount in levels:
+            self.set_level(float(price), float(amount))
+
+    def set_level(self, price: float, amount: float) -> None:
+        """
+        Установить объем на уровне цены. Нулевой объем удаляет уровень.
+        :param price: цена уровня;
+        :param amount: новый объем;
+        """
+        if amount == 0:
+            if self._amounts.pop(price, None) is not None:
+                key = self._sign * price
+                del self._keys[bisect_left(self._keys, key)]
+            return
+        if price not in self._amounts:
+            insort(self._keys, self._sign * price)
+        self._amounts[price] = amount
+
+    def levels(self, depth: int = None) -> list[list[float]]:
+        """
+        Уровни стороны от лучшей цены к худшей.
+        :param depth: количество уровней (по умолчанию все);
+        :return: list[list[float]] в формате [[price, amount], ...]
+        """
+        sign = self._sign
+        amounts = self._amounts
+        return [[sign * key, amounts[sign * key]] for key in self._keys[:depth]]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class IncrementalOrderbook(object):
+    """
+    Ордербук, который поддерживается инкрементальными обновлениями (OrderbookDelta) поверх снапшота.
+    Уровни bids и asks доступны так же, как в Orderbook: bids[0][0] - лучшая цена на покупку.
+    Запоздавшие и повторные обновления (номер не больше текущего или timestamp меньше текущего) отбрасываются.
+    Если обновление пришло с пропуском номера, ордербук считается рассинхронизированным (is_desynced)
+    и не принимает обновления, пока не придет новый снапшот.
+    """
+
+    def __init__(self, snapshot: Orderbook | CompactOrderbook):
+        """
+        :param snapshot: полный ордербук, от которого применяются обновления;
+        """
+        self.symbol: str = snapshot.symbol
+        self.timestamp: int | None = snapshot.timestamp
+        self.sequence: int | None = snapshot.sequence
+        self.is_synchronized: bool = True
+        self._bids = OrderbookSide(descending=True, levels=snapshot.bids)
+        self._asks = OrderbookSide(descending=False, levels=snapshot.asks)
+        # уровни в виде списков, пересчитываются при обращении после обновления
+        self._bids_cache: list[list[float]] | None = None
+        self._asks_cache: list[list[float]] | None = None
+
+    @property
+    def is_desynced(self) -> bool:
+        """Ордербук рассинхронизирован (был пропущен номер обновления), нужен снапшот"""
+        return not self.is_synchronized
+
+    def is_stale(self, delta: OrderbookDelta) -> bool:
+        """
+        Проверить, что обновление запоздало или повторяется.
+        :param delta: инкрементальное обновление;
+        :return: True, если номер обновления не больше текущего или timestamp обновления меньше текущего
+        """
+        if delta.sequence is not None and self.sequence is not None and delta.sequence <= self.sequence:
+            return True
+        return delta.timestamp is not None and self.timestamp is not None and delta.timestamp < self.timestamp
+
+    def is_gap(self, delta: OrderbookDelta) -> bool:
+        """
+        Проверить, что перед обновлением пропущены другие обновления.
+        :param delta: инкрементальное обновление;
+        :return: True, если номер обновления больше следующего за текущим
+        """
+        return delta.sequence is not None and self.sequence is not None and delta.sequence > self.sequence + 1
+
+    def apply(self, delta: OrderbookDelta) -> bool:
+        """
+        Применить инкрементальное обновление. Запоздавшее или повторное обновление отбрасывается,
+        при пропуске обновлений ордербук становится рассинхронизированным.
+        :param delta: инкрементальное обновление;
+        :return: True, если обновление применено. False, если обновление отброшено или ордербук рассинхронизирован
+        """
+        if not self.is_synchronized or self.is_stale(delta):
+            return False
+        if self.is_gap(delta):
+            self.is_synchronized = False
+            return False
+
+        for price, amount in delta.bids:
+            self._bids.set_level(price, amount)
+        for price, amount in delta.asks:
+            self._asks.set_level(price, amount)
+        if delta.bids:
+            self._bids_cache = None
+        if delta.asks:
+            self._asks_cache = None
+
+        if delta.timestamp is not None:
+            self.timestamp = delta.timestamp
+        if delta.sequence is not None:
+            self.sequence = delta.sequence
+        return True
+
+    @property
+    def bids(self) -> list[list[float]]:
+        """Уровни на покупку, от лучшей (наибольшей) цены к худшей"""
+        if self._bids_cache is None:
+            self._bids_cache = self._bids.levels()
+        return self._bids_cache
+
+    @property
+    def asks(self) -> list[list[float]]:
+        """Уровни на продажу, от лучшей (наименьшей) цены к худшей"""
+        if self._asks_cache is None:
+            self._asks_cache = self._asks.levels()
+        return self._asks_cache
+
+    def to_orderbook(self, depth: int = None) -> Orderbook:
+        """
+        Получить снимок ордербука.
+        :param depth: количество уровней на каждой стороне (по умолчанию все);
+        :return: Orderbook
+        """
+        return Orderbook.construct(
+            symbol=self.symbol,
+            timestamp=self.timestamp,
+            sequence=self.sequence,
+            bids=self._bids.levels(depth),
+            asks=self._asks.levels(depth)
+        )
+
+    def dict(self) -> dict:
+        """Ордербук в виде словаря (в том же формате, что и Orderbook.dict())"""
+        return self.to_orderbook().dict()
+
+    def __eq__(self, other):
+        if isinstance(other, (IncrementalOrderbook, Orderbook, CompactOrderbook)):
+            return self.dict() == other.dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f'IncrementalOrderbook(symbol={self.symbol!r}, timestamp={self.timestamp!r}, ' \
+               f'sequence={self.sequence!r}, bids={self.bids!r}, asks={self.asks!r})'
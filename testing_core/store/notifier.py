@@ -0,0 +1,46 @@
+import asyncio
+from typing import Callable
+
+
+class StateNotifier(object):
+    """
+    Ожидание изменения состояния без периодического опроса. Корутины ждут выполнения условия с помощью wait_for,
+    код, который изменяет состояние, вызывает notify - условия ожидающих проверяются сразу после изменения.
+    """
+
+    def __init__(self):
+        # ожидающие: условие и future, который будет завершен, когда условие выполнится
+        self._waiters: list[tuple[Callable[[], bool], asyncio.Future]] = []
+
+    async def wait_for(self, predicate: Callable[[], bool], timeout: float = None) -> bool:
+        """
+        Дождаться выполнения условия.
+        :param predicate: функция без аргументов, которая возвращает True, когда условие выполнено;
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если условие выполнено. False, если истекло время ожидания
+        """
+        if predicate():
+            return True
+        future = asyncio.get_running_loop().create_future()
+        waiter = (predicate, future)
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def notify(self) -> None:
+        """
+        Сообщить об изменении состояния: завершить ожидания, условия которых выполнены.
+        """
+        if not self._waiters:
+            return
+        for waiter in self._waiters.copy():
+            predicate, future = waiter
+            if not future.done() and predicate():
+                future.set_result(None)
+                self._waiters.remove(waiter)
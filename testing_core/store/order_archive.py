@@ -0,0 +1,100 @@
+import dataclasses
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Iterator, Mapping, TextIO
+
+import ujson
+
+from testing_core import enums
+from testing_core.order.order import OrderData, OrderUpdatable
+
+# поля ордера, которые записываются в файл архива
+_FIELDS = tuple(field.name for field in dataclasses.fields(OrderData))
+
+
+class OrderArchive(object):
+    """
+    Ограниченный архив завершенных ордеров (кольцевой буфер по core_order_id). Ордера, вытесненные из архива,
+    дописываются в файл (JSON lines), если он указан, иначе удаляются.
+    """
+
+    def __init__(self, max_size: int = 10_000, spill_path: str = None):
+        """
+        :param max_size: максимальное количество ордеров в архиве;
+        :param spill_path: файл, в который дописываются вытесненные из архива ордера. Опционально;
+        """
+        self._max_size = max_size
+        self._spill_path = spill_path
+        self._spill_file: TextIO | None = None
+        self._orders: OrderedDict[str, OrderUpdatable] = OrderedDict()
+        # количество ордеров, вытесненных из архива
+        self.evicted_count = 0
+
+    def add(self, order: OrderUpdatable) -> None:
+        """
+        Добавить ордер в архив. Если архив заполнен, самый старый ордер вытесняется.
+        :param order: завершенный ордер;
+        """
+        self._orders[order.core_order_id] = order
+        self._orders.move_to_end(order.core_order_id)
+        while len(self._orders) > self._max_size:
+            _, evicted = self._orders.popitem(last=False)
+            self._spill(evicted)
+
+    def get(self, order_id: str) -> OrderUpdatable | None:
+        return self._orders.get(order_id)
+
+    def pop(self, order_id: str) -> OrderUpdatable | None:
+        return self._orders.pop(order_id, None)
+
+    @property
+    def orders(self) -> Mapping[str, OrderUpdatable]:
+        """Ордера в архиве от старых к новым (представление только для чтения)"""
+        return MappingProxyType(self._orders)
+
+    def clear(self) -> None:
+        self._orders.clear()
+
+    def flush(self) -> None:
+        """Записать буферизованные ордера в файл"""
+        if self._spill_file is not None:
+            self._spill_file.flush()
+
+    def close(self) -> None:
+        """Закрыть файл архива (при следующем вытеснении он будет открыт снова)"""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _spill(self, order: OrderUpdatable) -> None:
+        self.evicted_count += 1
+        if self._spill_path is None:
+            return
+        if self._spill_file is None:
+            self._spill_file = open(self._spill_path, 'a')
+        record = {name: getattr(order, name) for name in _FIELDS}
+        for name in ('type', 'side', 'state'):
+            record[name] = record[name].value
+        self._spill_file.write(ujson.dumps(record))
+        self._spill_file.write('\n')
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._orders
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+
+def read_archive(path: str) -> Iterator[OrderData]:
+    """
+    Прочитать ордера, вытесненные из архива в файл.
+    :param path: путь к файлу архива;
+    :return: генератор OrderData в порядке вытеснения
+    """
+    with open(path) as file:
+        for line in file:
+            record = ujson.loads(line)
+            record['type'] = enums.OrderType(record['type'])
+            record['side'] = enums.OrderSide(record['side'])
+            record['state'] = enums.OrderState(record['state'])
+            yield OrderData(**record)
@@ -1,11 +1,20 @@
+from typing import Callable
+
 from testing_core.models.balance import Balance
+from testing_core.store.notifier import StateNotifier
 
 
 class BalancesState(object):
     """
     Класс для хранения баланса аккаунта на бирже по различным ассетам.
     """
-    balances: dict[str: Balance] = {}
+    balances: dict[str: Balance]
+
+    def __init__(self):
+        self.balances = {}
+        # количество полученных обновлений баланса
+        self.updates_count = 0
+        self._notifier = StateNotifier()
 
     def update(self, balances: dict[str: Balance]):
         """
@@ -15,6 +24,37 @@ class BalancesState(object):
         """
         for asset, balance in balances.items():
             self.balances[asset] = balance
+        self.updates_count += 1
+        self._notifier.notify()
+
+    async def wait_ready(self, assets: list[str] = None, timeout: float = None) -> bool:
+        """
+        Дождаться получения балансов.
+        :param assets: ассеты, по которым должен быть получен баланс (по умолчанию достаточно любого баланса);
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если балансы получены. False, если истекло время ожидания
+        """
+        if assets is None:
+            return await self._notifier.wait_for(lambda: self.balances != {}, timeout=timeout)
+        return await self._notifier.wait_for(lambda: all(asset in self.balances for asset in assets), timeout=timeout)
+
+    async def wait_for_update(self, timeout: float = None) -> bool:
+        """
+        Дождаться следующего обновления баланса.
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если пришло обновление. False, если истекло время ожидания
+        """
+        updates_count = self.updates_count
+        return await self._notifier.wait_for(lambda: self.updates_count > updates_count, timeout=timeout)
+
+    async def wait_for(self, predicate: Callable[[], bool], timeout: float = None) -> bool:
+        """
+        Дождаться, пока балансы будут удовлетворять условию. Условие проверяется после каждого обновления.
+        :param predicate: функция без аргументов, которая возвращает True, когда условие выполнено;
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если условие выполнено. False, если истекло время ожидания
+        """
+        return await self._notifier.wait_for(predicate, timeout=timeout)
 
     def __getitem__(self, asset: str) -> Balance:
         """
@@ -1,4 +1,10 @@
-from testing_core.models.orderbook import Orderbook
+from typing import Iterable
+
+from testing_core.metrics.orderbook_latency import OrderbookLatencyTracer
+from testing_core.models.compact_orderbook import CompactOrderbook
+from testing_core.models.orderbook import Orderbook, OrderbookDelta
+from testing_core.store.incremental_orderbook import IncrementalOrderbook
+from testing_core.store.notifier import StateNotifier
 from testing_core.utils import get_micro_timestamp
 
 
@@ -6,20 +12,101 @@ class OrderbookState(object):
     """
     Класс для хранения актуального ордербука.
     """
-    orderbooks: dict[str, Orderbook] = {}
-    last_update_timestamp: int
+    orderbooks: dict[str, Orderbook | CompactOrderbook | IncrementalOrderbook]
+    last_update_timestamp: int | None
+
+    def __init__(self, tracer: OrderbookLatencyTracer = None):
+        """
+        :param tracer: трассировка задержек доставки ордербуков. Опционально;
+        """
+        self.orderbooks = {}
+        self.last_update_timestamp = None
+        # количество полученных обновлений по символам
+        self._updates_count: dict[str, int] = {}
+        self._notifier = StateNotifier()
+        self._tracer = tracer
 
-    def update(self, orderbook: Orderbook):
+    def update(self, orderbook: Orderbook | CompactOrderbook):
         """
         Обновить ордербук.
 
-        :param update_timestamp: timestamp обновления ордербука на бирже
-        :param orderbook: актуальный ордербук.
+        :param orderbook: актуальный ордербук (Orderbook или CompactOrderbook).
         """
         self.orderbooks[orderbook.symbol] = orderbook
         self.last_update_timestamp = orderbook.timestamp
+        self._updates_count[orderbook.symbol] = self._updates_count.get(orderbook.symbol, 0) + 1
+        if self._tracer is not None:
+            self._tracer.on_visible(orderbook)
+        self._notifier.notify()
+
+    def apply_delta(self, delta: OrderbookDelta) -> bool:
+        """
+        Применить инкрементальное обновление к ордербуку. При первом обновлении ордербук по символу
+        становится IncrementalOrderbook, начальным состоянием служит последний полученный снапшот.
+
+        :param delta: инкрементальное обновление ордербука.
+        :return: True, если обновление применено. False, если обновление не применено: снапшота по символу еще нет,
+         обновление запоздало или повторяется (отбрасывается) или ордербук рассинхронизирован. Нужно ли запросить
+         снапшот, показывает is_desynced.
+        """
+        orderbook = self.orderbooks.get(delta.symbol)
+        if orderbook is None:
+            return False
+        if not isinstance(orderbook, IncrementalOrderbook):
+            orderbook = IncrementalOrderbook(snapshot=orderbook)
+            self.orderbooks[delta.symbol] = orderbook
+        if not orderbook.apply(delta):
+            return False
+        self.last_update_timestamp = orderbook.timestamp
+        self._updates_count[delta.symbol] += 1
+        if self._tracer is not None:
+            self._tracer.on_visible(delta)
+        self._notifier.notify()
+        return True
+
+    def is_desynced(self, symbol: str) -> bool:
+        """
+        Проверить, нужен ли снапшот ордербука, чтобы применять инкрементальные обновления.
+        :param symbol: символ торговой пары;
+        :return: True, если снапшота по символу еще нет или ордербук рассинхронизирован (пропущено обновление)
+        """
+        orderbook = self.orderbooks.get(symbol)
+        if orderbook is None:
+            return True
+        return isinstance(orderbook, IncrementalOrderbook) and orderbook.is_desynced
+
+    def updates_count(self, symbol: str = None) -> int:
+        """
+        Количество полученных обновлений ордербука.
+        :param symbol: символ торговой пары (по умолчанию - сумма по всем символам);
+        :return: int
+        """
+        if symbol is None:
+            return sum(self._updates_count.values())
+        return self._updates_count.get(symbol, 0)
+
+    async def wait_for_symbols(self, symbols: Iterable[str], timeout: float = None) -> bool:
+        """
+        Дождаться, пока будут получены ордербуки по всем символам.
+        :param symbols: символы торговых пар;
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если ордербуки получены. False, если истекло время ожидания
+        """
+        symbols = set(symbols)
+        return await self._notifier.wait_for(lambda: symbols.issubset(self.orderbooks.keys()), timeout=timeout)
+
+    async def wait_for_update(self, symbol: str = None, count: int = 1, timeout: float = None) -> bool:
+        """
+        Дождаться следующих обновлений ордербука.
+        :param symbol: символ торговой пары (по умолчанию - обновление по любому символу);
+        :param count: количество обновлений, которые нужно дождаться;
+        :param timeout: максимальное время ожидания в секундах (по умолчанию без ограничения);
+        :return: True, если пришло нужное количество обновлений. False, если истекло время ожидания
+        """
+        expected_count = self.updates_count(symbol) + count
+        return await self._notifier.wait_for(lambda: self.updates_count(symbol) >= expected_count, timeout=timeout)
 
-    def __getitem__(self, symbol: str) -> Orderbook:
+    def __getitem__(self, symbol: str) -> Orderbook | CompactOrderbook | IncrementalOrderbook:
         """
         Получить ордербук по символу.
         :param symbol: символ торговой пары;
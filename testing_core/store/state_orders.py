@@ -1,16 +1,61 @@
 import logging
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Callable, Mapping
 
 from testing_core import enums
 from testing_core.order.order import Order, OrderData, OrderUpdatable
+from testing_core.store.order_archive import OrderArchive
 
 logger = logging.getLogger(__name__)
 
+# пустое представление для отсутствующих значений индексов
+_EMPTY: Mapping[str, OrderUpdatable] = MappingProxyType({})
+
+# состояния завершенных ордеров, которые переносятся в архив
+TERMINAL_STATES = (enums.OrderState.CLOSED, enums.OrderState.CANCELED, enums.OrderState.ERROR)
+
+
 class OrdersState(object):
     """
-    Класс для хранения и обновления состояний ордеров
+    Класс для хранения и обновления состояний ордеров.
+
+    Кроме словаря ордеров по core_order_id поддерживаются индексы по символу, состоянию, стороне и id ордера
+    на бирже. Индексы обновляются при добавлении, обновлении, смене состояния и удалении ордеров, поэтому выборки
+    по ним не требуют просмотра всех ордеров. Состояние ордеров нужно изменять через OrdersState (update,
+    set_orders_state), иначе индекс по состоянию не будет обновлен.
+
+    Если задан retention_delay, завершенные ордера (TERMINAL_STATES) через retention_delay секунд переносятся
+    из хранимых ордеров в ограниченный архив (OrderArchive). Обновления по ордерам из архива применяются к ним,
+    а если ордер снова стал активным, он возвращается в хранимые ордера.
     """
-    def __init__(self):
+    def __init__(self,
+                 state_changed_callback: Callable[[OrderData, enums.OrderState], None] = None,
+                 retention_delay: float = None,
+                 archive_size: int = 10_000,
+                 archive_path: str = None):
+        """
+        :param state_changed_callback: вызывается с ордером и его предыдущим состоянием, если состояние ордера
+        изменилось при обновлении. Опционально;
+        :param retention_delay: через сколько секунд завершенный ордер переносится в архив. None - не переносить;
+        :param archive_size: максимальное количество ордеров в архиве;
+        :param archive_path: файл, в который дописываются вытесненные из архива ордера (JSON lines). Опционально;
+        """
         self._orders: dict[str: OrderUpdatable] = {}
+        self._state_changed_callback = state_changed_callback
+        # индексы: значение -> ордера по core_order_id (словари сохраняют порядок добавления ордеров)
+        self._by_symbol: dict[str, dict[str, OrderUpdatable]] = {}
+        self._by_state: dict[enums.OrderState, dict[str, OrderUpdatable]] = {}
+        self._by_side: dict[enums.OrderSide, dict[str, OrderUpdatable]] = {}
+        self._by_symbol_state: dict[tuple[str, enums.OrderState], dict[str, OrderUpdatable]] = {}
+        self._by_exchange_order_id: dict[str, OrderUpdatable] = {}
+        # перенос завершенных ордеров в архив
+        self._retention_delay = retention_delay
+        self._archive = OrderArchive(max_size=archive_size, spill_path=archive_path)
+        # очередь (время переноса, id) в порядке завершения ордеров и время переноса по id
+        self._expiration_queue: deque[tuple[float, str]] = deque()
+        self._expiration_times: dict[str, float] = {}
 
     def add_order(self, *orders: OrderUpdatable):
         """
@@ -19,7 +64,12 @@ class OrdersState(object):
         :param order: ордер, который нужно добавить;
         """
         for order in orders:
+            if order.core_order_id in self._orders:
+                self._unindex(self._orders[order.core_order_id])
+            else:
+                self._archive.pop(order.core_order_id)
             self._orders[order.core_order_id] = order
+            self._index(order)
 
     def remove_order(self, order: OrderData) -> bool:
         """
@@ -28,23 +78,74 @@ class OrdersState(object):
         :param order: ордер, который нужно удалить;
         :return: False если ордера не было среди хранимых. True если ордер был успешно удален.
         """
-        if order.core_order_id in self._orders:
-            del self._orders[order.core_order_id]
+        if stored := self._orders.pop(order.core_order_id, None):
+            self._unindex(stored)
+            self._expiration_times.pop(order.core_order_id, None)
             return True
-        return False
+        return self._archive.pop(order.core_order_id) is not None
 
     def update(self, orders: list[OrderData]):
         """
-        Обновить данные по ордерам. Обновляет только те ордера, которые есть среди хранимых.
+        Обновить данные по ордерам. Обновляет только те ордера, которые есть среди хранимых или в архиве.
+        Перед обновлением в архив переносятся завершенные ордера, время хранения которых истекло.
 
         :param orders: список из данных по ордерам;
         """
+        if self._expiration_queue:
+            self.expire()
         for order_data in orders:
             if order := self._orders.get(order_data.core_order_id):
+                previous_state = order.state
+                previous_exchange_order_id = order.exchange_order_id
                 order.update(order_data=order_data)
+                if order.state is not previous_state or order.exchange_order_id != previous_exchange_order_id:
+                    self._reindex(order, previous_state, previous_exchange_order_id)
+                if self._state_changed_callback is not None and order.state != previous_state:
+                    self._state_changed_callback(order, previous_state)
+            elif order := self._archive.get(order_data.core_order_id):
+                self._update_archived(order, order_data)
             else:
                 logger.warning(f'Unknown order with id: {order_data.core_order_id}')
 
+    def expire(self, now: float = None) -> int:
+        """
+        Перенести в архив завершенные ордера, время хранения которых истекло.
+        :param now: текущее время (time.monotonic), по умолчанию берется текущее;
+        :return: количество перенесенных ордеров
+        """
+        now = time.monotonic() if now is None else now
+        queue, expiration_times = self._expiration_queue, self._expiration_times
+        count = 0
+        while queue and queue[0][0] <= now:
+            expiration_time, order_id = queue.popleft()
+            # ордер мог быть удален, снова стать активным или завершиться повторно (тогда в очереди есть
+            # более поздняя запись)
+            if expiration_times.get(order_id) != expiration_time:
+                continue
+            del expiration_times[order_id]
+            order = self._orders.get(order_id)
+            if order is None or order.state not in TERMINAL_STATES:
+                continue
+            del self._orders[order_id]
+            self._unindex(order)
+            self._archive.add(order)
+            count += 1
+        return count
+
+    def _update_archived(self, order: OrderUpdatable, order_data: OrderData) -> None:
+        """
+        Применить запоздавшее обновление к ордеру из архива. Если ордер снова стал активным, он возвращается
+        в хранимые ордера.
+        """
+        previous_state = order.state
+        order.update(order_data=order_data)
+        if order.state not in TERMINAL_STATES:
+            self._archive.pop(order.core_order_id)
+            self._orders[order.core_order_id] = order
+            self._index(order)
+        if self._state_changed_callback is not None and order.state != previous_state:
+            self._state_changed_callback(order, previous_state)
+
     def set_orders_state(self, *orders: OrderData, state: enums.OrderState) -> None:
         """
         Установить новое состояние для одного или нескольких ордеров:
@@ -53,16 +154,172 @@ class OrdersState(object):
         """
         for order_data in orders:
             if order := self._orders.get(order_data.core_order_id):
+                previous_state = order.state
                 order.state = state
+                if state is not previous_state:
+                    self._reindex(order, previous_state, order.exchange_order_id)
+                order.notify_state_changed()
+                if self._state_changed_callback is not None and state != previous_state:
+                    self._state_changed_callback(order, previous_state)
 
     def reset(self):
         """
         Сбросить состояние: Удалить все хранимые ордера.
         """
         self._orders.clear()
+        # словари индексов очищаются, а не удаляются, чтобы выданные представления оставались актуальными
+        for index in (self._by_symbol, self._by_state, self._by_side, self._by_symbol_state):
+            for orders in index.values():
+                orders.clear()
+        self._by_exchange_order_id.clear()
+        self._archive.clear()
+        self._expiration_queue.clear()
+        self._expiration_times.clear()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    @property
+    def orders(self) -> Mapping[str, OrderUpdatable]:
+        """
+        Получить ордера, хранимые в экземпляре (представление только для чтения, без копирования). Представления
+        (в том числе by_symbol, by_state и by_side) отражают последующие изменения, для перебора с изменением
+        ордеров нужна копия (dict(...)).
+        """
+        return MappingProxyType(self._orders)
 
     @property
-    def orders(self):
-        """Получить копию ордеров, хранимых в экземпляре."""
-        return self._orders.copy()
+    def archive(self) -> OrderArchive:
+        """Архив завершенных ордеров"""
+        return self._archive
+
+    def close(self) -> None:
+        """Закрыть файл архива"""
+        self._archive.close()
+
+    def by_symbol(self, symbol: str) -> Mapping[str, OrderUpdatable]:
+        """Ордера по символу (представление только для чтения)"""
+        return self._view(self._by_symbol, symbol)
+
+    def by_state(self, state: enums.OrderState) -> Mapping[str, OrderUpdatable]:
+        """Ордера в состоянии (представление только для чтения)"""
+        return self._view(self._by_state, state)
+
+    def by_side(self, side: enums.OrderSide) -> Mapping[str, OrderUpdatable]:
+        """Ордера по стороне (представление только для чтения)"""
+        return self._view(self._by_side, side)
+
+    def by_exchange_order_id(self, exchange_order_id: str) -> OrderUpdatable | None:
+        """Ордер по id на бирже (GateOrderInfo.id) или None"""
+        return self._by_exchange_order_id.get(exchange_order_id)
+
+    def select(self,
+               symbol: str = None,
+               state: enums.OrderState = None,
+               side: enums.OrderSide = None) -> list[OrderUpdatable]:
+        """
+        Выбрать ордера по нескольким условиям (например, открытые ордера по BTC/USDT). Выборка по символу
+        и состоянию берется из индекса целиком, в остальных случаях просматривается наименьший из подходящих
+        индексов.
+        :param symbol: символ, опционально;
+        :param state: состояние, опционально;
+        :param side: сторона, опционально;
+        :return: список ордеров в порядке добавления
+        """
+        if symbol is not None and state is not None:
+            orders = self._by_symbol_state.get((symbol, state), _EMPTY)
+            if side is None:
+                return list(orders.values())
+            return [order for order in orders.values() if order.side == side]
+        candidates = []
+        if symbol is not None:
+            candidates.append(self._by_symbol.get(symbol, _EMPTY))
+        if state is not None:
+            candidates.append(self._by_state.get(state, _EMPTY))
+        if side is not None:
+            candidates.append(self._by_side.get(side, _EMPTY))
+        if not candidates:
+            return list(self._orders.values())
+        smallest = min(candidates, key=len)
+        return [order for order in smallest.values()
+                if (symbol is None or order.symbol == symbol)
+                and (state is None or order.state == state)
+                and (side is None or order.side == side)]
+
+    @staticmethod
+    def _view(index: dict, key) -> Mapping[str, OrderUpdatable]:
+        # словарь индекса создается заранее, чтобы представление отражало и ордера, добавленные позже
+        return MappingProxyType(index.setdefault(key, {}))
+
+    def _index(self, order: Order) -> None:
+        order_id = order.core_order_id
+        _insert(self._by_symbol, order.symbol, order_id, order)
+        _insert(self._by_state, order.state, order_id, order)
+        _insert(self._by_symbol_state, (order.symbol, order.state), order_id, order)
+        _insert(self._by_side, order.side, order_id, order)
+        if order.exchange_order_id is not None:
+            self._by_exchange_order_id[order.exchange_order_id] = order
+        if order.state in TERMINAL_STATES:
+            self._schedule_expiration(order_id)
+
+    def _schedule_expiration(self, order_id: str) -> None:
+        """Запланировать перенос завершенного ордера в архив"""
+        if self._retention_delay is None:
+            return
+        expiration_time = time.monotonic() + self._retention_delay
+        self._expiration_times[order_id] = expiration_time
+        self._expiration_queue.append((expiration_time, order_id))
+
+    def _unindex(self, order: Order) -> None:
+        order_id = order.core_order_id
+        # словари индексов не удаляются, даже если становятся пустыми (символов, состояний и сторон немного),
+        # чтобы выданные представления оставались актуальными
+        del self._by_symbol[order.symbol][order_id]
+        del self._by_side[order.side][order_id]
+        self._unindex_state(order)
+        if order.exchange_order_id is not None and self._by_exchange_order_id.get(order.exchange_order_id) is order:
+            del self._by_exchange_order_id[order.exchange_order_id]
+
+    def _unindex_state(self, order: Order, state: enums.OrderState = None) -> None:
+        """
+        Удалить ордер из индексов по состоянию. Если ордера нет в индексе указанного состояния (состояние было
+        изменено не через OrdersState), он удаляется из индексов всех состояний.
+        """
+        order_id = order.core_order_id
+        state = order.state if state is None else state
+        if self._by_state.get(state, _EMPTY).get(order_id) is order:
+            del self._by_state[state][order_id]
+            del self._by_symbol_state[order.symbol, state][order_id]
+            return
+        for state, orders in self._by_state.items():
+            orders.pop(order_id, None)
+            self._by_symbol_state.get((order.symbol, state), {}).pop(order_id, None)
+
+    def _reindex(self, order: Order, previous_state: enums.OrderState, previous_exchange_order_id: str | None):
+        """
+        Обновить индексы по состоянию и id на бирже после изменения ордера (символ и сторона не меняются).
+        :param order: измененный ордер;
+        :param previous_state: состояние до изменения;
+        :param previous_exchange_order_id: id на бирже до изменения;
+        """
+        order_id = order.core_order_id
+        if order.state is not previous_state:
+            self._unindex_state(order, previous_state)
+            _insert(self._by_state, order.state, order_id, order)
+            _insert(self._by_symbol_state, (order.symbol, order.state), order_id, order)
+            if order.state in TERMINAL_STATES:
+                self._schedule_expiration(order_id)
+        if order.exchange_order_id != previous_exchange_order_id:
+            if previous_exchange_order_id is not None and \
+                    self._by_exchange_order_id.get(previous_exchange_order_id) is order:
+                del self._by_exchange_order_id[previous_exchange_order_id]
+            if order.exchange_order_id is not None:
+                self._by_exchange_order_id[order.exchange_order_id] = order
+
 
+def _insert(index: dict, key, order_id: str, order: OrderUpdatable) -> None:
+    """Добавить ордер в индекс (словарь для значения создается при первом ордере)"""
+    orders = index.get(key)
+    if orders is None:
+        orders = index[key] = {}
+    orders[order_id] = order
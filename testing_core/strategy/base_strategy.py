@@ -4,6 +4,7 @@ from abc import ABC, abstractmethod
 from testing_core.config import Market
 from testing_core.store.state_balances import BalancesState
 from testing_core.store.state_orderbook import OrderbookState
+from testing_core.strategy.resources import StrategyResources
 from testing_core.trader.trader import Trader
 
 
@@ -17,6 +18,9 @@ class Strategy(ABC):
     """
     # имя стратегии
     name: str
+    # ресурсы аккаунта, которые использует стратегия (для параллельного запуска, см. StrategyScheduler).
+    # По умолчанию стратегия выставляет ордера по любым парам и использует баланс монопольно
+    resources: StrategyResources = StrategyResources()
 
     def __init__(self, trader: Trader, markets: dict[str, Market], assets: list[str]):
         # trader предназначен для взаимодействия с биржей через гейт
@@ -0,0 +1,42 @@
+class StrategyResources(object):
+    """
+    Ресурсы аккаунта, которые использует стратегия. По ним StrategyScheduler определяет, какие стратегии можно
+    запускать одновременно на одном Trader, а какие нужно запускать по очереди.
+    """
+
+    def __init__(self, markets: set[str] | None = None, exclusive_balance: bool = True):
+        """
+        :param markets: торговые пары, по которым стратегия выставляет ордера. None - любые пары конфигурации,
+        пустое множество - стратегия не выставляет ордера (только читает ордербуки и балансы);
+        :param exclusive_balance: если True, стратегии нужен баланс аккаунта целиком (например, она отменяет все
+        ордера аккаунта или проверяет, что средства не заблокированы). Такая стратегия не запускается одновременно
+        со стратегиями, которые выставляют ордера;
+        """
+        self.markets = markets
+        self.exclusive_balance = exclusive_balance
+
+    @property
+    def is_trading(self) -> bool:
+        """Стратегия выставляет ордера"""
+        return self.markets is None or bool(self.markets)
+
+    def conflicts_with(self, other: 'StrategyResources') -> bool:
+        """
+        Проверить, конфликтуют ли ресурсы двух стратегий (их нельзя запускать одновременно).
+        :param other: ресурсы другой стратегии;
+        :return: bool
+        """
+        if self.exclusive_balance and (other.is_trading or other.exclusive_balance):
+            return True
+        if other.exclusive_balance and self.is_trading:
+            return True
+        if not self.is_trading or not other.is_trading:
+            return False
+        return self.markets is None or other.markets is None or bool(self.markets & other.markets)
+
+    def __repr__(self):
+        return f'StrategyResources(markets={self.markets}, exclusive_balance={self.exclusive_balance})'
+
+
+# стратегия, которая только читает ордербуки и балансы и может работать одновременно с любыми стратегиями
+READ_ONLY = StrategyResources(markets=set(), exclusive_balance=False)
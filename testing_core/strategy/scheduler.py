@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import Type
+
+from testing_core import enums
+from testing_core.config import Configuration
+from testing_core.order.order import OrderUpdatable
+from testing_core.strategy.base_strategy import Strategy
+from testing_core.strategy.resources import StrategyResources
+from testing_core.trader.trader import Trader
+from testing_core.utils import order_id_namespace
+
+logger = logging.getLogger(__name__)
+
+# состояния ордеров, которые не нужно отменять
+_INACTIVE_STATES = (enums.OrderState.UNPLACED, enums.OrderState.CLOSED, enums.OrderState.CANCELED,
+                    enums.OrderState.ERROR)
+
+
+class StrategyTrader(object):
+    """
+    Trader стратегии, запущенной StrategyScheduler. Ордера стратегии создаются в ее пространстве имен id
+    (order_id_namespace), orders возвращает только ордера стратегии, а cancel_all_orders стратегии без монопольного
+    баланса отменяет только ее ордера. Остальные атрибуты берутся из общего Trader.
+    """
+
+    def __init__(self, trader: Trader, namespace: str, resources: StrategyResources):
+        """
+        :param trader: общий Trader;
+        :param namespace: пространство имен id ордеров стратегии;
+        :param resources: ресурсы стратегии;
+        """
+        self._trader = trader
+        self._namespace = namespace
+        self._resources = resources
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    @property
+    def orders(self) -> dict[str, OrderUpdatable]:
+        """
+        Получить копию ордеров стратегии по id.
+        :return: ордера
+        """
+        return {order_id: order for order_id, order in self._trader.orders.items()
+                if order_id.startswith(self._namespace)}
+
+    def cancel_all_orders(self) -> None:
+        """
+        Отменить все ордера аккаунта (если стратегия использует баланс монопольно) или только ордера стратегии.
+        """
+        if self._resources.exclusive_balance:
+            self._trader.cancel_all_orders()
+            return
+        orders = [order for order in self.orders.values() if order.state not in _INACTIVE_STATES]
+        if orders:
+            self._trader.cancel_orders(*orders)
+
+    def release(self) -> None:
+        """
+        Удалить ордера стратегии из общего Trader (после завершения стратегии).
+        """
+        self._trader.remove_orders(*self.orders.values())
+
+    def __getattr__(self, name: str):
+        return getattr(self._trader, name)
+
+
+class StrategyScheduler(object):
+    """
+    Планировщик для одновременного запуска стратегий на одном Trader (каждая стратегия - отдельная задача asyncio).
+
+    Стратегии запускаются в переданном порядке. Стратегия запускается, если ее ресурсы (Strategy.resources)
+    не конфликтуют с ресурсами работающих стратегий и стратегий, стоящих в очереди перед ней. Поэтому
+    конфликтующие стратегии выполняются по очереди и в исходном порядке, а независимые (например, только читающие
+    ордербуки) - одновременно с ними.
+    """
+
+    def __init__(self, trader: Trader, config: Configuration):
+        """
+        :param trader: общий Trader, цикл обработки подписок которого уже запущен;
+        :param config: конфигурация;
+        """
+        self._trader = trader
+        self._config = config
+
+    async def run(self, *strategy_types: Type[Strategy]) -> None:
+        """
+        Запустить стратегии и дождаться их завершения. Если стратегия завершилась с исключением, остальные
+        стратегии отменяются, а исключение пробрасывается.
+        :param strategy_types: классы стратегий;
+        """
+        pending = list(enumerate(strategy_types))
+        running: dict[asyncio.Task, Type[Strategy]] = {}
+        try:
+            while pending or running:
+                for position, (index, strategy_type) in enumerate(list(pending)):
+                    blocking = list(running.values()) + [other for _, other in pending[:position]]
+                    if any(strategy_type.resources.conflicts_with(other.resources) for other in blocking):
+                        continue
+                    pending.remove((index, strategy_type))
+                    running[asyncio.create_task(self._run_strategy(index, strategy_type))] = strategy_type
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    del running[task]
+                    task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def _run_strategy(self, index: int, strategy_type: Type[Strategy]) -> None:
+        """
+        Запустить стратегию в ее пространстве имен id ордеров (задача asyncio выполняется в своей копии контекста,
+        поэтому пространство имен не влияет на другие стратегии). Пространство имен состоит из символов,
+        допустимых в clientOrderId бирж, и заканчивается разделителем, чтобы s1- не было началом s10-.
+        """
+        namespace = f's{index}-'
+        order_id_namespace.set(namespace)
+        trader = StrategyTrader(trader=self._trader, namespace=namespace, resources=strategy_type.resources)
+        strategy = strategy_type(trader=trader, markets=self._config.markets, assets=self._config.assets)
+        logger.info(f'Start strategy "{strategy.name}" (order id namespace "{namespace}"): {strategy.__doc__}')
+        try:
+            await strategy.execute(
+                trader=trader,
+                orderbooks=self._trader.orderbooks,
+                balances=self._trader.balances
+            )
+        finally:
+            trader.release()
+        logger.info(f'Strategy "{strategy.name}" finished.')
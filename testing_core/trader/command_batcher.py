@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from typing import Callable
+
+from testing_core import enums
+from testing_core.formatter.formatter import Formatter
+from testing_core.formatter.prepared_command import PreparedCommand
+from testing_core.models.message import Message
+from testing_core.order.order import OrderData
+
+logger = logging.getLogger(__name__)
+
+
+class CommandBatcher(object):
+    """
+    Пакетная отправка команд по ордерам. Команды create_orders, cancel_orders и get_orders, вызванные в течение
+    одного прохода event loop (или в течение окна batch_window_us микросекунд), объединяются: подряд идущие
+    команды с одним action отправляются одним сообщением, поэтому сообщение форматируется и сериализуется
+    один раз на группу, а не на каждую команду.
+
+    Порядок отправки:
+    - объединяются только подряд идущие команды с одинаковым action: create A, cancel B, create C отправляются
+      тремя сообщениями в том же порядке, create A, create B - одним сообщением [A, B];
+    - ордера внутри сообщения идут в порядке вызова;
+    - остальные команды (publish) сначала отправляют накопленные команды, затем отправляются сами, поэтому
+      общий порядок команд сохраняется;
+    - без работающего event loop команды отправляются сразу.
+    """
+    BATCHED_ACTIONS = (enums.Action.CREATE_ORDERS, enums.Action.CANCEL_ORDERS, enums.Action.GET_ORDERS)
+
+    def __init__(self,
+                 formatter: Formatter,
+                 publish_function: Callable[[Message | PreparedCommand], None],
+                 batch_window_us: int = 0,
+                 published_callback: Callable[[enums.Action, tuple[OrderData]], None] = None):
+        """
+        :param formatter: форматтер команд;
+        :param publish_function: функция отправки сообщения (Communicator.publish);
+        :param batch_window_us: окно накопления команд в микросекундах. 0 - до конца текущего прохода event loop;
+        :param published_callback: вызывается с action и ордерами после отправки пакета. Опционально;
+        """
+        self._formatter = formatter
+        self._publish_function = publish_function
+        self._published_callback = published_callback
+        self._batch_window = batch_window_us / 1_000_000
+        self._format_functions: dict[enums.Action, Callable[[tuple[OrderData]], Message | PreparedCommand]] = {
+            enums.Action.CREATE_ORDERS: formatter.format_create_orders,
+            enums.Action.CANCEL_ORDERS: formatter.format_cancel_orders,
+            enums.Action.GET_ORDERS: formatter.format_get_orders,
+        }
+        # накопленные группы команд: action и ордера
+        self._groups: list[tuple[enums.Action, list[OrderData]]] = []
+        self._flush_handle: asyncio.Handle | None = None
+        # количество команд, которые были добавлены, и количество отправленных сообщений
+        self.commands_count: int = 0
+        self.messages_count: int = 0
+
+    def add(self, action: enums.Action, orders: tuple[OrderData]) -> None:
+        """
+        Добавить команду по ордерам в пакет.
+        :param action: create_orders, cancel_orders или get_orders;
+        :param orders: ордера команды;
+        """
+        if action not in self._format_functions:
+            raise ValueError(f'Action {action} can not be batched')
+        self.commands_count += 1
+        if self._groups and self._groups[-1][0] == action:
+            self._groups[-1][1].extend(orders)
+        else:
+            self._groups.append((action, list(orders)))
+        self._schedule_flush()
+
+    def publish(self, message: Message | PreparedCommand) -> None:
+        """
+        Отправить команду, которая не объединяется с другими. Накопленные команды отправляются перед ней.
+        :param message: команда;
+        """
+        self.flush()
+        self.commands_count += 1
+        self._send(message)
+
+    def flush(self) -> None:
+        """
+        Отправить накопленные команды.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        groups, self._groups = self._groups, []
+        for action, orders in groups:
+            orders = tuple(orders)
+            try:
+                self._send(self._format_functions[action](orders))
+                if self._published_callback is not None:
+                    self._published_callback(action, orders)
+            except Exception as e:
+                logger.error(f'Failed to publish batch of {action} for {len(orders)} orders. Exception: {e}',
+                             exc_info=True)
+
+    @property
+    def pending_count(self) -> int:
+        """Количество ордеров в накопленных командах"""
+        return sum(len(orders) for _, orders in self._groups)
+
+    def _send(self, message: Message | PreparedCommand) -> None:
+        self.messages_count += 1
+        self._publish_function(message)
+
+    def _schedule_flush(self) -> None:
+        """Запланировать отправку накопленных команд (или отправить сразу, если event loop не запущен)"""
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._batch_window > 0:
+            self._flush_handle = loop.call_later(self._batch_window, self.flush)
+        else:
+            self._flush_handle = loop.call_soon(self.flush)
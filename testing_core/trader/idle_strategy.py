@@ -0,0 +1,177 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable, Awaitable
+
+from testing_core import enums
+from testing_core.config import Configuration
+
+
+class IdleStrategy(ABC):
+    """
+    Стратегия ожидания в цикле обработки подписок (по аналогии с idle strategy в Aeron).
+    После каждого прохода по подпискам цикл вызывает idle с количеством прочитанных фрагментов,
+    стратегия решает, продолжить опрос сразу, передать управление event loop или подождать.
+
+    Ожидание реализовано через asyncio.sleep, поэтому его точность ограничена точностью селектора event loop
+    (для epoll - 1 мс).
+    """
+
+    @abstractmethod
+    async def idle(self, work_count: int) -> None:
+        """
+        Выполнить ожидание после прохода по подпискам.
+        :param work_count: количество фрагментов, прочитанных за проход;
+        """
+        ...
+
+    def reset(self) -> None:
+        """
+        Сбросить состояние стратегии.
+        """
+        pass
+
+
+class BusySpinIdleStrategy(IdleStrategy):
+    """
+    Постоянный опрос без ожидания. Управление передается event loop только раз в max_busy_polls проходов,
+    чтобы могли выполняться стратегии. Минимальная задержка, но ядро процессора загружено полностью.
+    """
+
+    def __init__(self, max_busy_polls: int = 10):
+        """
+        :param max_busy_polls: количество проходов, после которого управление передается event loop;
+        """
+        self._max_busy_polls = max_busy_polls
+        self._polls = 0
+
+    async def idle(self, work_count: int) -> None:
+        self._polls += 1
+        if self._polls >= self._max_busy_polls:
+            self._polls = 0
+            await asyncio.sleep(0)
+
+    def reset(self) -> None:
+        self._polls = 0
+
+
+class YieldingIdleStrategy(IdleStrategy):
+    """
+    Передача управления event loop после каждого прохода, без ожидания.
+    """
+
+    async def idle(self, work_count: int) -> None:
+        await asyncio.sleep(0)
+
+
+class BackoffIdleStrategy(IdleStrategy):
+    """
+    Стратегия с постепенным переходом к ожиданию (как BackoffIdleStrategy в Aeron):
+    пока сообщения есть, опрос продолжается сразу (управление передается event loop раз в max_busy_polls проходов);
+    после пустых проходов - max_spins проходов без передачи управления, затем max_yields проходов с передачей
+    управления без ожидания, затем ожидание, которое удваивается от min_park_period до max_park_period.
+    Любой проход с сообщениями возвращает стратегию в начальное состояние.
+    """
+
+    def __init__(self,
+                 max_spins: int = 10,
+                 max_yields: int = 5,
+                 min_park_period: float = 0.0001,
+                 max_park_period: float = 0.001,
+                 max_busy_polls: int = 10):
+        """
+        :param max_spins: количество пустых проходов подряд без передачи управления event loop;
+        :param max_yields: количество пустых проходов подряд с передачей управления event loop без ожидания;
+        :param min_park_period: начальное время ожидания в секундах;
+        :param max_park_period: максимальное время ожидания в секундах;
+        :param max_busy_polls: количество проходов подряд с сообщениями, после которого управление
+         передается event loop;
+        """
+        self._max_spins = max_spins
+        self._max_yields = max_yields
+        self._min_park_period = min_park_period
+        self._max_park_period = max_park_period
+        self._max_busy_polls = max_busy_polls
+
+        self._spins = 0
+        self._yields = 0
+        self._busy_polls = 0
+        self._park_period = min_park_period
+
+    async def idle(self, work_count: int) -> None:
+        if work_count > 0:
+            self._spins = 0
+            self._yields = 0
+            self._park_period = self._min_park_period
+            self._busy_polls += 1
+            if self._busy_polls >= self._max_busy_polls:
+                self._busy_polls = 0
+                await asyncio.sleep(0)
+            return
+
+        self._busy_polls = 0
+        if self._spins < self._max_spins:
+            self._spins += 1
+        elif self._yields < self._max_yields:
+            self._yields += 1
+            await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(self._park_period)
+            self._park_period = min(self._park_period * 2, self._max_park_period)
+
+    def reset(self) -> None:
+        self._spins = 0
+        self._yields = 0
+        self._busy_polls = 0
+        self._park_period = self._min_park_period
+
+
+class WakeupIdleStrategy(IdleStrategy):
+    """
+    Ожидание пробуждения вместо опроса: после пустого прохода корутина ждет, пока источник сообщений
+    не сообщит о новых сообщениях (используется с ThreadedAeronCommunicator).
+    Пока сообщения есть, управление передается event loop раз в max_busy_polls проходов.
+    """
+
+    def __init__(self, wait_function: Callable[[], Awaitable[None]], max_busy_polls: int = 10):
+        """
+        :param wait_function: корутина, которая завершается, когда появились новые сообщения;
+        :param max_busy_polls: количество проходов подряд с сообщениями, после которого управление
+         передается event loop;
+        """
+        self._wait_function = wait_function
+        self._max_busy_polls = max_busy_polls
+        self._busy_polls = 0
+
+    async def idle(self, work_count: int) -> None:
+        if work_count > 0:
+            self._busy_polls += 1
+            if self._busy_polls >= self._max_busy_polls:
+                self._busy_polls = 0
+                await asyncio.sleep(0)
+            return
+        self._busy_polls = 0
+        await self._wait_function()
+
+    def reset(self) -> None:
+        self._busy_polls = 0
+
+
+def create_idle_strategy(config: Configuration) -> IdleStrategy:
+    """
+    Создать idle strategy по настройкам из конфигурации.
+    :param config: конфигурация ядра;
+    :return: IdleStrategy
+    """
+    match config.idle_strategy:
+        case enums.IdleStrategyType.BUSY_SPIN:
+            return BusySpinIdleStrategy(max_busy_polls=config.idle_max_busy_polls)
+        case enums.IdleStrategyType.YIELD:
+            return YieldingIdleStrategy()
+        case _:
+            return BackoffIdleStrategy(
+                max_spins=config.idle_max_spins,
+                max_yields=config.idle_max_yields,
+                min_park_period=config.idle_min_park_period,
+                max_park_period=config.idle_max_park_period,
+                max_busy_polls=config.idle_max_busy_polls
+            )
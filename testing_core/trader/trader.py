@@ -1,24 +1,38 @@
-import asyncio
 import logging
-from typing import Callable, Coroutine
+import time
+from typing import Callable, Coroutine, Mapping, Sequence
+
+import numpy as np
 
 from testing_core import enums
 from testing_core.communicator.aeron_communicator import Communicator, AeronCommunicator
+from testing_core.communicator.replay_communicator import ReplayCommunicator
+from testing_core.communicator.threaded_communicator import ThreadedAeronCommunicator
 from testing_core.config import Configuration
 from testing_core.enums import OrderType, OrderSide
 from testing_core.formatter.formatter import Formatter
+from testing_core.formatter.prepared_command import PreparedCommand
+from testing_core.metrics.order_latency import OrderLatencyTracker
+from testing_core.metrics.orderbook_latency import OrderbookLatencyTracer
 from testing_core.models.balance import Balance
 from testing_core.models.message import Message, Balances, GateOrderInfo
-from testing_core.models.orderbook import Orderbook
+from testing_core.models.compact_orderbook import CompactOrderbook
+from testing_core.models.orderbook import Orderbook, OrderbookDelta
 from testing_core.order.order import OrderData, Order, OrderUpdatable
+from testing_core.order.order_batch import OrderBatch
 from testing_core.order.order_fabric import OrderFabric
 from testing_core.store.state_balances import BalancesState
 from testing_core.store.state_orderbook import OrderbookState
 from testing_core.store.state_orders import OrdersState
-from testing_core.utils import get_uuid
+from testing_core.trader.command_batcher import CommandBatcher
+from testing_core.trader.idle_strategy import IdleStrategy, WakeupIdleStrategy, create_idle_strategy
+from testing_core.utils import get_order_id
 
 logger = logging.getLogger(__name__)
 
+# минимальный интервал между повторными запросами снапшота ордербука по одному символу (в секундах)
+SNAPSHOT_REQUEST_DELAY = 1
+
 
 class Trader(object):
     """
@@ -30,6 +44,7 @@ class Trader(object):
     _balances_state: BalancesState
     _orderbook_state: OrderbookState
     _communicator: Communicator
+    _idle_strategy: IdleStrategy
     _formatter: Formatter
 
     _order_error_callback: Callable[[OrderData], None]
@@ -40,6 +55,7 @@ class Trader(object):
                  order_error_callback: Callable[[OrderData], None] = None,
                  order_closed_callback: Callable[[OrderData], None] = None,
                  communicator: Communicator = None,
+                 idle_strategy: IdleStrategy = None,
                  ):
         """
         Класс для управления ордерами и хранения актуального баланса.
@@ -47,32 +63,76 @@ class Trader(object):
         :param communicator: Коммуникатор для связи с гейтом. Должен реализовывать интерфейс Communicator
         :param order_error_callback: Функция обратного вызова для ошибок по ордерам. Опционально.
         :param order_closed_callback: Функция обратного вызова для исполненных ордеров на бирже. Опционально.
+        :param idle_strategy: Стратегия ожидания в цикле обработки подписок. По умолчанию выбирается по конфигурации.
         """
+        # задержки доставки ордербуков по этапам (если включены в конфигурации)
+        self._orderbook_tracer: OrderbookLatencyTracer | None = None
+        if config.orderbook_latency_tracing:
+            self._orderbook_tracer = OrderbookLatencyTracer(max_traces=config.orderbook_latency_traces)
         if communicator is None:
-            communicator = AeronCommunicator(config=config,
-                                             orderbook_handler=self._handle_orderbook,
-                                             balance_handler=self._handle_balances,
-                                             core_input_handler=self._handle_core_input)
+            if config.replay_path:
+                communicator_class = ReplayCommunicator
+            elif config.polling_thread:
+                communicator_class = ThreadedAeronCommunicator
+            else:
+                communicator_class = AeronCommunicator
+            communicator = communicator_class(config=config,
+                                              orderbook_handler=self._handle_orderbook,
+                                              balance_handler=self._handle_balances,
+                                              core_input_handler=self._handle_core_input,
+                                              publish_failed_handler=self._handle_publish_failed,
+                                              orderbook_tracer=self._orderbook_tracer)
         self._communicator = communicator
-        self._orders_state = OrdersState()
+        if idle_strategy is None:
+            if isinstance(communicator, ThreadedAeronCommunicator):
+                idle_strategy = WakeupIdleStrategy(communicator.wait_new_messages, config.idle_max_busy_polls)
+            else:
+                idle_strategy = create_idle_strategy(config)
+        self._idle_strategy = idle_strategy
+        # задержки полного цикла ордеров (если включены в конфигурации)
+        self._latency_tracker: OrderLatencyTracker | None = None
+        state_changed_callback = None
+        if config.latency_tracking:
+            self._latency_tracker = OrderLatencyTracker()
+            state_changed_callback = self._latency_tracker.on_state_changed
+        self._orders_state = OrdersState(state_changed_callback=state_changed_callback,
+                                         retention_delay=config.orders_retention_delay,
+                                         archive_size=config.orders_archive_size,
+                                         archive_path=config.orders_archive_path)
         self._balances_state = BalancesState()
-        self._orderbook_state = OrderbookState()
+        self._orderbook_state = OrderbookState(tracer=self._orderbook_tracer)
         self._order_fabric = OrderFabric(
             markets=config.markets,
             place_function=self.place_orders,
             request_update_function=self.request_update_orders,
             cancel_function=self.cancel_orders,
+            integer_ticks=config.integer_ticks
         )
         self._formatter = Formatter(
             exchange=config.exchange_id,
             instance=config.instance,
             algo=config.instance,
-            node=config.node.value
+            node=config.node.value,
+            markets=config.markets if config.integer_ticks else None
         )
+        # пакетная отправка команд по ордерам (если включена в конфигурации)
+        self._command_batcher: CommandBatcher | None = None
+        if config.batch_publishing:
+            self._command_batcher = CommandBatcher(formatter=self._formatter,
+                                                   publish_function=self._communicator.publish,
+                                                   batch_window_us=config.batch_window_us,
+                                                   published_callback=self._on_orders_command_published)
 
         self._order_error_callback = order_error_callback
         self._order_closed_callback = order_closed_callback
 
+        # проверка ордеров на лимиты перед отправкой (если включена в конфигурации)
+        self._markets = config.markets
+        self._pre_publish_validation = config.pre_publish_validation
+
+        # время последнего запроса снапшота ордербука по символам
+        self._snapshot_request_times: dict[str, float] = {}
+
     def create_order(
             self,
             symbol: str,
@@ -138,7 +198,7 @@ class Trader(object):
         :return: созданный ордер
         """
         # Создаю core order id
-        core_order_id = get_uuid(prefix=id_prefix, postfix=id_postfix)
+        core_order_id = get_order_id(prefix=id_prefix, postfix=id_postfix)
 
         # Тип и сторону ордера можно передавать в функцию в виде строки
         # Для внутреннего использования преобразую строку в enum
@@ -163,6 +223,104 @@ class Trader(object):
 
         return order
 
+    def create_orders(
+            self,
+            symbols: str | Sequence[str],
+            order_type: OrderType | str,
+            sides: OrderSide | str | Sequence[OrderSide | str],
+            prices: Sequence[float] | np.ndarray,
+            amounts: Sequence[float] | np.ndarray,
+            id_prefix: str = '',
+            id_postfix: str = '',
+            enable_validating: bool = True,
+            violation_policy: enums.ViolationPolicy | str = enums.ViolationPolicy.REJECT
+    ) -> OrderBatch:
+        """
+        Создать пакет ордеров (например, сетку уровней) и разместить его на бирже одной командой create_orders.
+        Параметры и результат как в create_unplaced_orders.
+        """
+        # place_orders добавляет ордера в хранилище ордеров
+        batch = self._create_orders_batch(
+            symbols=symbols,
+            order_type=order_type,
+            sides=sides,
+            prices=prices,
+            amounts=amounts,
+            id_prefix=id_prefix,
+            id_postfix=id_postfix,
+            enable_validating=enable_validating,
+            violation_policy=violation_policy
+        )
+        if batch.orders:
+            self.place_orders(*batch.orders)
+        return batch
+
+    def create_unplaced_orders(
+            self,
+            symbols: str | Sequence[str],
+            order_type: OrderType | str,
+            sides: OrderSide | str | Sequence[OrderSide | str],
+            prices: Sequence[float] | np.ndarray,
+            amounts: Sequence[float] | np.ndarray,
+            id_prefix: str = '',
+            id_postfix: str = '',
+            enable_validating: bool = True,
+            violation_policy: enums.ViolationPolicy | str = enums.ViolationPolicy.REJECT
+    ) -> OrderBatch:
+        """
+        Создать пакет ордеров без размещения на бирже. Цены и объемы округляются и проверяются на лимиты
+        векторизованно (см. OrderFabric.create_orders), созданные ордера добавляются в хранилище ордеров за один раз.
+        :param symbols: символ валютной пары (один для всех ордеров или по одному на ордер);
+        :param order_type: тип ордеров, например limit или market;
+        :param sides: сторона ордеров, buy или sell (одна для всех ордеров или по одной на ордер);
+        :param prices: цены ордеров (список или массив numpy);
+        :param amounts: объемы ордеров (список или массив numpy);
+        :param id_prefix: префикс для id, опционально;
+        :param id_postfix: постфикс для id, опционально;
+        :param enable_validating: bool - по умолчанию True. Если True, проверять ордера на лимиты;
+        :param violation_policy: reject - отклонять ордера, которые не соответствуют лимитам, clip - ограничивать
+        цену и объем лимитами;
+        :return: OrderBatch - созданные ордера, номера отклоненных и ограниченных строк с причинами
+        """
+        batch = self._create_orders_batch(
+            symbols=symbols,
+            order_type=order_type,
+            sides=sides,
+            prices=prices,
+            amounts=amounts,
+            id_prefix=id_prefix,
+            id_postfix=id_postfix,
+            enable_validating=enable_validating,
+            violation_policy=violation_policy
+        )
+        self._orders_state.add_order(*batch.orders)
+        return batch
+
+    def _create_orders_batch(self, symbols, order_type, sides, prices, amounts, id_prefix, id_postfix,
+                             enable_validating, violation_policy) -> OrderBatch:
+        """
+        Создать пакет ордеров фабрикой (без добавления в хранилище ордеров)
+        """
+        if isinstance(order_type, str):
+            order_type = enums.OrderType(order_type)
+        if isinstance(violation_policy, str):
+            violation_policy = enums.ViolationPolicy(violation_policy)
+        if isinstance(sides, (str, OrderSide)):
+            sides = enums.OrderSide(sides)
+        else:
+            sides = [enums.OrderSide(side) for side in sides]
+        core_order_ids = [get_order_id(prefix=id_prefix, postfix=id_postfix) for _ in range(len(prices))]
+        return self._order_fabric.create_orders(
+            core_order_ids=core_order_ids,
+            symbols=symbols,
+            order_type=order_type,
+            sides=sides,
+            prices=prices,
+            amounts=amounts,
+            enable_validating=enable_validating,
+            violation_policy=violation_policy
+        )
+
     def add_orders(self, *orders: OrderUpdatable) -> None:
         """
         Добавить ордер в структуру, хранящую и обновляющую ордера.
@@ -170,6 +328,30 @@ class Trader(object):
         """
         self._orders_state.add_order(*orders)
 
+    def remove_orders(self, *orders: OrderData) -> None:
+        """
+        Удалить ордера из структуры, хранящей и обновляющей ордера (обновления по ним больше не применяются).
+        :param orders: ордера
+        """
+        for order in orders:
+            self._orders_state.remove_order(order)
+
+    @property
+    def orders(self) -> Mapping[str, OrderUpdatable]:
+        """
+        Получить хранимые ордера по id (представление только для чтения, без копирования).
+        :return: ордера
+        """
+        return self._orders_state.orders
+
+    @property
+    def orders_state(self) -> OrdersState:
+        """
+        Получить хранилище ордеров (выборки по символу, состоянию, стороне и id ордера на бирже).
+        :return: OrdersState
+        """
+        return self._orders_state
+
     @property
     def balances(self) -> BalancesState:
         """
@@ -186,15 +368,52 @@ class Trader(object):
         """
         return self._orderbook_state
 
+    @property
+    def latency(self) -> OrderLatencyTracker | None:
+        """
+        Получить задержки полного цикла ордеров (None, если измерение выключено в конфигурации).
+        :return: OrderLatencyTracker
+        """
+        return self._latency_tracker
+
+    @property
+    def orderbook_latency(self) -> OrderbookLatencyTracer | None:
+        """
+        Получить задержки доставки ордербуков по этапам (None, если трассировка выключена в конфигурации).
+        :return: OrderbookLatencyTracer
+        """
+        return self._orderbook_tracer
+
+    def latency_report(self) -> str:
+        """
+        Получить отчет о задержках полного цикла ордеров (и доставки ордербуков, если включено) в виде таблицы.
+        :return: отчет
+        """
+        if self._latency_tracker is None:
+            report = 'Order latency tracking is disabled'
+        else:
+            report = self._latency_tracker.report()
+        if self._orderbook_tracer is not None:
+            report = f'{report}\n{self._orderbook_tracer.report()}'
+        return report
+
+    def reset_session(self) -> None:
+        """
+        Подготовить Trader к запуску следующей стратегии в той же сессии: отправить накопленные команды, удалить
+        ордера предыдущей стратегии и сбросить задержки полного цикла ордеров. Подключение к гейту, ордербуки,
+        балансы и задержки доставки ордербуков сохраняются.
+        """
+        self.flush_commands()
+        self._orders_state.reset()
+        if self._latency_tracker is not None:
+            self._latency_tracker.reset()
+
     def cancel_all_orders(self) -> None:
         """
         Отменить все открытые ордера на бирже.
         """
-        command = self._formatter.format_command(
-            action=enums.Action.CANCEL_ALL_ORDERS,
-            data=None
-        )
-        self._communicator.publish(command)
+        command = self._formatter.format_cancel_all_orders()
+        self._publish(command)
 
     def place_orders(self, *orders: OrderData) -> None:
         """
@@ -202,10 +421,39 @@ class Trader(object):
         :param orders: ордера, который нужно разместить на бирже (один или несколько);
         :return: None
         """
+        if self._pre_publish_validation:
+            orders = self._reject_invalid_orders(orders)
+            if not orders:
+                return
+        if self._latency_tracker is not None:
+            self._latency_tracker.on_place(*orders)
         self.add_orders(*orders)
-        command = self._formatter.format_create_orders(orders)
         self._orders_state.set_orders_state(*orders, state=enums.OrderState.PLACING)
-        self._communicator.publish(message=command)
+        self._publish_orders_command(enums.Action.CREATE_ORDERS, orders)
+
+    def _reject_invalid_orders(self, orders: tuple[OrderData, ...]) -> tuple[OrderData, ...]:
+        """
+        Проверить ордера на лимиты перед отправкой. Ордера, которые не соответствуют лимитам, не отправляются:
+        они переводятся в состояние ERROR (как при ошибке от гейта).
+        :param orders: ордера для размещения;
+        :return: ордера, которые соответствуют лимитам
+        """
+        valid = []
+        for order in orders:
+            market = self._markets.get(order.symbol)
+            if market is None:
+                reason = enums.LimitViolationReason.UNKNOWN_SYMBOL
+            else:
+                reason = market.validator.validate_order(order)
+            if reason is None:
+                valid.append(order)
+                continue
+            logger.error(f'Order was not placed, limit violation ({reason.value}): {order}')
+            self.add_orders(order)
+            self._orders_state.set_orders_state(order, state=enums.OrderState.ERROR)
+            if self._order_error_callback is not None:
+                self._order_error_callback(order)
+        return orders if len(valid) == len(orders) else tuple(valid)
 
     def cancel_orders(self, *orders: OrderData) -> None:
         """
@@ -213,8 +461,7 @@ class Trader(object):
         :param orders: ордера, который нужно отменить (один или несколько)
         :return: None
         """
-        command = self._formatter.format_cancel_orders(orders)
-        self._communicator.publish(message=command)
+        self._publish_orders_command(enums.Action.CANCEL_ORDERS, orders)
 
     def request_update_orders(self, *orders: OrderData) -> None:
         """
@@ -222,8 +469,7 @@ class Trader(object):
         :param orders: один или несколько ордеров.
         :return: None
         """
-        command = self._formatter.format_get_orders(orders)
-        self._communicator.publish(message=command)
+        self._publish_orders_command(enums.Action.GET_ORDERS, orders)
 
     def request_update_balances(self, assets: list[str]) -> None:
         """
@@ -232,7 +478,98 @@ class Trader(object):
         :return: None
         """
         command = self._formatter.format_get_balance(assets=assets)
+        self._publish(message=command)
+
+    def request_orderbook_snapshot(self, symbols: list[str]) -> None:
+        """
+        Запросить полный ордербук (снапшот). Снапшот будет получен не сразу.
+        :param symbols: список символов торговых пар.
+        :return: None
+        """
+        command = self._formatter.format_get_orderbook(symbols=symbols)
+        self._publish(message=command)
+
+    def flush_commands(self) -> None:
+        """
+        Отправить накопленные команды сразу, не дожидаясь конца прохода event loop (при пакетной отправке).
+        :return: None
+        """
+        if self._command_batcher is not None:
+            self._command_batcher.flush()
+
+    def _publish(self, message: Message | PreparedCommand) -> None:
+        """
+        Отправить команду гейту. При пакетной отправке накопленные команды по ордерам отправляются перед ней.
+        :param message: команда.
+        :return: None
+        """
+        if self._command_batcher is not None:
+            self._command_batcher.publish(message)
+        else:
+            self._communicator.publish(message=message)
+
+    def _publish_orders_command(self, action: enums.Action, orders: tuple[OrderData]) -> None:
+        """
+        Отправить команду по ордерам (create_orders, cancel_orders или get_orders) сразу или в составе пакета.
+        :param action: action команды.
+        :param orders: ордера.
+        :return: None
+        """
+        if self._command_batcher is not None:
+            self._command_batcher.add(action, orders)
+            return
+        match action:
+            case enums.Action.CREATE_ORDERS:
+                command = self._formatter.format_create_orders(orders)
+            case enums.Action.CANCEL_ORDERS:
+                command = self._formatter.format_cancel_orders(orders)
+            case _:
+                command = self._formatter.format_get_orders(orders)
         self._communicator.publish(message=command)
+        self._on_orders_command_published(action, orders)
+
+    def _on_orders_command_published(self, action: enums.Action, orders: tuple[OrderData]) -> None:
+        """
+        Команда по ордерам передана коммуникатору (сразу или в составе пакета).
+        :param action: action команды.
+        :param orders: ордера.
+        :return: None
+        """
+        if self._latency_tracker is not None:
+            self._latency_tracker.on_publish(action, orders)
+
+    def _apply_orderbook_delta(self, delta: OrderbookDelta) -> None:
+        """
+        Применить инкрементальное обновление ордербука. Если ордербук рассинхронизирован, запросить снапшот
+        (не чаще одного раза в SNAPSHOT_REQUEST_DELAY секунд для символа). Запоздавшие и повторные обновления
+        отбрасываются без запроса снапшота.
+        :param delta: инкрементальное обновление ордербука.
+        :return: None
+        """
+        if self._orderbook_state.apply_delta(delta=delta) or not self._orderbook_state.is_desynced(delta.symbol):
+            return
+        now = time.monotonic()
+        if now - self._snapshot_request_times.get(delta.symbol, -SNAPSHOT_REQUEST_DELAY) >= SNAPSHOT_REQUEST_DELAY:
+            logger.warning(f'Orderbook {delta.symbol} is out of sync, requesting snapshot.')
+            self._snapshot_request_times[delta.symbol] = now
+            self.request_orderbook_snapshot(symbols=[delta.symbol])
+
+    def _handle_publish_failed(self, message: Message | PreparedCommand, reason: str) -> None:
+        """
+        Обработчик неотправленных команд. Ордера из неотправленной команды на создание переводятся в состояние ERROR.
+        :param message: команда, которую не удалось отправить.
+        :param reason: причина.
+        :return: None
+        """
+        logger.error(f'Command {message.action} was not published: {reason}')
+        if message.action != enums.Action.CREATE_ORDERS:
+            return
+        orders = self._orders_state.orders
+        for order_id in message.data:
+            if order := orders.get(order_id.client_order_id):
+                self._orders_state.set_orders_state(order, state=enums.OrderState.ERROR)
+                if self._order_error_callback is not None:
+                    self._order_error_callback(order)
 
     def _update_orders(self, orders: list[GateOrderInfo], is_error: bool = False) -> None:
         """
@@ -275,8 +612,10 @@ class Trader(object):
             case enums.Event.ERROR:
                 logger.warning(f'Received message of error: {message}')
             case enums.Event.DATA:
-                if isinstance(message.data, Orderbook):
+                if isinstance(message.data, (Orderbook, CompactOrderbook)):
                     self._orderbook_state.update(orderbook=message.data)
+                elif isinstance(message.data, OrderbookDelta):
+                    self._apply_orderbook_delta(delta=message.data)
                 else:
                     logger.error(f'Unexpected type of data: {message}')
             case _:
@@ -300,9 +639,14 @@ class Trader(object):
                 logger.warning(f'Unexpected event in message: {message}')
 
     async def handle_subscriptions_loop(self):
-        while True:
-            self._communicator.handle_new_messages()
-            await asyncio.sleep(0.000001)
+        self._communicator.start()
+        try:
+            while True:
+                work_count = self._communicator.handle_new_messages()
+                await self._idle_strategy.idle(work_count)
+        finally:
+            self._communicator.stop()
+            self._orders_state.close()
 
     def get_loop(self) -> Coroutine:
         return self.handle_subscriptions_loop()
@@ -4,7 +4,7 @@ from testing_core.models.message import Message
 from testing_core.order.order import OrderUpdatable
 from testing_core.order.order_fabric import OrderFabric
 from testing_core.trader.trader import Trader
-from testing_core.utils import get_uuid
+from testing_core.utils import get_order_id
 
 
 class UnsafeOrder(OrderUpdatable):
@@ -45,9 +45,7 @@ class UnsafeOrderFabric(OrderFabric):
             side=side,
             price=price,
             amount=amount,
-            place_function=self._place_function,
-            request_update_function=self._request_update_function,
-            cancel_function=self._cancel_function
+            callbacks=self._callbacks
         )
         order = self.truncate_values_to_increment(order)
         return order
@@ -67,7 +65,7 @@ class UnsafeTrader(Trader):
             generate_order_id: bool = True,
     ):
         # Создаю core order id
-        core_order_id = get_uuid(prefix=id_prefix, postfix=id_postfix)
+        core_order_id = get_order_id(prefix=id_prefix, postfix=id_postfix)
 
         # Тип и сторону ордера можно передавать в функцию в виде строки
         # Для внутреннего использования преобразую строку в enum
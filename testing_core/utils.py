@@ -1,6 +1,11 @@
 import decimal
 import time
 import uuid
+from contextvars import ContextVar
+
+# пространство имен id ордеров: префикс, который добавляется ко всем id ордеров, созданным в текущем контексте
+# (задаче asyncio). Используется при параллельном запуске стратегий (см. StrategyScheduler)
+order_id_namespace: ContextVar[str] = ContextVar('order_id_namespace', default='')
 
 
 def get_micro_timestamp() -> int:
@@ -34,6 +39,21 @@ def get_uuid(prefix: str = '', postfix: str = '') -> str:
     return f'{prefix}{uuid.uuid4().__str__()}{postfix}'
 
 
+def get_order_id(prefix: str = '', postfix: str = '') -> str:
+    """
+    Функция для генерации id ордера в пространстве имен текущего контекста (order_id_namespace).
+    Пространство имен заменяет первые символы UUID, поэтому без префикса и постфикса длина id не превышает
+    длину UUID (36 символов - ограничение clientOrderId на биржах, например на Binance).
+    :param prefix: префикс id после пространства имен (не обязательный параметр)
+    :param postfix: постфикс id (не обязательный параметр)
+    :return: id ордера в виде строки.
+    """
+    namespace = order_id_namespace.get()
+    if not namespace:
+        return get_uuid(prefix=prefix, postfix=postfix)
+    return f'{namespace}{prefix}{uuid.uuid4().__str__()[len(namespace):]}{postfix}'
+
+
 def truncate_to_increment(number: float, increment: float) -> float:
     """
     Округлить число вниз, чтобы оно соответствовало инкременту.
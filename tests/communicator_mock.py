@@ -28,16 +28,22 @@ class CommunicatorMock(Communicator):
         self.balance_handler = balance_handler
         self.core_input_handler = core_input_handler
 
-    def handle_new_messages(self):
+    def handle_new_messages(self) -> int:
         """
         Проверить наличие новых сообщений. Если они есть, вызвать их обработчики.
+        :return: количество обработанных сообщений
         """
+        count = 0
         if self.orderbooks_queue:
             self.orderbook_handler(self.orderbooks_queue.pop(len(self.orderbooks_queue) - 1))
+            count += 1
         if self.balances_queue:
             self.balance_handler(self.balances_queue.pop(len(self.balances_queue) - 1))
+            count += 1
         if self.core_input_queue:
             self.core_input_handler(self.core_input_queue.pop(len(self.core_input_queue) - 1))
+            count += 1
+        return count
 
     def publish(self, message: Message):
         """
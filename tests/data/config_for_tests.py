@@ -149,3 +149,30 @@ config_2 = Configuration(
     orderbook_depth=10,
     markets=markets_1
 )
+
+# ответ конфигуратора, из которого parse_configuration получает конфигурацию с рынками markets_1
+configurator_response_1 = {
+    'exchange': 'binance',
+    'instance': 'test',
+    'algo': 'test_algo',
+    'data': {
+        'assets_labels': [{'common': 'BTC'}, {'common': 'ETH'}, {'common': 'USDT'}],
+        'markets': [market.dict() for market in markets_1.values()],
+        'configs': {
+            'core_config': {
+                'aeron': {
+                    'publishers': {
+                        'gate_input': aeron_channels_1.gate_input.dict(),
+                        'logs': aeron_channels_1.logs.dict(),
+                    },
+                    'subscribers': {
+                        'core_input': aeron_channels_1.core_input.dict(),
+                        'orderbooks': aeron_channels_1.orderbooks.dict(),
+                        'balances': aeron_channels_1.balances.dict(),
+                    },
+                    'no_subscriber_log_delay': 10,
+                },
+            },
+        },
+    },
+}
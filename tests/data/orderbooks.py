@@ -1,6 +1,6 @@
 from testing_core import enums
 from testing_core.models.message import Message
-from testing_core.models.orderbook import Orderbook
+from testing_core.models.orderbook import Orderbook, OrderbookDelta
 
 orderbook_1 = Orderbook(
     symbol='BTC/USDT',
@@ -108,4 +108,81 @@ orderbook_4_message = Message(
     message=None,
     timestamp=1658584052032997,
     data=orderbook_4
-)
\ No newline at end of file
+)
+orderbook_5 = Orderbook(
+    symbol='BTC/USDT',
+    timestamp=1658584052033997,
+    sequence=100,
+    bids=[
+            [8724.77, 0.149594],
+            [8724.11, 2.537818],
+            [8724.08, 0.030605]
+        ],
+    asks=[
+            [8725.61, 0.055265],
+            [8725.7, 0.028131],
+            [8725.81, 0.116984]
+        ]
+)
+orderbook_5_delta_1 = OrderbookDelta(
+    symbol='BTC/USDT',
+    timestamp=1658584052034997,
+    sequence=101,
+    bids=[
+            [8724.9, 1.5],
+            [8724.11, 0]
+        ],
+    asks=[
+            [8725.7, 0.5],
+            [8726.0, 3.0]
+        ]
+)
+orderbook_5_updated_1 = Orderbook(
+    symbol='BTC/USDT',
+    timestamp=1658584052034997,
+    sequence=101,
+    bids=[
+            [8724.9, 1.5],
+            [8724.77, 0.149594],
+            [8724.08, 0.030605]
+        ],
+    asks=[
+            [8725.61, 0.055265],
+            [8725.7, 0.5],
+            [8725.81, 0.116984],
+            [8726.0, 3.0]
+        ]
+)
+orderbook_5_delta_gap = OrderbookDelta(
+    symbol='BTC/USDT',
+    timestamp=1658584052035997,
+    sequence=103,
+    bids=[],
+    asks=[
+            [8725.61, 0]
+        ]
+)
+orderbook_5_delta_1_message = Message(
+    event_id='5f0c2a6e-8d3b-4e8e-9a57-2c6f3d1e7b42',
+    event=enums.Event.DATA,
+    exchange='binance',
+    instance='test',
+    node=enums.Node.GATE,
+    algo='test',
+    action=enums.Action.ORDERBOOK_DELTA,
+    message=None,
+    timestamp=1658584052034997,
+    data=orderbook_5_delta_1
+)
+orderbook_5_delta_gap_message = Message(
+    event_id='0d2b7c8e-1f5e-4a43-a1c4-1b1a0b5b8e11',
+    event=enums.Event.DATA,
+    exchange='binance',
+    instance='test',
+    node=enums.Node.GATE,
+    algo='test',
+    action=enums.Action.ORDERBOOK_DELTA,
+    message=None,
+    timestamp=1658584052035997,
+    data=orderbook_5_delta_gap
+)
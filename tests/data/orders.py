@@ -122,6 +122,21 @@ order_2_updated = OrderUpdatable(
     request_update_function=empty_func,
     cancel_function=empty_func
 )
+# order_2 после обновления сообщением order_2_update_message (с id ордера на бирже)
+order_2_updated_from_gate = OrderUpdatable(
+    core_order_id='test_prefix|56202bc7-0584-4a85-9118-391af8c34a49|test_postfix',
+    state=enums.OrderState.CLOSED,
+    symbol='ETH/BTC',
+    type=enums.OrderType.MARKET,
+    side=enums.OrderSide.SELL,
+    price=1_000_00,
+    amount=0.1,
+    filled=0.1,
+    exchange_order_id='123443211234',
+    place_function=empty_func,
+    request_update_function=empty_func,
+    cancel_function=empty_func
+)
 
 order_message_str_1 = '''{
     "event_id":"9978009a-eb10-11ec-8fea-0242ac120002",
@@ -0,0 +1,21 @@
+from testing_core.communicator.send_pipeline import AERON_BACK_PRESSURED
+
+
+class PublisherMock(object):
+    """
+    Мок для имитации Aeron Publisher с back pressure. Первые back_pressured_offers вызовов offer возвращают
+    код back pressure, остальные принимают сообщение и добавляют его в массив
+    """
+
+    def __init__(self, back_pressured_offers: int = 0):
+        self.back_pressured_offers = back_pressured_offers
+        self.offers_count = 0
+        self.messages = []
+
+    def offer(self, message: str) -> int:
+        self.offers_count += 1
+        if self.back_pressured_offers > 0:
+            self.back_pressured_offers -= 1
+            return AERON_BACK_PRESSURED
+        self.messages.append(message)
+        return len(self.messages)
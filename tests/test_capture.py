@@ -0,0 +1,151 @@
+import os
+import tempfile
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from aeron import Publisher, Subscriber
+
+from testing_core.communicator.aeron_communicator import AeronCommunicator
+from testing_core.communicator.capture import CaptureWriter, CaptureRecord, read_capture
+from testing_core.communicator.replay_communicator import ReplayCommunicator
+from testing_core.enums import CaptureChannel
+from testing_core.exceptions import CaptureFormatError
+from testing_core.trader.trader import Trader
+from tests.data.balances import balances_1_message
+from tests.data.config_for_tests import config_1, config_2, aeron_channels_1
+from tests.data.core_commands import command_get_balance_1
+from tests.data.orderbooks import orderbook_1_message, orderbook_2_message, orderbook_2
+
+
+class TestCapture(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'traffic.capture')
+
+    def test_write_and_read(self):
+        """
+        Тест на запись и чтение файла записи трафика (в том числе дописывание в существующий файл)
+        """
+        writer = CaptureWriter(self.path)
+        writer.write(CaptureChannel.ORDERBOOKS, '{"symbol": "BTC/USDT"}', timestamp=1)
+        writer.close()
+        writer = CaptureWriter(self.path)
+        writer.write(CaptureChannel.GATE_INPUT, '{"data": "₿"}', timestamp=2)
+        writer.close()
+        self.assertEqual(list(read_capture(self.path)), [
+            CaptureRecord(1, CaptureChannel.ORDERBOOKS, '{"symbol": "BTC/USDT"}'),
+            CaptureRecord(2, CaptureChannel.GATE_INPUT, '{"data": "₿"}'),
+        ])
+
+    def test_corrupted_file(self):
+        """
+        Тест на чтение поврежденного файла и файла другого формата
+        """
+        writer = CaptureWriter(self.path)
+        writer.write(CaptureChannel.BALANCES, '{}')
+        writer.close()
+        with open(self.path, 'rb+') as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(CaptureFormatError):
+            list(read_capture(self.path))
+        with open(self.path, 'wb') as file:
+            file.write(b'not a capture')
+        with self.assertRaises(CaptureFormatError):
+            list(read_capture(self.path))
+
+    def test_communicator_capture(self):
+        """
+        Тест на запись полученных и отправленных сообщений коммуникатором
+        """
+        received = []
+        communicator = AeronCommunicator(
+            config=config_1.copy(update={'capture_path': self.path}),
+            orderbook_handler=received.append,
+            balance_handler=received.append,
+            core_input_handler=received.append
+        )
+        gate_input = Subscriber(lambda message: None, aeron_channels_1.gate_input.channel,
+                                aeron_channels_1.gate_input.stream_id)
+        publisher = Publisher(aeron_channels_1.orderbooks.channel, aeron_channels_1.orderbooks.stream_id)
+        publisher.offer(orderbook_1_message.json())
+        time.sleep(0.1)
+        communicator.handle_new_messages()
+        communicator.publish(command_get_balance_1)
+        communicator.stop()
+        gate_input.poll()
+
+        records = list(read_capture(self.path))
+        self.assertEqual(received, [orderbook_1_message])
+        self.assertEqual([record.channel for record in records],
+                         [CaptureChannel.ORDERBOOKS, CaptureChannel.GATE_INPUT])
+        self.assertEqual(records[0].message, orderbook_1_message.json())
+        self.assertEqual(records[1].message, command_get_balance_1.json())
+        self.assertLessEqual(records[0].timestamp, records[1].timestamp)
+
+
+class TestReplayCommunicator(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'traffic.capture')
+        writer = CaptureWriter(self.path)
+        writer.write(CaptureChannel.ORDERBOOKS, orderbook_1_message.json(), timestamp=1_000_000_000)
+        writer.write(CaptureChannel.GATE_INPUT, command_get_balance_1.json(), timestamp=1_000_000_001)
+        writer.write(CaptureChannel.BALANCES, balances_1_message.json(), timestamp=1_010_000_000)
+        writer.write(CaptureChannel.ORDERBOOKS, orderbook_2_message.json(), timestamp=1_200_000_000)
+        writer.close()
+        self.orderbooks = []
+        self.balances = []
+
+    def _create_communicator(self, speed: float) -> ReplayCommunicator:
+        return ReplayCommunicator(config=config_1,
+                                  orderbook_handler=self.orderbooks.append,
+                                  balance_handler=self.balances.append,
+                                  core_input_handler=lambda message: None,
+                                  path=self.path,
+                                  speed=speed)
+
+    async def test_replay_as_fast_as_possible(self):
+        """
+        Тест на воспроизведение без задержек: все входящие сообщения обрабатываются за один вызов,
+        отправленные ядром сообщения пропускаются
+        """
+        communicator = self._create_communicator(speed=0)
+        self.assertEqual(communicator.handle_new_messages(), 3)
+        self.assertEqual(self.orderbooks, [orderbook_1_message, orderbook_2_message])
+        self.assertEqual(self.balances, [balances_1_message])
+        self.assertTrue(await communicator.wait_finished(timeout=1))
+        self.assertEqual(communicator.handle_new_messages(), 0)
+
+    async def test_replay_at_recorded_speed(self):
+        """
+        Тест на воспроизведение с записанными интервалами: сообщения обрабатываются по мере наступления их времени
+        """
+        communicator = self._create_communicator(speed=1)
+        self.assertEqual(communicator.handle_new_messages(), 1)
+        self.assertEqual(self.orderbooks, [orderbook_1_message])
+        time.sleep(0.02)
+        communicator.handle_new_messages()
+        self.assertEqual(self.balances, [balances_1_message])
+        self.assertEqual(len(self.orderbooks), 1)
+        self.assertFalse(communicator.is_finished)
+
+        # в 10 раз быстрее: вся запись (0.2 секунды) воспроизводится за 0.02 секунды
+        self.orderbooks.clear()
+        communicator = self._create_communicator(speed=10)
+        communicator.handle_new_messages()
+        time.sleep(0.025)
+        communicator.handle_new_messages()
+        self.assertEqual(self.orderbooks, [orderbook_1_message, orderbook_2_message])
+
+    async def test_trader_replay(self):
+        """
+        Тест на воспроизведение записи в Trader: коммуникатор выбирается по config.replay_path
+        """
+        trader = Trader(config=config_2.copy(update={'replay_path': self.path, 'replay_speed': 0}))
+        self.assertIsInstance(trader._communicator, ReplayCommunicator)
+        trader._communicator.handle_new_messages()
+        self.assertEqual(trader.orderbooks[orderbook_2.symbol], orderbook_2)
+        trader.request_update_balances(assets=['BTC'])
+        self.assertEqual(trader._communicator.published_count, 1)
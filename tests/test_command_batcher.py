@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from testing_core import enums
+from testing_core.formatter.formatter import Formatter
+from testing_core.trader.command_batcher import CommandBatcher
+from tests.data.orders import order_1, order_2, order_3
+
+
+class TestCommandBatcher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.published = []
+        self.batcher = CommandBatcher(
+            formatter=Formatter(exchange='binance', instance='test', algo='test'),
+            publish_function=self.published.append
+        )
+
+    def _published_actions(self) -> list[tuple[enums.Action, list[str]]]:
+        return [(message.action, [order.client_order_id for order in message.data] if message.data else None)
+                for message in self.published]
+
+    async def test_merge_within_tick(self):
+        """
+        Подряд идущие команды с одним action за проход event loop отправляются одним сообщением
+        """
+        self.batcher.add(enums.Action.CREATE_ORDERS, (order_1,))
+        self.batcher.add(enums.Action.CREATE_ORDERS, (order_2, order_3))
+        self.assertEqual(self.published, [])
+        await asyncio.sleep(0)
+        self.assertEqual(self._published_actions(), [
+            (enums.Action.CREATE_ORDERS, [order_1.core_order_id, order_2.core_order_id, order_3.core_order_id])
+        ])
+        self.assertEqual((self.batcher.commands_count, self.batcher.messages_count), (2, 1))
+
+    async def test_order_preserved(self):
+        """
+        Команды с разными action не переставляются, остальные команды отправляются после накопленных
+        """
+        self.batcher.add(enums.Action.CREATE_ORDERS, (order_1,))
+        self.batcher.add(enums.Action.CANCEL_ORDERS, (order_1,))
+        self.batcher.add(enums.Action.CREATE_ORDERS, (order_2,))
+        self.batcher.publish(Formatter(exchange='binance', instance='test', algo='test').format_cancel_all_orders())
+        self.assertEqual(self._published_actions(), [
+            (enums.Action.CREATE_ORDERS, [order_1.core_order_id]),
+            (enums.Action.CANCEL_ORDERS, [order_1.core_order_id]),
+            (enums.Action.CREATE_ORDERS, [order_2.core_order_id]),
+            (enums.Action.CANCEL_ALL_ORDERS, None),
+        ])
+
+    async def test_window(self):
+        """
+        С окном накопления команды отправляются после окончания окна
+        """
+        batcher = CommandBatcher(
+            formatter=Formatter(exchange='binance', instance='test', algo='test'),
+            publish_function=self.published.append,
+            batch_window_us=20000
+        )
+        batcher.add(enums.Action.GET_ORDERS, (order_1,))
+        await asyncio.sleep(0)
+        batcher.add(enums.Action.GET_ORDERS, (order_2,))
+        self.assertEqual(self.published, [])
+        await asyncio.sleep(0.05)
+        self.assertEqual(self._published_actions(), [
+            (enums.Action.GET_ORDERS, [order_1.core_order_id, order_2.core_order_id])
+        ])
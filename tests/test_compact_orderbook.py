@@ -0,0 +1,54 @@
+import copy
+from unittest import TestCase
+
+from testing_core import enums
+from testing_core.communicator.decoder import FastDecoder
+from testing_core.models.compact_orderbook import CompactOrderbook
+from testing_core.store.state_orderbook import OrderbookState
+from tests.data.orderbooks import orderbook_1, orderbook_1_message
+
+
+class TestCompactOrderbook(TestCase):
+    def setUp(self):
+        self.orderbook = CompactOrderbook.from_orderbook(orderbook_1)
+
+    def test_indexing(self):
+        """
+        Индексация уровней совпадает с Orderbook
+        """
+        self.assertEqual(self.orderbook.bids[0][0], orderbook_1.bids[0][0])
+        self.assertEqual(self.orderbook.asks[2][1], orderbook_1.asks[2][1])
+        self.assertEqual(self.orderbook, orderbook_1)
+        self.assertEqual(copy.deepcopy(self.orderbook), self.orderbook)
+
+    def test_best_prices(self):
+        self.assertEqual(self.orderbook.best_bid, 8724.77)
+        self.assertEqual(self.orderbook.best_ask, 8725.61)
+        self.assertAlmostEqual(self.orderbook.mid, (8724.77 + 8725.61) / 2)
+        self.assertAlmostEqual(self.orderbook.spread, 8725.61 - 8724.77)
+
+    def test_vwap(self):
+        """
+        Средняя цена исполнения по нескольким уровням
+        """
+        amount = 0.055265 + 0.01
+        expected = (8725.61 * 0.055265 + 8725.7 * 0.01) / amount
+        self.assertAlmostEqual(self.orderbook.vwap(enums.OrderSide.BUY, amount), expected)
+        self.assertEqual(self.orderbook.vwap(enums.OrderSide.SELL, 0.1), 8724.77)
+        self.assertIsNone(self.orderbook.vwap(enums.OrderSide.SELL, 100))
+
+    def test_cumulative_depth(self):
+        depth = self.orderbook.cumulative_depth(enums.OrderSide.SELL)
+        self.assertEqual(depth[:, 0].tolist(), [8724.77, 8724.11, 8724.08])
+        self.assertAlmostEqual(depth[-1, 1], 0.149594 + 2.537818 + 0.030605)
+
+    def test_decoding(self):
+        """
+        Быстрый декодер разбирает ордербук в CompactOrderbook, OrderbookState его принимает
+        """
+        message = FastDecoder(compact_orderbooks=True).decode(orderbook_1_message.json())
+        self.assertIsInstance(message.data, CompactOrderbook)
+        self.assertEqual(message.data, orderbook_1)
+        state = OrderbookState()
+        state.update(message.data)
+        self.assertEqual(state['BTC/USDT'].bids[0][0], 8724.77)
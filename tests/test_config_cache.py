@@ -0,0 +1,170 @@
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import IsolatedAsyncioTestCase
+
+from testing_core import config as config_module
+from testing_core.config import receive_configuration, parse_configuration
+from testing_core.config_cache import ConfigurationCache, wait_revalidations
+from tests.data.config_for_tests import configurator_response_1, markets_1
+
+
+class ConfiguratorStandIn(object):
+    """
+    Локальный конфигуратор: отдает конфигурацию с ETag и Last-Modified, отвечает 304 на условные запросы
+    и считает запросы.
+    """
+    LAST_MODIFIED = 'Sun, 18 Oct 2026 10:00:00 GMT'
+
+    def __init__(self, body: dict):
+        self.body = body
+        self.version = 1
+        self.requests: list[dict] = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests.append(dict(self.headers))
+                etag = f'"{stand_in.version}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                data = json.dumps(stand_in.body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', stand_in.LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self._server.server_port}/binance/test'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread.is_alive():
+            return
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+
+
+class TestConfigurationCache(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.configurator = ConfiguratorStandIn(configurator_response_1)
+        self.addCleanup(self.configurator.stop)
+        config_module._configurations_memo.clear()
+        self.addCleanup(config_module._configurations_memo.clear)
+
+    def _settings(self, **kwargs) -> dict:
+        return {'type': 'api', 'path': self.configurator.url, 'cache_dir': self.directory.name, **kwargs}
+
+    async def test_conditional_revalidation(self):
+        """
+        Тест на повторный запрос с If-None-Match и If-Modified-Since: при ответе 304 используется кеш
+        """
+        cache = ConfigurationCache(cache_dir=self.directory.name)
+        self.assertEqual(await cache.fetch(self.configurator.url), configurator_response_1)
+        self.assertEqual(await cache.fetch(self.configurator.url), configurator_response_1)
+        self.assertEqual(len(self.configurator.requests), 2)
+        self.assertNotIn('If-None-Match', self.configurator.requests[0])
+        self.assertEqual(self.configurator.requests[1]['If-None-Match'], '"1"')
+        self.assertEqual(self.configurator.requests[1]['If-Modified-Since'], ConfiguratorStandIn.LAST_MODIFIED)
+
+    async def test_changed_configuration(self):
+        """
+        Тест на обновление кеша, если конфигурация изменилась
+        """
+        cache = ConfigurationCache(cache_dir=self.directory.name)
+        await cache.fetch(self.configurator.url)
+        self.configurator.version = 2
+        self.configurator.body = {**configurator_response_1, 'instance': 'changed'}
+        self.assertEqual((await cache.fetch(self.configurator.url))['instance'], 'changed')
+        self.configurator.stop()
+        self.assertEqual((await cache.fetch(self.configurator.url))['instance'], 'changed')
+
+    async def test_offline_startup(self):
+        """
+        Тест на запуск без конфигуратора: используется конфигурация из кеша, без кеша - исключение
+        """
+        cache = ConfigurationCache(cache_dir=self.directory.name, timeout=1)
+        await cache.fetch(self.configurator.url)
+        self.configurator.stop()
+        self.assertEqual(await cache.fetch(self.configurator.url), configurator_response_1)
+        with self.assertRaises(Exception):
+            await ConfigurationCache(cache_dir=tempfile.mkdtemp(dir=self.directory.name), timeout=1).fetch(
+                self.configurator.url)
+
+    async def test_stale_while_revalidate(self):
+        """
+        Тест на stale-while-revalidate: кеш возвращается сразу, обновленная конфигурация сохраняется в фоне
+        """
+        cache = ConfigurationCache(cache_dir=self.directory.name)
+        await cache.fetch(self.configurator.url)
+        self.configurator.version = 2
+        self.configurator.body = {**configurator_response_1, 'instance': 'changed'}
+        stale = await cache.fetch(self.configurator.url, stale_while_revalidate=True)
+        self.assertEqual(stale['instance'], 'test')
+        await cache.wait_revalidation()
+        self.assertEqual(len(self.configurator.requests), 2)
+        self.configurator.stop()
+        fresh = await cache.fetch(self.configurator.url, stale_while_revalidate=True)
+        self.assertEqual(fresh['instance'], 'changed')
+        await cache.wait_revalidation()
+
+    async def test_receive_configuration_memo(self):
+        """
+        Тест на receive_configuration: конфигурация запрашивается и разбирается один раз за процесс
+        """
+        first = await receive_configuration(self._settings())
+        second = await receive_configuration(self._settings())
+        self.assertEqual(len(self.configurator.requests), 1)
+        self.assertEqual(first, parse_configuration(configurator_response_1))
+        self.assertEqual(first.markets, markets_1)
+        self.assertIsNot(first, second)
+
+        # изменения вложенных полей конфигурации одного запуска не влияют на следующие
+        first.markets['BTC/USDT'].limits.amount.min = 1
+        first.assets.append('XXX')
+        third = await receive_configuration(self._settings())
+        self.assertEqual(third.markets, markets_1)
+        self.assertEqual(third.assets, second.assets)
+
+    async def test_receive_configuration_revalidation(self):
+        """
+        Тест на receive_configuration в режиме stale_while_revalidate: фоновая проверка выполняется в кеше процесса
+        и завершается в wait_revalidations, обновленная конфигурация используется при следующем запуске
+        """
+        await receive_configuration(self._settings())
+        self.configurator.version = 2
+        self.configurator.body = {**configurator_response_1, 'instance': 'changed'}
+        config_module._configurations_memo.clear()
+        stale = await receive_configuration(self._settings(stale_while_revalidate=True))
+        self.assertEqual(stale.instance, 'test')
+        await wait_revalidations()
+        self.assertEqual(len(self.configurator.requests), 2)
+
+        config_module._configurations_memo.clear()
+        self.configurator.stop()
+        fresh = await receive_configuration(self._settings(stale_while_revalidate=True))
+        self.assertEqual(fresh.instance, 'changed')
+        await wait_revalidations()
+
+    async def test_receive_configuration_offline(self):
+        """
+        Тест на receive_configuration без конфигуратора после очистки памяти процесса
+        """
+        await receive_configuration(self._settings())
+        config_module._configurations_memo.clear()
+        self.configurator.stop()
+        config = await receive_configuration(self._settings())
+        self.assertEqual(config.instance, 'test')
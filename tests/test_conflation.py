@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+from testing_core.communicator.conflation import OrderbookConflator
+from tests.data.balances import balances_1_message
+from tests.data.error_messages import error_from_gate_1
+from tests.data.orderbooks import orderbook_1_message, orderbook_2_message, orderbook_3_message, \
+    orderbook_5_delta_gap_message
+from tests.data.orders import order_2_update_message
+
+
+class TestOrderbookConflator(TestCase):
+    def setUp(self):
+        self.conflator = OrderbookConflator()
+
+    def test_latest_orderbook(self):
+        """
+        Из нескольких ордербуков по символу остается последний, порядок символов сохраняется
+        """
+        for message in (orderbook_1_message, orderbook_3_message, orderbook_2_message):
+            self.assertTrue(self.conflator.offer(message.json()))
+        self.assertEqual(self.conflator.drain(),
+                         [(orderbook_2_message.json(), None), (orderbook_3_message.json(), None)])
+        self.assertEqual(self.conflator.conflated, {orderbook_1_message.data.symbol: 1})
+        self.assertEqual(self.conflator.drain(), [])
+
+    def test_deltas_not_conflated(self):
+        """
+        Инкрементальные обновления не заменяют друг друга, но заменяются следующим снапшотом
+        """
+        delta = orderbook_5_delta_gap_message.json()
+        symbol = orderbook_5_delta_gap_message.data.symbol
+        snapshot = orderbook_1_message.copy(update={'data': orderbook_1_message.data.copy(update={'symbol': symbol})})
+        self.conflator.offer(snapshot.json())
+        self.conflator.offer(delta)
+        self.conflator.offer(delta)
+        self.assertEqual(self.conflator.pending_count, 3)
+        self.conflator.offer(snapshot.json(), received=1)
+        self.assertEqual(self.conflator.drain(), [(snapshot.json(), 1)])
+        self.assertEqual(self.conflator.conflated, {symbol: 3})
+
+    def test_not_conflated_messages(self):
+        """
+        Ордера, балансы и ошибки не проходят через конфлюэнцию
+        """
+        for message in (order_2_update_message, balances_1_message, error_from_gate_1):
+            self.assertFalse(self.conflator.offer(message.json()))
+        self.assertFalse(self.conflator.has_pending)
@@ -0,0 +1,87 @@
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+
+from testing_core import core, enums
+from testing_core.communicator.capture import CaptureWriter
+from testing_core.core import run_session
+from testing_core.strategy.base_strategy import Strategy
+from testing_core.trader.trader import Trader
+from tests.data.balances import balances_1_message
+from tests.data.config_for_tests import config_2
+from tests.data.orderbooks import orderbook_1_message
+
+
+class TestCoreSession(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        path = os.path.join(self.directory.name, 'traffic.capture')
+        writer = CaptureWriter(path)
+        writer.write(enums.CaptureChannel.BALANCES, balances_1_message.json(), timestamp=1)
+        writer.write(enums.CaptureChannel.ORDERBOOKS, orderbook_1_message.json(), timestamp=2)
+        writer.close()
+        self.config = config_2.copy(update={'replay_path': path, 'replay_speed': 0})
+
+    async def test_shared_trader(self):
+        """
+        Тест на сессию: стратегии используют один Trader, ордербуки и балансы сохраняются между стратегиями,
+        ордера предыдущей стратегии удаляются
+        """
+        runs: list[dict] = []
+
+        class WarmingUp(Strategy):
+            name = 'Warming up'
+
+            async def execute(self, trader: Trader, orderbooks, balances):
+                await balances.wait_ready(timeout=1)
+                await orderbooks.wait_for_symbols(['BTC/USDT'], timeout=1)
+                trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=1000,
+                                             amount=1, enable_validating=False)
+                runs.append({'trader': trader, 'orders': len(trader._orders_state.orders)})
+
+        class Warm(Strategy):
+            name = 'Warm'
+
+            async def execute(self, trader: Trader, orderbooks, balances):
+                runs.append({'trader': trader, 'orders': len(trader._orders_state.orders),
+                             'balances': balances.balances != {}, 'orderbook': 'BTC/USDT' in orderbooks.orderbooks})
+
+        with patch.object(core, 'load_basic_settings', return_value={'configuration': {}}), \
+                patch.object(core, 'receive_configuration', AsyncMock(return_value=self.config)) as receive, \
+                patch.object(core, 'wait_revalidations', AsyncMock()) as wait_revalidations:
+            await run_session(WarmingUp, Warm)
+
+        receive.assert_awaited_once()
+        wait_revalidations.assert_awaited_once()
+        self.assertIs(runs[0]['trader'], runs[1]['trader'])
+        self.assertEqual(runs[0]['orders'], 1)
+        self.assertEqual(runs[1], {'trader': runs[0]['trader'], 'orders': 0, 'balances': True, 'orderbook': True})
+        self.assertTrue(runs[0]['trader']._communicator.is_finished)
+
+    async def test_failed_strategy(self):
+        """
+        Тест на сброс состояния Trader, если стратегия завершилась с исключением (последовательный и
+        одновременный запуск стратегий)
+        """
+        traders: list[Trader] = []
+
+        class Failing(Strategy):
+            name = 'Failing'
+
+            async def execute(self, trader: Trader, orderbooks, balances):
+                trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=1000,
+                                             amount=1, enable_validating=False)
+                traders.append(trader)
+                raise RuntimeError
+
+        for parallel in [False, True]:
+            with patch.object(core, 'load_basic_settings', return_value={'configuration': {}}), \
+                    patch.object(core, 'receive_configuration', AsyncMock(return_value=self.config)), \
+                    patch.object(core, 'wait_revalidations', AsyncMock()) as wait_revalidations:
+                with self.assertRaises(RuntimeError):
+                    await run_session(Failing, parallel=parallel)
+
+            wait_revalidations.assert_awaited_once()
+            self.assertFalse(traders[-1]._orders_state.orders)
@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+from pydantic import ValidationError
+
+from testing_core.communicator.decoder import FastDecoder, StrictDecoder
+from testing_core.models.message import Balances
+from testing_core.models.orderbook import Orderbook
+from tests.data.balances import balances_1_message
+from tests.data.error_messages import error_from_gate_1
+from tests.data.invalid_messages import invalid_order_message_1, invalid_order_message_2, invalid_balance_message_1, \
+    invalid_orderbook_message_1, invalid_orderbook_message_2
+from tests.data.orderbooks import orderbook_1_message, orderbook_5_delta_gap_message
+from tests.data.orders import order_2_update_message, order_message_str_1
+
+
+class TestFastDecoder(TestCase):
+    def setUp(self):
+        self.fast_decoder = FastDecoder()
+        self.strict_decoder = StrictDecoder()
+
+    def _assert_same_as_strict(self, message_as_str: str):
+        self.assertEqual(self.fast_decoder.decode(message_as_str), self.strict_decoder.decode(message_as_str))
+
+    def test_orderbook(self):
+        """
+        Ордербук разбирается быстрым путем так же, как строгим декодером
+        """
+        message = self.fast_decoder.decode(orderbook_1_message.json())
+        self.assertIsInstance(message.data, Orderbook)
+        self.assertEqual(message, orderbook_1_message)
+
+    def test_orderbook_delta(self):
+        """
+        Инкрементальное обновление ордербука разбирается быстрым путем
+        """
+        self.assertEqual(self.fast_decoder.decode(orderbook_5_delta_gap_message.json()), orderbook_5_delta_gap_message)
+
+    def test_balances(self):
+        """
+        Балансы разбираются быстрым путем так же, как строгим декодером
+        """
+        message = self.fast_decoder.decode(balances_1_message.json())
+        self.assertIsInstance(message.data, Balances)
+        self.assertEqual(message, balances_1_message)
+
+    def test_orders(self):
+        """
+        Список ордеров разбирается быстрым путем так же, как строгим декодером
+        """
+        self.assertEqual(self.fast_decoder.decode(order_2_update_message.json()), order_2_update_message)
+        self._assert_same_as_strict(order_message_str_1)
+
+    def test_error_fallback(self):
+        """
+        Сообщения об ошибках разбираются строгим декодером
+        """
+        self._assert_same_as_strict(error_from_gate_1.json())
+
+    def test_invalid_messages(self):
+        """
+        Невалидные сообщения приводят к той же ошибке валидации, что и в строгом декодере
+        """
+        for message_as_str in (invalid_order_message_1, invalid_order_message_2, invalid_balance_message_1,
+                               invalid_orderbook_message_1, invalid_orderbook_message_2):
+            with self.assertRaises(ValidationError):
+                self.fast_decoder.decode(message_as_str)
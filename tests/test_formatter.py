@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+from testing_core import enums
+from testing_core.formatter.formatter import Formatter
+from testing_core.formatter.prepared_command import PreparedCommand
+from testing_core.models.message import Message
+from tests.data.orders import order_1, order_2, order_3
+
+
+class TestPreparedCommands(TestCase):
+    """
+    Команды, сериализованные по шаблону, совпадают побайтно с Message.json()
+    """
+
+    def setUp(self):
+        self.formatter = Formatter(exchange='binance', instance='test "instance"', algo='тест')
+        self.message_formatter = Formatter(exchange='binance', instance='test "instance"', algo='тест',
+                                           prepared_commands=False)
+
+    def _assert_same_json(self, command: PreparedCommand, message: Message):
+        self.assertIsInstance(command, PreparedCommand)
+        message = message.copy(update={'event_id': command.event_id, 'timestamp': command.timestamp})
+        self.assertEqual(command.json(), message.json())
+        self.assertEqual(command.to_message(), message)
+
+    def test_orders_commands(self):
+        orders = (order_1, order_2, order_3)
+        self._assert_same_json(self.formatter.format_create_orders(orders),
+                               self.message_formatter.format_create_orders(orders))
+        self._assert_same_json(self.formatter.format_cancel_orders(orders),
+                               self.message_formatter.format_cancel_orders(orders))
+        self._assert_same_json(self.formatter.format_get_orders(orders),
+                               self.message_formatter.format_get_orders(orders))
+        self._assert_same_json(self.formatter.format_cancel_all_orders(),
+                               self.message_formatter.format_cancel_all_orders())
+
+    def test_requests(self):
+        self._assert_same_json(self.formatter.format_get_balance(['BTC', 'USDT']),
+                               self.message_formatter.format_get_balance(['BTC', 'USDT']))
+        self._assert_same_json(self.formatter.format_get_orderbook(['BTC/USDT']),
+                               self.message_formatter.format_get_orderbook(['BTC/USDT']))
+
+    def test_message_fields(self):
+        command = self.formatter.format_create_orders((order_1,))
+        self.assertEqual(command.event, enums.Event.COMMAND)
+        self.assertEqual(command.action, enums.Action.CREATE_ORDERS)
+        self.assertEqual(command.data[0].client_order_id, order_1.core_order_id)
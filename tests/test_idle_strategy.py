@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from testing_core.trader.idle_strategy import BackoffIdleStrategy, BusySpinIdleStrategy
+
+
+class TestIdleStrategy(unittest.IsolatedAsyncioTestCase):
+    """
+    Переходы состояний idle strategy: опрос без ожидания, передача управления event loop, ожидание
+    """
+
+    async def test_backoff(self):
+        strategy = BackoffIdleStrategy(max_spins=2, max_yields=2, min_park_period=0.001, max_park_period=0.004,
+                                       max_busy_polls=3)
+        with patch('testing_core.trader.idle_strategy.asyncio.sleep', new_callable=AsyncMock) as sleep:
+            # пустые проходы: 2 без ожидания, 2 с передачей управления, затем ожидание с удвоением до максимума
+            for _ in range(8):
+                await strategy.idle(0)
+            self.assertEqual([call.args[0] for call in sleep.await_args_list],
+                             [0, 0, 0.001, 0.002, 0.004, 0.004])
+
+            # сообщения сбрасывают состояние, управление передается раз в max_busy_polls проходов
+            sleep.reset_mock()
+            for _ in range(3):
+                await strategy.idle(5)
+            self.assertEqual([call.args[0] for call in sleep.await_args_list], [0])
+
+            sleep.reset_mock()
+            for _ in range(3):
+                await strategy.idle(0)
+            self.assertEqual([call.args[0] for call in sleep.await_args_list], [0])
+
+    async def test_busy_spin(self):
+        strategy = BusySpinIdleStrategy(max_busy_polls=4)
+        with patch('testing_core.trader.idle_strategy.asyncio.sleep', new_callable=AsyncMock) as sleep:
+            for _ in range(8):
+                await strategy.idle(0)
+            self.assertEqual(sleep.await_count, 2)
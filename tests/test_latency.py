@@ -0,0 +1,138 @@
+import copy
+from unittest import TestCase
+from unittest.mock import patch
+
+from testing_core import enums
+from testing_core.metrics import order_latency
+from testing_core.metrics.histogram import LatencyHistogram
+from testing_core.metrics.order_latency import OrderLatencyTracker, PLACE_TO_PUBLISH, PLACE_TO_OPEN, \
+    PLACE_TO_CLOSED, CANCEL_TO_CANCELED
+from testing_core.order.order import OrderData
+from testing_core.store.state_orders import OrdersState
+from testing_core.trader.trader import Trader
+from tests.communicator_mock import CommunicatorMock
+from tests.data.config_for_tests import config_2
+from tests.data.orders import order_1, order_2
+
+
+def order_update(order: OrderData, state: enums.OrderState) -> OrderData:
+    """Данные ордера от гейта с новым состоянием"""
+    return OrderData(core_order_id=order.core_order_id, symbol=order.symbol, type=order.type, side=order.side,
+                     price=order.price, amount=order.amount, state=state)
+
+
+class TestLatencyHistogram(TestCase):
+    def test_percentiles(self):
+        """
+        Тест на перцентили: погрешность не больше ширины корзины (1/64 значения)
+        """
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value)
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 10000)
+        self.assertEqual(summary['min'], 1)
+        self.assertEqual(summary['max'], 10000)
+        self.assertEqual(summary['mean'], 5000)
+        for percentile, expected in ((50, 5000), (90, 9000), (99, 9900), (99.9, 9990)):
+            value = histogram.percentile(percentile)
+            self.assertGreaterEqual(value, expected)
+            self.assertLessEqual(value, expected * (1 + 1 / 64))
+
+    def test_bounded_memory(self):
+        """
+        Тест на ограниченную память: значения больше max_value попадают в последнюю корзину
+        """
+        histogram = LatencyHistogram(max_value=1000)
+        buckets = len(histogram._counts)
+        histogram.record(10 ** 9)
+        histogram.record(-5)
+        self.assertEqual(len(histogram._counts), buckets)
+        self.assertEqual(histogram.min, 0)
+        self.assertEqual(histogram.max, 10 ** 9)
+        # перцентиль различим только до max_value (с точностью до корзины)
+        self.assertLess(histogram.percentile(100), 1000 * (1 + 1 / 64))
+
+    def test_merge(self):
+        """
+        Тест на объединение гистограмм
+        """
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(10)
+        second.record(1000)
+        first.merge(second)
+        self.assertEqual(first.count, 2)
+        self.assertEqual((first.min, first.max), (10, 1000))
+        self.assertEqual(first.percentile(50), 10)
+        self.assertEqual(LatencyHistogram().percentile(50), None)
+
+
+class TestOrderLatencyTracker(TestCase):
+    def setUp(self):
+        self.now = 0
+        patcher = patch.object(order_latency, '_now', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracker = OrderLatencyTracker()
+        self.orders_state = OrdersState(state_changed_callback=self.tracker.on_state_changed)
+        self.order_1 = copy.deepcopy(order_1)
+        self.order_2 = copy.deepcopy(order_2)
+        self.orders_state.add_order(self.order_1, self.order_2)
+
+    def _update(self, order: OrderData, state: enums.OrderState):
+        self.orders_state.update(orders=[order_update(order, state)])
+
+    def test_order_round_trip(self):
+        """
+        Тест на задержки place->publish, place->open, place->closed и cancel->canceled по символам
+        """
+        self.tracker.on_place(self.order_1, self.order_2)
+        self.now = 100
+        self.tracker.on_publish(enums.Action.CREATE_ORDERS, (self.order_1, self.order_2))
+        self.now = 1000
+        self._update(self.order_1, enums.OrderState.OPEN)
+        self._update(self.order_2, enums.OrderState.CLOSED)
+        self.now = 2000
+        self.tracker.on_publish(enums.Action.CANCEL_ORDERS, (self.order_1,))
+        self.now = 2500
+        self._update(self.order_1, enums.OrderState.CANCELED)
+
+        self.assertEqual(self.tracker.histogram(PLACE_TO_PUBLISH).count, 2)
+        self.assertEqual(self.tracker.histogram(PLACE_TO_PUBLISH).max, 100)
+        self.assertEqual(self.tracker.histogram(PLACE_TO_OPEN, 'BTC/USDT').max, 1000)
+        self.assertEqual(self.tracker.histogram(PLACE_TO_OPEN, 'ETH/BTC').count, 0)
+        self.assertEqual(self.tracker.histogram(PLACE_TO_CLOSED, 'ETH/BTC').max, 1000)
+        self.assertEqual(self.tracker.histogram(CANCEL_TO_CANCELED, 'BTC/USDT').max, 500)
+
+        summary = self.tracker.summary()
+        self.assertEqual(summary[PLACE_TO_PUBLISH]['all']['count'], 2)
+        self.assertEqual(set(summary[PLACE_TO_PUBLISH]), {'all', 'BTC/USDT', 'ETH/BTC'})
+        self.assertIn(CANCEL_TO_CANCELED, self.tracker.report())
+        # завершенные ордера больше не отслеживаются
+        self.assertEqual(self.tracker._orders, {})
+
+    def test_max_tracked_orders(self):
+        """
+        Тест на ограничение количества отслеживаемых ордеров: самые старые вытесняются
+        """
+        tracker = OrderLatencyTracker(max_tracked_orders=1)
+        tracker.on_place(self.order_1, self.order_2)
+        self.assertEqual(list(tracker._orders), [self.order_2.core_order_id])
+
+    def test_trader_tracking(self):
+        """
+        Тест на измерение задержек в Trader: размещение, отправка и открытие ордера
+        """
+        communicator_mock = CommunicatorMock()
+        trader = Trader(config=config_2.copy(update={'latency_tracking': True}), communicator=communicator_mock)
+        order = trader.create_order(symbol='BTC/USDT', order_type=enums.OrderType.LIMIT, side=enums.OrderSide.BUY,
+                                    price=1000.132, amount=20.1)
+        self.assertIsNotNone(order.place_timestamp)
+        self.assertEqual(trader.latency.histogram(PLACE_TO_PUBLISH).count, 1)
+        self.now = 300
+        trader._orders_state.update(orders=[order_update(order, enums.OrderState.OPEN)])
+        self.assertEqual(trader.latency.histogram(PLACE_TO_OPEN, 'BTC/USDT').max, 300)
+        self.assertIn(PLACE_TO_OPEN, trader.latency_report())
+
+        disabled_trader = Trader(config=config_2, communicator=CommunicatorMock())
+        self.assertIsNone(disabled_trader.latency)
@@ -0,0 +1,124 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from testing_core import enums
+from testing_core.config import Market
+from testing_core.exceptions import LimitViolation
+from testing_core.order.order_fabric import OrderFabric
+from testing_core.trader.trader import Trader
+from tests.communicator_mock import CommunicatorMock
+from tests.data.config_for_tests import config_2, markets_1
+from tests.data.orders import empty_func
+
+
+class TestLimitValidator(TestCase):
+    def test_reasons(self):
+        """
+        Тест на причины нарушения лимитов и пропуск незаданных границ (у BTC/USDT не заданы границы цены)
+        """
+        validator = markets_1['BTC/USDT'].validator
+        self.assertIsNone(validator.validate(price=20000, amount=0.1))
+        self.assertIsNone(validator.validate(price=1e11, amount=1e-04))
+        self.assertEqual(validator.validate(price=20000, amount=1e-05), enums.LimitViolationReason.AMOUNT_TOO_LOW)
+        self.assertEqual(validator.validate(price=20000, amount=1e10), enums.LimitViolationReason.AMOUNT_TOO_HIGH)
+        self.assertEqual(validator.validate(price=1, amount=0.001), enums.LimitViolationReason.COST_TOO_LOW)
+        self.assertEqual(validator.validate(price=1e9, amount=1), enums.LimitViolationReason.COST_TOO_HIGH)
+        self.assertEqual(validator.violations(prices=[20000, 20000, 1], amounts=[0.1, 1e-05, 0.001]),
+                         [None, enums.LimitViolationReason.AMOUNT_TOO_LOW, enums.LimitViolationReason.COST_TOO_LOW])
+
+    def test_create_order(self):
+        """
+        Тест на причину нарушения в LimitViolation при создании ордера
+        """
+        order_fabric = OrderFabric(markets=markets_1, place_function=empty_func,
+                                   request_update_function=empty_func, cancel_function=empty_func)
+        with self.assertRaises(LimitViolation) as context:
+            order_fabric.create_order(core_order_id='1', symbol='BTC/USDT', order_type=enums.OrderType.LIMIT,
+                                      side=enums.OrderSide.BUY, price=1, amount=0.001)
+        self.assertEqual(context.exception.reason, enums.LimitViolationReason.COST_TOO_LOW)
+
+    def test_bulk_without_increments(self):
+        """
+        Тест на пакетное создание ордеров торговой пары без шага цены и объема: проверка по float без округления
+        """
+        market = Market(**{**markets_1['BTC/USDT'].dict(), 'price_increment': None})
+        self.assertIsNone(market.tick_limits)
+        order_fabric = OrderFabric(markets={'BTC/USDT': market}, place_function=empty_func,
+                                   request_update_function=empty_func, cancel_function=empty_func)
+        batch = order_fabric.create_orders(core_order_ids=['0', '1'], symbols='BTC/USDT',
+                                           order_type=enums.OrderType.LIMIT, sides=enums.OrderSide.BUY,
+                                           prices=[20000.12345, 1], amounts=[0.1, 0.001])
+        self.assertEqual(batch.orders[0].price, 20000.12345)
+        self.assertEqual([(violation.row, violation.reason) for violation in batch.rejected],
+                         [(1, enums.LimitViolationReason.COST_TOO_LOW)])
+
+
+class TestPrePublishValidation(TestCase):
+    def test_place_orders(self):
+        """
+        Тест на проверку ордеров перед отправкой: ордер, нарушающий лимиты, не отправляется и переводится в ERROR
+        """
+        errors = []
+        communicator_mock = CommunicatorMock()
+        trader = Trader(config=config_2.copy(update={'pre_publish_validation': True}),
+                        communicator=communicator_mock, order_error_callback=errors.append)
+        valid = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=20000,
+                                             amount=0.1)
+        invalid = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=1,
+                                               amount=0.001, enable_validating=False)
+        trader.place_orders(valid, invalid)
+        self.assertEqual(len(communicator_mock.published_messages), 1)
+        self.assertEqual([order.client_order_id for order in communicator_mock.published_messages[0].data],
+                         [valid.core_order_id])
+        self.assertEqual(valid.state, enums.OrderState.PLACING)
+        self.assertEqual(invalid.state, enums.OrderState.ERROR)
+        self.assertEqual(errors, [invalid])
+
+        self.assertFalse(invalid.place())
+        self.assertEqual(len(communicator_mock.published_messages), 1)
+
+    def test_place_rejected(self):
+        """
+        Тест на размещение ордера, нарушающего лимиты: place возвращает False, ордер остается в ERROR
+        (состояние не перезаписывается на PLACING) и находится в индексе состояния ERROR
+        """
+        errors = []
+        communicator_mock = CommunicatorMock()
+        trader = Trader(config=config_2.copy(update={'pre_publish_validation': True}),
+                        communicator=communicator_mock, order_error_callback=errors.append)
+        order = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=1,
+                                             amount=0.001, enable_validating=False)
+        for _ in range(2):
+            self.assertFalse(order.place())
+            self.assertEqual(order.state, enums.OrderState.ERROR)
+            self.assertEqual(list(trader.orders_state.by_state(enums.OrderState.ERROR).values()), [order])
+            self.assertFalse(trader.orders_state.by_state(enums.OrderState.PLACING))
+        self.assertEqual(errors, [order, order])
+        self.assertFalse(communicator_mock.published_messages)
+
+        valid = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=20000,
+                                             amount=0.1)
+        self.assertTrue(valid.place())
+        self.assertEqual(valid.state, enums.OrderState.PLACING)
+        self.assertEqual(list(trader.orders_state.by_state(enums.OrderState.PLACING).values()), [valid])
+
+    def test_place_state_changed(self):
+        """
+        Тест на уведомление о переходе unplaced -> placing при размещении ордера (переход выполняется через
+        OrdersState) и восстановление состояния ордера, если при отправке возникло исключение
+        """
+        changes = []
+        trader = Trader(config=config_2, communicator=CommunicatorMock())
+        trader.orders_state._state_changed_callback = lambda order, previous: changes.append((previous, order.state))
+        order = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=20000,
+                                             amount=0.1)
+        self.assertTrue(order.place())
+        self.assertEqual(changes, [(enums.OrderState.UNPLACED, enums.OrderState.PLACING)])
+        self.assertEqual(list(trader.orders_state.by_state(enums.OrderState.PLACING).values()), [order])
+
+        failed = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=20000,
+                                              amount=0.1)
+        with patch.object(trader, '_publish_orders_command', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                failed.place()
+        self.assertEqual(failed.state, enums.OrderState.UNPLACED)
@@ -0,0 +1,49 @@
+import os
+import struct
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from testing_core.communicator import media_driver
+from testing_core.communicator.media_driver import is_media_driver_running, CNC_FILE_NAME, CNC_PID_OFFSET
+
+
+class TestMediaDriverCheck(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = patch.dict(os.environ, {'AERON_DIR': self.directory.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        is_media_driver_running.cache_clear()
+        self.addCleanup(is_media_driver_running.cache_clear)
+
+    def _write_cnc(self, pid: int):
+        with open(os.path.join(self.directory.name, CNC_FILE_NAME), 'wb') as file:
+            file.write(bytes(CNC_PID_OFFSET) + struct.pack('<q', pid) + bytes(64))
+
+    def test_driver_pid_from_cnc(self):
+        """
+        Тест на проверку по PID из файла CnC: процесс жив - media driver запущен
+        """
+        self._write_cnc(os.getpid())
+        with patch.object(media_driver, '_find_aeron_process') as find_aeron_process:
+            self.assertTrue(is_media_driver_running())
+        find_aeron_process.assert_not_called()
+
+    def test_driver_not_running(self):
+        """
+        Тест на устаревший файл CnC (процесс завершен) и отсутствие процесса aeron
+        """
+        self._write_cnc(2 ** 62)
+        with patch.object(media_driver, '_find_aeron_process', return_value=False):
+            self.assertFalse(is_media_driver_running())
+
+    def test_check_is_cached(self):
+        """
+        Тест на однократную проверку: повторный вызов не читает CnC и /proc
+        """
+        with patch.object(media_driver, '_find_aeron_process', return_value=True) as find_aeron_process:
+            self.assertTrue(is_media_driver_running())
+            self.assertTrue(is_media_driver_running())
+        find_aeron_process.assert_called_once()
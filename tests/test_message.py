@@ -0,0 +1,36 @@
+import copy
+from unittest import TestCase
+
+from pydantic import ValidationError
+
+from testing_core import enums
+from testing_core.models.message import Message, GateOrderToCreate
+from testing_core.models.orderbook import Orderbook
+from tests.data.balances import balances_1_message
+from tests.data.error_messages import error_from_gate_1
+from tests.data.orderbooks import orderbook_1_message
+
+
+class TestMessageData(TestCase):
+    def test_data_type_by_action(self):
+        """
+        Тип data выбирается по event и action сообщения
+        """
+        message = Message(**orderbook_1_message.dict())
+        self.assertIsInstance(message.data, Orderbook)
+
+    def test_data_not_matching_action(self):
+        """
+        Данные, которые не соответствуют action, не проходят валидацию, даже если подходят под другой тип
+        """
+        message_as_dict = copy.deepcopy(balances_1_message.dict())
+        message_as_dict['action'] = enums.Action.ORDERBOOK_UPDATE
+        with self.assertRaises(ValidationError):
+            Message(**message_as_dict)
+
+    def test_error_data(self):
+        """
+        Для ошибок тип data не определен, используется любой из возможных типов
+        """
+        message = Message(**error_from_gate_1.dict())
+        self.assertIsInstance(message.data, GateOrderToCreate)
@@ -0,0 +1,110 @@
+import copy
+import dataclasses
+import os
+import tempfile
+from unittest import TestCase
+
+from testing_core.store.order_archive import OrderArchive, read_archive
+from testing_core.store.state_orders import OrdersState
+from testing_core.trader.trader import Trader
+from tests.communicator_mock import CommunicatorMock
+from tests.data.config_for_tests import config_2
+from tests.data.orders import *
+
+
+class TestOrderArchive(TestCase):
+    def test_spill(self):
+        """
+        Тест на вытеснение самых старых ордеров из заполненного архива в файл и чтение файла
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'archive.jsonl')
+            archive = OrderArchive(max_size=1, spill_path=path)
+            archive.add(copy.deepcopy(order_1_updated))
+            archive.add(copy.deepcopy(order_2))
+            archive.close()
+            self.assertEqual(list(archive.orders), [order_2.core_order_id])
+            self.assertEqual(archive.evicted_count, 1)
+            spilled = list(read_archive(path))
+        self.assertEqual(len(spilled), 1)
+        self.assertEqual(spilled[0].core_order_id, order_1.core_order_id)
+        self.assertEqual(spilled[0].state, enums.OrderState.CANCELED)
+        self.assertEqual(spilled[0].side, enums.OrderSide.BUY)
+
+
+class TestOrdersRetention(TestCase):
+    def setUp(self) -> None:
+        self.changes = []
+        self.orders_state = OrdersState(state_changed_callback=lambda order, state: self.changes.append(order.state),
+                                        retention_delay=0, archive_size=10)
+        self.order_1, self.order_2 = copy.deepcopy(order_1), copy.deepcopy(order_2)
+        self.orders_state.add_order(self.order_1, self.order_2)
+
+    def test_expire(self):
+        """
+        Тест на перенос завершенного ордера в архив: он удаляется из хранимых ордеров и индексов
+        """
+        self.orders_state.update(orders=[order_1_update])
+        self.assertEqual(self.orders_state.expire(), 1)
+        self.assertEqual(list(self.orders_state.orders), [order_2.core_order_id])
+        self.assertIs(self.orders_state.archive.get(order_1.core_order_id), self.order_1)
+        self.assertEqual(self.orders_state.by_symbol('BTC/USDT'), {})
+        self.assertEqual(self.orders_state.by_state(enums.OrderState.CANCELED), {})
+        # повторно ордер не переносится
+        self.assertEqual(self.orders_state.expire(), 0)
+
+    def test_not_expired(self):
+        """
+        Тест на ордер, время хранения которого не истекло, и ордер, который снова стал активным
+        """
+        orders_state = OrdersState(retention_delay=60)
+        order = copy.deepcopy(order_1)
+        orders_state.add_order(order)
+        orders_state.update(orders=[order_1_update])
+        self.assertEqual(orders_state.expire(), 0)
+        orders_state.set_orders_state(order, state=enums.OrderState.OPEN)
+        self.assertEqual(orders_state.expire(now=float('inf')), 0)
+        self.assertIs(orders_state.orders[order.core_order_id], order)
+
+    def test_late_update(self):
+        """
+        Тест на запоздавшие обновления ордера из архива: обновление применяется к ордеру в архиве,
+        а если ордер снова стал активным, он возвращается в хранимые ордера
+        """
+        self.orders_state.update(orders=[order_1_update])
+        self.orders_state.expire()
+        self.orders_state.update(orders=[dataclasses.replace(order_1_update, state=enums.OrderState.CLOSED,
+                                                             filled=1)])
+        self.assertEqual(self.order_1.filled, 1)
+        self.assertIn(order_1.core_order_id, self.orders_state.archive)
+        self.orders_state.update(orders=[dataclasses.replace(order_1_update, state=enums.OrderState.OPEN)])
+        self.assertNotIn(order_1.core_order_id, self.orders_state.archive)
+        self.assertIs(self.orders_state.orders[order_1.core_order_id], self.order_1)
+        self.assertEqual(list(self.orders_state.by_state(enums.OrderState.OPEN)), [order_1.core_order_id])
+        self.assertEqual(self.changes, [enums.OrderState.CANCELED, enums.OrderState.CLOSED, enums.OrderState.OPEN])
+
+    def test_remove_and_reset(self):
+        """
+        Тест на удаление ордера из архива и очистку архива при сбросе состояния
+        """
+        self.orders_state.update(orders=[order_1_update])
+        self.orders_state.expire()
+        self.assertTrue(self.orders_state.remove_order(self.order_1))
+        self.assertEqual(len(self.orders_state.archive), 0)
+        self.orders_state.set_orders_state(self.order_2, state=enums.OrderState.ERROR)
+        self.orders_state.expire()
+        self.orders_state.reset()
+        self.assertEqual(len(self.orders_state.archive), 0)
+
+    def test_disabled_by_default(self):
+        """
+        Тест на конфигурацию по умолчанию: завершенные ордера не переносятся в архив и остаются в Trader.orders
+        """
+        trader = Trader(config=config_2, communicator=CommunicatorMock())
+        self.assertIsNone(config_2.orders_retention_delay)
+        order = copy.deepcopy(order_1)
+        trader.add_orders(order)
+        trader.orders_state.update(orders=[order_1_update])
+        self.assertEqual(trader.orders_state.expire(now=float('inf')), 0)
+        self.assertIs(trader.orders[order.core_order_id], order)
+        self.assertEqual(list(trader.orders_state.by_state(enums.OrderState.CANCELED)), [order.core_order_id])
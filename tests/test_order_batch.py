@@ -0,0 +1,119 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from testing_core import enums
+from testing_core.config import Market
+from testing_core.order.order_fabric import OrderFabric
+from testing_core.trader.trader import Trader
+from tests.communicator_mock import CommunicatorMock
+from tests.data.config_for_tests import config_2, markets_1
+from tests.data.orders import empty_func
+
+
+# торговые пары, у которых задан только один из шагов (цены или объема)
+markets_with_one_increment = {
+    **markets_1,
+    'XRP/USDT': Market(**{**markets_1['ETH/USDT'].dict(), 'common_symbol': 'XRP/USDT', 'price_increment': None}),
+    'LTC/USDT': Market(**{**markets_1['ETH/USDT'].dict(), 'common_symbol': 'LTC/USDT', 'amount_increment': None}),
+}
+
+
+class TestCreateOrders(TestCase):
+    def setUp(self):
+        self.order_fabric = OrderFabric(markets=markets_1, place_function=empty_func,
+                                        request_update_function=empty_func, cancel_function=empty_func)
+
+    def test_same_as_create_order(self):
+        """
+        Тест на пакетное создание: округление, тики и проверка лимитов совпадают с create_order по каждой строке,
+        в том числе для торговых пар, у которых задан только один из шагов
+        """
+        random.seed(3)
+        rows = 2000
+        symbols = [random.choice(list(markets_with_one_increment)) for _ in range(rows)]
+        prices = [round(random.uniform(0, 0.2), random.randint(3, 12)) for _ in range(rows)]
+        amounts = np.array([round(random.uniform(0, 0.2), random.randint(3, 12)) for _ in range(rows)])
+        ids = [str(row) for row in range(rows)]
+        for integer_ticks in (False, True):
+            order_fabric = OrderFabric(markets=markets_with_one_increment, place_function=empty_func,
+                                       request_update_function=empty_func, cancel_function=empty_func,
+                                       integer_ticks=integer_ticks)
+            batch = order_fabric.create_orders(core_order_ids=ids, symbols=symbols,
+                                               order_type=enums.OrderType.LIMIT, sides=enums.OrderSide.BUY,
+                                               prices=prices, amounts=amounts)
+            self.assertTrue(batch.orders and batch.rejected)
+            self.assertEqual(len(batch.orders) + len(batch.rejected), rows)
+            rejected = {violation.row for violation in batch.rejected}
+            created = dict(zip(batch.rows, batch.orders))
+            for row in range(rows):
+                order = order_fabric.create_order(core_order_id=ids[row], symbol=symbols[row],
+                                                  order_type=enums.OrderType.LIMIT, side=enums.OrderSide.BUY,
+                                                  price=prices[row], amount=float(amounts[row]),
+                                                  enable_validating=False)
+                self.assertEqual(row in rejected, not order_fabric.check_order_to_limits(order), row)
+                if row in created:
+                    self.assertEqual(created[row], order)
+                    self.assertEqual((created[row].price_ticks, created[row].amount_ticks),
+                                     (order.price_ticks, order.amount_ticks))
+                    self.assertIs(type(created[row].price), float)
+
+    def test_one_increment(self):
+        """
+        Тест на пакетное создание для торговой пары без шага цены: объем округляется по шагу объема
+        """
+        order_fabric = OrderFabric(markets=markets_with_one_increment, place_function=empty_func,
+                                   request_update_function=empty_func, cancel_function=empty_func)
+        batch = order_fabric.create_orders(core_order_ids=['0'], symbols='XRP/USDT', order_type=enums.OrderType.LIMIT,
+                                           sides=enums.OrderSide.BUY, prices=[20000.123456789],
+                                           amounts=[0.123456789])
+        self.assertEqual((batch.orders[0].price, batch.orders[0].amount), (20000.123456789, 0.1234567))
+
+    def test_reasons(self):
+        """
+        Тест на причины отклонения строк и ограничение лимитами (ViolationPolicy.CLIP)
+        """
+        arguments = dict(core_order_ids=['0', '1', '2', '3', '4'],
+                         symbols=['BTC/USDT', 'BTC/USDT', 'BTC/USDT', 'XXX/USDT', 'BTC/USDT'],
+                         order_type=enums.OrderType.LIMIT,
+                         sides=[enums.OrderSide.BUY, enums.OrderSide.SELL, enums.OrderSide.BUY,
+                                enums.OrderSide.BUY, enums.OrderSide.BUY],
+                         prices=[20000, 20000, 0.001, 20000, float('nan')], amounts=[0.1, 1e-06, 1, 0.1, 0.1])
+        batch = self.order_fabric.create_orders(**arguments)
+        self.assertEqual(batch.rows, [0])
+        self.assertEqual([(violation.row, violation.reason) for violation in batch.rejected], [
+            (1, enums.LimitViolationReason.AMOUNT_TOO_LOW),
+            (2, enums.LimitViolationReason.COST_TOO_LOW),
+            (3, enums.LimitViolationReason.UNKNOWN_SYMBOL),
+            (4, enums.LimitViolationReason.INVALID_VALUE),
+        ])
+
+        batch = self.order_fabric.create_orders(**arguments, violation_policy=enums.ViolationPolicy.CLIP)
+        self.assertEqual(batch.rows, [0, 1, 2])
+        self.assertEqual([violation.row for violation in batch.clipped], [1, 2])
+        self.assertEqual(batch.orders[1].amount, 1.001e-05)
+        self.assertEqual(batch.orders[2].amount, 10.00000001)
+        self.assertEqual([violation.row for violation in batch.rejected], [3, 4])
+        for order in batch.orders:
+            self.assertTrue(self.order_fabric.check_order_to_limits(order))
+
+
+class TestTraderCreateOrders(TestCase):
+    def test_one_command(self):
+        """
+        Тест на размещение пакета ордеров одной командой create_orders
+        """
+        communicator_mock = CommunicatorMock()
+        trader = Trader(config=config_2, communicator=communicator_mock)
+        prices = np.linspace(19000, 20000, 100)
+        batch = trader.create_orders(symbols='BTC/USDT', order_type='limit', sides='buy', prices=prices,
+                                     amounts=[0.01] * 100, id_prefix='grid|')
+        self.assertEqual(len(batch), 100)
+        self.assertEqual(len(communicator_mock.published_messages), 1)
+        command = communicator_mock.published_messages[0]
+        self.assertEqual(command.action, enums.Action.CREATE_ORDERS)
+        self.assertEqual([order.client_order_id for order in command.data],
+                         [order.core_order_id for order in batch.orders])
+        self.assertEqual(len(trader.orders_state.by_state(enums.OrderState.PLACING)), 100)
+        self.assertTrue(all(order_id.startswith('grid|') for order_id in trader.orders))
@@ -1,6 +1,7 @@
 import copy
 from unittest import TestCase
 
+from testing_core import enums
 from testing_core.order.order import OrderData
 from testing_core.order.order_fabric import OrderFabric
 from tests.data.config_for_tests import markets_1
@@ -39,3 +40,18 @@ class TestOrderFabric(TestCase):
         order.amount = 1e-04
         order.price = 0.0001
         self.assertFalse(self.order_fabric.check_order_to_limits(order))
+
+    def test_compact_orders(self):
+        """
+        Тест на компактные ордера: без __dict__, функции размещения и отмены общие для всех ордеров фабрики
+        """
+        placed = []
+        order_fabric = OrderFabric(markets=markets_1, place_function=placed.append,
+                                   request_update_function=empty_func, cancel_function=empty_func)
+        orders = [order_fabric.create_order(core_order_id=str(i), symbol='BTC/USDT', order_type=enums.OrderType.LIMIT,
+                                            side=enums.OrderSide.BUY, price=1000, amount=1) for i in range(2)]
+        self.assertFalse(hasattr(orders[0], '__dict__'))
+        self.assertIs(orders[0]._callbacks, orders[1]._callbacks)
+        orders[1].place()
+        self.assertEqual(placed, [orders[1]])
+        self.assertEqual(copy.deepcopy(orders[1]), orders[1])
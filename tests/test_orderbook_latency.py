@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from testing_core.communicator import aeron_communicator
+from testing_core.communicator.aeron_communicator import AeronCommunicator
+from testing_core.communicator.decoder import FastDecoder
+from testing_core.metrics import orderbook_latency
+from testing_core.metrics.orderbook_latency import OrderbookLatencyTracer, EXCHANGE_TO_GATE, GATE_TO_FRAGMENT, \
+    FRAGMENT_TO_DECODED, DECODED_TO_VISIBLE, FRAGMENT_TO_VISIBLE, EXCHANGE_TO_VISIBLE
+from testing_core.store.state_orderbook import OrderbookState
+from tests.data.config_for_tests import config_1
+from tests.data.orderbooks import orderbook_1_message, orderbook_3_message
+
+
+class TestOrderbookLatencyTracer(TestCase):
+    def setUp(self):
+        self.tracer = OrderbookLatencyTracer(max_traces=10)
+        self.orderbook_state = OrderbookState(tracer=self.tracer)
+        self.decoder = FastDecoder()
+
+    def test_stages(self):
+        """
+        Тест на задержки по этапам: биржа -> гейт -> фрагмент -> разбор -> OrderbookState
+        """
+        message = self.decoder.decode(orderbook_1_message.json().replace(
+            f'"timestamp": {orderbook_1_message.timestamp}, "data"',
+            f'"timestamp": {orderbook_1_message.data.timestamp + 700}, "data"'
+        ))
+        gate = message.timestamp
+        with patch.object(orderbook_latency, 'get_micro_timestamp', lambda: gate + 300):
+            self.tracer.on_decoded(message, received=gate + 100)
+        with patch.object(orderbook_latency, 'get_micro_timestamp', lambda: gate + 1000):
+            self.orderbook_state.update(orderbook=message.data)
+
+        symbol = message.data.symbol
+        self.assertEqual(self.tracer.histogram(EXCHANGE_TO_GATE, symbol).max, 700)
+        self.assertEqual(self.tracer.histogram(GATE_TO_FRAGMENT, symbol).max, 100)
+        self.assertEqual(self.tracer.histogram(FRAGMENT_TO_DECODED, symbol).max, 200)
+        self.assertEqual(self.tracer.histogram(DECODED_TO_VISIBLE, symbol).max, 700)
+        self.assertEqual(self.tracer.histogram(FRAGMENT_TO_VISIBLE, symbol).max, 900)
+        self.assertEqual(self.tracer.histogram(EXCHANGE_TO_VISIBLE).max, 1700)
+        self.assertEqual(self.tracer._pending, {})
+
+    def test_not_visible_orderbooks(self):
+        """
+        Тест на ордербуки, которые не дошли до OrderbookState: они не учитываются и вытесняются
+        """
+        tracer = OrderbookLatencyTracer(max_pending=1)
+        first = self.decoder.decode(orderbook_1_message.json())
+        second = self.decoder.decode(orderbook_3_message.json())
+        tracer.on_decoded(first, received=0)
+        tracer.on_decoded(second, received=0)
+        tracer.on_visible(first.data)
+        self.assertEqual(tracer.histogram(FRAGMENT_TO_VISIBLE).count, 0)
+        tracer.on_visible(second.data)
+        self.assertEqual(tracer.histogram(FRAGMENT_TO_VISIBLE).count, 1)
+
+    def test_export_jsonl(self):
+        """
+        Тест на выгрузку статистик и трассировок в формате JSON lines
+        """
+        for message in (orderbook_1_message, orderbook_3_message):
+            message = self.decoder.decode(message.json())
+            self.tracer.on_decoded(message, received=message.timestamp)
+            self.orderbook_state.update(orderbook=message.data)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'orderbook_latency.jsonl')
+            self.tracer.export_jsonl(path)
+            with open(path) as file:
+                lines = [json.loads(line) for line in file]
+        summaries = [line for line in lines if line['type'] == 'summary']
+        traces = [line for line in lines if line['type'] == 'trace']
+        self.assertEqual({line['symbol'] for line in summaries if line['stage'] == FRAGMENT_TO_VISIBLE},
+                         {'all', 'BTC/USDT', 'ETH/USDT'})
+        self.assertEqual([trace['symbol'] for trace in traces], ['BTC/USDT', 'ETH/USDT'])
+        self.assertTrue(all(trace['visible'] >= trace['received'] for trace in traces))
+
+    def test_communicator_tracing(self):
+        """
+        Тест на трассировку в коммуникаторе: время получения фрагмента и разбора записывается до обработчика
+        """
+        communicator = AeronCommunicator(
+            config=config_1,
+            orderbook_handler=lambda message: self.orderbook_state.update(orderbook=message.data),
+            balance_handler=lambda message: None,
+            core_input_handler=lambda message: None,
+            orderbook_tracer=self.tracer
+        )
+        communicator._handler(orderbook_1_message.json())
+        self.assertEqual(self.tracer.histogram(FRAGMENT_TO_VISIBLE, 'BTC/USDT').count, 1)
+        self.assertIn(FRAGMENT_TO_DECODED, self.tracer.report())
+
+    def test_conflation_received_time(self):
+        """
+        Тест на трассировку при конфлюэнции: время получения фрагмента фиксируется при получении, поэтому
+        ожидание в конфлюэнции учитывается в этапе fragment -> decoded, а не gate -> fragment
+        """
+        communicator = AeronCommunicator(
+            config=config_1.copy(update={'conflate_orderbooks': True}),
+            orderbook_handler=lambda message: self.orderbook_state.update(orderbook=message.data),
+            balance_handler=lambda message: None,
+            core_input_handler=lambda message: None,
+            orderbook_tracer=self.tracer
+        )
+        gate = orderbook_1_message.timestamp
+        with patch.object(aeron_communicator, 'get_micro_timestamp', lambda: gate + 100):
+            communicator._orderbooks_channel_handler(orderbook_1_message.json())
+        with patch.object(aeron_communicator, 'get_micro_timestamp', lambda: gate + 300), \
+                patch.object(orderbook_latency, 'get_micro_timestamp', lambda: gate + 300):
+            self.assertEqual(communicator._handle_conflated_orderbooks(), 1)
+
+        symbol = orderbook_1_message.data.symbol
+        self.assertEqual(self.tracer.histogram(GATE_TO_FRAGMENT, symbol).max, 100)
+        self.assertEqual(self.tracer.histogram(FRAGMENT_TO_DECODED, symbol).max, 200)
@@ -0,0 +1,129 @@
+import asyncio
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+from testing_core import enums
+from testing_core.strategy.base_strategy import Strategy
+from testing_core.strategy.resources import StrategyResources, READ_ONLY
+from testing_core.strategy.scheduler import StrategyScheduler
+from testing_core.trader.trader import Trader
+from tests.communicator_mock import CommunicatorMock
+from tests.data.config_for_tests import config_2
+
+
+class TestStrategyResources(TestCase):
+    def test_conflicts(self):
+        """
+        Тест на конфликты ресурсов: монопольный баланс, пересекающиеся и независимые торговые пары
+        """
+        exclusive = StrategyResources()
+        btc = StrategyResources(markets={'BTC/USDT'}, exclusive_balance=False)
+        eth = StrategyResources(markets={'ETH/USDT'}, exclusive_balance=False)
+        any_market = StrategyResources(exclusive_balance=False)
+        self.assertTrue(exclusive.conflicts_with(exclusive))
+        self.assertTrue(exclusive.conflicts_with(btc))
+        self.assertTrue(btc.conflicts_with(exclusive))
+        self.assertFalse(exclusive.conflicts_with(READ_ONLY))
+        self.assertFalse(READ_ONLY.conflicts_with(exclusive))
+        self.assertTrue(btc.conflicts_with(btc))
+        self.assertFalse(btc.conflicts_with(eth))
+        self.assertTrue(btc.conflicts_with(any_market))
+
+
+class TestStrategyScheduler(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.communicator_mock = CommunicatorMock()
+        self.trader = Trader(config=config_2, communicator=self.communicator_mock)
+        self.events: list[str] = []
+        self.order_ids: list[str] = []
+
+    def _strategy(self, name: str, resources: StrategyResources, steps: int = 3) -> type[Strategy]:
+        """Стратегия, которая создает ордер и записывает начало и конец работы, передавая управление между ними"""
+        events, order_ids = self.events, self.order_ids
+
+        class RecordingStrategy(Strategy):
+            async def execute(self, trader, orderbooks, balances):
+                events.append(f'{name} start')
+                order = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=1000,
+                                                     amount=1, enable_validating=False)
+                assert order.core_order_id.startswith(trader.namespace)
+                order_ids.append(order.core_order_id)
+                assert list(trader.orders) == [order.core_order_id]
+                for _ in range(steps):
+                    await asyncio.sleep(0)
+                events.append(f'{name} end')
+
+        RecordingStrategy.name = name
+        RecordingStrategy.resources = resources
+        return RecordingStrategy
+
+    async def test_parallel_and_serialized(self):
+        """
+        Тест на планирование: только читающая стратегия работает одновременно с монопольными,
+        монопольные выполняются по очереди в исходном порядке
+        """
+        await StrategyScheduler(trader=self.trader, config=config_2).run(
+            self._strategy('first', StrategyResources()),
+            self._strategy('reader', READ_ONLY, steps=10),
+            self._strategy('second', StrategyResources()),
+        )
+        self.assertLess(self.events.index('reader start'), self.events.index('first end'))
+        self.assertLess(self.events.index('first end'), self.events.index('second start'))
+        self.assertLess(self.events.index('second start'), self.events.index('reader end'))
+        # ордера завершившихся стратегий удалены из общего Trader
+        self.assertEqual(self.trader.orders, {})
+
+    async def test_order_id_format(self):
+        """
+        Тест на id ордеров стратегий: пространство имен входит в 36 символов UUID, используются только символы,
+        допустимые в clientOrderId (Binance: до 36 символов [.A-Za-z0-9:/_-])
+        """
+        strategies = [self._strategy(f'strategy {index}', StrategyResources(), steps=0) for index in range(12)]
+        await StrategyScheduler(trader=self.trader, config=config_2).run(*strategies)
+        self.assertEqual(len(self.order_ids), 12)
+        self.assertEqual(len(set(self.order_ids)), 12)
+        for index, order_id in enumerate(self.order_ids):
+            self.assertTrue(order_id.startswith(f's{index}-'), order_id)
+            self.assertEqual(len(order_id), 36, order_id)
+            self.assertRegex(order_id, r'^[.A-Za-z0-9:/_-]{1,36}$')
+
+    async def test_cancel_own_orders(self):
+        """
+        Тест на cancel_all_orders стратегии без монопольного баланса: отменяются только ее ордера
+        """
+        cancelled = []
+
+        class Trading(Strategy):
+            name = 'trading'
+            resources = StrategyResources(markets={'BTC/USDT'}, exclusive_balance=False)
+
+            async def execute(self, trader, orderbooks, balances):
+                order = trader.create_order(symbol='BTC/USDT', order_type='limit', side='buy', price=1000,
+                                            amount=1, enable_validating=False)
+                trader.cancel_all_orders()
+                cancelled.append(order.core_order_id)
+
+        foreign = self.trader.create_order(symbol='BTC/USDT', order_type='limit', side='buy', price=1000, amount=1,
+                                           enable_validating=False)
+        await StrategyScheduler(trader=self.trader, config=config_2).run(Trading)
+
+        actions = [message.action for message in self.communicator_mock.published_messages]
+        self.assertNotIn(enums.Action.CANCEL_ALL_ORDERS, actions)
+        cancel = self.communicator_mock.published_messages[actions.index(enums.Action.CANCEL_ORDERS)]
+        self.assertEqual([order.client_order_id for order in cancel.data], cancelled)
+        self.assertEqual(list(self.trader.orders), [foreign.core_order_id])
+
+    async def test_failed_strategy(self):
+        """
+        Тест на исключение в стратегии: остальные стратегии отменяются, исключение пробрасывается
+        """
+        class Failing(Strategy):
+            name = 'failing'
+            resources = READ_ONLY
+
+            async def execute(self, trader, orderbooks, balances):
+                raise RuntimeError('failed')
+
+        with self.assertRaises(RuntimeError):
+            await StrategyScheduler(trader=self.trader, config=config_2).run(
+                self._strategy('long', StrategyResources(), steps=1000), Failing)
+        self.assertNotIn('long end', self.events)
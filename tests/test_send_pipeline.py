@@ -0,0 +1,144 @@
+from unittest import TestCase
+
+from testing_core import enums
+from testing_core.communicator.send_pipeline import SendPipeline, offer_result_status
+from testing_core.formatter.formatter import Formatter
+from testing_core.trader.trader import Trader
+from tests.communicator_mock import CommunicatorMock
+from tests.data.config_for_tests import config_2
+from tests.data.orders import order_1, order_2
+from tests.publisher_mock import PublisherMock
+
+
+class TestSendPipeline(TestCase):
+    def setUp(self):
+        self.time = 0.0
+        self.failed = []
+        self.formatter = Formatter(exchange='binance', instance='test', algo='test')
+
+    def _create_pipeline(self, publisher: PublisherMock, capacity: int = 1024) -> SendPipeline:
+        return SendPipeline(
+            offer_function=lambda message: offer_result_status(publisher.offer(message.json())),
+            capacity=capacity,
+            failed_handler=lambda message, reason: self.failed.append((message, reason)),
+            clock=lambda: self.time
+        )
+
+    def test_retry_with_backoff(self):
+        """
+        При back pressure сообщение остается в буфере и отправляется повторно после ожидания, порядок сохраняется
+        """
+        publisher = PublisherMock(back_pressured_offers=2)
+        pipeline = self._create_pipeline(publisher)
+        first = self.formatter.format_create_orders((order_1,))
+        second = self.formatter.format_cancel_orders((order_2,))
+        pipeline.publish(first)
+        pipeline.publish(second)
+        self.assertEqual(pipeline.buffer_depth, 2)
+
+        # время ожидания перед повторной попыткой еще не прошло
+        pipeline.drain()
+        self.assertEqual(publisher.offers_count, 1)
+
+        self.time += 0.001
+        self.assertEqual(pipeline.drain(), 0)
+        self.time += 0.001
+        self.assertEqual(pipeline.drain(), 2)
+        self.assertEqual(publisher.messages, [first.json(), second.json()])
+        self.assertEqual(pipeline.metrics.sent, 2)
+        self.assertEqual(pipeline.metrics.retries, 2)
+        self.assertEqual(pipeline.metrics.back_pressured, 2)
+        self.assertAlmostEqual(pipeline.metrics.back_pressured_time, 0.004)
+        self.assertEqual(self.failed, [])
+
+    def test_deadline(self):
+        """
+        Сообщение, которое не удалось отправить до deadline, передается в обработчик неотправленных сообщений
+        """
+        publisher = PublisherMock(back_pressured_offers=1000)
+        pipeline = self._create_pipeline(publisher)
+        request = self.formatter.format_get_balance(['BTC'])
+        pipeline.publish(request)
+        self.time += 2
+        pipeline.drain()
+        self.assertEqual(self.failed, [(request, 'deadline exceeded')])
+        self.assertEqual(pipeline.metrics.expired, 1)
+        self.assertEqual(pipeline.buffer_depth, 0)
+
+    def test_buffer_overflow(self):
+        """
+        При переполнении буфера сообщение не теряется молча: оно передается в обработчик неотправленных сообщений
+        """
+        publisher = PublisherMock(back_pressured_offers=1000)
+        pipeline = self._create_pipeline(publisher, capacity=1)
+        first = self.formatter.format_create_orders((order_1,))
+        second = self.formatter.format_create_orders((order_2,))
+        pipeline.publish(first)
+        pipeline.publish(second)
+        self.assertEqual(self.failed, [(second, 'send buffer is full')])
+        self.assertEqual(pipeline.metrics.dropped, 1)
+        self.assertEqual(pipeline.metrics.max_buffer_depth, 1)
+
+    def test_not_connected(self):
+        """
+        Если нет подписчика, команда ордеров передается в обработчик неотправленных сообщений, а остальные
+        сообщения - в обработчик отсутствия подписчика
+        """
+        not_connected = []
+        pipeline = SendPipeline(
+            offer_function=lambda message: enums.PublishStatus.NOT_CONNECTED,
+            failed_handler=lambda message, reason: self.failed.append((message, reason)),
+            not_connected_handler=not_connected.append,
+            clock=lambda: self.time
+        )
+        command = self.formatter.format_create_orders((order_1,))
+        request = self.formatter.format_get_balance(['BTC'])
+        pipeline.publish(command)
+        pipeline.publish(request)
+        self.assertEqual(self.failed, [(command, 'not connected')])
+        self.assertEqual(not_connected, [request])
+        self.assertEqual(pipeline.metrics.not_connected, 2)
+        self.assertEqual(pipeline.buffer_depth, 0)
+
+
+class PipelineCommunicatorMock(CommunicatorMock):
+    """
+    Мок коммуникатора, который отправляет сообщения через SendPipeline в PublisherMock
+    """
+
+    def __init__(self, publisher: PublisherMock, capacity: int):
+        super().__init__()
+        self.publish_failed_handler = None
+        self.pipeline = SendPipeline(
+            offer_function=lambda message: offer_result_status(publisher.offer(message.json())),
+            capacity=capacity,
+            failed_handler=lambda message, reason: self.publish_failed_handler(message, reason)
+        )
+
+    def publish(self, message):
+        self.pipeline.publish(message)
+
+
+class TestPlaceWithFullBuffer(TestCase):
+    def test_place(self):
+        """
+        Ордер, команда на создание которого не поместилась в буфер отправки, остается в состоянии ERROR:
+        place возвращает False, ордер находится в индексе состояния ERROR
+        """
+        errors = []
+        communicator = PipelineCommunicatorMock(PublisherMock(back_pressured_offers=1000), capacity=1)
+        trader = Trader(config=config_2, communicator=communicator, order_error_callback=errors.append)
+        communicator.publish_failed_handler = trader._handle_publish_failed
+        buffered = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=20000,
+                                                amount=0.1)
+        dropped = trader.create_unplaced_order(symbol='BTC/USDT', order_type='limit', side='buy', price=20000,
+                                               amount=0.1)
+
+        self.assertTrue(buffered.place())
+        self.assertEqual(buffered.state, enums.OrderState.PLACING)
+        self.assertFalse(dropped.place())
+        self.assertEqual(dropped.state, enums.OrderState.ERROR)
+        self.assertEqual(list(trader.orders_state.by_state(enums.OrderState.ERROR).values()), [dropped])
+        self.assertEqual(list(trader.orders_state.by_state(enums.OrderState.PLACING).values()), [buffered])
+        self.assertEqual(errors, [dropped])
+        self.assertEqual(communicator.pipeline.metrics.dropped, 1)
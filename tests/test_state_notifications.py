@@ -0,0 +1,55 @@
+import asyncio
+import copy
+import unittest
+
+from testing_core import enums
+from testing_core.store.state_balances import BalancesState
+from testing_core.store.state_orderbook import OrderbookState
+from testing_core.store.state_orders import OrdersState
+from tests.data.balances import balances_1
+from tests.data.orderbooks import orderbook_1, orderbook_3
+from tests.data.orders import order_1, order_1_update
+
+
+class TestStateNotifications(unittest.IsolatedAsyncioTestCase):
+    """
+    Ожидание изменений состояния: ожидание завершается после обновления состояния, без периодического опроса
+    """
+
+    async def test_order_wait_for_state(self):
+        orders_state = OrdersState()
+        order = copy.deepcopy(order_1)
+        orders_state.add_order(order)
+        waiting = asyncio.create_task(order.wait_for_state(enums.OrderState.CANCELED, timeout=1))
+        await asyncio.sleep(0)
+        self.assertFalse(waiting.done())
+
+        orders_state.update(orders=[order_1_update])
+        self.assertTrue(await waiting)
+
+    async def test_order_wait_while_state(self):
+        orders_state = OrdersState()
+        order = copy.deepcopy(order_1)
+        orders_state.add_order(order)
+        orders_state.set_orders_state(order, state=enums.OrderState.PLACING)
+        self.assertFalse(await order.wait_while_state(enums.OrderState.PLACING, timeout=0.01))
+
+        asyncio.get_running_loop().call_soon(lambda: orders_state.set_orders_state(order, state=enums.OrderState.OPEN))
+        self.assertTrue(await order.wait_while_state(enums.OrderState.PLACING, timeout=1))
+
+    async def test_balances_wait_ready(self):
+        balances_state = BalancesState()
+        self.assertFalse(await balances_state.wait_ready(timeout=0.01))
+
+        asyncio.get_running_loop().call_soon(balances_state.update, balances_1['assets'])
+        self.assertTrue(await balances_state.wait_ready(assets=['BTC', 'USDT'], timeout=1))
+
+    async def test_orderbooks_wait_for_symbols(self):
+        orderbook_state = OrderbookState()
+        loop = asyncio.get_running_loop()
+        loop.call_soon(orderbook_state.update, orderbook_1)
+        self.assertFalse(await orderbook_state.wait_for_symbols(['BTC/USDT', 'ETH/USDT'], timeout=0.01))
+
+        loop.call_soon(orderbook_state.update, orderbook_3)
+        self.assertTrue(await orderbook_state.wait_for_symbols(['BTC/USDT', 'ETH/USDT'], timeout=1))
+        self.assertEqual(orderbook_state.updates_count('BTC/USDT'), 1)
@@ -0,0 +1,69 @@
+import copy
+from unittest import TestCase
+
+from testing_core.store.incremental_orderbook import IncrementalOrderbook
+from testing_core.store.state_orderbook import OrderbookState
+from tests.data.orderbooks import orderbook_5, orderbook_5_delta_1, orderbook_5_updated_1, orderbook_5_delta_gap
+
+
+class TestOrderbookState(TestCase):
+    def setUp(self):
+        self.orderbook_state = OrderbookState()
+        self.orderbook_state.update(orderbook=copy.deepcopy(orderbook_5))
+
+    def test_apply_delta(self):
+        """
+        Обновление добавляет, изменяет и удаляет уровни, сохраняя сортировку
+        """
+        self.assertTrue(self.orderbook_state.apply_delta(delta=orderbook_5_delta_1))
+        orderbook = self.orderbook_state['BTC/USDT']
+        self.assertIsInstance(orderbook, IncrementalOrderbook)
+        self.assertEqual(orderbook, orderbook_5_updated_1)
+        self.assertEqual(orderbook.bids[0][0], 8724.9)
+        self.assertEqual(self.orderbook_state.last_update_timestamp, orderbook_5_delta_1.timestamp)
+
+    def test_sequence_gap(self):
+        """
+        При пропуске обновления ордербук рассинхронизирован до получения снапшота
+        """
+        self.assertFalse(self.orderbook_state.is_desynced('BTC/USDT'))
+        self.assertFalse(self.orderbook_state.apply_delta(delta=orderbook_5_delta_gap))
+        self.assertTrue(self.orderbook_state.is_desynced('BTC/USDT'))
+        self.assertFalse(self.orderbook_state.apply_delta(delta=orderbook_5_delta_1))
+        self.assertEqual(self.orderbook_state['BTC/USDT'], orderbook_5)
+
+        self.orderbook_state.update(orderbook=copy.deepcopy(orderbook_5))
+        self.assertFalse(self.orderbook_state.is_desynced('BTC/USDT'))
+        self.assertTrue(self.orderbook_state.apply_delta(delta=orderbook_5_delta_1))
+
+    def test_stale_delta(self):
+        """
+        Повторное и запоздавшее обновления отбрасываются, ордербук остается синхронизированным
+        """
+        self.assertTrue(self.orderbook_state.apply_delta(delta=orderbook_5_delta_1))
+        late = orderbook_5_delta_1.copy(update={'sequence': 100, 'asks': [[8725.61, 0]]})
+        for delta in (orderbook_5_delta_1, late):
+            self.assertFalse(self.orderbook_state.apply_delta(delta=delta))
+            self.assertFalse(self.orderbook_state.is_desynced('BTC/USDT'))
+        self.assertEqual(self.orderbook_state['BTC/USDT'], orderbook_5_updated_1)
+
+        delta_2 = orderbook_5_delta_gap.copy(update={'sequence': 102})
+        self.assertTrue(self.orderbook_state.apply_delta(delta=delta_2))
+
+    def test_timestamp_regression(self):
+        """
+        Обновление с timestamp меньше текущего отбрасывается, ордербук остается синхронизированным
+        """
+        delta = orderbook_5_delta_1.copy(update={'sequence': None, 'timestamp': orderbook_5.timestamp - 1})
+        self.assertFalse(self.orderbook_state.apply_delta(delta=delta))
+        self.assertFalse(self.orderbook_state.is_desynced('BTC/USDT'))
+        self.assertTrue(self.orderbook_state.apply_delta(delta=orderbook_5_delta_1))
+
+    def test_delta_without_snapshot(self):
+        """
+        Обновление по символу без снапшота не применяется
+        """
+        delta = orderbook_5_delta_1.copy(update={'symbol': 'ETH/USDT'})
+        self.assertFalse(self.orderbook_state.apply_delta(delta=delta))
+        self.assertIsNone(self.orderbook_state['ETH/USDT'])
+        self.assertTrue(self.orderbook_state.is_desynced('ETH/USDT'))
@@ -1,4 +1,5 @@
 import copy
+import dataclasses
 from unittest import TestCase
 
 from testing_core.store.state_orders import OrdersState
@@ -44,3 +45,31 @@ class TestOrdersState(TestCase):
             order_3.core_order_id: order_3
         }
         self.assertEqual(self.orders_state.orders, updated_orders)
+
+    def test_indexes(self):
+        """
+        Тест на индексы по символу, состоянию, стороне и id ордера на бирже при добавлении, обновлении и удалении
+        """
+        self.orders_state.reset()
+        order_1_copy, order_2_copy = copy.deepcopy(order_1), copy.deepcopy(order_2)
+        self.orders_state.add_order(order_1_copy, order_2_copy)
+        btc_orders = self.orders_state.by_symbol('BTC/USDT')
+        self.assertEqual(list(btc_orders), [order_1.core_order_id])
+        self.assertEqual(list(self.orders_state.by_side(enums.OrderSide.SELL)), [order_2.core_order_id])
+        self.assertEqual(len(self.orders_state.by_state(enums.OrderState.UNPLACED)), 2)
+
+        self.orders_state.set_orders_state(order_1_copy, state=enums.OrderState.PLACING)
+        self.assertEqual(list(self.orders_state.by_state(enums.OrderState.PLACING)), [order_1.core_order_id])
+        self.orders_state.update(orders=[dataclasses.replace(order_1_update, exchange_order_id='42')])
+        self.assertEqual(self.orders_state.by_state(enums.OrderState.PLACING), {})
+        self.assertEqual(self.orders_state.select(symbol='BTC/USDT', state=enums.OrderState.CANCELED), [order_1_copy])
+        self.assertEqual(self.orders_state.select(symbol='BTC/USDT', state=enums.OrderState.OPEN), [])
+        self.assertIs(self.orders_state.by_exchange_order_id('42'), order_1_copy)
+
+        self.orders_state.remove_order(order_1_copy)
+        # представление отражает изменения
+        self.assertEqual(btc_orders, {})
+        self.assertIsNone(self.orders_state.by_exchange_order_id('42'))
+        self.assertEqual(self.orders_state.by_state(enums.OrderState.CANCELED), {})
+        with self.assertRaises(TypeError):
+            btc_orders['id'] = order_1_copy
@@ -0,0 +1,106 @@
+import asyncio
+import time
+import unittest
+
+from aeron import Publisher
+
+from testing_core.communicator.threaded_communicator import ThreadedAeronCommunicator
+from tests.data.balances import balances_1_message
+from tests.data.config_for_tests import config_1, aeron_channels_1
+from tests.data.core_commands import command_get_balance_1
+from tests.data.orderbooks import orderbook_1_message
+from tests.publisher_mock import PublisherMock
+
+
+class TestThreadedAeronCommunicator(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.orderbooks = []
+        self.balances = []
+        self.core_input = []
+
+    def _create_communicator(self, **config_update) -> ThreadedAeronCommunicator:
+        return ThreadedAeronCommunicator(
+            config=config_1.copy(update=config_update),
+            orderbook_handler=self.orderbooks.append,
+            balance_handler=self.balances.append,
+            core_input_handler=self.core_input.append
+        )
+
+    async def test_handoff(self):
+        """
+        Сообщения читаются в потоке опроса, обработчики вызываются в event loop после пробуждения
+        """
+        communicator = self._create_communicator()
+        communicator.start()
+        try:
+            publisher = Publisher(aeron_channels_1.orderbooks.channel, aeron_channels_1.orderbooks.stream_id)
+            publisher.offer(orderbook_1_message.json())
+            await asyncio.wait_for(communicator.wait_new_messages(), timeout=1)
+            self.assertEqual(communicator.handle_new_messages(), 1)
+            self.assertEqual(self.orderbooks, [orderbook_1_message])
+            self.assertEqual(communicator.metrics.handled, 1)
+        finally:
+            communicator.stop()
+
+    async def test_conflation(self):
+        """
+        При конфлюэнции ордербуки минуют очередь, разбирается только последний ордербук по символу
+        """
+        communicator = self._create_communicator(conflate_orderbooks=True)
+        publisher = Publisher(aeron_channels_1.orderbooks.channel, aeron_channels_1.orderbooks.stream_id)
+        for _ in range(3):
+            publisher.offer(orderbook_1_message.json())
+        communicator.start()
+        # event loop занят, пока поток опроса вычитывает подписки
+        time.sleep(0.1)
+        try:
+            while not self.orderbooks:
+                await asyncio.wait_for(communicator.wait_new_messages(), timeout=1)
+                communicator.handle_new_messages()
+            self.assertEqual(self.orderbooks, [orderbook_1_message])
+            self.assertEqual(communicator.conflated_orderbooks, {orderbook_1_message.data.symbol: 2})
+        finally:
+            communicator.stop()
+
+    async def test_backpressure(self):
+        """
+        При переполнении очереди ордербуки отбрасываются, остальные сообщения ждут места в очереди
+        """
+        communicator = self._create_communicator(polling_queue_size=1)
+        orderbooks_publisher = Publisher(aeron_channels_1.orderbooks.channel, aeron_channels_1.orderbooks.stream_id)
+        balances_publisher = Publisher(aeron_channels_1.balances.channel, aeron_channels_1.balances.stream_id)
+        for _ in range(3):
+            orderbooks_publisher.offer(orderbook_1_message.json())
+        balances_publisher.offer(balances_1_message.json())
+        communicator.start()
+        # event loop занят, пока поток опроса вычитывает подписки
+        time.sleep(0.1)
+        try:
+            while not self.balances:
+                await asyncio.wait_for(communicator.wait_new_messages(), timeout=1)
+                communicator.handle_new_messages()
+
+            self.assertEqual(communicator.metrics.dropped, 2)
+            self.assertEqual(self.orderbooks, [orderbook_1_message])
+            self.assertEqual(self.balances, [balances_1_message])
+            self.assertGreaterEqual(communicator.metrics.blocked, 1)
+        finally:
+            communicator.stop()
+
+    async def test_send_buffer_drain(self):
+        """
+        Пока в буфере отправки есть сообщения, ожидание ограничено по времени: команда, не принятая из-за
+        back pressure, отправляется повторно без входящих сообщений и учитывается в количестве работы
+        """
+        communicator = self._create_communicator()
+        publisher = PublisherMock(back_pressured_offers=1)
+        communicator._gate_input = publisher
+        communicator.start()
+        try:
+            communicator.publish(command_get_balance_1)
+            self.assertEqual(communicator.publish_metrics.max_buffer_depth, 1)
+            await asyncio.wait_for(communicator.wait_new_messages(), timeout=1)
+            self.assertEqual(communicator.handle_new_messages(), 1)
+            self.assertEqual(publisher.messages, [command_get_balance_1.json()])
+        finally:
+            communicator.stop()
@@ -0,0 +1,104 @@
+import copy
+import random
+from unittest import TestCase
+
+from testing_core import enums
+from testing_core.exceptions import LimitViolation
+from testing_core.formatter.formatter import Formatter
+from testing_core.order.order_fabric import OrderFabric
+from testing_core.order.ticks import TickScale, levels_to_ticks
+from testing_core.utils import truncate_to_increment
+from tests.data.config_for_tests import markets_1
+from tests.data.orders import empty_func
+
+
+class TestTickScale(TestCase):
+    def test_truncate_same_as_decimal(self):
+        """
+        Тест на совпадение целочисленного округления с truncate_to_increment (decimal.Decimal)
+        """
+        random.seed(1)
+        for increment in (1e-08, 1e-05, 0.001, 0.025, 0.1, 0.3, 0.5, 1, 2.5, 10):
+            scale = TickScale(increment)
+            values = [0.29, 0.58, 1.15, 2.675, 4.35, 0.1 + 0.2, 1e-05, 123.1234, -123.1234, 12345.1234]
+            values += [round(random.uniform(0, 1e6), random.randint(0, 12)) for _ in range(2000)]
+            values += [random.uniform(0, 1e4) for _ in range(2000)]
+            for value in values:
+                self.assertEqual(scale.truncate(value), truncate_to_increment(value, increment), (increment, value))
+
+    def test_ticks_and_format(self):
+        scale = TickScale(0.025)
+        self.assertEqual((scale.decimals, scale.step), (3, 25))
+        self.assertEqual(scale.to_ticks(123.1234), 4924)
+        self.assertEqual(scale.from_ticks(4924), 123.1)
+        self.assertEqual(scale.format(4924), '123.1')
+        self.assertEqual(TickScale(10).format(1234), '12340.0')
+        self.assertEqual(TickScale(1e-05).format(3), '0.00003')
+        self.assertEqual(levels_to_ticks([[100.05, 1.5]], TickScale(0.01), TickScale(0.1)), [(10005, 15)])
+
+    def test_market_scales(self):
+        """
+        Тест на шкалы тиков, рассчитанные при создании Market, и их копирование вместе с конфигурацией
+        """
+        market = markets_1['BTC/USDT']
+        self.assertEqual(market.price_scale.step, 1)
+        self.assertEqual(market.price_scale.decimals, 3)
+        self.assertEqual(market.amount_scale.decimals, 8)
+        self.assertIsNotNone(market.copy(deep=True).tick_limits)
+        self.assertNotIn('_price_scale', market.dict())
+
+
+class TestIntegerTicks(TestCase):
+    def setUp(self):
+        self.order_fabric = OrderFabric(markets=markets_1, place_function=empty_func,
+                                        request_update_function=empty_func, cancel_function=empty_func,
+                                        integer_ticks=True)
+
+    def test_create_order(self):
+        order = self.order_fabric.create_order(core_order_id='1', symbol='BTC/USDT', order_type=enums.OrderType.LIMIT,
+                                               side=enums.OrderSide.BUY, price=20000.12345, amount=0.123456789)
+        self.assertEqual((order.price, order.amount), (20000.123, 0.12345678))
+        self.assertEqual((order.price_ticks, order.amount_ticks), (20000123, 12345678))
+        from_ticks = self.order_fabric.create_order_from_ticks(
+            core_order_id='1', symbol='BTC/USDT', order_type=enums.OrderType.LIMIT, side=enums.OrderSide.BUY,
+            price_ticks=20000123, amount_ticks=12345678)
+        self.assertEqual(from_ticks, order)
+
+    def test_limits(self):
+        """
+        Тест на проверку лимитов в тиках: результат совпадает с проверкой по float, границы строгие
+        """
+        limits = markets_1['BTC/USDT'].tick_limits
+        # минимальный объем 1e-05 (1000 тиков), минимальная стоимость 0.01
+        self.assertFalse(limits.check(price_ticks=1_000_000, amount_ticks=1000))
+        self.assertTrue(limits.check(price_ticks=1_000_000, amount_ticks=1001))
+        self.assertFalse(limits.check(price_ticks=10_000, amount_ticks=1001))
+        float_fabric = OrderFabric(markets=markets_1, place_function=empty_func,
+                                   request_update_function=empty_func, cancel_function=empty_func)
+        random.seed(2)
+        for _ in range(1000):
+            price, amount = round(random.uniform(0, 20), 3), round(random.uniform(0, 0.01), 8)
+            ticks_order = self.order_fabric.create_order(core_order_id='1', symbol='BTC/USDT', order_type='limit',
+                                                         side='buy', price=price, amount=amount,
+                                                         enable_validating=False)
+            float_order = copy.copy(ticks_order)
+            float_order.price_ticks = float_order.amount_ticks = None
+            self.assertEqual(self.order_fabric.check_order_to_limits(ticks_order),
+                             float_fabric.check_order_to_limits(float_order), (price, amount))
+        with self.assertRaises(LimitViolation):
+            self.order_fabric.create_order_from_ticks(core_order_id='1', symbol='BTC/USDT', order_type='limit',
+                                                      side='buy', price_ticks=1, amount_ticks=1)
+
+    def test_serialization(self):
+        """
+        Тест на сериализацию цены и объема из тиков десятичными строками (без экспоненты)
+        """
+        formatter = Formatter(exchange='binance', instance='test', algo='test', markets=markets_1)
+        order = self.order_fabric.create_order(core_order_id='1', symbol='ETH/BTC', order_type=enums.OrderType.LIMIT,
+                                               side=enums.OrderSide.BUY, price=0.00005, amount=1000.00012)
+        command = formatter.format_create_orders((order,))
+        self.assertIn('"amount": 1000.00012, "price": 0.00005}', command.json())
+        self.assertEqual(command.data[0].price, 0.00005)
+        # без тиков - как раньше, через float
+        order.price_ticks = None
+        self.assertIn('"price": 5e-05}', formatter.format_create_orders((order,)).json())
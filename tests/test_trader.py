@@ -11,8 +11,9 @@ from tests.data.balances import balances_1_message, balances_1, balances_2_messa
 from tests.data.config_for_tests import config_1, config_2
 from tests.data.error_messages import error_from_gate_1
 from tests.data.orderbooks import orderbook_1_message, orderbook_1, orderbook_2_message, orderbook_3_message, \
-    orderbook_2, orderbook_3
-from tests.data.orders import order_1, order_2, order_2_update_message, order_2_updated, order_4
+    orderbook_2, orderbook_3, orderbook_5, orderbook_5_delta_gap_message, orderbook_5_delta_1_message, \
+    orderbook_5_updated_1
+from tests.data.orders import order_1, order_2, order_2_update_message, order_2_updated_from_gate, order_4
 
 
 class TestTrader(TestCase):
@@ -104,6 +105,31 @@ class TestTrader(TestCase):
         self.assertEqual(self.trader.orderbooks['BTC/USDT'], orderbook_2, 'Orderbooks is not equal.')
         self.assertEqual(self.trader.orderbooks['ETH/USDT'], orderbook_3, 'Orderbooks is not equal.')
 
+    def test_orderbook_snapshot_request(self):
+        """
+        Тест, что при пропуске инкрементального обновления ордербука запрашивается снапшот (один раз)
+        """
+        self.trader.orderbooks.update(orderbook=copy.deepcopy(orderbook_5))
+        self.communicator_mock.orderbooks_queue.append(orderbook_5_delta_gap_message)
+        self.communicator_mock.handle_new_messages()
+        self.communicator_mock.orderbooks_queue.append(orderbook_5_delta_gap_message)
+        self.communicator_mock.handle_new_messages()
+        self.assertEqual(len(self.communicator_mock.published_messages), 1)
+        message = self.communicator_mock.published_messages[0]
+        self.assertEqual(message.action, enums.Action.GET_ORDERBOOK)
+        self.assertEqual(message.data, ['BTC/USDT'])
+
+    def test_stale_orderbook_delta(self):
+        """
+        Тест, что повторное инкрементальное обновление ордербука отбрасывается без запроса снапшота
+        """
+        self.trader.orderbooks.update(orderbook=copy.deepcopy(orderbook_5))
+        for _ in range(2):
+            self.communicator_mock.orderbooks_queue.append(orderbook_5_delta_1_message)
+            self.communicator_mock.handle_new_messages()
+        self.assertEqual(self.trader.orderbooks['BTC/USDT'], orderbook_5_updated_1)
+        self.assertEqual(self.communicator_mock.published_messages, [])
+
     def test_cancel_all_orders(self):
         """
         Тест отправления команды на отмену всех ордеров
@@ -161,7 +187,7 @@ class TestTrader(TestCase):
         self.trader.add_orders(order)
         self.communicator_mock.core_input_queue.append(order_2_update_message)
         self.communicator_mock.handle_new_messages()
-        self.assertEqual(order, order_2_updated)
+        self.assertEqual(order, order_2_updated_from_gate)
 
     @pytest.mark.skip('Error codes is not implemented in current version of trade system.')
     def test_handle_core_input(self):
@@ -176,3 +202,13 @@ class TestTrader(TestCase):
         self.communicator_mock.core_input_queue.append(error_from_gate_1)
         self.communicator_mock.handle_new_messages()
         self.assertEqual(order.state, enums.OrderState.ERROR)
+
+    def test_publish_failed(self):
+        """
+        Тест, что ордера из команды на создание, которую не удалось отправить, переводятся в состояние ERROR
+        """
+        order = copy.deepcopy(order_4)
+        self.trader.place_orders(order)
+        command = self.communicator_mock.published_messages[0]
+        self.trader._handle_publish_failed(command, 'deadline exceeded')
+        self.assertEqual(order.state, enums.OrderState.ERROR)